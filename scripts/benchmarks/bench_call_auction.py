@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Call Auction Matching Benchmark
+
+Runs the same single-stock simulation of rule-based traders (market makers,
+limit buyers, market buyers, gap, mixed-order and momentum traders) once per
+matching mode, and times MatchingEngine.match_orders each round:
+
+  continuous          non-crossing limits, then market orders, then crossing
+                      limits, matched one order at a time (the default)
+  call_auction time   every order of the round and the resting book cleared
+                      at one price, marginal level filled in time priority
+  call_auction pro    the same, marginal level filled pro rata
+
+For the auctions, the share spent computing the clearing price and fills
+(clear_call_auction) is reported separately from settling the trades. The
+population is --scale copies of the base mix of 27 agents. Both modes use the
+price-level book with a deferred public view, and verification is off. Runs
+inside a temporary directory, since the simulation writes under ./logs.
+Per-trade and agent state logging is a large part of either mode's cost;
+--quiet switches INFO logging off to compare the matching work itself.
+
+Usage:
+    python scripts/benchmarks/bench_call_auction.py
+    python scripts/benchmarks/bench_call_auction.py --scale 40 --rounds 20 --quiet
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / 'src'))
+
+from base_sim import BaseSimulation
+from scenarios import get_scenario
+from market.engine.services import call_auction_service
+
+MIX = {'deterministic_market_maker': 6, 'buy_trader': 4, 'market_buyer': 3, 'gap_trader': 5,
+       'mixed_order': 2, 'momentum_trader': 3, 'hold_trader': 4}
+MODES = (('continuous', 'continuous', 'time'), ('call_auction time', 'call_auction', 'time'),
+         ('call_auction pro', 'call_auction', 'pro_rata'))
+
+
+def make_simulation(scale: int, rounds: int, seed: int, mode: str, allocation: str) -> BaseSimulation:
+    params = get_scenario('deterministic_only').parameters
+    agent_params = dict(params['AGENT_PARAMS'],
+                        agent_composition={agent_type: n * scale for agent_type, n in MIX.items()})
+    return BaseSimulation(
+        num_rounds=rounds,
+        initial_price=params['INITIAL_PRICE'],
+        fundamental_price=params['FUNDAMENTAL_PRICE'],
+        redemption_value=params['REDEMPTION_VALUE'],
+        agent_params=agent_params,
+        dividend_params=params['DIVIDEND_PARAMS'],
+        interest_params=params['INTEREST_MODEL'],
+        fundamental_info_mode=params['FUNDAMENTAL_INFO_MODE'],
+        sim_type='bench_call_auction',
+        async_llm_decisions=True,  # No serial pacing between agents
+        diagnostic_logging='summary',
+        order_book_backend='price_level',  # Keep book upkeep out of the comparison
+        deferred_order_book_view=True,
+        verification_level='off',
+        matching_mode=mode,
+        auction_allocation=allocation,
+        random_seed=seed,
+    )
+
+
+def run_mode(scale: int, rounds: int, seed: int, mode: str, allocation: str) -> dict:
+    timings = {'match': 0.0, 'clear': 0.0}
+    clear_call_auction = call_auction_service.clear_call_auction
+
+    def timed_clear(*args, **kwargs):
+        start = time.perf_counter()
+        result = clear_call_auction(*args, **kwargs)
+        timings['clear'] += time.perf_counter() - start
+        return result
+
+    simulation = make_simulation(scale, rounds, seed, mode, allocation)
+    match_orders = simulation.matching_engine.match_orders
+
+    def timed_match(*args, **kwargs):
+        start = time.perf_counter()
+        result = match_orders(*args, **kwargs)
+        timings['match'] += time.perf_counter() - start
+        return result
+
+    simulation.matching_engine.match_orders = timed_match
+    call_auction_service.clear_call_auction = timed_clear
+    try:
+        for round_number in range(rounds):
+            simulation.execute_round(round_number)
+    finally:
+        call_auction_service.clear_call_auction = clear_call_auction
+    trades = simulation.context.public_info['trade_history']
+    orders = len(simulation.order_repository.orders)
+    simulation.close()
+    return dict(timings, trades=len(trades), volume=sum(t['quantity'] for t in trades), orders=orders)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark continuous matching against call auctions.")
+    parser.add_argument("--scale", type=int, default=10, help="Copies of the 27-agent base mix")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--quiet", action="store_true", help="Drop INFO logging (per-trade and agent state lines)")
+    args = parser.parse_args()
+    if args.quiet:
+        logging.disable(logging.INFO)
+
+    cwd = os.getcwd()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            for name, mode, allocation in MODES:
+                results[name] = run_mode(args.scale, args.rounds, args.seed, mode, allocation)
+        finally:
+            os.chdir(cwd)
+
+    agents = args.scale * sum(MIX.values())
+    print(f"{agents} agents, {args.rounds} rounds, {results['continuous']['orders']} orders (continuous)")
+    print(f"{'mode':>18} {'match ms/round':>15} {'clearing ms':>12} {'trades':>7} {'volume':>9}")
+    for name, result in results.items():
+        match_ms = 1000 * result['match'] / args.rounds
+        clear_ms = 1000 * result['clear'] / args.rounds
+        print(f"{name:>18} {match_ms:>15.1f} {clear_ms:>12.2f} {result['trades']:>7} {result['volume']:>9}")
+
+
+if __name__ == "__main__":
+    main()
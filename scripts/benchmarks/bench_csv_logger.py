@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+CSV Logger Benchmark
+
+Writes margin-call rows three ways and reports the total time:
+
+  verified   the previous CSVLogger path: count every line of the file before
+             and after each write to confirm the row landed (O(file) per row)
+  flushed    plain logging.FileHandler, flushed after every row
+  buffered   BufferedCSVFileHandler with an in-memory row counter, one
+             fsync per round and a single verification at shutdown
+
+The verified path is quadratic, so it runs on --verified-rows (and half as
+many) and its time at --rows is extrapolated from a fit of a*n + b*n^2.
+
+Usage:
+    python scripts/benchmarks/bench_csv_logger.py
+    python scripts/benchmarks/bench_csv_logger.py --rows 100000 --rows-per-round 50
+"""
+
+import sys
+import logging
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / 'src'))
+
+from logging_utils.csv_header_manager import CSVHeaderManager, CSVHeaders
+from logging_utils.csv_logger import BufferedCSVFileHandler, CSVLogger
+
+
+def make_logger(name: str, path: Path, handler_class) -> logging.Logger:
+    CSVHeaderManager.initialize_csv_file(path, CSVHeaders.MARGIN_CALLS)
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = handler_class(path)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    return logger
+
+
+def close_logger(logger: logging.Logger) -> None:
+    for handler in list(logger.handlers):
+        handler.close()
+        logger.removeHandler(handler)
+
+
+def log_row(logger: logging.Logger, i: int) -> None:
+    CSVLogger.log_margin_call(logger, round_number=i // 100, agent_id=str(i % 500),
+                              agent_type="leveraged_trader", borrowed_shares=120.0,
+                              max_borrowable=80.0, action="forced_buy_to_cover",
+                              excess_shares=40.0, price=101.25)
+
+
+def count_lines(path: Path) -> int:
+    with open(path, 'r') as f:
+        return sum(1 for _ in f)
+
+
+def run_verified(path: Path, rows: int) -> float:
+    """Previous behaviour: line-count the file around every write"""
+    logger = make_logger('bench_verified', path, logging.FileHandler)
+    start = time.perf_counter()
+    for i in range(rows):
+        pre_lines = count_lines(path)
+        log_row(logger, i)
+        for handler in logger.handlers:
+            handler.flush()
+        if count_lines(path) <= pre_lines:
+            raise RuntimeError("row not written")
+    elapsed = time.perf_counter() - start
+    close_logger(logger)
+    return elapsed
+
+
+def run_flushed(path: Path, rows: int) -> float:
+    logger = make_logger('bench_flushed', path, logging.FileHandler)
+    start = time.perf_counter()
+    for i in range(rows):
+        log_row(logger, i)
+    elapsed = time.perf_counter() - start
+    close_logger(logger)
+    return elapsed
+
+
+def run_buffered(path: Path, rows: int, rows_per_round: int) -> float:
+    logger = make_logger('bench_buffered', path, BufferedCSVFileHandler)
+    start = time.perf_counter()
+    for i in range(rows):
+        log_row(logger, i)
+        if (i + 1) % rows_per_round == 0:
+            CSVLogger.sync(logger)  # LoggingService.flush_csv_logs() at round end
+    CSVLogger.verify(logger, path)  # LoggingService.verify_csv_logs() at shutdown
+    elapsed = time.perf_counter() - start
+    close_logger(logger)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CSV margin-call logging.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Margin-call rows to write")
+    parser.add_argument("--verified-rows", type=int, default=2_000,
+                        help="Rows for the quadratic verified path (extrapolated to --rows)")
+    parser.add_argument("--rows-per-round", type=int, default=100,
+                        help="Rows between fsyncs for the buffered path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        n1, n2 = args.verified_rows // 2, args.verified_rows
+        t1 = run_verified(tmp / 'verified_half.csv', n1)
+        verified = run_verified(tmp / 'verified.csv', n2)
+        # Solve t = a*n + b*n^2 through both measurements
+        b = max(0.0, (verified / n2 - t1 / n1) / (n2 - n1))
+        a = verified / n2 - b * n2
+        verified_estimate = a * args.rows + b * args.rows ** 2
+        flushed = run_flushed(tmp / 'flushed.csv', args.rows)
+        buffered = run_buffered(tmp / 'buffered.csv', args.rows, args.rows_per_round)
+
+    print(f"{args.rows:,} margin-call rows")
+    print(f"{'path':>10} {'seconds':>12} {'us/row':>10} {'vs buffered':>12}")
+    for name, seconds, note in (
+        ('verified', verified_estimate, f"  (measured {verified:.2f}s for {args.verified_rows:,} rows)"),
+        ('flushed', flushed, ''),
+        ('buffered', buffered, ''),
+    ):
+        print(f"{name:>10} {seconds:>12.2f} {seconds / args.rows * 1e6:>10.1f} "
+              f"{seconds / buffered:>11.1f}x{note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Deterministic Agent Decision Benchmark
+
+Runs a population of momentum and mean reversion traders (half each) over a
+synthetic random-walk price path, recorded into a MarketHistory with rolling
+indicators as DataRecorder does, and times the decision phase two ways:
+
+  per-agent   make_decision() + model_dump() for every agent, as
+              AgentRepository.get_agent_decision does
+  batched     one AgentBatch.decide() call per agent class (parameters
+              held as arrays, NumPy signals and quantities, plain-dict
+              decisions), as AgentDecisionService does with
+              BATCHED_DETERMINISTIC_DECISIONS
+
+Every round runs batched. The per-agent path is slow at this scale, so it is
+timed on every --sample-every'th round and reported per round. Sampled rounds
+also check that both paths return the same decisions.
+
+Usage:
+    python scripts/benchmarks/bench_deterministic_agents.py
+    python scripts/benchmarks/bench_deterministic_agents.py --agents 2000 --rounds 200
+"""
+
+import sys
+import random
+import argparse
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / 'src'))
+
+from agents.deterministic.batched_decisions import AgentBatch
+from agents.deterministic.mean_reversion_trader import MeanReversionTrader
+from agents.deterministic.momentum_trader import MomentumTrader
+from market.indicators import IndicatorStore, MarketHistory
+from services.simulation_runtime import SimulationRuntime
+
+
+def make_population(n: int, rng: random.Random):
+    momentum = [MomentumTrader(agent_id=f"mom_{i}", initial_cash=rng.uniform(1e3, 1e5),
+                               initial_shares=rng.randint(0, 1000),
+                               short_window=rng.choice([3, 5, 8]), long_window=rng.choice([20, 30, 50]),
+                               min_trend=rng.uniform(0.005, 0.03), max_position=rng.uniform(0.1, 0.5))
+                for i in range(n // 2)]
+    mean_reversion = [MeanReversionTrader(agent_id=f"mr_{i}", initial_cash=rng.uniform(1e3, 1e5),
+                                          initial_shares=rng.randint(0, 1000),
+                                          window_size=rng.choice([10, 20, 40]),
+                                          threshold=rng.uniform(0.01, 0.05), max_position=rng.uniform(0.1, 0.5))
+                      for i in range(n - n // 2)]
+    return momentum, mean_reversion
+
+
+def per_agent(groups, market_state, history, round_number):
+    return {agent.agent_id: agent.make_decision(market_state, history, round_number).model_dump()
+            for agents in groups for agent in agents}
+
+
+def batched(batches, market_state, history, round_number):
+    decisions = {}
+    for batch in batches:
+        decisions.update(batch.decide(market_state, history, round_number))
+    return decisions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched deterministic agent decisions.")
+    parser.add_argument("--agents", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=1_000)
+    parser.add_argument("--sample-every", type=int, default=50,
+                        help="Rounds between timings of the per-agent path")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    groups = make_population(args.agents, rng)
+    batches = [AgentBatch(agents) for agents in groups]  # Built once, as AgentDecisionService does
+    runtime = SimulationRuntime(seed=args.seed)  # Messages go to a throwaway message bus
+
+    price = 100.0
+    indicators = IndicatorStore()
+    history = MarketHistory(indicators)  # As DataRecorder.history, with rolling indicators
+    batched_time = per_agent_time = 0.0
+    sampled = orders = 0
+    with runtime.activate():
+        for round_number in range(1, args.rounds + 1):
+            price *= 1 + rng.gauss(0, 0.02)
+            market_state = {'price': price, 'is_multi_stock': False}
+
+            start = time.perf_counter()
+            decisions = batched(batches, market_state, history, round_number)
+            batched_time += time.perf_counter() - start
+            orders += sum(len(d['orders']) for d in decisions.values())
+
+            if round_number % args.sample_every == 0:
+                runtime.messages.clear()
+                start = time.perf_counter()
+                reference = per_agent(groups, market_state, history, round_number)
+                per_agent_time += time.perf_counter() - start
+                sampled += 1
+                if reference != decisions:
+                    raise RuntimeError(f"round {round_number}: batched decisions differ from make_decision")
+
+            runtime.messages.clear()
+            history.append({'price': price, 'round': round_number})
+            indicators.record("DEFAULT_STOCK", price)
+
+    batched_ms = batched_time / args.rounds * 1e3
+    per_agent_ms = per_agent_time / sampled * 1e3
+    print(f"{args.agents:,} agents, {args.rounds:,} rounds, {orders / args.rounds:,.0f} orders/round")
+    print(f"{'path':>10} {'ms/round':>10} {'us/agent':>10}")
+    print(f"{'per-agent':>10} {per_agent_ms:>10.1f} {per_agent_ms * 1e3 / args.agents:>10.2f}"
+          f"  ({sampled} sampled rounds)")
+    print(f"{'batched':>10} {batched_ms:>10.1f} {batched_ms * 1e3 / args.agents:>10.2f}")
+    print(f"speedup: {per_agent_ms / batched_ms:.1f}x; decision phase for all rounds: "
+          f"{batched_time:.1f}s batched vs ~{per_agent_ms * args.rounds / 1e3:.0f}s per-agent")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+LLM Decision Pipeline Benchmark
+
+Runs a local fake OpenAI-compatible endpoint that answers every chat
+completion with a valid hold decision after a fixed latency, then measures
+one round of decision collection as the number of LLM agents grows:
+
+- threaded: the legacy path (sync client, ThreadPoolExecutor with 2 workers)
+- async:    LLMService.get_decision_async fanned out with asyncio.gather,
+            limited by the endpoint profile's max_in_flight
+
+With --cache, each round is run twice through a read-through response
+cache: once cold (every call reaches the endpoint) and once warm (served
+from disk), as in a rerun of a seeded scenario.
+
+No API key or network access is needed.
+
+Usage:
+    python scripts/benchmarks/bench_llm_pipeline.py
+    python scripts/benchmarks/bench_llm_pipeline.py --agents 10 50 200 --latency 0.5 --max-in-flight 32
+    python scripts/benchmarks/bench_llm_pipeline.py --cache
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / 'src'))
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-fake-benchmark")
+
+from agents.LLMs.services.llm_services import LLMService, LLMRequest
+from agents.LLMs.services.llm_endpoints import AsyncLLMPool, EndpointProfile
+from agents.LLMs.services.llm_cache import LLMResponseCache
+
+HOLD_DECISION = json.dumps({
+    "valuation_reasoning": "benchmark",
+    "valuation": 28.0,
+    "price_prediction_reasoning": "benchmark",
+    "price_prediction_t": 28.0,
+    "price_prediction_t1": 28.0,
+    "price_prediction_t2": 28.0,
+    "reasoning": "benchmark",
+    "orders": [],
+    "replace_decision": "Add",
+})
+
+
+class FakeCompletionServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # accept the whole fan-out without refusing connections
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        super().__init__(("127.0.0.1", 0), FakeCompletionHandler)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class FakeCompletionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b"{}")
+        time.sleep(self.server.latency)
+        payload = json.dumps({
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": HOLD_DECISION},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 400, "completion_tokens": 80, "total_tokens": 480},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def make_requests(count: int, round_number: int = 1):
+    return [
+        LLMRequest(system_prompt="You are a trader.", user_prompt=f"Round {round_number} agent {i}. " + "Market data " * 200,
+                   model="fake-model", agent_id=str(i), round_number=1, enabled_features=set())
+        for i in range(count)
+    ]
+
+
+def run_threaded(service: LLMService, requests) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(len(requests), 2)) as executor:
+        list(executor.map(service.get_decision, requests))
+    return time.perf_counter() - start
+
+
+def run_async(service: LLMService, requests) -> float:
+    async def fan_out():
+        try:
+            await asyncio.gather(*(service.get_decision_async(r) for r in requests))
+        finally:
+            await AsyncLLMPool.close_all()
+
+    start = time.perf_counter()
+    asyncio.run(fan_out())
+    return time.perf_counter() - start
+
+
+def run_cache_comparison(service: LLMService, args) -> None:
+    """Time a full run of `rounds` async rounds cold, then again from the cache"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        LLMResponseCache.configure({'mode': 'read_through', 'path': Path(cache_dir) / 'responses.sqlite'})
+        print(f"fake endpoint latency {args.latency:.2f}s, {args.rounds} rounds per run")
+        print(f"{'agents':>8} {'cold (s)':>10} {'cached (s)':>11} {'speedup':>9}")
+        for count in args.agents:
+            rounds = [make_requests(count, r) for r in range(args.rounds)]
+            cold = sum(run_async(service, requests) for requests in rounds)
+            warm = sum(run_async(service, requests) for requests in rounds)
+            print(f"{count:>8} {cold:>10.2f} {warm:>11.2f} {cold / warm:>8.1f}x")
+        LLMResponseCache.close_active()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark threaded vs async LLM decision collection.")
+    parser.add_argument("--agents", type=int, nargs='+', default=[10, 25, 50, 100, 200],
+                        help="Numbers of LLM agents per round")
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake endpoint latency in seconds")
+    parser.add_argument("--max-in-flight", type=int, default=64)
+    parser.add_argument("--rpm", type=float, default=None, help="Optional requests-per-minute limit")
+    parser.add_argument("--skip-threaded", action="store_true", help="Only run the async path")
+    parser.add_argument("--cache", action="store_true",
+                        help="Compare cold vs warm rounds through a read-through response cache")
+    parser.add_argument("--rounds", type=int, default=20, help="Rounds per measurement with --cache")
+    args = parser.parse_args()
+
+    server = FakeCompletionServer(args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    profile = EndpointProfile(name="fake", base_url=server.base_url,
+                              max_in_flight=args.max_in_flight, requests_per_minute=args.rpm)
+    service = LLMService(endpoint_profile=profile)
+
+    if args.cache:
+        run_cache_comparison(service, args)
+        server.shutdown()
+        return
+
+    print(f"fake endpoint latency {args.latency:.2f}s, max_in_flight {args.max_in_flight}")
+    print(f"{'agents':>8} {'threaded (s)':>14} {'async (s)':>11} {'speedup':>9}")
+    for count in args.agents:
+        requests = make_requests(count)
+        async_time = run_async(service, requests)
+        if args.skip_threaded:
+            print(f"{count:>8} {'-':>14} {async_time:>11.2f} {'-':>9}")
+            continue
+        threaded_time = run_threaded(service, requests)
+        print(f"{count:>8} {threaded_time:>14.2f} {async_time:>11.2f} {threaded_time / async_time:>8.1f}x")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
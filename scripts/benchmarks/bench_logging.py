@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Logging Benchmark
+
+Replays a round's worth of simulation logging (order state transitions,
+decisions, agent states, market and margin-call lines) through
+LoggingService, with and without queued logging. Reports:
+
+  ms/round on sim thread   time the simulation spends inside logging calls,
+                           including the per-round CSV flush
+  finalize ms              end-of-run drain of the queue plus mirroring of
+                           files into latest_sim (queued mode only)
+
+The sync mode writes dual-output files twice on the calling thread; the
+queued mode writes each file once on a background thread. Runs inside a
+temporary directory, since LoggingService writes under ./logs.
+
+Usage:
+    python scripts/benchmarks/bench_logging.py
+    python scripts/benchmarks/bench_logging.py --agents 200 --rounds 50
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / 'src'))
+
+from services.logging_service import LoggingService
+
+
+def log_round(round_number: int, agents: int, orders_per_agent: int) -> None:
+    market = LoggingService.get_logger('market')
+    for agent_id in range(agents):
+        LoggingService.log_decision(
+            f"Round {round_number} Agent {agent_id}: decision=Buy, orders=[limit buy 10 @ 101.25], "
+            f"reasoning=price below estimated fundamental value")
+        for order in range(orders_per_agent):
+            order_id = f"{round_number}-{agent_id}-{order}"
+            for state in ('VALIDATED', 'COMMITTED', 'PENDING', 'ACTIVE', 'FILLED'):
+                LoggingService.log_order_state(
+                    f"Order {order_id} state transition: PREVIOUS -> {state} "
+                    f"(agent {agent_id}, qty 10, price 101.25)")
+        LoggingService.log_agent(
+            f"Agent {agent_id} | cash: 10000.00 (available 9000.00, committed 1000.00) | "
+            f"shares: 100 (available 90, committed 10) | outstanding orders: {orders_per_agent}")
+        market.info(f"Round {round_number}: agent {agent_id} submitted {orders_per_agent} orders")
+        if agent_id % 10 == 0:
+            LoggingService.log_margin_call(round_number, str(agent_id), "leveraged_trader",
+                                           120.0, 80.0, "forced_buy_to_cover", 40.0, 101.25)
+    LoggingService.flush_csv_logs()  # base_sim.execute_round ends with this
+
+
+def run(mode: str, agents: int, rounds: int, orders_per_agent: int):
+    LoggingService.initialize(f"bench_logging/{mode}", queued=(mode == 'queued'))
+    per_round = []
+    for round_number in range(rounds):
+        start = time.perf_counter()
+        log_round(round_number, agents, orders_per_agent)
+        per_round.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    LoggingService.verify_csv_logs()
+    LoggingService.finalize()
+    finalize = time.perf_counter() - start
+    return per_round, finalize
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-round logging cost.")
+    parser.add_argument("--agents", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--orders-per-agent", type=int, default=3)
+    args = parser.parse_args()
+
+    lines = args.agents * (3 + 5 * args.orders_per_agent)
+    print(f"{args.agents} agents, {args.rounds} rounds, ~{lines:,} log lines/round")
+    print(f"{'mode':>8} {'ms/round on sim thread':>24} {'finalize ms':>12}")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            results = {}
+            for mode in ('sync', 'queued'):
+                per_round, finalize = run(mode, args.agents, args.rounds, args.orders_per_agent)
+                results[mode] = sum(per_round) / len(per_round)
+                print(f"{mode:>8} {results[mode] * 1e3:>24.2f} {finalize * 1e3:>12.2f}")
+            LoggingService.close()
+        finally:
+            os.chdir(cwd)
+    print(f"sim-thread logging time, queued vs sync: {results['queued'] / results['sync']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Order Book Backend Benchmark
+
+Compares the heap-backed order book with the price-level backend on books with
+1k, 10k and 100k resting limit orders. Each measurement applies a mixed stream
+of inserts, cancels and pop/push-back cycles (the pattern used while matching)
+to a pre-built book and reports the mean cost per operation.
+
+Usage:
+    python scripts/benchmarks/bench_order_book.py
+    python scripts/benchmarks/bench_order_book.py --sizes 1000 10000 --ops 500
+    python scripts/benchmarks/bench_order_book.py --defer-public-view
+"""
+
+import sys
+import heapq
+import random
+import argparse
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / 'src'))
+
+from services.logging_service import LoggingService
+from market.orders.order import Order, OrderState
+from market.orders.order_entry import OrderEntry
+from market.orders.order_book import create_order_book
+from market.orders.order_repository import OrderRepository
+from market.state.sim_context import SimulationContext
+
+
+def make_order(rng: random.Random, timestamp: float) -> Order:
+    """Random resting limit order around a price of 100"""
+    side = rng.choice(['buy', 'sell'])
+    offset = rng.randint(1, 1000) / 100
+    price = 100 - offset if side == 'buy' else 100 + offset
+    order = Order(agent_id=rng.randrange(500), order_type='limit', side=side,
+                  quantity=rng.randint(1, 100), round_placed=0, price=price,
+                  timestamp=timestamp)
+    order.state = OrderState.PENDING
+    return order
+
+
+def build_book(backend: str, resting: int, seed: int, defer_public_view: bool = False):
+    """Build a book with `resting` orders without timing the setup"""
+    context = SimulationContext(num_rounds=1, initial_price=100, fundamental_price=100,
+                                redemption_value=100, transaction_cost=0.0)
+    book = create_order_book(context=context, order_repository=OrderRepository(),
+                             logger=LoggingService.get_logger('order_book'), backend=backend,
+                             defer_public_view=defer_public_view)
+    rng = random.Random(seed)
+    orders = [make_order(rng, float(i)) for i in range(resting)]
+
+    if backend == 'heap':
+        buys = [OrderEntry.create_buy(o) for o in orders if o.side == 'buy']
+        sells = [OrderEntry.create_sell(o) for o in orders if o.side == 'sell']
+        heapq.heapify(buys)
+        heapq.heapify(sells)
+        book._buy_orders, book._sell_orders = buys, sells
+    else:
+        for order in orders:
+            entry = OrderEntry.create_buy(order) if order.side == 'buy' else OrderEntry.create_sell(order)
+            book._side(order.side).push(entry)
+            book._index_entry(entry)
+
+    return book, orders, rng
+
+
+def run_ops(book, orders, rng: random.Random, ops: int) -> float:
+    """Apply a mixed insert/cancel/pop stream, return seconds per operation"""
+    next_ts = float(len(orders))
+    start = time.perf_counter()
+    for _ in range(ops):
+        action = rng.random()
+        if action < 0.4:
+            order = make_order(rng, next_ts)
+            next_ts += 1
+            book.add_limit_order(order)
+            orders.append(order)
+        elif action < 0.7:
+            victim = orders.pop(rng.randrange(len(orders)))
+            book.remove_order(victim)
+        else:
+            entry = book.pop_best_sell() if rng.random() < 0.5 else book.pop_best_buy()
+            if entry is not None:
+                entry.order.state = OrderState.PARTIALLY_FILLED
+                book._push_order(entry, entry.order.side)
+    return (time.perf_counter() - start) / ops
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark order book backends.")
+    parser.add_argument("--sizes", type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                        help="Numbers of resting orders to benchmark")
+    parser.add_argument("--ops", type=int, default=200, help="Operations per measurement")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--defer-public-view", action="store_true",
+                        help="Only mark the public view dirty on mutation (one snapshot per phase)")
+    args = parser.parse_args()
+
+    LoggingService.initialize("benchmarks/order_book")
+
+    print(f"{'resting':>10} {'heap (ms/op)':>14} {'price_level (ms/op)':>21} {'speedup':>9}")
+    for size in args.sizes:
+        results = {}
+        for backend in ('heap', 'price_level'):
+            book, orders, rng = build_book(backend, size, args.seed, args.defer_public_view)
+            results[backend] = run_ops(book, orders, rng, args.ops) * 1000
+        speedup = results['heap'] / results['price_level'] if results['price_level'] else float('inf')
+        print(f"{size:>10} {results['heap']:>14.3f} {results['price_level']:>21.3f} {speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Order Model Benchmark
+
+Pushes a synthetic stream of orders through the repository lifecycle
+(input -> validated -> committed -> pending -> active -> filled/cancelled),
+building a book entry and, for filled orders, a trade along the way.
+Reports:
+
+  bytes/order       memory retained per order (Order, history, book entry,
+                    trade and repository indexes), measured with tracemalloc
+  us/transition     CPU time per OrderRepository.transition_state call
+  us/order          CPU time for the whole lifecycle of one order
+
+Run it on two checkouts to compare representations.
+
+Usage:
+    python scripts/benchmarks/bench_order_model.py
+    python scripts/benchmarks/bench_order_model.py --orders 100000 --repeat 3
+"""
+
+import sys
+import gc
+import logging
+import random
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / 'src'))
+
+from market.orders.order import Order, OrderState
+from market.orders.order_entry import OrderEntry
+from market.orders.order_repository import OrderRepository
+from market.trade import Trade
+
+LIFECYCLE = (OrderState.VALIDATED, OrderState.COMMITTED, OrderState.PENDING, OrderState.ACTIVE)
+
+
+def make_orders(n: int, seed: int):
+    rng = random.Random(seed)
+    specs = []
+    for i in range(n):
+        side = 'buy' if i % 2 == 0 else 'sell'
+        specs.append((rng.randrange(200), side, rng.randint(1, 100), round(rng.uniform(90, 110), 2)))
+    return specs
+
+
+def run_stream(specs, keep: list):
+    """Run every order through its lifecycle; returns (transition seconds, transitions)"""
+    repository = OrderRepository(logger=logging.getLogger('bench_orders'))
+    transition = repository.transition_state
+    transition_time = 0.0
+    transitions = 0
+    counterparty = None
+
+    for i, (agent_id, side, quantity, price) in enumerate(specs):
+        order = Order(agent_id=agent_id, order_type='limit', side=side, quantity=quantity,
+                      round_placed=i // 1000, price=price)
+        repository.create_order(order)
+        if side == 'buy':
+            order.original_cash_commitment = order.current_cash_commitment = quantity * price
+        else:
+            order.original_share_commitment = order.current_share_commitment = quantity
+
+        start = time.perf_counter()
+        for state in LIFECYCLE:
+            transition(order.order_id, state)
+        transition_time += time.perf_counter() - start
+        transitions += len(LIFECYCLE)
+
+        entry = OrderEntry.create_buy(order) if side == 'buy' else OrderEntry.create_sell(order)
+        keep.append(entry)
+
+        if i % 4 == 3:  # A quarter of the orders are cancelled
+            start = time.perf_counter()
+            transition(order.order_id, OrderState.CANCELLED, notes="Replaced by agent")
+            transition_time += time.perf_counter() - start
+            transitions += 1
+        elif counterparty is None:
+            counterparty = order
+        else:
+            buy, sell = (order, counterparty) if side == 'buy' else (counterparty, order)
+            if buy.side != sell.side:
+                keep.append(Trade.from_orders(buy, sell, quantity=min(buy.quantity, sell.quantity),
+                                              price=sell.price, round=i // 1000))
+                start = time.perf_counter()
+                for filled in (buy, sell):
+                    transition(filled.order_id, OrderState.FILLED,
+                               filled_qty=filled.quantity, price=sell.price)
+                transition_time += time.perf_counter() - start
+                transitions += 2
+                counterparty = None
+            else:
+                counterparty = order
+    keep.append(repository)
+    return transition_time, transitions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark order/entry/trade representation.")
+    parser.add_argument("--orders", type=int, default=100_000, help="Orders in the synthetic stream")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best is reported)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    logging.getLogger('bench_orders').setLevel(logging.WARNING)  # INFO disabled, as in a normal run
+    specs = make_orders(args.orders, args.seed)
+
+    # Memory: everything reachable from the stream is kept alive until measured
+    gc.collect()
+    tracemalloc.start()
+    keep = []
+    run_stream(specs, keep)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del keep
+
+    best_total = best_transition = float('inf')
+    transitions = 0
+    for _ in range(args.repeat):
+        gc.collect()
+        start = time.perf_counter()
+        transition_time, transitions = run_stream(specs, [])
+        best_total = min(best_total, time.perf_counter() - start)
+        best_transition = min(best_transition, transition_time)
+
+    print(f"{args.orders:,} orders, {transitions:,} transitions")
+    print(f"{'bytes/order':>14} {retained / args.orders:>10.0f}")
+    print(f"{'us/transition':>14} {best_transition / transitions * 1e6:>10.2f}")
+    print(f"{'us/order':>14} {best_total / args.orders * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+LLM Prompt Build Benchmark
+
+Runs a small single-stock simulation of rule-based traders (market makers,
+gap, momentum and mean reversion traders) so the order book, prices and
+histories look like a real run. After each round, every one of --agents
+LLM value investors receives that round's signals, as the information
+service hands them out, and builds its prompt (LLMAgent._build_llm_request)
+two ways:
+
+  per-agent   every agent renders every prompt section
+  shared      SHARED_PROMPT_FRAGMENTS: market sections (order book, price
+              history, dividend/interest/redemption terms, news) and the
+              social feed rendered once per round and reused; only position,
+              orders, trades and memory sections are rendered per agent
+
+Agents start with different cash and shares, and each round every LLM
+agent gets its own last reasoning and memory note and posts one social
+message, as agents with those features do. Both ways must build identical prompts. No LLM is
+called, and the prompt log line is disabled so timings cover building
+only. Runs inside a temporary directory, since the simulation writes under
+./logs.
+
+It then estimates what provider prompt caching could reuse under each
+PROMPT_LAYOUT: the share of prompt characters (system + user) that repeat a
+prefix already sent, by the previous agent of the round or by the same
+agent last round. Live runs log the cached token counts providers actually
+report (llm_call_stats.csv, cached_prompt_tokens).
+
+Usage:
+    python scripts/benchmarks/bench_prompt_build.py
+    python scripts/benchmarks/bench_prompt_build.py --agents 500 --rounds 50
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / 'src'))
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-fake-benchmark")
+
+from base_sim import BaseSimulation
+from scenarios import get_scenario
+from agents.LLMs.services.prompt_fragments import PromptFragments
+from services.logging_service import LoggingService
+from services.messaging_service import MessagingService
+
+TRADERS = {'deterministic_market_maker': 2, 'gap_trader': 2, 'momentum_trader': 3,
+           'mean_reversion': 3, 'hold_trader': 1}
+
+
+def make_simulation(rounds: int, seed: int) -> BaseSimulation:
+    params = get_scenario('deterministic_only').parameters
+    agent_params = dict(params['AGENT_PARAMS'], agent_composition=TRADERS)
+    return BaseSimulation(
+        num_rounds=rounds,
+        initial_price=params['INITIAL_PRICE'],
+        fundamental_price=params['FUNDAMENTAL_PRICE'],
+        redemption_value=params['REDEMPTION_VALUE'],
+        agent_params=agent_params,
+        dividend_params=params['DIVIDEND_PARAMS'],
+        interest_params=params['INTEREST_MODEL'],
+        fundamental_info_mode=params['FUNDAMENTAL_INFO_MODE'],
+        sim_type='bench_prompt_build',
+        random_seed=seed,
+    )
+
+
+def build_prompts(agents, market_state, round_number):
+    start = time.perf_counter()
+    requests = [agent._build_llm_request(market_state, round_number) for agent in agents]
+    elapsed = time.perf_counter() - start
+    return elapsed, [request.system_prompt + request.user_prompt for request in requests]
+
+
+def prefix_reuse(prompts, last_round):
+    """Characters of the prompts that repeat the longest prefix shared with
+    the previous agent's prompt or the agent's own prompt last round"""
+    reused = 0
+    for i, prompt in enumerate(prompts):
+        earlier = ([prompts[i - 1]] if i else []) + ([last_round[i]] if last_round else [])
+        reused += max((len(os.path.commonprefix([prompt, other])) for other in earlier), default=0)
+    return reused
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-agent vs shared prompt fragments.")
+    parser.add_argument("--agents", type=int, default=200, help="LLM agents building prompts each round")
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            simulation = make_simulation(args.rounds, args.seed)
+            agent_params = get_scenario('deterministic_only').parameters['AGENT_PARAMS']
+            llm_agents = [simulation.create_agent(agent_id=1000 + i, agent_type='value', agent_params=agent_params)
+                          for i in range(args.agents)]
+            rng = random.Random(args.seed)
+            for agent in llm_agents:
+                agent.cash, agent.shares = round(rng.uniform(1e4, 1e6), 2), rng.randint(0, 20_000)
+            LoggingService.get_logger('decisions').setLevel(logging.WARNING)
+
+            # Market state of the round, as execute_round passes it to agents
+            market_states = {}
+            update_market = simulation._phase_update_market
+
+            def capture_market_state(round_number):
+                market_states[round_number] = update_market(round_number)
+                return market_states[round_number]
+
+            simulation._phase_update_market = capture_market_state
+
+            per_agent_time = shared_time = 0.0
+            layouts = ('standard', 'prefix_stable')
+            reused, sent, last_round = dict.fromkeys(layouts, 0), dict.fromkeys(layouts, 0), {}
+            for round_number in range(args.rounds):
+                simulation.execute_round(round_number)
+                signals = simulation.information_service.get_signal_history(round_number)
+                for agent in llm_agents:
+                    agent.receive_information(dict(signals))
+
+                PromptFragments.configure(False)
+                elapsed, per_agent_prompts = build_prompts(llm_agents, market_states[round_number], round_number)
+                per_agent_time += elapsed
+                PromptFragments.configure(True)
+                elapsed, shared_prompts = build_prompts(llm_agents, market_states[round_number], round_number)
+                shared_time += elapsed
+                cache = PromptFragments.get_active()
+                fragment_counts = (cache.misses, cache.hits)
+                assert shared_prompts == per_agent_prompts, f"prompts differ in round {round_number}"
+
+                for layout in layouts:
+                    for agent in llm_agents:
+                        agent.prompt_layout = layout
+                    _, prompts = build_prompts(llm_agents, market_states[round_number], round_number)
+                    reused[layout] += prefix_reuse(prompts, last_round.get(layout))
+                    sent[layout] += sum(map(len, prompts))
+                    last_round[layout] = prompts
+                for agent in llm_agents:
+                    agent.prompt_layout = 'standard'
+
+                # What each agent's response would leave behind for next round
+                price = market_states[round_number]['price']
+                for agent in llm_agents:
+                    view = rng.choice(["rich against dividends, trimming", "cheap, adding on dips"])
+                    MessagingService.add_message(round_number, agent.agent_id, f"Price {price:.2f} looks {view}")
+                    agent.last_reasoning = {'round': round_number, 'reasoning': f"Agent {agent.agent_id}: {view}",
+                                            'valuation_reasoning': f"Valued at {rng.uniform(20, 36):.2f}",
+                                            'price_prediction_reasoning': "Trend continues"}
+                    agent.memory_notes.append((round_number, f"Round {round_number}: {view}"))
+            simulation.close()
+        finally:
+            os.chdir(cwd)
+
+    print(f"{args.agents} LLM agents, {args.rounds} rounds, prompts identical in every round")
+    print(f"last round: {fragment_counts[0]} fragments rendered, {fragment_counts[1]} reused")
+    print(f"{'per-agent (ms/round)':>22} {'shared (ms/round)':>19} {'speedup':>9}")
+    per_agent_ms, shared_ms = 1000 * per_agent_time / args.rounds, 1000 * shared_time / args.rounds
+    print(f"{per_agent_ms:>22.1f} {shared_ms:>19.1f} {per_agent_ms / shared_ms:>8.1f}x")
+    print()
+    print(f"{'layout':>14} {'prompt chars':>13} {'reusable prefix':>16}")
+    for layout in layouts:
+        print(f"{layout:>14} {sent[layout] // (args.rounds * args.agents):>13} "
+              f"{100 * reused[layout] / sent[layout]:>15.1f}%")
+
+
+if __name__ == "__main__":
+    main()
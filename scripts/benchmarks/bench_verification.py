@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Verification Level Benchmark
+
+Runs a single-stock simulation of rule-based traders (market makers, gap,
+momentum, mean reversion and hold traders) and, at the end of every round,
+verifies the same state once per verification level, timing each:
+
+  off       no checks
+  cheap     system-wide cash and share totals only, no per-agent logging
+  sampled   full checks on a --sample fraction of rounds (and the final
+            round), cheap checks on the rest
+  full      every check, every round, with per-agent logging (the default),
+            plus the full audit on the final round
+  audit     full, with the full audit (payment history re-sums and a scan
+            of every order) every round
+
+Each level's cost per round includes the pre-round snapshot it needs. It
+is reported next to the time of the round itself, which excludes
+verification. Verification logs go to verification.log as in a real run.
+Runs inside a temporary directory, since the simulation writes under ./logs.
+
+Usage:
+    python scripts/benchmarks/bench_verification.py
+    python scripts/benchmarks/bench_verification.py --agents 500 --rounds 100 --sample 0.05
+"""
+
+import os
+import sys
+import copy
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / 'src'))
+
+from base_sim import BaseSimulation
+from scenarios import get_scenario
+
+MIX = {'deterministic_market_maker': 0.1, 'gap_trader': 0.1, 'momentum_trader': 0.3, 'mean_reversion': 0.3}
+
+
+def composition(agents: int) -> dict:
+    traders = {agent_type: max(1, int(agents * share)) for agent_type, share in MIX.items()}
+    traders['hold_trader'] = max(1, agents - sum(traders.values()))
+    return traders
+
+
+def make_simulation(agents: int, rounds: int, seed: int) -> BaseSimulation:
+    params = get_scenario('deterministic_only').parameters
+    agent_params = dict(params['AGENT_PARAMS'], agent_composition=composition(agents))
+    return BaseSimulation(
+        num_rounds=rounds,
+        initial_price=params['INITIAL_PRICE'],
+        fundamental_price=params['FUNDAMENTAL_PRICE'],
+        redemption_value=params['REDEMPTION_VALUE'],
+        agent_params=agent_params,
+        dividend_params=params['DIVIDEND_PARAMS'],
+        interest_params=params['INTEREST_MODEL'],
+        fundamental_info_mode=params['FUNDAMENTAL_INFO_MODE'],
+        sim_type='bench_verification',
+        async_llm_decisions=True,  # No serial pacing between agents
+        diagnostic_logging='summary',
+        random_seed=seed,
+    )
+
+
+class TimedVerifiers:
+    """Stands in for simulation.verifier and runs one verifier per level"""
+
+    def __init__(self, verifier, sample: float, seed: int):
+        self.verifiers = {}
+        for name, level, full_audit_every in (('off', 'off', None), ('cheap', 'cheap', None),
+                                              ('sampled', 'sampled', None), ('full', 'full', None),
+                                              ('audit', 'full', 1)):
+            level_verifier = copy.copy(verifier)
+            level_verifier.full_audit_every = full_audit_every
+            level_verifier.configure(level, sample, seed)
+            self.verifiers[name] = level_verifier
+        self.times = dict.fromkeys(self.verifiers, 0.0)
+
+        # Count the rounds the sampled level checks fully
+        self.full_rounds = 0
+        sampled = self.verifiers['sampled']
+        checks_for_round = sampled.checks_for_round
+
+        def counted_checks(round_number):
+            checks = checks_for_round(round_number)
+            self.full_rounds += checks == 'full'
+            return checks
+
+        sampled.checks_for_round = counted_checks
+
+    def store_pre_round_states(self):
+        states = {}
+        for name, level_verifier in self.verifiers.items():
+            start = time.perf_counter()
+            states[name] = level_verifier.store_pre_round_states()
+            self.times[name] += time.perf_counter() - start
+        return states
+
+    def verify_round_end_states(self, states):
+        for name, level_verifier in self.verifiers.items():
+            start = time.perf_counter()
+            level_verifier.verify_round_end_states(states[name])
+            self.times[name] += time.perf_counter() - start
+
+    @property
+    def total(self) -> float:
+        return sum(self.times.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-round cost of each verification level.")
+    parser.add_argument("--agents", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--sample", type=float, default=0.1, help="Fraction of rounds fully checked when sampled")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            simulation = make_simulation(args.agents, args.rounds, args.seed)
+            timed = TimedVerifiers(simulation.verifier, args.sample, args.seed)
+            simulation.verifier = timed
+            round_time = 0.0
+            for round_number in range(args.rounds):
+                start, verification_before = time.perf_counter(), timed.total
+                simulation.execute_round(round_number)
+                round_time += time.perf_counter() - start - (timed.total - verification_before)
+            simulation.close()
+        finally:
+            os.chdir(cwd)
+
+    round_ms = 1000 * round_time / args.rounds
+    print(f"{args.agents} agents, {args.rounds} rounds, round without verification: {round_ms:.1f} ms")
+    print(f"sampled: {timed.full_rounds} of {args.rounds} rounds fully checked")
+    print(f"{'level':>8} {'ms/round':>9} {'overhead':>9}")
+    for name, seconds in timed.times.items():
+        level_ms = 1000 * seconds / args.rounds
+        print(f"{name:>8} {level_ms:>9.2f} {100 * level_ms / round_ms:>8.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,11 +10,19 @@ Usage:
     python scripts/run_paper_scenarios.py --list       # List scenarios without running
     python scripts/run_paper_scenarios.py --dry-run    # Show what would be run
     python scripts/run_paper_scenarios.py scenario1 scenario2  # Run specific scenarios
+    python scripts/run_paper_scenarios.py --workers 4 --llm-concurrency 16
+    python scripts/run_paper_scenarios.py --resume logs/paper_v1_YYYYMMDD_HHMMSS
+
+Scenarios run in parallel on a process pool (see src/run_sweep.py), one
+worker per scenario by default, so the suite takes about as long as its
+slowest scenario. manifest.json is updated as each scenario finishes;
+--resume reruns only the scenarios that did not succeed.
 
 Output:
     logs/paper_v1_YYYYMMDD_HHMMSS/
     ├── manifest.json          # Provenance: git commit, timestamps, parameters
     ├── paper_no_trade_homogeneous/
+    │   ├── run.log            # Simulation output
     │   ├── data/
     │   ├── plots/
     │   ├── metadata.json
@@ -25,8 +33,7 @@ Output:
 """
 
 import sys
-import json
-import subprocess
+import time
 import argparse
 from datetime import datetime
 from pathlib import Path
@@ -35,36 +42,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from scenarios.paper_management_science import PAPER_SCENARIO_NAMES, PAPER_VERSION
-
-
-def get_git_info():
-    """Get current git commit and status for provenance tracking."""
-    try:
-        commit = subprocess.check_output(
-            ['git', 'rev-parse', 'HEAD'],
-            stderr=subprocess.DEVNULL
-        ).decode().strip()
-
-        branch = subprocess.check_output(
-            ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
-            stderr=subprocess.DEVNULL
-        ).decode().strip()
-
-        # Check if working directory is clean
-        status = subprocess.check_output(
-            ['git', 'status', '--porcelain'],
-            stderr=subprocess.DEVNULL
-        ).decode().strip()
-        is_clean = len(status) == 0
-
-        return {
-            'commit': commit,
-            'branch': branch,
-            'is_clean': is_clean,
-            'dirty_files': status.split('\n') if status else []
-        }
-    except subprocess.CalledProcessError:
-        return {'commit': 'unknown', 'branch': 'unknown', 'is_clean': False}
+from run_sweep import SweepManifest, expand_jobs, get_git_info, print_summary, run_sweep
 
 
 def create_paper_output_dir():
@@ -77,103 +55,6 @@ def create_paper_output_dir():
     return output_dir
 
 
-def create_manifest(output_dir: Path, scenarios_to_run: list, start_time: datetime):
-    """Create manifest.json with full provenance information."""
-    git_info = get_git_info()
-
-    manifest = {
-        'paper_version': PAPER_VERSION,
-        'created_at': start_time.isoformat(),
-        'git': git_info,
-        'python_version': sys.version,
-        'scenarios': scenarios_to_run,
-        'output_directory': str(output_dir),
-        'status': 'in_progress',
-        'results': {}
-    }
-
-    manifest_path = output_dir / 'manifest.json'
-    with open(manifest_path, 'w') as f:
-        json.dump(manifest, f, indent=2)
-
-    return manifest_path
-
-
-def update_manifest(manifest_path: Path, scenario_name: str, status: str, duration: float = None):
-    """Update manifest with scenario completion status."""
-    with open(manifest_path, 'r') as f:
-        manifest = json.load(f)
-
-    manifest['results'][scenario_name] = {
-        'status': status,
-        'completed_at': datetime.now().isoformat(),
-        'duration_seconds': duration
-    }
-
-    # Check if all scenarios are done
-    if len(manifest['results']) == len(manifest['scenarios']):
-        all_success = all(r['status'] == 'success' for r in manifest['results'].values())
-        manifest['status'] = 'completed' if all_success else 'completed_with_errors'
-        manifest['completed_at'] = datetime.now().isoformat()
-
-    with open(manifest_path, 'w') as f:
-        json.dump(manifest, f, indent=2)
-
-
-def run_scenario(scenario_name: str, output_dir: Path):
-    """Run a single scenario using run_base_sim.py and copy results."""
-    import time
-    import shutil
-
-    print(f"\n{'='*60}")
-    print(f"Running: {scenario_name}")
-    print(f"{'='*60}")
-
-    start_time = time.time()
-
-    try:
-        # Create scenario output directory
-        scenario_dir = output_dir / scenario_name
-        scenario_dir.mkdir(parents=True, exist_ok=True)
-
-        # Run simulation via run_base_sim.py (handles all parameter expansion correctly)
-        repo_root = Path(__file__).parent.parent
-        result = subprocess.run(
-            ["python", "src/run_base_sim.py", scenario_name],
-            cwd=repo_root,
-            capture_output=False
-        )
-
-        if result.returncode != 0:
-            raise RuntimeError(f"run_base_sim.py exited with code {result.returncode}")
-
-        # Find the latest run directory for this scenario
-        latest_sim_dir = repo_root / "logs" / "latest_sim" / scenario_name
-        if not latest_sim_dir.exists():
-            raise RuntimeError(f"No output found at {latest_sim_dir}")
-
-        # Copy key directories and files
-        for item in ['data', 'plots']:
-            src_path = latest_sim_dir / item
-            if src_path.exists():
-                shutil.copytree(src_path, scenario_dir / item, dirs_exist_ok=True)
-
-        # Copy all important files at root level
-        for fname in ['metadata.json', 'parameters.json', 'structured_decisions.csv',
-                      'margin_calls.csv', 'validation_errors.csv', 'decisions.log']:
-            if (latest_sim_dir / fname).exists():
-                shutil.copy2(latest_sim_dir / fname, scenario_dir / fname)
-
-        duration = time.time() - start_time
-        print(f"✓ Completed {scenario_name} in {duration:.1f}s")
-        return 'success', duration
-
-    except Exception as e:
-        duration = time.time() - start_time
-        print(f"✗ Failed {scenario_name}: {e}")
-        return 'failed', duration
-
-
 def main():
     parser = argparse.ArgumentParser(
         description='Run paper scenarios for reproducibility',
@@ -183,6 +64,12 @@ def main():
     parser.add_argument('scenarios', nargs='*', help='Specific scenarios to run (default: all)')
     parser.add_argument('--list', action='store_true', help='List available scenarios')
     parser.add_argument('--dry-run', action='store_true', help='Show what would be run without running')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Scenarios running at once (default: all of them)')
+    parser.add_argument('--llm-concurrency', type=int, default=None,
+                        help='LLM requests in flight across all workers (default: no shared cap)')
+    parser.add_argument('--resume', type=Path, default=None, metavar='DIR',
+                        help='Rerun the unfinished scenarios of an earlier paper run')
 
     args = parser.parse_args()
 
@@ -195,21 +82,25 @@ def main():
         print(f"\nTotal: {len(PAPER_SCENARIO_NAMES)} scenarios")
         return
 
-    # Determine which scenarios to run
-    if args.scenarios:
-        scenarios_to_run = []
-        for s in args.scenarios:
-            if s in PAPER_SCENARIO_NAMES:
-                scenarios_to_run.append(s)
-            elif f"paper_{s}" in PAPER_SCENARIO_NAMES:
-                scenarios_to_run.append(f"paper_{s}")
-            else:
-                print(f"Warning: Unknown scenario '{s}', skipping")
-        if not scenarios_to_run:
-            print("No valid scenarios specified")
-            return
+    if args.resume:
+        manifest = SweepManifest.load(args.resume)
+        scenarios_to_run = [job.key for job in manifest.pending()]
     else:
-        scenarios_to_run = PAPER_SCENARIO_NAMES
+        # Determine which scenarios to run
+        if args.scenarios:
+            scenarios_to_run = []
+            for s in args.scenarios:
+                if s in PAPER_SCENARIO_NAMES:
+                    scenarios_to_run.append(s)
+                elif f"paper_{s}" in PAPER_SCENARIO_NAMES:
+                    scenarios_to_run.append(f"paper_{s}")
+                else:
+                    print(f"Warning: Unknown scenario '{s}', skipping")
+            if not scenarios_to_run:
+                print("No valid scenarios specified")
+                return
+        else:
+            scenarios_to_run = PAPER_SCENARIO_NAMES
 
     # Dry run mode
     if args.dry_run:
@@ -229,45 +120,32 @@ def main():
             print("Aborted.")
             return
 
-    # Create output directory
-    start_time = datetime.now()
-    output_dir = create_paper_output_dir()
-    print(f"\n📁 Output directory: {output_dir}")
-
-    # Create manifest
-    manifest_path = create_manifest(output_dir, scenarios_to_run, start_time)
-    print(f"📋 Manifest: {manifest_path}")
+    if args.resume:
+        output_dir = manifest.path.parent.resolve()
+        print(f"\n📁 Resuming: {output_dir}")
+    else:
+        # Create output directory and manifest
+        start_time = datetime.now()
+        output_dir = create_paper_output_dir().resolve()
+        print(f"\n📁 Output directory: {output_dir}")
+        manifest = SweepManifest.create(output_dir, expand_jobs(scenarios_to_run), start_time,
+                                        paper_version=PAPER_VERSION)
+    print(f"📋 Manifest: {manifest.path}")
     print(f"🔗 Git commit: {git_info['commit'][:8]}")
 
-    # Run scenarios
+    # Run scenarios, all at once unless --workers bounds the pool
     print(f"\n🚀 Running {len(scenarios_to_run)} scenarios...")
-
-    # Ensure paths are absolute (we use subprocess so no chdir needed)
-    output_dir = output_dir.resolve()
-    manifest_path = manifest_path.resolve()
-
-    results = []
-    for i, scenario_name in enumerate(scenarios_to_run, 1):
-        print(f"\n[{i}/{len(scenarios_to_run)}]", end="")
-        status, duration = run_scenario(scenario_name, output_dir)
-        update_manifest(manifest_path, scenario_name, status, duration)
-        results.append((scenario_name, status, duration))
+    start = time.time()
+    results = run_sweep(manifest, workers=args.workers or len(scenarios_to_run),
+                        llm_concurrency=args.llm_concurrency)
 
     # Summary
     print(f"\n{'='*60}")
     print("SUMMARY")
     print(f"{'='*60}")
-
-    success = sum(1 for _, s, _ in results if s == 'success')
-    failed = sum(1 for _, s, _ in results if s == 'failed')
-    total_time = sum(d for _, _, d in results)
-
-    print(f"✓ Success: {success}/{len(results)}")
-    if failed > 0:
-        print(f"✗ Failed: {failed}/{len(results)}")
-    print(f"⏱ Total time: {total_time/60:.1f} minutes")
+    print_summary(results, time.time() - start)
     print(f"📁 Results saved to: {output_dir}")
-    print(f"📋 Manifest: {manifest_path}")
+    print(f"📋 Manifest: {manifest.path}")
 
     # Create symlink to latest paper run
     repo_root = Path(__file__).parent.parent
@@ -92,7 +92,8 @@ class MarketCalculator:
     def calculate_trade_pnl_summary(trade_history: List[Trade],
                                    agent_id: str,
                                    current_round: int,
-                                   lookback: int = 5) -> Dict[str, Any]:
+                                   lookback: int = 5,
+                                   ledger=None) -> Dict[str, Any]:
         """Calculate P&L summary from trade history
 
         Args:
@@ -100,6 +101,8 @@ class MarketCalculator:
             agent_id: ID of the agent
             current_round: Current round number
             lookback: Number of rounds to look back
+            ledger: The agent's TradeLedger; when given, recent trades come
+                from its deque in O(lookback) instead of a sort of the history
 
         Returns:
             Dictionary containing trade summary with buy/sell volumes and average prices
@@ -116,11 +119,13 @@ class MarketCalculator:
             }
 
         # Get trades from recent rounds
-        recent_trades = sorted(
-            [t for t in trade_history if t.round < current_round],
-            key=lambda x: x.round,
-            reverse=True
-        )[:lookback]
+        recent_trades = ledger.recent_trades(current_round, lookback) if ledger is not None else None
+        if recent_trades is None:
+            recent_trades = sorted(
+                [t for t in trade_history if t.round < current_round],
+                key=lambda x: x.round,
+                reverse=True
+            )[:lookback]
 
         # Calculate running totals for P&L tracking
         buy_volume = 0
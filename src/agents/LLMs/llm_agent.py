@@ -5,8 +5,11 @@ from typing import List, Dict, Any, Set
 from .services.formatting_services import MarketStateFormatter, AgentContext
 from services.logging_models import DecisionLogEntry
 from .services.llm_services import LLMService, LLMRequest
+from .services.llm_retry import LLMCallControl
 from .services.schema_features import Feature, FeatureRegistry
-from .services.prompt_builder import PromptBuilder
+from .services.prompt_builder import PromptBuilder, PROMPT_LAYOUTS
+from .llm_prompt_templates import STANDARD_USER_TEMPLATE
+from .services.prompt_fragments import PromptFragments
 from services.logging_service import LoggingService
 from market.information.information_types import InformationType
 from scenarios.base import FundamentalInfoMode
@@ -19,12 +22,20 @@ class LLMAgent(BaseAgent):
                  model_open_ai: str = "gpt-oss-20b",
                  enabled_features: Set[Feature] = None,
                  fundamental_info_mode: FundamentalInfoMode = FundamentalInfoMode.FULL,
+                 endpoint_profile=None,
+                 prompt_layout: str = "standard",
                  *args, **kwargs):  # Usually set via scenario params
         super().__init__(agent_id, *args, **kwargs)
         self.agent_type = AGENT_TYPES[agent_type]
+        if prompt_layout not in PROMPT_LAYOUTS:
+            raise ValueError(f"Unknown prompt layout '{prompt_layout}'. Valid layouts: {PROMPT_LAYOUTS}")
+        # Prefix-stable layout replaces STANDARD_USER_TEMPLATE; custom templates are kept
+        if self.agent_type.user_prompt_template != STANDARD_USER_TEMPLATE:
+            prompt_layout = "standard"
+        self.prompt_layout = prompt_layout
         self.model = model_open_ai
         self._formatter = MarketStateFormatter()
-        self._llm_service = LLMService()
+        self._llm_service = LLMService(endpoint_profile)  # None = default endpoint profile
 
         # Fundamental info mode: controls what agents see about fundamental values
         self.fundamental_info_mode = fundamental_info_mode
@@ -47,53 +58,90 @@ class LLMAgent(BaseAgent):
 
     def make_decision(self, market_state, history, round_number):
         try:
-            # Store market_state for multi-stock support
-            self.current_market_state = market_state
+            request = self._build_llm_request(market_state, round_number)
+            # Get decision from LLM
+            response = self._llm_service.get_decision(request)
+            return self._apply_llm_response(response, round_number)
+        except Exception as e:
+            return self._fallback_on_error(e)
 
-            # Prepare context using signals + market_state
-            context = self.prepare_context_llm()
+    async def make_decision_async(self, market_state, history, round_number):
+        """Same as make_decision, awaiting the LLM call instead of blocking"""
+        try:
+            request = self._build_llm_request(market_state, round_number)
+            response = await self._llm_service.get_decision_async(request)
+            return self._apply_llm_response(response, round_number)
+        except Exception as e:
+            return self._fallback_on_error(e)
 
-            # Build last reasoning section (if feature enabled - provides continuity)
-            last_reasoning_section = ""
-            if Feature.LAST_REASONING in self.enabled_features:
-                last_reasoning_section = PromptBuilder.build_last_reasoning_section(
-                    self.last_reasoning
-                )
+    def _build_llm_request(self, market_state, round_number) -> LLMRequest:
+        """Assemble prompts for this round and log them"""
+        # Store market_state for multi-stock support
+        self.current_market_state = market_state
 
-            # Build memory section using PromptBuilder (only if memory enabled)
-            memory_section = ""
-            if Feature.MEMORY in self.enabled_features:
-                memory_notes = getattr(self, 'memory_notes', [])
-                memory_section = PromptBuilder.build_memory_section(
-                    memory_notes,
-                    self.MEMORY_DISPLAY_LIMIT
-                )
+        # Prepare context using signals + market_state
+        context = self.prepare_context_llm()
+
+        # Build last reasoning section (if feature enabled - provides continuity)
+        last_reasoning_section = ""
+        if Feature.LAST_REASONING in self.enabled_features:
+            last_reasoning_section = PromptBuilder.build_last_reasoning_section(
+                self.last_reasoning
+            )
 
-            # Build social feed section using PromptBuilder (only if social enabled)
-            messages_section = ""
-            if Feature.SOCIAL in self.enabled_features:
-                last_messages = self.get_last_round_messages(round_number)
+        # Build memory section using PromptBuilder (only if memory enabled)
+        memory_section = ""
+        if Feature.MEMORY in self.enabled_features:
+            memory_notes = getattr(self, 'memory_notes', [])
+            memory_section = PromptBuilder.build_memory_section(
+                memory_notes,
+                self.MEMORY_DISPLAY_LIMIT
+            )
+
+        # Build social feed section using PromptBuilder (only if social enabled)
+        messages_section = ""
+        if Feature.SOCIAL in self.enabled_features:
+            last_messages = self.get_last_round_messages(round_number)
+            fragments = PromptFragments.get_active()
+            if fragments is None:
                 messages_section = PromptBuilder.build_social_section(
                     last_messages,
                     self.enabled_features
                 )
-
-            # Build self-modify section using PromptBuilder (only if self-modify enabled)
-            self_modify_section = ""
-            if Feature.SELF_MODIFY in self.enabled_features:
-                prompt_history = getattr(self, 'prompt_history', [])
-                current_prompt = self.get_current_system_prompt()
-                self_modify_section = PromptBuilder.build_self_modify_section(
-                    prompt_history,
-                    current_prompt
+            else:
+                # Every agent reads the same list of last round's messages
+                messages_section = fragments.get(
+                    round_number, 'social', (last_messages,),
+                    lambda: PromptBuilder.build_social_section(last_messages, self.enabled_features)
                 )
 
-            # Detect if this is a multi-stock scenario
-            is_multi_stock = 'stocks' in market_state
-
-            # Build feature instructions (tells agent HOW to use memory/social/self-modify)
-            feature_instructions = PromptBuilder.build_instructions(self.enabled_features)
+        # Build self-modify section using PromptBuilder (only if self-modify enabled)
+        self_modify_section = ""
+        if Feature.SELF_MODIFY in self.enabled_features:
+            prompt_history = getattr(self, 'prompt_history', [])
+            current_prompt = self.get_current_system_prompt()
+            self_modify_section = PromptBuilder.build_self_modify_section(
+                prompt_history,
+                current_prompt
+            )
 
+        # Detect if this is a multi-stock scenario
+        is_multi_stock = 'stocks' in market_state
+
+        # Build feature instructions (tells agent HOW to use memory/social/self-modify)
+        feature_instructions = PromptBuilder.build_instructions(self.enabled_features)
+
+        if self.prompt_layout == "prefix_stable":
+            user_prompt = PromptBuilder.build_prefix_stable_prompt(
+                context,
+                feature_instructions,
+                is_multi_stock,
+                social_feed=messages_section,
+                last_reasoning=last_reasoning_section,
+                memory=memory_section,
+                self_modify=self_modify_section
+            )
+        else:
             user_prompt = (
                 self.agent_type.user_prompt_template.format(**context)
                 + last_reasoning_section
@@ -103,132 +151,141 @@ class LLMAgent(BaseAgent):
                 + ("\n\n" + feature_instructions if feature_instructions else "")
             )
 
-            # Determine system prompt: use mutable version if self-modify enabled
-            system_prompt = self.get_current_system_prompt()
-
-            # Create LLM request with enabled features
-            request = LLMRequest(
-                system_prompt=system_prompt,
-                user_prompt=user_prompt,
-                model=self.model,
-                agent_id=self.agent_id,
-                round_number=round_number,
-                is_multi_stock=is_multi_stock,
-                enabled_features=self.enabled_features
-            )
-            
-            # Log prompt
-            LoggingService.log_decision(
-                f"\n========== Agent {self.agent_id} Prompt ==========\n"
-                f"System: {request.system_prompt}\n"
-                f"User: {request.user_prompt}"
-            )
-            
-            # Get decision from LLM
-            response = self._llm_service.get_decision(request)
-            
-            # Log raw response
-            LoggingService.log_decision(
-                f"\n========== Agent {self.agent_id} Response ==========\n"
-                f"{response.raw_response}"
-            )
-            
-            # Store replace_decision in the agent instance
-            self.last_replace_decision = response.decision['replace_decision']
-
-            # Store reasoning for next round's context
-            self.last_reasoning = {
-                'round': round_number,
-                'reasoning': response.decision.get('reasoning', ''),
-                'valuation_reasoning': response.decision.get('valuation_reasoning', ''),
-                'price_prediction_reasoning': response.decision.get('price_prediction_reasoning', ''),
-            }
-
-            # Store memory notes with validation (only if memory feature enabled)
-            if Feature.MEMORY in self.enabled_features:
-                if note := response.decision.get('notes_to_self', '').strip():
-                    # Ensure memory_notes exists (should be initialized in __init__)
-                    if not hasattr(self, 'memory_notes'):
-                        self.memory_notes = []
-
-                    # Validation: warn if round numbers are non-monotonic
-                    if self.memory_notes and round_number <= self.memory_notes[-1][0]:
-                        LoggingService.log_decision(
-                            f"\n========== Agent {self.agent_id} Memory Warning ==========\n"
-                            f"Non-monotonic round numbers: previous={self.memory_notes[-1][0]}, current={round_number}"
-                        )
-
-                    # Store the note (all notes are kept in memory + saved to CSV)
-                    self.memory_notes.append((round_number, note))
+        # Determine system prompt: use mutable version if self-modify enabled
+        system_prompt = self.get_current_system_prompt()
 
-                    LoggingService.log_decision(
-                        f"\n========== Agent {self.agent_id} Memory Note ==========\n"
-                        f"Round {round_number}: {note}\n"
-                        f"Total notes in memory: {len(self.memory_notes)}"
-                    )
+        # Create LLM request with enabled features
+        request = LLMRequest(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            model=self.model,
+            agent_id=self.agent_id,
+            round_number=round_number,
+            is_multi_stock=is_multi_stock,
+            enabled_features=self.enabled_features,
+            deadline=LLMCallControl.round_deadline(),
+            prompt_layout=self.prompt_layout
+        )
 
-            # Process prompt modification (only if self-modify feature enabled)
-            if Feature.SELF_MODIFY in self.enabled_features:
-                modification = response.decision.get('prompt_modification', '')
-                reasoning = response.decision.get('modification_reasoning', '')
-                if modification and modification.strip():
-                    self._apply_prompt_modification(modification, reasoning, round_number)
-
-            # Get price signal for logging (handle multi-stock format)
-            if isinstance(self.private_signals, dict) and self.private_signals.get('is_multi_stock'):
-                # Multi-stock: get first stock's price signal
-                first_stock_signals = next(iter(self.private_signals['multi_stock_signals'].values()))
-                price_signal = first_stock_signals[InformationType.PRICE]
-            else:
-                # Single-stock: original behavior
-                price_signal = self.private_signals[InformationType.PRICE]
-
-            # Create and log structured decision entries
-            log_entries = DecisionLogEntry.from_decision(
-                decision=response.decision,
-                agent_type_name=self.agent_type.name,
-                agent_type_id=self.agent_type.type_id,
-                round_number=round_number,
-                market_price=price_signal.value
-            )
-            
-            # Log each entry
-            for entry in log_entries:
-                LoggingService.log_structured_decision(entry)
-
-            # Optional: Broadcast message if agent chose to post (only if social feature enabled)
-            if Feature.SOCIAL in self.enabled_features:
-                post_message = response.decision.get('post_message')
-                message_reasoning = response.decision.get('message_reasoning')
-                if post_message:
-                    self.broadcast_message(round_number, post_message)
-                    reasoning_text = f"\nMessage Reasoning: {message_reasoning}" if message_reasoning else ""
+        # Log prompt
+        LoggingService.log_decision(
+            f"\n========== Agent {self.agent_id} Prompt ==========\n"
+            f"System: {request.system_prompt}\n"
+            f"User: {request.user_prompt}"
+        )
+
+        return request
+
+    def _apply_llm_response(self, response, round_number):
+        """Update agent memory/reasoning from the LLM response and log the decision"""
+        # Log raw response
+        LoggingService.log_decision(
+            f"\n========== Agent {self.agent_id} Response ==========\n"
+            f"{response.raw_response}"
+        )
+
+        # Store replace_decision in the agent instance
+        self.last_replace_decision = response.decision['replace_decision']
+
+        # Store reasoning for next round's context
+        self.last_reasoning = {
+            'round': round_number,
+            'reasoning': response.decision.get('reasoning', ''),
+            'valuation_reasoning': response.decision.get('valuation_reasoning', ''),
+            'price_prediction_reasoning': response.decision.get('price_prediction_reasoning', ''),
+        }
+
+        # Store memory notes with validation (only if memory feature enabled)
+        if Feature.MEMORY in self.enabled_features:
+            if note := response.decision.get('notes_to_self', '').strip():
+                # Ensure memory_notes exists (should be initialized in __init__)
+                if not hasattr(self, 'memory_notes'):
+                    self.memory_notes = []
+
+                # Validation: warn if round numbers are non-monotonic
+                if self.memory_notes and round_number <= self.memory_notes[-1][0]:
                     LoggingService.log_decision(
-                        f"\n========== Agent {self.agent_id} Posted to Social Feed ==========\n"
-                        f"{post_message}{reasoning_text}"
+                        f"\n========== Agent {self.agent_id} Memory Warning ==========\n"
+                        f"Non-monotonic round numbers: previous={self.memory_notes[-1][0]}, current={round_number}"
                     )
 
-            # NOTE: stock_id auto-fix removed - now handled by dynamic schema
-            # In single-stock mode, stock_id field is excluded from schema entirely
-            # and automatically added in llm_services.py when parsing the response
+                # Store the note (all notes are kept in memory + saved to CSV)
+                self.memory_notes.append((round_number, note))
+
+                LoggingService.log_decision(
+                    f"\n========== Agent {self.agent_id} Memory Note ==========\n"
+                    f"Round {round_number}: {note}\n"
+                    f"Total notes in memory: {len(self.memory_notes)}"
+                )
+
+        # Process prompt modification (only if self-modify feature enabled)
+        if Feature.SELF_MODIFY in self.enabled_features:
+            modification = response.decision.get('prompt_modification', '')
+            reasoning = response.decision.get('modification_reasoning', '')
+            if modification and modification.strip():
+                self._apply_prompt_modification(modification, reasoning, round_number)
+
+        # Get price signal for logging (handle multi-stock format)
+        if isinstance(self.private_signals, dict) and self.private_signals.get('is_multi_stock'):
+            # Multi-stock: get first stock's price signal
+            first_stock_signals = next(iter(self.private_signals['multi_stock_signals'].values()))
+            price_signal = first_stock_signals[InformationType.PRICE]
+        else:
+            # Single-stock: original behavior
+            price_signal = self.private_signals[InformationType.PRICE]
+
+        # Create and log structured decision entries
+        log_entries = DecisionLogEntry.from_decision(
+            decision=response.decision,
+            agent_type_name=self.agent_type.name,
+            agent_type_id=self.agent_type.type_id,
+            round_number=round_number,
+            market_price=price_signal.value
+        )
+
+        # Log each entry
+        for entry in log_entries:
+            LoggingService.log_structured_decision(entry)
+
+        # Optional: Broadcast message if agent chose to post (only if social feature enabled)
+        if Feature.SOCIAL in self.enabled_features:
+            post_message = response.decision.get('post_message')
+            message_reasoning = response.decision.get('message_reasoning')
+            if post_message:
+                self.broadcast_message(round_number, post_message)
+                reasoning_text = f"\nMessage Reasoning: {message_reasoning}" if message_reasoning else ""
+                LoggingService.log_decision(
+                    f"\n========== Agent {self.agent_id} Posted to Social Feed ==========\n"
+                    f"{post_message}{reasoning_text}"
+                )
+
+        # NOTE: stock_id auto-fix removed - now handled by dynamic schema
+        # In single-stock mode, stock_id field is excluded from schema entirely
+        # and automatically added in llm_services.py when parsing the response
+
+        return response.decision
+
+    def _fallback_on_error(self, e: Exception):
+        """Log the failure and fall back to a hold decision"""
+        LLMCallControl.stats.fallbacks += 1
+        LoggingService.log_decision(
+            f"\n========== Agent {self.agent_id} Error ==========\n"
+            f"Error: {str(e)}\n"
+            f"Traceback: {traceback.format_exc()}"
+        )
+        fallback = self._llm_service.get_fallback_decision(
+            agent_id=self.agent_id
+        )
+        LoggingService.log_decision(
+            f"\n========== Agent {self.agent_id} Fallback ==========\n"
+            f"Using fallback decision: {fallback}"
+        )
+        return fallback
+
+    def get_fallback_decision(self):
+        """Hold decision matching this agent's enabled features"""
+        return self._llm_service.get_fallback_decision(self.agent_id, self.enabled_features)
 
-            return response.decision
-                
-        except Exception as e:
-            LoggingService.log_decision(
-                f"\n========== Agent {self.agent_id} Error ==========\n"
-                f"Error: {str(e)}\n"
-                f"Traceback: {traceback.format_exc()}"
-            )
-            fallback = self._llm_service.get_fallback_decision(
-                agent_id=self.agent_id
-            )
-            LoggingService.log_decision(
-                f"\n========== Agent {self.agent_id} Fallback ==========\n"
-                f"Using fallback decision: {fallback}"
-            )
-            return fallback
-    
     def prepare_agent_context(self):
         """Prepare agent context"""
         # Get all active orders (pending, active, and partially filled)
@@ -289,6 +346,7 @@ class LLMAgent(BaseAgent):
             },
             signal_history=self.signal_history,
             trade_history=self.trade_history,
+            trade_ledger=self.trade_ledger,
             dividend_cash=self.dividend_cash,
             committed_cash=self.committed_cash,
             committed_shares=self.committed_shares,
@@ -117,6 +117,13 @@ Redemption Information:
 {redemption_text}
 """
 
+DECISION_TRADEOFFS = """Consider carefully the trade-offs between:
+The execution uncertainty of limit orders and potential opportunity costs of holding an overvalued asset and missing on the interest rate or holding cash and missing on the dividend of an undervalued asset.
+
+Your optimal decision should balance these factors based on your analysis."""
+
+DECISION_QUESTION = "Based on your trading strategy, what is your decision?"
+
 # Standard user prompt template for all agents
 STANDARD_USER_TEMPLATE = """{base_market_state}
 {news_info}
@@ -129,11 +136,43 @@ STANDARD_USER_TEMPLATE = """{base_market_state}
 {position_info}
 {leverage_info}
 
-Consider carefully the trade-offs between:
-The execution uncertainty of limit orders and potential opportunity costs of holding an overvalued asset and missing on the interest rate or holding cash and missing on the dividend of an undervalued asset.
+""" + DECISION_TRADEOFFS + "\n" + DECISION_QUESTION
 
-Your optimal decision should balance these factors based on your analysis.
-Based on your trading strategy, what is your decision?"""
+MULTI_STOCK_INSTRUCTIONS = """
+IMPORTANT: This is a MULTI-STOCK scenario. You MUST include stock_id for each order using the stock IDs shown in the market information (e.g., "TECH_A", "TECH_B")."""
+
+# Prefix-stable layout (PROMPT_LAYOUT = "prefix_stable"), used in place of
+# STANDARD_USER_TEMPLATE. Sections run from most to least shared: rules that
+# never change, then this round's market data (the same for every agent),
+# then the agent's own account. Prompts of all agents in a round, and of one
+# agent across rounds, start with a long byte-identical prefix that provider
+# prompt caching can reuse.
+PREFIX_STABLE_INSTRUCTIONS_TEMPLATE = """{trading_options}
+""" + DECISION_TRADEOFFS + """{feature_instructions}{multi_stock_instructions}
+"""
+
+PREFIX_STABLE_ROUND_TEMPLATE = """
+=== MARKET THIS ROUND ===
+{market_state}
+{news_info}
+{multi_stock_info}
+{price_history}
+{dividend_info}
+{redemption_info}
+{interest_info}{social_feed}
+"""
+
+PREFIX_STABLE_AGENT_TEMPLATE = """
+=== YOUR ACCOUNT ===
+- Recent Trades
+{trade_history}
+
+{orders_display}
+
+{position_info}
+{leverage_info}{last_reasoning}{memory}{self_modify}
+
+""" + DECISION_QUESTION
 
 
 BASE_MARKET_TEMPLATE = """
@@ -152,6 +191,19 @@ Market Depth:
 {orders_display}
 """
 
+# Public part of BASE_MARKET_TEMPLATE, for the prefix-stable layout
+MARKET_STATE_TEMPLATE = """
+Market State:
+- Last Price: ${price:.2f}
+- Round Number: {round_number}/{num_rounds}
+- Best Public Estimate of Risk-Neutral Fundamental Value: {fundamental_display}
+- Last Trading Volume: {volume_display}
+- Price/Fundamental Ratio: {pf_ratio_display}
+
+Market Depth:
+{order_book_display}
+"""
+
 PRICE_HISTORY_TEMPLATE = """
 Price History (last 5 rounds):
 {price_history}
@@ -1,4 +1,4 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from dataclasses import dataclass
 from market.information.information_types import InformationType, InformationSignal
 from market.trade import Trade
@@ -8,10 +8,11 @@ from agents.LLMs.llm_prompt_templates import (
     DIVIDEND_INFO_REALIZATIONS_TEMPLATE, DIVIDEND_INFO_AVERAGE_TEMPLATE,
     DIVIDEND_INFO_NONE_TEMPLATE,
     INTEREST_INFO_TEMPLATE, PRICE_HISTORY_TEMPLATE,
-    REDEMPTION_INFO_TEMPLATE, LEVERAGE_INFO_TEMPLATE
+    REDEMPTION_INFO_TEMPLATE, LEVERAGE_INFO_TEMPLATE, MARKET_STATE_TEMPLATE
 )
 from agents.LLMs.signal_extraction.signal_extractor import SignalExtractor
 from agents.LLMs.calculation.market_calculator import MarketCalculator
+from agents.LLMs.services.prompt_fragments import PromptFragmentCache, PromptFragments
 from scenarios.base import FundamentalInfoMode
 
 @dataclass
@@ -47,6 +48,7 @@ class AgentContext:
     allow_short_selling: bool = False
     borrowed_shares: int = 0
     net_shares: int = 0
+    trade_ledger: Any = None  # Agent's TradeLedger; recent trades without rescanning trade_history
 
 class MarketStateFormatter:
     """Formats market state information for LLM consumption"""
@@ -88,11 +90,6 @@ class MarketStateFormatter:
                 fundamental_signal = first_stock_signals[InformationType.FUNDAMENTAL]
                 dividend_signal = first_stock_signals.get(InformationType.DIVIDEND)
                 interest_signal = first_stock_signals.get(InformationType.INTEREST)
-
-                # Format multi-stock info section using ALL stocks
-                multi_stock_info_from_signals = MarketStateFormatter._format_multi_stock_from_signals(
-                    agent_signals['multi_stock_signals']
-                )
             else:
                 # Single stock: original behavior
                 # Extract basic signals
@@ -102,17 +99,32 @@ class MarketStateFormatter:
                 fundamental_signal = agent_signals[InformationType.FUNDAMENTAL]
                 dividend_signal = agent_signals[InformationType.DIVIDEND]
                 interest_signal = agent_signals[InformationType.INTEREST]
-                multi_stock_info_from_signals = ""  # No multi-stock info for single stock
-
-            periods_remaining = fundamental_signal.metadata['periods_remaining']
-            if isinstance(periods_remaining, str):
-                if periods_remaining.isdigit():
-                    periods_remaining = int(periods_remaining)
-            if isinstance(periods_remaining, int) and periods_remaining > 0:
-                num_rounds = periods_remaining + price_signal.metadata['round']
+
+            current_round = price_signal.metadata['round']
+
+            # Market sections are the same for every agent given the same
+            # signals: render them once per round when fragments are shared
+            fragments = PromptFragments.get_active()
+
+            def render_public():
+                return MarketStateFormatter._format_public_sections(
+                    agent_signals, price_signal, volume_signal, order_book_signal,
+                    fundamental_signal, dividend_signal, interest_signal,
+                    market_state, fundamental_info_mode
+                )
+
+            if fragments is None:
+                public_context, public_sections = render_public()
             else:
-                num_rounds = "Infinite"
-            
+                public_context, public_sections = fragments.get(
+                    current_round, 'market',
+                    (fundamental_info_mode, price_signal, volume_signal, order_book_signal,
+                     fundamental_signal, dividend_signal, interest_signal,
+                     agent_signals.get(InformationType.NEWS),
+                     agent_signals.get('multi_stock_signals'), market_state),
+                    render_public
+                )
+
             # Format position display (handles both single and multi-stock)
             position_display = MarketStateFormatter._format_position_info(agent_context)
 
@@ -131,10 +143,8 @@ class MarketStateFormatter:
                 shares_display = f"- Shares: {agent_context.shares} shares"
 
             context = {
-                # Market data from signals
-                'price': price_signal.value,
-                'round_number': price_signal.metadata['round'],
-                'num_rounds': num_rounds,
+                # Market data from signals (shared by all agents)
+                **public_context,
 
                 # Agent data (already safe via dataclass)
                 'shares': agent_context.shares,
@@ -148,31 +158,9 @@ class MarketStateFormatter:
                 'position_display': position_display,  # Multi-stock aware display
                 'leverage_note': leverage_note,  # Leverage information
                 'short_selling_note': short_selling_note,  # Short selling information
-
-                # Calculated display values
-                'volume_display': MarketStateFormatter._format_volume(volume_signal),
-                'fundamental_display': MarketStateFormatter._format_fundamental(fundamental_signal),
-                'order_book_display': MarketStateFormatter._format_order_book(order_book_signal),
                 'orders_display': MarketStateFormatter._format_outstanding_orders(
                     agent_context.outstanding_orders
                 ),
-                'pf_ratio_display': MarketStateFormatter._format_pf_ratio(
-                    price_signal, fundamental_signal
-                ),
-
-                # Dividend and interest data (mode-aware)
-                **SignalExtractor.extract_dividend_context(
-                    dividend_signal, fundamental_info_mode
-                ),
-                **SignalExtractor.extract_interest_context(interest_signal),
-
-                # Add redemption context (mode-aware)
-                **SignalExtractor.extract_redemption_context(
-                    fundamental_signal, fundamental_info_mode
-                ),
-
-                # Add final round message
-                'final_round_message': "\nIn the final round, all shares are redeemed at the fundamental value." if num_rounds != "Infinite" else ""
             }
             
             # Use signal_history from context if not provided directly
@@ -180,8 +168,9 @@ class MarketStateFormatter:
             
             # Format price history
             price_history = MarketStateFormatter._format_price_history(
-                current_round=price_signal.metadata['round'],
-                signal_history=history_to_use
+                current_round=current_round,
+                signal_history=history_to_use,
+                fragments=fragments
             )
             
             # Add to context with the correct key name
@@ -191,17 +180,11 @@ class MarketStateFormatter:
             context['trade_history'] = MarketStateFormatter._format_trade_history(
                 trade_history=agent_context.trade_history,
                 agent_id=agent_context.agent_id,
-                current_round=price_signal.metadata['round'],
-                lookback=5
+                current_round=current_round,
+                lookback=5,
+                ledger=agent_context.trade_ledger
             )
 
-            # Format multi-stock market information
-            # Prefer signals-based formatting if available, otherwise use market_state
-            if multi_stock_info_from_signals:
-                multi_stock_info = multi_stock_info_from_signals
-            else:
-                multi_stock_info = MarketStateFormatter._format_multi_stock_market_info(market_state)
-
             # Format leverage information if enabled
             leverage_info = ""
             if agent_context.leverage_ratio > 1.0 and agent_context.equity is not None:
@@ -231,26 +214,18 @@ class MarketStateFormatter:
                     margin_status=margin_status
                 )
 
-            # Format news information if available
-            news_info = MarketStateFormatter._format_news_info(agent_signals)
-
-            # Format dividend info based on mode
-            dividend_info = MarketStateFormatter._format_dividend_info_by_mode(
-                context, fundamental_info_mode
-            )
-
             # Use templates consistently
             sections = {
                 'base_market_state': BASE_MARKET_TEMPLATE.format(**context),
                 'position_info': position_display,  # Use pre-formatted multi-stock aware display
                 'leverage_info': leverage_info,  # NEW: Leverage information
                 'price_history': PRICE_HISTORY_TEMPLATE.format(**context),
-                'dividend_info': dividend_info,  # Mode-aware dividend info
-                'interest_info': INTEREST_INFO_TEMPLATE.format(**context),
-                'redemption_info': REDEMPTION_INFO_TEMPLATE.format(**context),
                 'trading_options': TRADING_OPTIONS_TEMPLATE.format(short_selling_note=short_selling_note),
-                'multi_stock_info': multi_stock_info,  # From signals or market_state
-                'news_info': news_info  # LLM-generated market news
+                # Parts of base_market_state, for the prefix-stable layout
+                'trade_history': context['trade_history'],
+                'orders_display': context['orders_display'],
+                # market state, dividend, interest, redemption, multi-stock and news info
+                **public_sections
             }
 
             return sections
@@ -258,6 +233,83 @@ class MarketStateFormatter:
         except KeyError as e:
             raise ValueError(f"Missing required signal: {e}")
 
+    @staticmethod
+    def _format_public_sections(
+        agent_signals: Dict,
+        price_signal: InformationSignal,
+        volume_signal: InformationSignal,
+        order_book_signal: InformationSignal,
+        fundamental_signal: InformationSignal,
+        dividend_signal: InformationSignal,
+        interest_signal: InformationSignal,
+        market_state: Dict,
+        fundamental_info_mode: FundamentalInfoMode
+    ) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """Template values and sections that depend only on market signals.
+
+        Returns (context, sections). Both may be shared by every agent of the
+        round (PromptFragments), so callers must not modify them.
+        """
+        periods_remaining = fundamental_signal.metadata['periods_remaining']
+        if isinstance(periods_remaining, str):
+            if periods_remaining.isdigit():
+                periods_remaining = int(periods_remaining)
+        if isinstance(periods_remaining, int) and periods_remaining > 0:
+            num_rounds = periods_remaining + price_signal.metadata['round']
+        else:
+            num_rounds = "Infinite"
+
+        context = {
+            # Market data from signals
+            'price': price_signal.value,
+            'round_number': price_signal.metadata['round'],
+            'num_rounds': num_rounds,
+
+            # Calculated display values
+            'volume_display': MarketStateFormatter._format_volume(volume_signal),
+            'fundamental_display': MarketStateFormatter._format_fundamental(fundamental_signal),
+            'order_book_display': MarketStateFormatter._format_order_book(order_book_signal),
+            'pf_ratio_display': MarketStateFormatter._format_pf_ratio(
+                price_signal, fundamental_signal
+            ),
+
+            # Dividend and interest data (mode-aware)
+            **SignalExtractor.extract_dividend_context(
+                dividend_signal, fundamental_info_mode
+            ),
+            **SignalExtractor.extract_interest_context(interest_signal),
+
+            # Add redemption context (mode-aware)
+            **SignalExtractor.extract_redemption_context(
+                fundamental_signal, fundamental_info_mode
+            ),
+
+            # Add final round message
+            'final_round_message': "\nIn the final round, all shares are redeemed at the fundamental value." if num_rounds != "Infinite" else ""
+        }
+
+        # Format multi-stock market information
+        # Prefer signals-based formatting if available, otherwise use market_state
+        multi_stock_info = ""
+        if isinstance(agent_signals, dict) and agent_signals.get('is_multi_stock'):
+            multi_stock_info = MarketStateFormatter._format_multi_stock_from_signals(
+                agent_signals['multi_stock_signals']
+            )
+        if not multi_stock_info:
+            multi_stock_info = MarketStateFormatter._format_multi_stock_market_info(market_state)
+
+        sections = {
+            'market_state': MARKET_STATE_TEMPLATE.format(**context),  # Without the agent's trades and orders
+            'dividend_info': MarketStateFormatter._format_dividend_info_by_mode(
+                context, fundamental_info_mode
+            ),  # Mode-aware dividend info
+            'interest_info': INTEREST_INFO_TEMPLATE.format(**context),
+            'redemption_info': REDEMPTION_INFO_TEMPLATE.format(**context),
+            'multi_stock_info': multi_stock_info,  # From signals or market_state
+            'news_info': MarketStateFormatter._format_news_info(agent_signals)  # LLM-generated market news
+        }
+        return context, sections
+
     @staticmethod
     def _format_currency(value: float) -> str:
         """Consistent currency formatting"""
@@ -463,44 +515,62 @@ class MarketStateFormatter:
     def _format_price_history(
         current_round: int,
         signal_history: Dict[int, Dict[InformationType, InformationSignal]],
-        lookback: int = 5
+        lookback: int = 5,
+        fragments: PromptFragmentCache = None
     ) -> str:
-        """Format price history for display"""
+        """Format price history for display.
+
+        With a PromptFragmentCache, agents holding the same price and volume
+        signals for the shown rounds share one rendering.
+        """
         if current_round <= 1:  # First round
             return "No price history available (first round)"
             
         if not signal_history:
             return "No price history available"
             
-        # Get rounds to display
-        rounds = sorted(
-            [r for r in signal_history.keys() if r < current_round],
-            reverse=True
-        )[:lookback]
+        # Get rounds to display. Signal history is filled in round order, so
+        # walk it from the newest entry instead of sorting every round
+        rounds = []
+        for r in reversed(signal_history):
+            if r < current_round:
+                rounds.append(r)
+                if len(rounds) == lookback:
+                    break
         
         if not rounds:
             return "No previous price data"
             
-        # Format each round's price with volume if available
-        history_lines = []
-        for round_num in rounds:
-            price_info = signal_history[round_num].get(InformationType.PRICE)
-            volume_info = signal_history[round_num].get(InformationType.VOLUME)
-            
-            if price_info:
-                line = f"Round {round_num}: {MarketStateFormatter._format_currency(price_info.value)}"
-                if volume_info:
-                    line += f" (Volume: {volume_info.value:.0f})"
-                history_lines.append(line)
-                    
-        return "\n".join(history_lines)
+        entries = [
+            (round_num,
+             signal_history[round_num].get(InformationType.PRICE),
+             signal_history[round_num].get(InformationType.VOLUME))
+            for round_num in rounds
+        ]
+
+        def render():
+            # Format each round's price with volume if available
+            history_lines = []
+            for round_num, price_info, volume_info in entries:
+                if price_info:
+                    line = f"Round {round_num}: {MarketStateFormatter._format_currency(price_info.value)}"
+                    if volume_info:
+                        line += f" (Volume: {volume_info.value:.0f})"
+                    history_lines.append(line)
+            return "\n".join(history_lines)
+
+        if fragments is None:
+            return render()
+        sources = tuple(signal for _, price_info, volume_info in entries for signal in (price_info, volume_info))
+        return fragments.get(current_round, ('price_history', *rounds), sources, render)
 
     @staticmethod
     def _format_trade_history(
         trade_history: List[Trade],
         agent_id: str,
         current_round: int,
-        lookback: int = 5
+        lookback: int = 5,
+        ledger=None
     ) -> str:
         """Format recent trade history for display with P&L information
 
@@ -509,10 +579,11 @@ class MarketStateFormatter:
             agent_id: ID of the agent requesting history
             current_round: Current round number
             lookback: Number of rounds to look back
+            ledger: The agent's TradeLedger, if any, to read recent trades from
         """
         # Get P&L summary from calculator
         summary = MarketCalculator.calculate_trade_pnl_summary(
-            trade_history, agent_id, current_round, lookback
+            trade_history, agent_id, current_round, lookback, ledger=ledger
         )
 
         if current_round == 0:
@@ -0,0 +1,198 @@
+"""Content-addressed on-disk cache of LLM responses.
+
+Responses are stored in SQLite under a SHA-256 of everything that determines
+the model's answer: model, system prompt, user prompt (as sent), response
+schema, seed and temperature. With deterministic scenarios (RANDOM_SEED) a
+rerun builds identical prompts, so it can be served entirely from the cache.
+
+Modes:
+    read_through: serve hits, call the API on misses and store the result
+    record:       always call the API and store (refreshes existing entries)
+    replay:       serve hits only; a miss raises LLMCacheMiss (no network)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from services.simulation_runtime import SimulationRuntime
+
+CACHE_MODES = ('read_through', 'record', 'replay')
+DEFAULT_CACHE_PATH = 'llm_cache/responses.sqlite'
+
+
+class LLMCacheMiss(Exception):
+    """Replay-only cache has no entry for this request"""
+
+
+def cache_key(model: str, system_prompt: str, user_prompt: str,
+              schema: Dict[str, Any], seed: Optional[int], temperature: float) -> str:
+    """Stable hash identifying one LLM request"""
+    payload = json.dumps({
+        'model': model,
+        'system': system_prompt,
+        'user': user_prompt,
+        'schema': schema,
+        'seed': seed,
+        'temperature': temperature,
+    }, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class _LLMCacheState:
+    """LLMResponseCache state for one SimulationRuntime"""
+    active: Optional['LLMResponseCache'] = None
+
+
+class LLMResponseCache:
+    """SQLite-backed response cache with LRU eviction by total size.
+
+    One cache is active per simulation (configure()/get_active(), like the
+    other shared services); every LLMService of that simulation consults it.
+    Safe to use from the decision thread pool, and several simulations or
+    processes may share one file.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_CACHE_PATH, mode: str = 'read_through',
+                 max_bytes: Optional[int] = None):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown LLM cache mode '{mode}'. Valid modes: {CACHE_MODES}")
+        self.path = Path(path)
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT NOT NULL,"
+            " raw_response TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used)")
+        self._conn.commit()
+
+    # Instance of the current simulation
+    @staticmethod
+    def _state() -> _LLMCacheState:
+        return SimulationRuntime.current().service_state('llm_cache', _LLMCacheState)
+
+    @classmethod
+    def configure(cls, config: Union[None, str, Dict[str, Any]] = None) -> Optional['LLMResponseCache']:
+        """Open the cache described by a scenario's LLM_CACHE setting.
+
+        Args:
+            config: None (disabled unless LLM_CACHE_MODE is set in the
+                environment), a mode name, or a dict with 'mode', 'path'
+                and optional 'max_mb'. LLM_CACHE_MODE / LLM_CACHE_PATH
+                environment variables override the scenario, so CI or
+                health checks can replay without editing scenarios.
+        """
+        if isinstance(config, str):
+            config = {'mode': config}
+        config = dict(config or {})
+        if os.environ.get('LLM_CACHE_MODE'):
+            config['mode'] = os.environ['LLM_CACHE_MODE']
+        if os.environ.get('LLM_CACHE_PATH'):
+            config['path'] = os.environ['LLM_CACHE_PATH']
+
+        cls.close_active()
+        mode = config.get('mode', 'off')
+        if mode in (None, 'off'):
+            return None
+        max_mb = config.get('max_mb')
+        state = cls._state()
+        state.active = cls(
+            path=config.get('path', DEFAULT_CACHE_PATH),
+            mode=mode,
+            max_bytes=int(max_mb * 1024 * 1024) if max_mb else None,
+        )
+        return state.active
+
+    @classmethod
+    def get_active(cls) -> Optional['LLMResponseCache']:
+        return cls._state().active
+
+    @classmethod
+    def close_active(cls) -> None:
+        state = cls._state()
+        if state.active is not None:
+            state.active.close()
+            state.active = None
+
+    # Lookups
+    @property
+    def serves_hits(self) -> bool:
+        return self.mode in ('read_through', 'replay')
+
+    def get(self, key: str) -> Optional[str]:
+        """Raw response for `key`, or None (LLMCacheMiss in replay mode)"""
+        if not self.serves_hits:
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT raw_response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+                self._conn.commit()
+                self.hits += 1
+                return row[0]
+            self.misses += 1
+        if self.mode == 'replay':
+            raise LLMCacheMiss(f"No cached LLM response for key {key[:12]}... (replay mode)")
+        return None
+
+    def put(self, key: str, model: str, raw_response: str) -> None:
+        if self.mode == 'replay' or raw_response is None:
+            return
+        now = time.time()
+        size = len(raw_response.encode('utf-8'))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, raw_response, size, created, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, raw_response, size, now, now)
+            )
+            self.writes += 1
+            if self.max_bytes is not None:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_used ASC"):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {'mode': self.mode, 'entries': entries, 'bytes': size, 'hits': self.hits,
+                'misses': self.misses, 'writes': self.writes, 'evictions': self.evictions}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
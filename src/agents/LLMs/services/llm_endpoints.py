@@ -0,0 +1,266 @@
+"""Endpoint profiles, rate limiting and shared async clients for LLM calls.
+
+An EndpointProfile describes one OpenAI-compatible endpoint: where it lives,
+how many requests may be in flight at once and its requests-per-minute /
+tokens-per-minute budget. All LLMService instances pointing at the same
+profile share one AsyncLLMPool, so the limits hold across every agent in
+the simulation rather than per agent.
+
+Pools are per simulation (SimulationRuntime service state). When several
+simulations run in separate processes (run_sweep.py), SharedLLMBudget caps
+the requests in flight across all of them.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Optional, Union
+
+import httpx
+import openai
+
+from scenarios.base import DEFAULT_LLM_BASE_URL
+from services.simulation_runtime import SimulationRuntime
+from .llm_retry import LLMCallControl, LLMDeadlineExceeded
+
+
+@dataclass(frozen=True)
+class EndpointProfile:
+    """Connection and throughput settings for one LLM endpoint"""
+    name: str
+    base_url: Optional[str] = None  # None = OpenAI's default endpoint
+    max_in_flight: int = 8
+    requests_per_minute: Optional[float] = None  # None = unlimited
+    tokens_per_minute: Optional[float] = None  # None = unlimited
+    timeout: float = 20.0
+    connect_timeout: float = 10.0
+
+    def __post_init__(self):
+        if self.max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be at least 1, got {self.max_in_flight}")
+        for field_name in ('requests_per_minute', 'tokens_per_minute'):
+            value = getattr(self, field_name)
+            if value is not None and value <= 0:
+                raise ValueError(f"{field_name} must be positive, got {value}")
+
+    def httpx_timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(self.timeout, connect=self.connect_timeout)
+
+
+# Built-in profiles. "default" follows DEFAULT_LLM_BASE_URL from scenarios/base.py.
+ENDPOINT_PROFILES: Dict[str, EndpointProfile] = {
+    'default': EndpointProfile(name='default', base_url=DEFAULT_LLM_BASE_URL),
+    'openai': EndpointProfile(name='openai', base_url=None, max_in_flight=32),
+    # Shared university endpoint: keep it gentle (replaces the old serial + 0.5s sleep path)
+    'hypergator': EndpointProfile(name='hypergator', base_url="https://api.ai.it.ufl.edu/v1",
+                                  max_in_flight=4, requests_per_minute=120),
+    # Local vLLM / llama.cpp servers handle wide fan-out fine
+    'local': EndpointProfile(name='local', base_url="http://localhost:8000/v1",
+                             max_in_flight=64, timeout=120.0),
+}
+
+
+def resolve_endpoint_profile(spec: Union[None, str, Dict[str, Any], EndpointProfile] = None) -> EndpointProfile:
+    """Turn a scenario setting into an EndpointProfile.
+
+    Args:
+        spec: None for the default profile, a profile name from ENDPOINT_PROFILES,
+            a dict of EndpointProfile fields (optionally with 'base' naming a
+            profile to override), or an EndpointProfile instance.
+    """
+    if spec is None:
+        return ENDPOINT_PROFILES['default']
+    if isinstance(spec, EndpointProfile):
+        return spec
+    if isinstance(spec, str):
+        if spec not in ENDPOINT_PROFILES:
+            raise ValueError(f"Unknown LLM endpoint profile '{spec}'. "
+                             f"Available profiles: {sorted(ENDPOINT_PROFILES)}")
+        return ENDPOINT_PROFILES[spec]
+    if isinstance(spec, dict):
+        overrides = dict(spec)
+        base = resolve_endpoint_profile(overrides.pop('base', None))
+        overrides.setdefault('name', f"{base.name}_custom")
+        return replace(base, **overrides)
+    raise TypeError(f"Cannot build an endpoint profile from {type(spec).__name__}")
+
+
+class TokenBucket:
+    """Refilling bucket enforcing a per-minute budget (requests or tokens).
+
+    Holds no asyncio primitives: taking tokens happens between awaits, so one
+    bucket can be shared by every coroutine and survives across the event
+    loops of successive rounds.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0  # tokens per second
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, amount: float = 1.0) -> float:
+        """Take `amount` if available and return 0, else return seconds to wait"""
+        amount = min(amount, self.capacity)  # oversized requests wait for a full bucket
+        self._refill()
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        while (wait := self.try_acquire(amount)) > 0:
+            await asyncio.sleep(wait)
+
+    def adjust(self, delta: float) -> None:
+        """Charge (positive) or refund (negative) a correction once real usage is known"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class SharedLLMBudget:
+    """Cap on LLM requests in flight across processes.
+
+    The sweep runner creates one multiprocessing semaphore and installs it in
+    every worker process; each request holds a slot while it is on the wire,
+    on top of its profile's per-process max_in_flight. Without an installed
+    semaphore the slots are no-ops. A request with a deadline waits for a
+    slot only until then and raises LLMDeadlineExceeded, so sibling workers
+    holding every slot cannot stretch a round past its deadline.
+    """
+    _semaphore = None
+    POLL_SECONDS = 0.05  # async waiters poll; blocking would stall the event loop
+
+    @classmethod
+    def install(cls, semaphore) -> None:
+        """Use `semaphore` (a multiprocessing semaphore, or None to remove) for this process"""
+        cls._semaphore = semaphore
+
+    @classmethod
+    def installed(cls) -> bool:
+        return cls._semaphore is not None
+
+    @classmethod
+    @contextmanager
+    def slot(cls, deadline: Optional[float] = None):
+        semaphore = cls._semaphore
+        if semaphore is None:
+            yield
+            return
+        wait_start = time.monotonic()
+        acquired = semaphore.acquire(True, LLMCallControl.remaining(deadline))
+        LLMCallControl.stats.rate_limit_wait_seconds += time.monotonic() - wait_start
+        if not acquired:
+            raise LLMDeadlineExceeded("Round deadline passed waiting for a shared LLM slot")
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    @classmethod
+    @asynccontextmanager
+    async def async_slot(cls, deadline: Optional[float] = None):
+        semaphore = cls._semaphore
+        if semaphore is None:
+            yield
+            return
+        wait_start = time.monotonic()
+        while not semaphore.acquire(False):
+            remaining = LLMCallControl.remaining(deadline)
+            if remaining == 0.0:
+                LLMCallControl.stats.rate_limit_wait_seconds += time.monotonic() - wait_start
+                raise LLMDeadlineExceeded("Round deadline passed waiting for a shared LLM slot")
+            await asyncio.sleep(cls.POLL_SECONDS if remaining is None else min(cls.POLL_SECONDS, remaining))
+        LLMCallControl.stats.rate_limit_wait_seconds += time.monotonic() - wait_start
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+
+@dataclass
+class _LLMPoolState:
+    """AsyncLLMPool registry for one SimulationRuntime"""
+    pools: Dict[str, 'AsyncLLMPool'] = field(default_factory=dict)
+
+
+class AsyncLLMPool:
+    """Shared AsyncOpenAI client, in-flight cap and rate limits for one profile.
+
+    The client and semaphore belong to an event loop, so they are created
+    lazily on the running loop and dropped by close_all() at the end of each
+    fan-out. Rate buckets are kept for the life of the simulation.
+    """
+
+    def __init__(self, profile: EndpointProfile):
+        self.profile = profile
+        self.request_bucket = TokenBucket(profile.requests_per_minute) if profile.requests_per_minute else None
+        self.token_bucket = TokenBucket(profile.tokens_per_minute) if profile.tokens_per_minute else None
+        self._client: Optional[openai.AsyncOpenAI] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @staticmethod
+    def _state() -> _LLMPoolState:
+        return SimulationRuntime.current().service_state('llm_pools', _LLMPoolState)
+
+    @classmethod
+    def for_profile(cls, profile: EndpointProfile) -> 'AsyncLLMPool':
+        pools = cls._state().pools
+        pool = pools.get(profile.name)
+        if pool is None or pool.profile != profile:
+            pool = cls(profile)
+            pools[profile.name] = pool
+        return pool
+
+    @classmethod
+    async def close_all(cls) -> None:
+        """Close the current simulation's clients bound to the running loop"""
+        for pool in cls._state().pools.values():
+            await pool.aclose()
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._state().pools.clear()
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            kwargs = {'timeout': self.profile.httpx_timeout(), 'max_retries': 0}  # LLMCallControl retries
+            if self.profile.base_url:
+                kwargs['base_url'] = self.profile.base_url
+            self._client = openai.AsyncOpenAI(**kwargs)
+            self._semaphore = asyncio.Semaphore(self.profile.max_in_flight)
+            self._loop = loop
+
+    async def aclose(self) -> None:
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.close()
+        self._client = None
+        self._semaphore = None
+        self._loop = None
+
+    async def parse(self, estimated_tokens: int, deadline: Optional[float] = None, **kwargs):
+        """Structured-output completion under the profile's concurrency and rate limits"""
+        self._bind_loop()
+        async with self._semaphore:
+            if self.request_bucket or self.token_bucket:
+                wait_start = time.monotonic()
+                if self.request_bucket:
+                    await self.request_bucket.acquire(1)
+                if self.token_bucket:
+                    await self.token_bucket.acquire(estimated_tokens)
+                LLMCallControl.stats.rate_limit_wait_seconds += time.monotonic() - wait_start
+            async with SharedLLMBudget.async_slot(deadline):
+                completion = await self._client.beta.chat.completions.parse(**kwargs)
+
+        usage = getattr(completion, 'usage', None)
+        if self.token_bucket and usage is not None and usage.total_tokens:
+            self.token_bucket.adjust(usage.total_tokens - estimated_tokens)
+        return completion
@@ -0,0 +1,193 @@
+"""Retry policy, round deadline and call counters for LLM requests.
+
+LLMCallControl state belongs to the current simulation (SimulationRuntime
+service state, like LoggingService): every LLMService of a simulation
+consults the same policy and deadline and feeds the same LLMCallStats, so
+one set of counters explains where a round's time went.
+"""
+import asyncio
+import random
+import time
+from dataclasses import dataclass, asdict, field
+from typing import Any, Dict, Optional
+
+import httpx
+import openai
+
+from services.simulation_runtime import SimulationRuntime
+
+# Status codes worth retrying besides 5xx: request timeout, conflict, rate limit
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+class LLMDeadlineExceeded(Exception):
+    """The round deadline passed before the LLM call could complete"""
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter, retrying only transient errors.
+
+    Attempt n (0-based) waits uniformly in
+    [(1 - jitter) * d, d] with d = min(max_delay, base_delay * multiplier ** n).
+    """
+    max_attempts: int = 6
+    base_delay: float = 1.0
+    multiplier: float = 2.0
+    max_delay: float = 30.0
+    jitter: float = 1.0  # 1.0 = full jitter, 0.0 = deterministic delays
+
+    def __post_init__(self):
+        if self.max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, got {self.max_attempts}")
+        if not 0.0 <= self.jitter <= 1.0:
+            raise ValueError(f"jitter must be between 0 and 1, got {self.jitter}")
+
+    @staticmethod
+    def is_timeout(error: BaseException) -> bool:
+        return isinstance(error, (openai.APITimeoutError, httpx.TimeoutException, asyncio.TimeoutError))
+
+    @classmethod
+    def is_retryable(cls, error: BaseException) -> bool:
+        """Timeouts, connection failures, 429 and 5xx; not schema or other 4xx errors"""
+        if cls.is_timeout(error) or isinstance(error, (openai.APIConnectionError, httpx.TransportError)):
+            return True
+        if isinstance(error, openai.APIStatusError):
+            return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+        return False
+
+    def delay(self, attempt: int, rng: Optional[random.Random] = None) -> float:
+        """Backoff before retry number `attempt` + 1"""
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier ** attempt)
+        rng = rng or random
+        return ceiling * (1.0 - self.jitter * rng.random())
+
+
+@dataclass
+class LLMCallStats:
+    """Counters describing where LLM time went"""
+    calls: int = 0
+    retries: int = 0
+    timeouts: int = 0
+    non_retryable_errors: int = 0
+    fallbacks: int = 0
+    deadline_fallbacks: int = 0
+    backoff_wait_seconds: float = 0.0
+    rate_limit_wait_seconds: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    prompt_tokens: int = 0         # From the API usage field
+    cached_prompt_tokens: int = 0  # Of which served from the provider's prompt cache
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def reset(self) -> None:
+        for name, value in asdict(LLMCallStats()).items():
+            setattr(self, name, value)
+
+
+@dataclass
+class _LLMCallState:
+    """LLMCallControl state for one SimulationRuntime"""
+    policy: RetryPolicy = field(default_factory=RetryPolicy)
+    stats: LLMCallStats = field(default_factory=LLMCallStats)
+    round_deadline: Optional[float] = None  # None = no deadline
+    rng: random.Random = field(default_factory=random.Random)  # Backoff jitter
+
+
+class _LLMCallControlMeta(type):
+    """Reads LLMCallControl.policy and .stats from the current simulation"""
+
+    @property
+    def policy(cls) -> RetryPolicy:
+        return cls._state().policy
+
+    @property
+    def stats(cls) -> LLMCallStats:
+        return cls._state().stats
+
+
+class LLMCallControl(metaclass=_LLMCallControlMeta):
+    """Retry policy, round deadline and counters for the current simulation's LLM calls.
+
+    Deadlines are time.monotonic() values. The round deadline is copied into
+    each LLMRequest when it is built, so a call still running after its round
+    ended keeps checking its own round's deadline.
+    """
+
+    @staticmethod
+    def _state() -> _LLMCallState:
+        return SimulationRuntime.current().service_state('llm_call_control', _LLMCallState)
+
+    @classmethod
+    def configure(cls, policy: Optional[RetryPolicy] = None) -> None:
+        cls._state().policy = policy or RetryPolicy()
+
+    @classmethod
+    def reset(cls) -> None:
+        state = cls._state()
+        state.policy = RetryPolicy()
+        state.stats.reset()
+        state.round_deadline = None
+
+    @classmethod
+    def start_round(cls, timeout_seconds: Optional[float]) -> None:
+        """Set the deadline for this round's decisions (None = no deadline)"""
+        cls._state().round_deadline = None if timeout_seconds is None else time.monotonic() + timeout_seconds
+
+    @classmethod
+    def end_round(cls) -> None:
+        """Close the round: requests built from now on are already past its deadline"""
+        state = cls._state()
+        if state.round_deadline is not None:
+            state.round_deadline = min(state.round_deadline, time.monotonic())
+
+    @classmethod
+    def round_deadline(cls) -> Optional[float]:
+        return cls._state().round_deadline
+
+    @staticmethod
+    def remaining(deadline: Optional[float]) -> Optional[float]:
+        """Seconds left before `deadline`, None if there is none"""
+        if deadline is None:
+            return None
+        return max(0.0, deadline - time.monotonic())
+
+    @staticmethod
+    def check_deadline(deadline: Optional[float]) -> None:
+        if deadline is not None and time.monotonic() >= deadline:
+            raise LLMDeadlineExceeded("Round deadline passed")
+
+    @classmethod
+    def next_backoff(cls, error: BaseException, attempt: int, deadline: Optional[float] = None) -> float:
+        """Record a failed attempt and return the wait before retrying.
+
+        Re-raises `error` when it is not retryable or attempts are exhausted,
+        and raises LLMDeadlineExceeded when the wait would cross the deadline.
+        """
+        if isinstance(error, LLMDeadlineExceeded):
+            raise error  # Ran out of time waiting (e.g. for a shared slot): not an API error
+        state = cls._state()
+        if state.policy.is_timeout(error):
+            state.stats.timeouts += 1
+        if not state.policy.is_retryable(error):
+            state.stats.non_retryable_errors += 1
+            raise error
+        if attempt + 1 >= state.policy.max_attempts:
+            raise error
+
+        delay = state.policy.delay(attempt, state.rng)
+        remaining = cls.remaining(deadline)
+        if remaining is not None and delay >= remaining:
+            raise LLMDeadlineExceeded("Round deadline would pass during backoff") from error
+
+        state.stats.retries += 1
+        state.stats.backoff_wait_seconds += delay
+        return delay
+
+    @classmethod
+    def request_timeout(cls, default: float, deadline: Optional[float] = None) -> float:
+        """Per-request timeout, shortened so a call cannot outlive the deadline"""
+        remaining = cls.remaining(deadline)
+        return default if remaining is None else max(0.001, min(default, remaining))
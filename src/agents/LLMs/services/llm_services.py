@@ -1,13 +1,18 @@
 from dataclasses import dataclass
-from typing import Dict, Any, Optional, List, Literal, Set
+from typing import Dict, Any, Optional, List, Literal, Set, Tuple, Type
 import openai
+import os
 import time
+import asyncio
 import logging
 from agents.agents_api import TradeDecision, OrderDetails
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
-from scenarios.base import DEFAULT_LLM_BASE_URL
 from .schema_features import Feature, FeatureRegistry
+from .llm_endpoints import AsyncLLMPool, SharedLLMBudget, resolve_endpoint_profile
+from .llm_retry import LLMCallControl
+from .llm_cache import LLMResponseCache, cache_key
+from agents.LLMs.llm_prompt_templates import MULTI_STOCK_INSTRUCTIONS
 
 logger = logging.getLogger("llm_timing")
 
@@ -27,6 +32,8 @@ class LLMRequest:
     round_number: int
     is_multi_stock: bool = False
     enabled_features: Set[Feature] = None  # NEW: Feature configuration for dynamic schema
+    deadline: Optional[float] = None  # time.monotonic() round deadline, None = no deadline
+    prompt_layout: str = "standard"  # "prefix_stable" prompts already carry the multi-stock instructions
 
     def __post_init__(self):
         """Set default features if none provided (backward compatibility)"""
@@ -41,63 +48,198 @@ class LLMResponse:
 
 class LLMService:
     """Pure service for LLM interactions"""
-    
-    def __init__(self):
+
+    _schema_fingerprints: Dict[type, Dict[str, Any]] = {}  # schema class -> JSON schema, for cache keys
+
+    def __init__(self, endpoint_profile=None):
         load_dotenv()  # Load API key from .env
 
-        # Initialize OpenAI client with configured base_url and timeout
-        # (base_url set in scenarios/base.py - non-sensitive config)
-        # Use httpx timeout for reliable request timeout (20s default)
-        import httpx
-        timeout_config = httpx.Timeout(20.0, connect=10.0)
-        if DEFAULT_LLM_BASE_URL:
-            self.client = openai.OpenAI(base_url=DEFAULT_LLM_BASE_URL, timeout=timeout_config)
-        else:
-            self.client = openai.OpenAI(timeout=timeout_config)
+        # Endpoint profile: base_url, timeouts, in-flight cap and rate limits
+        # (default profile uses base_url from scenarios/base.py - non-sensitive config)
+        self.endpoint_profile = resolve_endpoint_profile(endpoint_profile)
+
+        # Sync client keeps the original httpx timeout (20s default).
+        # Retries are handled by LLMCallControl's policy, not the client.
+        client_kwargs = {'timeout': self.endpoint_profile.httpx_timeout(), 'max_retries': 0}
+        if self.endpoint_profile.base_url:
+            client_kwargs['base_url'] = self.endpoint_profile.base_url
+        cache = LLMResponseCache.get_active()
+        if cache is not None and cache.mode == 'replay' and not os.environ.get('OPENAI_API_KEY'):
+            client_kwargs['api_key'] = 'replay-only'  # Never used: replay mode makes no API calls
+        self.client = openai.OpenAI(**client_kwargs)
 
         self.seed = 42
-    
+
     def get_decision(self, request: LLMRequest) -> LLMResponse:
         """Get decision from LLM using dynamic schema based on enabled features"""
         # Special case for hold_llm agent type to avoid API calls
         if request.model == "hold_llm":
-            # Create hold decision with only the fields enabled by features
-            decision_dict = {
-                "valuation_reasoning": "LLM Hold Agent: Always hold strategy",
-                "valuation": 0,
-                "price_prediction_reasoning": "LLM Hold Agent: Always hold strategy",
-                "price_prediction_t": 0,
-                "price_prediction_t1": 0,
-                "price_prediction_t2": 0,
-                "orders": [],  # Empty list for hold
-                "replace_decision": "Add",
-                "reasoning": "LLM Hold Agent: Always hold strategy",
-            }
+            return self._hold_response(request)
 
-            # Add optional fields only if features are enabled
-            if Feature.MEMORY in request.enabled_features:
-                decision_dict["notes_to_self"] = None
-            if Feature.SOCIAL in request.enabled_features:
-                decision_dict["message_reasoning"] = None
-                decision_dict["post_message"] = None
-            if Feature.SELF_MODIFY in request.enabled_features:
-                decision_dict["prompt_modification"] = None
-                decision_dict["modification_reasoning"] = None
+        messages, dynamic_schema = self._prepare_messages(request)
 
-            decision_dict["agent_id"] = request.agent_id
+        cache = LLMResponseCache.get_active()
+        key = self._cache_key(request, messages, dynamic_schema) if cache else None
+        if cache is not None and (cached := self._cached_response(cache, key, request, dynamic_schema)):
+            return cached
 
-            return LLMResponse(
-                decision=decision_dict,
-                raw_response="Testing hold_llm agent. Always holds."
-            )
+        # Get the response using the parse method with our dynamic schema
+        # Retry transient errors (timeouts, 429, 5xx) with jittered backoff; stop at the round deadline
+        start_time = time.time()
+        prompt_len = len(request.system_prompt) + len(request.user_prompt)
+
+        attempt = 0
+        while True:
+            LLMCallControl.check_deadline(request.deadline)
+            try:
+                self._log_call_start(request, prompt_len, attempt)
+                LLMCallControl.stats.calls += 1
+                with SharedLLMBudget.slot(request.deadline):
+                    completion = self.client.beta.chat.completions.parse(
+                        model=request.model,
+                        messages=messages,
+                        response_format=dynamic_schema,
+                        temperature=0.0,
+                        seed=self.seed,
+                        timeout=LLMCallControl.request_timeout(self.endpoint_profile.timeout, request.deadline)
+                    )
+                self._log_call_success(request, start_time, completion)
+                break  # Success, exit retry loop
+            except Exception as e:
+                delay = self._backoff_or_raise(request, start_time, e, attempt)
+                time.sleep(delay)
+                attempt += 1
+
+        # A response that arrives after the deadline is not used
+        LLMCallControl.check_deadline(request.deadline)
+        if cache is not None:
+            cache.put(key, request.model, completion.choices[0].message.content)
+        return self._parse_completion(request, completion)
+
+    async def get_decision_async(self, request: LLMRequest) -> LLMResponse:
+        """Async variant of get_decision.
+
+        Requests go through the AsyncLLMPool shared by every service on the
+        same endpoint profile, which enforces the in-flight cap and the
+        requests/tokens per minute budget.
+        """
+        if request.model == "hold_llm":
+            return self._hold_response(request)
+
+        messages, dynamic_schema = self._prepare_messages(request)
+
+        cache = LLMResponseCache.get_active()
+        key = self._cache_key(request, messages, dynamic_schema) if cache else None
+        if cache is not None and (cached := self._cached_response(cache, key, request, dynamic_schema)):
+            return cached
+
+        pool = AsyncLLMPool.for_profile(self.endpoint_profile)
+
+        start_time = time.time()
+        prompt_len = len(request.system_prompt) + len(request.user_prompt)
 
-        # Normal LLM processing for other models
+        attempt = 0
+        while True:
+            LLMCallControl.check_deadline(request.deadline)
+            try:
+                self._log_call_start(request, prompt_len, attempt)
+                LLMCallControl.stats.calls += 1
+                completion = await pool.parse(
+                    estimated_tokens=prompt_len // 4,
+                    deadline=request.deadline,
+                    model=request.model,
+                    messages=messages,
+                    response_format=dynamic_schema,
+                    temperature=0.0,
+                    seed=self.seed,
+                    timeout=LLMCallControl.request_timeout(self.endpoint_profile.timeout, request.deadline)
+                )
+                self._log_call_success(request, start_time, completion)
+                break
+            except Exception as e:
+                delay = self._backoff_or_raise(request, start_time, e, attempt)
+                await asyncio.sleep(delay)
+                attempt += 1
+
+        LLMCallControl.check_deadline(request.deadline)
+        if cache is not None:
+            cache.put(key, request.model, completion.choices[0].message.content)
+        return self._parse_completion(request, completion)
+
+    def _log_call_start(self, request: LLMRequest, prompt_len: int, attempt: int) -> None:
+        logger.warning(f"[LLM_CALL] Agent {request.agent_id} R{request.round_number}: Calling {request.model} (~{prompt_len//4} tokens){'...' if attempt == 0 else f' (retry {attempt})...'}")
+
+    def _log_call_success(self, request: LLMRequest, start_time: float, completion) -> None:
+        """Log response time and prompt cache use, and add the token counts to the call stats"""
+        elapsed = time.time() - start_time
+        prompt_tokens, cached_tokens = self._prompt_usage(completion)
+        LLMCallControl.stats.prompt_tokens += prompt_tokens
+        LLMCallControl.stats.cached_prompt_tokens += cached_tokens
+        logger.warning(f"[LLM_CALL] Agent {request.agent_id} R{request.round_number}: Response in {elapsed:.1f}s "
+                       f"({prompt_tokens} prompt tokens, {cached_tokens} cached)")
+
+    @staticmethod
+    def _prompt_usage(completion) -> Tuple[int, int]:
+        """(prompt tokens, cached prompt tokens) from the completion's usage, zeros if not reported.
+
+        OpenAI reports cached tokens in usage.prompt_tokens_details; vLLM
+        only with --enable-prompt-tokens-details.
+        """
+        usage = getattr(completion, 'usage', None)
+        if usage is None:
+            return 0, 0
+        details = getattr(usage, 'prompt_tokens_details', None)
+        return usage.prompt_tokens or 0, getattr(details, 'cached_tokens', None) or 0
+
+    def _backoff_or_raise(self, request: LLMRequest, start_time: float, error: Exception, attempt: int) -> float:
+        """Log a failed attempt and return the backoff delay, or raise if we should give up"""
+        elapsed = time.time() - start_time
+        try:
+            delay = LLMCallControl.next_backoff(error, attempt, request.deadline)
+        except Exception:
+            logger.warning(f"[LLM_CALL] Agent {request.agent_id} R{request.round_number}: Giving up after {attempt + 1} attempt(s) ({elapsed:.1f}s total): {type(error).__name__}")
+            raise
+        logger.warning(f"[LLM_CALL] Agent {request.agent_id} R{request.round_number}: {type(error).__name__} after {elapsed:.1f}s, retrying in {delay:.1f}s...")
+        return delay
+
+    def _hold_response(self, request: LLMRequest) -> LLMResponse:
+        """Canned hold decision for the hold_llm test model"""
+        # Create hold decision with only the fields enabled by features
+        decision_dict = {
+            "valuation_reasoning": "LLM Hold Agent: Always hold strategy",
+            "valuation": 0,
+            "price_prediction_reasoning": "LLM Hold Agent: Always hold strategy",
+            "price_prediction_t": 0,
+            "price_prediction_t1": 0,
+            "price_prediction_t2": 0,
+            "orders": [],  # Empty list for hold
+            "replace_decision": "Add",
+            "reasoning": "LLM Hold Agent: Always hold strategy",
+        }
+
+        # Add optional fields only if features are enabled
+        if Feature.MEMORY in request.enabled_features:
+            decision_dict["notes_to_self"] = None
+        if Feature.SOCIAL in request.enabled_features:
+            decision_dict["message_reasoning"] = None
+            decision_dict["post_message"] = None
+        if Feature.SELF_MODIFY in request.enabled_features:
+            decision_dict["prompt_modification"] = None
+            decision_dict["modification_reasoning"] = None
+
+        decision_dict["agent_id"] = request.agent_id
+
+        return LLMResponse(
+            decision=decision_dict,
+            raw_response="Testing hold_llm agent. Always holds."
+        )
+
+    def _prepare_messages(self, request: LLMRequest) -> Tuple[List[Dict[str, str]], Type[BaseModel]]:
+        """Build chat messages and the dynamic response schema for a request"""
         # Conditionally append multi-stock instructions
         user_prompt = request.user_prompt
-        if request.is_multi_stock:
-            multi_stock_instructions = """
-IMPORTANT: This is a MULTI-STOCK scenario. You MUST include stock_id for each order using the stock IDs shown in the market information (e.g., "TECH_A", "TECH_B")."""
-            user_prompt = user_prompt + multi_stock_instructions
+        if request.is_multi_stock and request.prompt_layout == "standard":
+            user_prompt = user_prompt + MULTI_STOCK_INSTRUCTIONS
 
         messages = [
             {"role": "system", "content": request.system_prompt},
@@ -109,42 +251,44 @@ IMPORTANT: This is a MULTI-STOCK scenario. You MUST include stock_id for each or
             request.enabled_features,
             is_multi_stock=request.is_multi_stock
         )
+        return messages, dynamic_schema
 
-        # Get the response using the parse method with our dynamic schema
-        # Use timeout + retry for flaky APIs (e.g., UF Hypergator)
-        start_time = time.time()
-        prompt_len = len(request.system_prompt) + len(request.user_prompt)
-
-        max_retries = 20  # High retry count for flaky API (timeout ~60s per attempt)
+    def _cache_key(self, request: LLMRequest, messages: List[Dict[str, str]], dynamic_schema: Type[BaseModel]) -> str:
+        """Content address of a request: model, prompts as sent, schema and seed"""
+        schema_json = self._schema_fingerprints.get(dynamic_schema)
+        if schema_json is None:
+            schema_json = dynamic_schema.model_json_schema()
+            self._schema_fingerprints[dynamic_schema] = schema_json
+        return cache_key(request.model, messages[0]["content"], messages[1]["content"],
+                         schema_json, self.seed, 0.0)
 
-        for attempt in range(max_retries):
-            try:
-                logger.warning(f"[LLM_CALL] Agent {request.agent_id} R{request.round_number}: Calling {request.model} (~{prompt_len//4} tokens){'...' if attempt == 0 else f' (retry {attempt})...'}")
-                completion = self.client.beta.chat.completions.parse(
-                    model=request.model,
-                    messages=messages,
-                    response_format=dynamic_schema,
-                    temperature=0.0,
-                    seed=self.seed
-                )
-                elapsed = time.time() - start_time
-                logger.warning(f"[LLM_CALL] Agent {request.agent_id} R{request.round_number}: Response in {elapsed:.1f}s")
-                break  # Success, exit retry loop
-            except Exception as e:
-                elapsed = time.time() - start_time
-                if attempt < max_retries - 1:
-                    logger.warning(f"[LLM_CALL] Agent {request.agent_id} R{request.round_number}: Timeout/error after {elapsed:.1f}s, retrying...")
-                    continue
-                else:
-                    logger.warning(f"[LLM_CALL] Agent {request.agent_id} R{request.round_number}: Failed after {max_retries} attempts ({elapsed:.1f}s total)")
-                    raise e
+    def _cached_response(self, cache: LLMResponseCache, key: str, request: LLMRequest,
+                         dynamic_schema: Type[BaseModel]) -> Optional[LLMResponse]:
+        """Serve a request from the response cache, None on a miss"""
+        try:
+            raw_response = cache.get(key)
+        except Exception:
+            LLMCallControl.stats.cache_misses += 1
+            raise
+        if raw_response is None:
+            if cache.serves_hits:
+                LLMCallControl.stats.cache_misses += 1
+            return None
+        LLMCallControl.stats.cache_hits += 1
+        logger.info(f"[LLM_CACHE] Agent {request.agent_id} R{request.round_number}: cache hit")
+        return self._build_response(request, raw_response,
+                                    lambda: dynamic_schema.model_validate_json(raw_response))
 
-        # Get raw response from LLM
-        raw_response = completion.choices[0].message.content
+    def _parse_completion(self, request: LLMRequest, completion) -> LLMResponse:
+        """Convert a parsed completion into an LLMResponse"""
+        message = completion.choices[0].message
+        return self._build_response(request, message.content, lambda: message.parsed)
 
+    def _build_response(self, request: LLMRequest, raw_response: str, load_parsed) -> LLMResponse:
+        """Build the decision dict from a structured response (live or cached)"""
         # Parse the response into structured format
         try:
-            parsed_response = completion.choices[0].message.parsed
+            parsed_response = load_parsed()
 
             # Convert the parsed response to OrderDetails format
             # In single-stock mode, add stock_id automatically since it's not in the schema
@@ -189,11 +333,12 @@ IMPORTANT: This is a MULTI-STOCK scenario. You MUST include stock_id for each or
             )
         except Exception as e:
             # Still return the raw response even if parsing fails
+            LLMCallControl.stats.fallbacks += 1
             return LLMResponse(
                 raw_response=raw_response,
                 decision=self.get_fallback_decision(request.agent_id, request.enabled_features)
             )
-    
+
     def get_fallback_decision(self, agent_id: str, enabled_features: Set[Feature] = None) -> Dict[str, Any]:
         """Get fallback decision when LLM fails, respecting enabled features"""
         if enabled_features is None:
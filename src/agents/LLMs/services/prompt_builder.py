@@ -8,8 +8,17 @@ Architecture:
     Enabled Features → Prompt Builder → Modular Instructions → Agent Prompt
 """
 
-from typing import Set
+from typing import Dict, Set
 from .schema_features import Feature
+from agents.LLMs.llm_prompt_templates import (
+    MULTI_STOCK_INSTRUCTIONS, PREFIX_STABLE_INSTRUCTIONS_TEMPLATE,
+    PREFIX_STABLE_ROUND_TEMPLATE, PREFIX_STABLE_AGENT_TEMPLATE
+)
+
+# User prompt layouts: "standard" fills the agent type's user_prompt_template;
+# "prefix_stable" orders sections from most to least shared (see
+# build_prefix_stable_prompt)
+PROMPT_LAYOUTS = ('standard', 'prefix_stable')
 
 
 class PromptBuilder:
@@ -92,14 +101,49 @@ Your entire current strategy will be replaced with whatever you write in prompt_
 
         instruction_parts = []
 
-        # Add instructions for each enabled feature
-        for feature in enabled_features:
-            if feature in PromptBuilder.FEATURE_INSTRUCTIONS:
-                instruction_parts.append(PromptBuilder.FEATURE_INSTRUCTIONS[feature])
+        # Add instructions for each enabled feature, in FEATURE_INSTRUCTIONS
+        # order: set order varies between processes, and prompts must not
+        for feature, instructions in PromptBuilder.FEATURE_INSTRUCTIONS.items():
+            if feature in enabled_features:
+                instruction_parts.append(instructions)
 
         # Combine all instructions with blank lines between sections
         return "\n\n".join(instruction_parts)
 
+    @staticmethod
+    def build_prefix_stable_prompt(sections: Dict[str, str], feature_instructions: str,
+                                   is_multi_stock: bool, social_feed: str = "",
+                                   last_reasoning: str = "", memory: str = "",
+                                   self_modify: str = "") -> str:
+        """
+        Build a user prompt in the prefix-stable layout.
+
+        Static rules come first (trading options, feature and multi-stock
+        instructions), then this round's market data and social feed, then
+        the agent's own trades, orders, position, reasoning and memory. The
+        prompt holds the same information as the standard layout.
+
+        Args:
+            sections: Prompt sections from MarketStateFormatter.format_prompt_sections
+            feature_instructions: Output of build_instructions
+            is_multi_stock: Include the multi-stock order instructions
+            social_feed, last_reasoning, memory, self_modify: Optional sections,
+                as built by the other build_* methods
+
+        Returns:
+            Complete user prompt
+        """
+        instructions = PREFIX_STABLE_INSTRUCTIONS_TEMPLATE.format(
+            trading_options=sections['trading_options'],
+            feature_instructions="\n\n" + feature_instructions if feature_instructions else "",
+            multi_stock_instructions=MULTI_STOCK_INSTRUCTIONS if is_multi_stock else ""
+        )
+        market = PREFIX_STABLE_ROUND_TEMPLATE.format(social_feed=social_feed, **sections)
+        account = PREFIX_STABLE_AGENT_TEMPLATE.format(
+            last_reasoning=last_reasoning, memory=memory, self_modify=self_modify, **sections
+        )
+        return instructions + market + account
+
     @staticmethod
     def build_memory_section(memory_notes: list, display_limit: int = 10) -> str:
         """
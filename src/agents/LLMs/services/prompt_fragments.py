@@ -0,0 +1,78 @@
+"""Per-round cache of the public sections of LLM agent prompts.
+
+Most of an agent's user prompt describes the market: order book, volume,
+fundamental, dividend/interest/redemption terms, price history, news and the
+multi-stock overview, followed by last round's social feed. InformationService
+hands every agent the same signal objects unless an information capability
+modifies them, and MessagingService the same message list, so these sections
+come out identical for every agent. With the cache enabled they are rendered
+once per round, and only the private sections (position, orders, trades,
+leverage, memory, last reasoning) per agent.
+
+Fragments are keyed on the identity of the objects they are rendered from
+(signals, message list), so an agent with modified signals gets its own
+rendering and prompts are byte-identical to uncached ones. Entries hold
+their sources, so ids are not reused while they are cached; the cache
+empties when the round changes.
+
+Enabled per simulation (SimulationRuntime service state), like
+SharedServiceFactory.
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+from services.simulation_runtime import SimulationRuntime
+
+
+class PromptFragmentCache:
+    """Rendered public prompt fragments of the current round"""
+
+    def __init__(self):
+        self.round_number: Optional[int] = None
+        self._fragments: Dict[Tuple, Tuple[Sequence[Any], Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, round_number: int, name: Hashable, sources: Sequence[Any],
+            render: Callable[[], Any]) -> Any:
+        """Fragment `name` rendered from `sources`, rendering it on first use this round.
+
+        Two decision threads missing the same fragment both render it; the
+        results are equal, so the second simply replaces the first.
+        """
+        if round_number != self.round_number:
+            self._fragments = {}
+            self.round_number = round_number
+        key = (name, *map(id, sources))
+        entry = self._fragments.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        value = render()
+        self._fragments[key] = (sources, value)
+        return value
+
+
+@dataclass
+class _PromptFragmentState:
+    """PromptFragments state for one SimulationRuntime"""
+    cache: Optional[PromptFragmentCache] = None
+
+
+class PromptFragments:
+    """Switch for the current simulation's PromptFragmentCache"""
+
+    @staticmethod
+    def _state() -> _PromptFragmentState:
+        return SimulationRuntime.current().service_state('prompt_fragments', _PromptFragmentState)
+
+    @classmethod
+    def configure(cls, enabled: bool) -> None:
+        """Start (enabled) or stop sharing fragments in the current simulation"""
+        cls._state().cache = PromptFragmentCache() if enabled else None
+
+    @classmethod
+    def get_active(cls) -> Optional[PromptFragmentCache]:
+        """Cache of the current simulation, None when sharing is off"""
+        return cls._state().cache
@@ -24,7 +24,10 @@ class AgentRepository:
     """Manages a collection of agents"""
     def __init__(self, agents: List[BaseAgent], logger, context,
                  borrowing_repository: Optional[BorrowingRepository] = None,
-                 borrowing_repositories: Optional[Dict[str, BorrowingRepository]] = None):
+                 borrowing_repositories: Optional[Dict[str, BorrowingRepository]] = None,
+                 rng=None, check_order_commitments: bool = False):
+        self.rng = rng or random  # Shuffles agent order; the simulation runtime's generator
+        self.check_order_commitments = check_order_commitments  # Re-sum commitments on every sync
         self._agents: Dict[str, BaseAgent] = {
             agent.agent_id: agent for agent in agents
         }
@@ -181,10 +184,31 @@ class AgentRepository:
         agent = self.get_agent(order.agent_id)
         agent.order_history.append(order)
 
+    def forget_agent_orders(self, orders: List[Order]) -> None:
+        """Drop archived orders from their agents' order history"""
+        archived_by_agent: Dict[str, set] = {}
+        for order in orders:
+            archived_by_agent.setdefault(order.agent_id, set()).add(order.order_id)
+        for agent_id, order_ids in archived_by_agent.items():
+            agent = self.get_agent(agent_id)
+            if agent is not None:
+                agent.order_history = [o for o in agent.order_history if o.order_id not in order_ids]
+
     def sync_agent_orders(self, agent_id: str, orders: List[Order]) -> None:
-        """Sync agent's orders with current state"""
+        """Sync agent's orders with current state.
+
+        The agent's committed cash and positions are running totals, moved by
+        every commit and release, so they are only re-summed from the orders
+        when check_order_commitments is set.
+        """
         agent = self.get_agent(agent_id)
-        
+        if self.check_order_commitments:
+            self.check_agent_commitments(agent, orders)
+        agent.sync_orders(orders)
+
+    def check_agent_commitments(self, agent: BaseAgent, orders: List[Order]) -> None:
+        """Raise if the agent's committed cash or shares differ from the sum over its active orders"""
+        agent_id = agent.agent_id
         active_orders = [order for order in orders if is_active(order)]
         
         # Calculate total commitments using active orders
@@ -238,9 +262,6 @@ class AgentRepository:
                         error_msg.append(f"\n{order}\nHistory:\n{order.print_history()}")
 
                 raise ValueError("\n".join(error_msg))
-        
-        # Update orders
-        agent.sync_orders(orders)
     
     
     def get_all_agent_ids(self) -> List[str]:
@@ -278,11 +299,21 @@ class AgentRepository:
         if isinstance(decision, TradeDecision):
             return decision.model_dump()
         return decision
+
+    async def get_agent_decision_async(self, agent_id: str, market_state: Dict, history: List, round_number: int) -> dict:
+        """Async variant of get_agent_decision (same return format)"""
+        agent = self.get_agent(agent_id)
+
+        decision = await agent.make_decision_async(market_state, history, round_number)
+
+        if isinstance(decision, TradeDecision):
+            return decision.model_dump()
+        return decision
     
     def get_shuffled_agent_ids(self) -> List[str]:
         """Get randomized list of agent IDs"""
         agent_ids = list(self._agents.keys())
-        random.shuffle(agent_ids)
+        self.rng.shuffle(agent_ids)
         return agent_ids
     
     def get_commitment_state(self, agent_id: str) -> AgentCommitmentState:
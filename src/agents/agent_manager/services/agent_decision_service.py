@@ -1,7 +1,13 @@
-from typing import List, Dict
+import time
+import asyncio
+import contextvars
+from typing import List, Dict, Optional
 from market.orders.order import Order
 from agents.agents_api import OrderDetails
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from agents.deterministic.batched_decisions import AgentBatch, supports_batch
+from agents.LLMs.services.llm_endpoints import AsyncLLMPool
+from agents.LLMs.services.llm_retry import LLMCallControl
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 
 
 class AgentDecisionService:
@@ -14,7 +20,10 @@ class AgentDecisionService:
         order_state_manager,
         agents_logger,
         decisions_logger,
-        context
+        context,
+        async_decisions: bool = False,
+        round_deadline: Optional[float] = None,
+        batch_deterministic: bool = False
     ):
         self.agent_repository = agent_repository
         self.order_repository = order_repository
@@ -22,48 +31,35 @@ class AgentDecisionService:
         self.agents_logger = agents_logger
         self.decisions_logger = decisions_logger
         self.context = context
+        self.async_decisions = async_decisions  # Fan out all agents on one event loop
+        self.round_deadline = round_deadline  # Seconds allowed for decisions per round, None = no limit
+        self.batch_deterministic = batch_deterministic  # Agent classes with batch_decide decide together
+        self._batches: List[AgentBatch] = []
+        self._batched_population = None
+        self.llm_stats_history: List[Dict] = []  # Per-round LLM call counters
 
     def collect_decisions(self, market_state, history, round_number):
         agent_ids = self.agent_repository.get_shuffled_agent_ids()
         new_orders = []
 
-        # Check if we should use serial execution (for gpt-oss models on remote APIs with rate limits)
-        # Local vLLM endpoints can handle parallel requests fine
-        from scenarios.base import DEFAULT_LLM_MODEL, DEFAULT_LLM_BASE_URL
-        is_local = DEFAULT_LLM_BASE_URL and 'localhost' in DEFAULT_LLM_BASE_URL
-        use_serial = 'gpt-oss' in DEFAULT_LLM_MODEL.lower() and not is_local
+        round_start = time.monotonic()
+        stats_before = LLMCallControl.stats.as_dict()
+        LLMCallControl.start_round(self.round_deadline)
+        try:
+            decisions, pending_ids = {}, agent_ids
+            if self.batch_deterministic and not market_state.get('is_multi_stock'):
+                decisions, pending_ids = self._batch_decisions(agent_ids, market_state, history, round_number)
+            if pending_ids:
+                decisions.update(self._request_decisions(pending_ids, market_state, history, round_number))
+        finally:
+            LLMCallControl.end_round()
 
-        decisions = {}
-        if use_serial:
-            # Serial execution for gpt-oss (more reliable)
-            import time as _time
-            for i, agent_id in enumerate(agent_ids):
-                # Add small delay between requests to avoid rate limiting
-                if i > 0:
-                    _time.sleep(0.5)  # 500ms delay between requests
-                decisions[agent_id] = self.agent_repository.get_agent_decision(
-                    agent_id=agent_id,
-                    market_state=market_state,
-                    history=history,
-                    round_number=round_number
-                )
-        else:
-            # Parallel execution for other models (faster)
-            with ThreadPoolExecutor(max_workers=min(len(agent_ids), 2)) as executor:
-                future_to_agent = {
-                    executor.submit(
-                        self.agent_repository.get_agent_decision,
-                        agent_id=agent_id,
-                        market_state=market_state,
-                        history=history,
-                        round_number=round_number
-                    ): agent_id
-                    for agent_id in agent_ids
-                }
+        # Agents still outstanding at the deadline hold this round
+        for agent_id in agent_ids:
+            if agent_id not in decisions:
+                decisions[agent_id] = self._deadline_fallback(agent_id, round_number)
 
-                for future in as_completed(future_to_agent):
-                    agent_id = future_to_agent[future]
-                    decisions[agent_id] = future.result()
+        self._record_llm_stats(round_number, stats_before, time.monotonic() - round_start)
 
         # Process decisions sequentially in random order
         for agent_id in agent_ids:
@@ -111,6 +107,150 @@ class AgentDecisionService:
         
         return new_orders
 
+    def _batch_decisions(self, agent_ids, market_state, history, round_number):
+        """Decide for agents whose class implements batch_decide, one call per class.
+
+        Batches (agents in repository order, parameters as arrays) are built
+        once and rebuilt when the population changes. Returns the decisions
+        keyed by agent_id and the ids of the other agents, in round order.
+        """
+        population = set(agent_ids)
+        if population != self._batched_population:
+            groups = {}
+            for agent_id in self.agent_repository.get_all_agent_ids():
+                agent = self.agent_repository.get_agent(agent_id)
+                if agent_id in population and supports_batch(agent):
+                    groups.setdefault(type(agent), []).append(agent)
+            self._batches = [AgentBatch(agents) for agents in groups.values()]
+            self._batched_population = population
+
+        decisions = {}
+        for batch in self._batches:
+            decisions.update(batch.decide(market_state, history, round_number))
+        pending_ids = [agent_id for agent_id in agent_ids if agent_id not in decisions]
+        return decisions, pending_ids
+
+    @staticmethod
+    def _run_coroutine(coroutine):
+        """asyncio.run the coroutine, on a private loop in a worker thread if this thread is running a loop"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        # asyncio.run cannot nest; the worker runs in a copy of this thread's
+        # context, so it sees this simulation's runtime
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(contextvars.copy_context().run, asyncio.run, coroutine).result()
+
+    def _request_decisions(self, agent_ids, market_state, history, round_number) -> Dict:
+        """Ask agents for decisions, keyed by agent_id; agents past the deadline are missing"""
+        # Check if we should use serial execution (for gpt-oss models on remote APIs with rate limits)
+        # Local vLLM endpoints can handle parallel requests fine
+        from scenarios.base import DEFAULT_LLM_MODEL, DEFAULT_LLM_BASE_URL
+        is_local = DEFAULT_LLM_BASE_URL and 'localhost' in DEFAULT_LLM_BASE_URL
+        use_serial = 'gpt-oss' in DEFAULT_LLM_MODEL.lower() and not is_local
+        deadline = LLMCallControl.round_deadline()
+
+        decisions = {}
+        if self.async_decisions:
+            # All agents at once; endpoint profiles cap in-flight requests and rate
+            decisions = self._run_coroutine(
+                self._gather_decisions(agent_ids, market_state, history, round_number)
+            )
+        elif use_serial:
+            # Serial execution for gpt-oss (more reliable)
+            for i, agent_id in enumerate(agent_ids):
+                # Add small delay between requests to avoid rate limiting
+                if i > 0:
+                    time.sleep(0.5)  # 500ms delay between requests
+                if LLMCallControl.remaining(deadline) == 0:
+                    break
+                decisions[agent_id] = self.agent_repository.get_agent_decision(
+                    agent_id=agent_id,
+                    market_state=market_state,
+                    history=history,
+                    round_number=round_number
+                )
+        else:
+            # Parallel execution for other models (faster)
+            executor = ThreadPoolExecutor(max_workers=min(len(agent_ids), 2))
+            try:
+                # Workers run in a copy of this thread's context, so they see
+                # this simulation's runtime (loggers, message bus)
+                future_to_agent = {
+                    executor.submit(
+                        contextvars.copy_context().run,
+                        self.agent_repository.get_agent_decision,
+                        agent_id=agent_id,
+                        market_state=market_state,
+                        history=history,
+                        round_number=round_number
+                    ): agent_id
+                    for agent_id in agent_ids
+                }
+
+                try:
+                    for future in as_completed(future_to_agent, timeout=LLMCallControl.remaining(deadline)):
+                        agent_id = future_to_agent[future]
+                        decisions[agent_id] = future.result()
+                except FuturesTimeoutError:
+                    pass  # Outstanding agents fall back
+            finally:
+                # Past the deadline, don't wait for stragglers: their requests carry
+                # this round's deadline, so late responses are discarded
+                executor.shutdown(wait=deadline is None, cancel_futures=True)
+        return decisions
+
+    async def _gather_decisions(self, agent_ids, market_state, history, round_number) -> Dict:
+        """Collect every agent's decision concurrently, keyed by agent_id"""
+        tasks = {
+            asyncio.ensure_future(self.agent_repository.get_agent_decision_async(
+                agent_id=agent_id,
+                market_state=market_state,
+                history=history,
+                round_number=round_number
+            )): agent_id
+            for agent_id in agent_ids
+        }
+        try:
+            done, pending = await asyncio.wait(
+                tasks, timeout=LLMCallControl.remaining(LLMCallControl.round_deadline())
+            )
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            # Async clients are bound to this round's event loop
+            await AsyncLLMPool.close_all()
+        return {tasks[task]: task.result() for task in done}
+
+    def _deadline_fallback(self, agent_id: str, round_number: int) -> dict:
+        """Hold decision for an agent that missed the round deadline"""
+        LLMCallControl.stats.deadline_fallbacks += 1
+        self.decisions_logger.warning(
+            f"Round {round_number}: Agent {agent_id} missed the {self.round_deadline}s decision deadline, holding"
+        )
+        return self.agent_repository.get_agent(agent_id).get_fallback_decision()
+
+    def _record_llm_stats(self, round_number: int, stats_before: Dict, elapsed: float) -> None:
+        """Store and log this round's LLM call counters"""
+        round_stats = {
+            name: value - stats_before[name]
+            for name, value in LLMCallControl.stats.as_dict().items()
+        }
+        round_stats = {'round': round_number, 'decision_seconds': elapsed, **round_stats}
+        self.llm_stats_history.append(round_stats)
+        self.decisions_logger.info(
+            f"Round {round_number} LLM calls: {elapsed:.1f}s total, "
+            f"{round_stats['calls']} calls, {round_stats['retries']} retries, "
+            f"{round_stats['timeouts']} timeouts, {round_stats['fallbacks']} fallbacks, "
+            f"{round_stats['deadline_fallbacks']} deadline fallbacks, "
+            f"{round_stats['cache_hits']} cache hits, "
+            f"{round_stats['cached_prompt_tokens']}/{round_stats['prompt_tokens']} prompt tokens cached, "
+            f"{round_stats['backoff_wait_seconds']:.1f}s backoff, "
+            f"{round_stats['rate_limit_wait_seconds']:.1f}s rate-limit wait"
+        )
+
     def _log_decision(self, decision: dict, agent_id: str, round_number: int):
         """Log agent decision"""
         self.decisions_logger.info(f"=== Logging decisions round {round_number} ===")
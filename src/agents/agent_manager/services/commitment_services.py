@@ -1,5 +1,6 @@
 from market.trade import Trade
 from market.orders.order import Order
+from services.settlement_buffer import SettlementBuffer
 
 
 def release_for_cancellation(agent_repository, logger, order: Order):
@@ -27,18 +28,9 @@ def release_commitment_agent(agent_repository, logger, order: Order, amount: flo
                              resource_type: str, return_borrowed: bool = True):
     """Helper for releasing commitments"""
     try:
-        result = agent_repository.release_resources(
-            order.agent_id,
-            cash_amount=amount if resource_type == 'cash' else 0,
-            share_amount=amount if resource_type == 'shares' else 0,
-            return_borrowed=return_borrowed,
-            stock_id=order.stock_id  # Pass stock_id for multi-stock support
-        )
-        
-        if not result.success:
-            raise ValueError(f"Failed to release resources in release_commitment_agent\n:\n {result.message}"
-                             f"Attempted to release {amount} {resource_type} for order {order.order_id}")
-            
+        # The agent's side is queued while a settlement buffer is recording
+        SettlementBuffer.settle(_release_agent_resources, agent_repository, order, amount,
+                                resource_type, return_borrowed)
         order.release_commitment(amount)
         
         logger.info(
@@ -54,6 +46,21 @@ def release_commitment_agent(agent_repository, logger, order: Order, amount: flo
         )
         raise
 
+def _release_agent_resources(agent_repository, order: Order, amount: float,
+                             resource_type: str, return_borrowed: bool):
+    """Release an order's commitment from its agent"""
+    result = agent_repository.release_resources(
+        order.agent_id,
+        cash_amount=amount if resource_type == 'cash' else 0,
+        share_amount=amount if resource_type == 'shares' else 0,
+        return_borrowed=return_borrowed,
+        stock_id=order.stock_id  # Pass stock_id for multi-stock support
+    )
+
+    if not result.success:
+        raise ValueError(f"Failed to release resources in release_commitment_agent\n:\n {result.message}"
+                         f"Attempted to release {amount} {resource_type} for order {order.order_id}")
+
 def release_for_trade(trade: Trade, order_repository, agent_repository, commitment_calculator, logger):
     """Release commitments after trade execution"""
     buy_order = order_repository.get_order(trade.buyer_order_id)
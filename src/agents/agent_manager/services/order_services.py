@@ -1,6 +1,19 @@
 from typing import List
 from market.orders.order import Order, OrderState
 
+# States in which an order holds a commitment
+ACTIVE_STATES = frozenset({
+    OrderState.ACTIVE,
+    OrderState.PENDING,
+    OrderState.PARTIALLY_FILLED,
+    OrderState.COMMITTED,
+    OrderState.MATCHING,        # Market orders being matched
+    OrderState.LIMIT_MATCHING,  # Limit orders being matched
+})
+
+# States in which an order rests in the order book
+BOOK_STATES = frozenset({OrderState.ACTIVE, OrderState.PARTIALLY_FILLED})
+
 def has_commitments(order: Order) -> bool:
     """Check if order has any actual resource commitments"""
     return (
@@ -31,20 +44,8 @@ def get_book_orders(orders: List[Order]) -> List[Order]:
 
 def is_active(order: Order) -> bool:
     """Check if order is active (has commitment held)"""
-    return (
-        order.state in {
-            OrderState.ACTIVE,
-            OrderState.PENDING,
-            OrderState.PARTIALLY_FILLED,
-            OrderState.COMMITTED,
-            OrderState.MATCHING,        # Market orders being matched
-            OrderState.LIMIT_MATCHING,  # Limit orders being matched
-        }
-    )
+    return order.state in ACTIVE_STATES
 
 def is_in_book(order: Order) -> bool:
     """Check if an order is currently in the order book"""
-    return order.state in {
-        OrderState.ACTIVE,
-        OrderState.PARTIALLY_FILLED
-    }
\ No newline at end of file
+    return order.state in BOOK_STATES
\ No newline at end of file
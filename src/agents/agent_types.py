@@ -1,5 +1,7 @@
 from pydantic import BaseModel
-import random  # Add at top of file
+import random
+from typing import Optional
+from services.simulation_runtime import SimulationRuntime
 from .LLMs.llm_prompt_templates import STANDARD_USER_TEMPLATE
 class AgentType(BaseModel):
     name: str
@@ -7,10 +9,14 @@ class AgentType(BaseModel):
     user_prompt_template: str
     type_id: str = ""
 
-def generate_agent_composition(total_agents: int, distribution_type: str | dict) -> dict:
+def generate_agent_composition(total_agents: int, distribution_type: str | dict,
+                               rng: Optional[random.Random] = None) -> dict:
     """
     Generate agent composition for different experimental setups.
+
+    Types are sampled from rng, by default the current simulation's generator.
     """
+    rng = rng or SimulationRuntime.current().rng
     print(f"Generating agent composition for {total_agents} agents with distribution type: {distribution_type}")
     base_types = list(AGENT_TYPES.keys())
     
@@ -63,7 +69,7 @@ def generate_agent_composition(total_agents: int, distribution_type: str | dict)
     # Helper function for cases with fewer agents than types
     def handle_fewer_agents(types_to_sample_from):
         # Randomly sample types and give each 1 agent
-        selected_types = random.sample(types_to_sample_from, total_agents)
+        selected_types = rng.sample(types_to_sample_from, total_agents)
         return {
             agent_type: 1 if agent_type in selected_types else 0
             for agent_type in base_types
@@ -136,7 +142,7 @@ def generate_agent_composition(total_agents: int, distribution_type: str | dict)
                 other_types = [t for t in base_types if t != matching_type]
                 remaining_slots = total_agents - 1
                 if remaining_slots > 0:
-                    selected_others = random.sample(other_types, remaining_slots)
+                    selected_others = rng.sample(other_types, remaining_slots)
                 else:
                     selected_others = []
                 return {
@@ -4,6 +4,7 @@ from typing import Optional, List, Dict, Literal, Any, Tuple
 import numpy as np
 from market.trade import Trade
 from market.information.information_types import InformationType, InformationSignal, InfoCapability
+from market.information.signal_history import SignalHistory
 from agents.agents_api import TradeDecision
 import logging
 from services.logging_service import LoggingService
@@ -11,6 +12,7 @@ from services.messaging_service import MessagingService
 from constants import FLOAT_TOLERANCE, CASH_MATCHING_TOLERANCE
 from agents.verification.agent_verifier import AgentVerifier
 from agents.services.margin_service import MarginService
+from agents.services.trade_ledger import TradeLedger
 
 @dataclass
 class AgentType:
@@ -76,34 +78,11 @@ class BaseAgent(ABC):
         self.order_history = []
         self.decision_history = []
         self.trade_history: List[Trade] = []
-        self.trade_stats = {
-            'buys': 0,
-            'sells': 0,
-            'buy_volume': 0,
-            'sell_volume': 0,
-            'buy_value': 0.0,
-            'sell_value': 0.0,
-            'avg_buy_price': 0.0,
-            'avg_sell_price': 0.0
-        }
+        # Running totals and recent trades, so summaries don't rescan trade_history
+        self.trade_ledger = TradeLedger(self)
         
-        # Initialize orders dictionary with all possible states
-        self.orders = {
-            # Pre-book states
-            'input': {'buy': [], 'sell': []},
-            'validated': {'buy': [], 'sell': []},
-            'matching': {'buy': [], 'sell': []},
-            'limit_matching': {'buy': [], 'sell': []},
-            
-            # Active states
-            'pending': {'buy': [], 'sell': []},
-            'active': {'buy': [], 'sell': []},
-            'partially_filled': {'buy': [], 'sell': []},
-            
-            # Terminal states
-            'filled': {'buy': [], 'sell': []},
-            'cancelled': {'buy': [], 'sell': []}
-        }
+        # Live orders by state, rebuilt by sync_orders
+        self.orders = self._empty_order_buckets()
         
         # Initialize outstanding orders (active orders only)
         self.outstanding_orders = {
@@ -118,7 +97,8 @@ class BaseAgent(ABC):
         self.wealth = self.cash + self.shares * initial_price + self.dividend_cash
         self.info_capabilities: Dict[InformationType, InfoCapability] = {}
         self.private_signals: Dict[InformationType, InformationSignal] = {}
-        self.signal_history: Dict[int, Dict[InformationType, InformationSignal]] = {}
+        # Last few rounds only; InformationService archives every round
+        self.signal_history: Dict[int, Dict[InformationType, InformationSignal]] = SignalHistory()
         self.last_update_round: int = 0
         self.last_replace_decision: Literal["Cancel", "Replace", "Add"] = "Replace"
         self.payment_history: Dict[str, List[Payment]] = {
@@ -275,6 +255,28 @@ class BaseAgent(ABC):
         """
         pass
 
+    async def make_decision_async(self, market_state: Dict, history: List, round_number: int) -> TradeDecision:
+        """Awaitable make_decision used by the async decision pipeline.
+
+        Agents without I/O (deterministic traders) just run make_decision;
+        LLM agents override this to await the model call.
+        """
+        return self.make_decision(market_state, history, round_number)
+
+    def get_fallback_decision(self) -> Dict:
+        """Hold decision used when no decision arrived before the round deadline"""
+        return TradeDecision(
+            valuation_reasoning="Fallback decision: round deadline passed",
+            valuation=0,
+            price_prediction_reasoning="Fallback decision: round deadline passed",
+            price_prediction_t=0,
+            price_prediction_t1=0,
+            price_prediction_t2=0,
+            reasoning="Fallback decision: round deadline passed",
+            orders=[],
+            replace_decision="Add",
+        ).model_dump()
+
     def _log_agent_state(self, operation: str, amount: float = None, 
                         include_orders: bool = True, 
                         include_order_history: bool = False,
@@ -828,13 +830,12 @@ class BaseAgent(ABC):
         """
         self.margin_service.handle_margin_call(current_price, round_number)
 
-    def sync_orders(self, orders):
-        """Sync agent's orders with the order repository"""
-        # Track all orders by state
-        self.orders = {
+    @staticmethod
+    def _empty_order_buckets() -> dict:
+        """One bucket per live state (ACTIVE_STATES), the only orders the repository syncs"""
+        return {
             # Pre-book states
-            'input': {'buy': [], 'sell': []},
-            'validated': {'buy': [], 'sell': []},
+            'committed': {'buy': [], 'sell': []},
             'matching': {'buy': [], 'sell': []},
             'limit_matching': {'buy': [], 'sell': []},
             
@@ -842,11 +843,17 @@ class BaseAgent(ABC):
             'pending': {'buy': [], 'sell': []},
             'active': {'buy': [], 'sell': []},
             'partially_filled': {'buy': [], 'sell': []},
-            
-            # Terminal states
-            'filled': {'buy': [], 'sell': []},
-            'cancelled': {'buy': [], 'sell': []}
         }
+
+    def sync_orders(self, orders):
+        """Sync agent's orders with the order repository.
+
+        The repository passes the agent's live orders only, so filled and
+        cancelled orders drop out of self.orders; order_history and the
+        order repository keep them.
+        """
+        # Track live orders by state
+        self.orders = self._empty_order_buckets()
         
         # Categorize orders by state and side
         for order in orders:
@@ -872,48 +879,32 @@ class BaseAgent(ABC):
     def record_trade(self, trade: Trade):
         """Record a trade and update statistics"""
         self.trade_history.append(trade)
-        
-        # Update trade statistics
-        if trade.buyer_id == self.agent_id:
-            self.trade_stats['buys'] += 1
-            self.trade_stats['buy_volume'] += trade.quantity
-            self.trade_stats['buy_value'] += trade.value
-            self.trade_stats['avg_buy_price'] = (
-                self.trade_stats['buy_value'] / self.trade_stats['buy_volume']
-                if self.trade_stats['buy_volume'] > 0 else 0.0
-            )
-        else:  # seller
-            self.trade_stats['sells'] += 1
-            self.trade_stats['sell_volume'] += trade.quantity
-            self.trade_stats['sell_value'] += trade.value
-            self.trade_stats['avg_sell_price'] = (
-                self.trade_stats['sell_value'] / self.trade_stats['sell_volume']
-                if self.trade_stats['sell_volume'] > 0 else 0.0
-            )
+        self.trade_ledger.record(trade)
+
+    @property
+    def trade_stats(self) -> dict:
+        """Trade counts, volumes, values and average prices"""
+        return self.trade_ledger.stats()
 
     def get_trade_summary(self) -> dict:
         """Get summary of trading activity"""
+        ledger = self.trade_ledger
         summary = {
-            'total_trades': len(self.trade_history),
-            'net_volume': self.trade_stats['buy_volume'] - self.trade_stats['sell_volume'],
-            'net_value': self.trade_stats['buy_value'] - self.trade_stats['sell_value'],
+            'total_trades': ledger.count,
+            'net_volume': ledger.net_volume,
+            'net_value': ledger.buy_value - ledger.sell_value,
             'avg_trade_size': (
-                (self.trade_stats['buy_volume'] + self.trade_stats['sell_volume']) / 
-                len(self.trade_history) if self.trade_history else 0
+                (ledger.buy_volume + ledger.sell_volume) / ledger.count
+                if ledger.count else 0
             ),
-            'recent_trades': self.trade_history[-5:],  # Show last 5 trades
-            **self.trade_stats
+            'recent_trades': ledger.last(5),  # Show last 5 trades
+            **ledger.stats()
         }
-        
+
         # Add realized P&L
-        if self.trade_stats['sell_volume'] > 0:
-            summary['realized_pnl'] = (
-                self.trade_stats['sell_value'] - 
-                (self.trade_stats['sell_volume'] * 
-                 (self.trade_stats['buy_value'] / self.trade_stats['buy_volume']))
-                if self.trade_stats['buy_volume'] > 0 else 0.0
-            )
-        
+        if ledger.sell_volume > 0:
+            summary['realized_pnl'] = ledger.realized_pnl
+
         return summary
 
     def verify_state(self):
@@ -1018,7 +1009,11 @@ class BaseAgent(ABC):
         self.info_signals_logger.info(full_message)
     
     def get_signal(self, info_type: InformationType, round_number: Optional[int] = None) -> Optional[InformationSignal]:
-        """Get information signal, optionally from history"""
+        """Get information signal, optionally from history
+
+        History holds the last signal_history.retention_rounds rounds; older
+        rounds are in InformationService.get_signal_history.
+        """
         if round_number is None:
             return self.private_signals.get(info_type)
         return self.signal_history.get(round_number, {}).get(info_type)
@@ -1028,7 +1023,7 @@ class BaseAgent(ABC):
         
         Args:
             info_type: Type of information to retrieve
-            lookback: Number of rounds to look back (None for all)
+            lookback: Number of rounds to look back (None for all retained rounds)
         """
         history = {
             round_num: signals[info_type]
@@ -0,0 +1,137 @@
+"""Batched decisions for rule-based agents.
+
+A deterministic agent class opts in by declaring the parameters its rule
+uses and a classmethod that decides for many agents at once:
+
+    batch_params = {'window_size': int, 'threshold': float}
+
+    @classmethod
+    def batch_decide(cls, batch, market_state, history, round_number) -> Dict[str, dict]
+
+AgentBatch reads batch_params into arrays once; batch_decide computes all
+signals and order quantities with NumPy and returns decisions keyed by
+agent_id as plain dicts in the shape of TradeDecision.model_dump(), without
+building pydantic objects. AgentDecisionService uses it in single-stock
+markets when batched deterministic decisions are enabled.
+
+The records equal what make_decision returns through model_dump(): moving
+averages come from the same source (the indicator store, or prices summed
+in the same order), the remaining arithmetic is elementwise float64 like
+Python's, and strings are lowercased as TradeDecision does.
+"""
+from operator import attrgetter
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from agents.agents_api import OrderType
+from market.indicators import price_series
+
+
+def supports_batch(agent) -> bool:
+    return getattr(type(agent), 'batch_decide', None) is not None
+
+
+def param_array(agents: Sequence, name: str, dtype=float) -> np.ndarray:
+    """One attribute of every agent as an array"""
+    return np.fromiter(map(attrgetter(name), agents), dtype=dtype, count=len(agents))
+
+
+class AgentBatch:
+    """Agents of one class with their batch_params as arrays.
+
+    Parameters are read when the batch is built; cash and shares change
+    every round and are read by batch_decide.
+    """
+
+    def __init__(self, agents: Sequence):
+        self.agents = list(agents)
+        self.agent_class = type(self.agents[0])
+        self.params = {name: param_array(self.agents, name, dtype)
+                       for name, dtype in self.agent_class.batch_params.items()}
+
+    def __len__(self) -> int:
+        return len(self.agents)
+
+    def available_cash(self) -> np.ndarray:
+        return param_array(self.agents, 'available_cash')
+
+    def available_shares(self) -> np.ndarray:
+        return param_array(self.agents, 'available_shares')
+
+    def decide(self, market_state: Dict, history: List, round_number: int) -> Dict[str, dict]:
+        return self.agent_class.batch_decide(self, market_state, history, round_number)
+
+
+def moving_averages(history: List, windows: np.ndarray) -> np.ndarray:
+    """Simple moving average of the last `window` prices for each window.
+
+    Each distinct window is computed once, the way the agents'
+    calculate_moving_average does: from the indicator store when history
+    carries one that covers the window, otherwise by summing the prices.
+    With less history than the window the last price is used.
+    """
+    series = price_series(history)
+    prices = None
+    unique, inverse = np.unique(windows, return_inverse=True)
+    values = np.empty(len(unique))
+    for i, window in enumerate(unique.tolist()):
+        if len(history) < window:
+            values[i] = history[-1]['price'] if history else 0
+        elif series is not None and series.covers(window):
+            values[i] = series.sma(window)
+        else:
+            if prices is None:
+                prices = [h['price'] for h in history[-int(unique[-1]):]]
+            recent = prices[-window:]
+            values[i] = sum(recent) / len(recent)
+    return values[inverse]
+
+
+def hold_record(price: float, reasoning: str, price_prediction_reasoning: str) -> dict:
+    """Plain-dict TradeDecision without orders, valued at the current price.
+
+    Built once per round and reason; copy it per agent with a new orders list.
+    """
+    return {
+        'valuation_reasoning': "using current price as valuation baseline",
+        'valuation': float(price),
+        'price_prediction_reasoning': price_prediction_reasoning.lower(),
+        'price_prediction_t': float(price),
+        'price_prediction_t1': float(price),
+        'price_prediction_t2': float(price),
+        'reasoning': reasoning.lower(),
+        'orders': [],
+        'replace_decision': "Add",
+        'message_reasoning': None,
+        'post_message': None,
+        'notes_to_self': None,
+    }
+
+
+def trade_record(price: float, reasoning: str, price_prediction_reasoning: str,
+                 side: str, quantity: int, price_limit: float, prediction: float) -> dict:
+    """Plain-dict TradeDecision replacing open orders with one limit order.
+
+    Hot path: strings must already be lowercase.
+    """
+    return {
+        'valuation_reasoning': "using current price as valuation baseline",
+        'valuation': price,
+        'price_prediction_reasoning': price_prediction_reasoning,
+        'price_prediction_t': price,
+        'price_prediction_t1': prediction,
+        'price_prediction_t2': prediction,
+        'reasoning': reasoning,
+        'orders': [{
+            'decision': side,
+            'quantity': quantity,
+            'order_type': OrderType.LIMIT,
+            'price_limit': price_limit,
+            'stock_id': "DEFAULT_STOCK",
+        }],
+        'replace_decision': "Replace",
+        'message_reasoning': None,
+        'post_message': None,
+        'notes_to_self': None,
+    }
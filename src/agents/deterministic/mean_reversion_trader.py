@@ -1,10 +1,17 @@
 from typing import Dict, List
+import numpy as np
 from agents.base_agent import BaseAgent
 from agents.agents_api import TradeDecision, OrderType, OrderDetails
+from agents.deterministic.batched_decisions import (
+    AgentBatch, hold_record, moving_averages, trade_record
+)
+from market.indicators import price_series
 
 class MeanReversionTrader(BaseAgent):
     """Trades based on deviations from moving average"""
 
+    batch_params = {'window_size': int, 'threshold': float, 'max_position': float}
+
     def __init__(self,
                  window_size: int = 10,  # Length of moving average window
                  threshold: float = 0.03,  # Minimum 3% deviation to trade
@@ -20,6 +27,10 @@ class MeanReversionTrader(BaseAgent):
         if len(history) < self.window_size:
             return history[-1]['price'] if history else 0
 
+        series = price_series(history)
+        if series is not None and series.covers(self.window_size):
+            return series.sma(self.window_size)
+
         recent_prices = [h['price'] for h in history[-self.window_size:]]
         return sum(recent_prices) / len(recent_prices)
 
@@ -131,3 +142,53 @@ class MeanReversionTrader(BaseAgent):
             price_prediction_t1=target_price,
             price_prediction_t2=target_price,
         )
+
+    @classmethod
+    def batch_decide(cls, batch: AgentBatch, market_state: Dict, history: List,
+                     round_number: int) -> Dict[str, dict]:
+        """make_decision for a batch of mean reversion traders, as plain decision records"""
+        current_price = market_state['price']
+        if len(history) < 2:
+            hold = hold_record(current_price, "Insufficient history for mean reversion", "No historical data")
+            return {agent.agent_id: {**hold, 'orders': []} for agent in batch.agents}
+
+        params = batch.params
+        moving_avg = moving_averages(history, params['window_size'])
+        deviation = (current_price - moving_avg) / moving_avg
+        size = np.minimum(np.abs(deviation), params['max_position'])
+        buy_quantity = np.trunc(np.trunc(batch.available_cash() / current_price) * size)
+        sell_quantity = np.trunc(batch.available_shares() * size)
+        near = np.abs(deviation) < params['threshold']
+
+        holds = {
+            'near': hold_record(current_price, "Price near moving average", "Deviation below threshold"),
+            'shares': hold_record(current_price, "Insufficient shares for mean reversion trade",
+                                  "Cannot participate"),
+            'cash': hold_record(current_price, "Insufficient cash for mean reversion trade",
+                                "Cannot participate"),
+        }
+        price = float(current_price)
+        buy_limit, sell_limit = current_price * 1.01, current_price * 0.99
+        decisions = {}
+        for agent, is_near, d, ma, buy, sell in zip(
+                batch.agents, near.tolist(), deviation.tolist(), moving_avg.tolist(),
+                buy_quantity.tolist(), sell_quantity.tolist()):
+            if is_near:
+                decision = {**holds['near'], 'orders': []}
+            elif d > 0:
+                if int(sell) == 0:
+                    decision = {**holds['shares'], 'orders': []}
+                else:
+                    decision = trade_record(
+                        price, f"price ${current_price:.2f} above ma ${ma:.2f} by {d:.1%}",
+                        "expect reversion toward average",
+                        "Sell", int(sell), sell_limit, current_price * (1 - min(abs(d), 0.05)))
+            elif int(buy) == 0:
+                decision = {**holds['cash'], 'orders': []}
+            else:
+                decision = trade_record(
+                    price, f"price ${current_price:.2f} below ma ${ma:.2f} by {abs(d):.1%}",
+                    "expect reversion toward average",
+                    "Buy", int(buy), buy_limit, current_price * (1 + min(abs(d), 0.05)))
+            decisions[agent.agent_id] = decision
+        return decisions
@@ -1,10 +1,18 @@
 from typing import Dict, List
+import numpy as np
 from agents.base_agent import BaseAgent
 from agents.agents_api import TradeDecision, OrderType, OrderDetails
+from agents.deterministic.batched_decisions import (
+    AgentBatch, hold_record, moving_averages, trade_record
+)
+from market.indicators import price_series
+from services.messaging_service import MessagingService
 
 class MomentumTrader(BaseAgent):
     """Trades based on price momentum/trend following"""
 
+    batch_params = {'short_window': int, 'long_window': int, 'min_trend': float, 'max_position': float}
+
     def __init__(self,
                  short_window: int = 5,    # Short-term moving average window
                  long_window: int = 20,    # Long-term moving average window
@@ -22,6 +30,10 @@ class MomentumTrader(BaseAgent):
         if len(history) < window:
             return history[-1]['price'] if history else 0
 
+        series = price_series(history)
+        if series is not None and series.covers(window):
+            return series.sma(window)
+
         recent_prices = [h['price'] for h in history[-window:]]
         return sum(recent_prices) / len(recent_prices)
 
@@ -170,3 +182,64 @@ class MomentumTrader(BaseAgent):
             'reasoning': decision.reasoning,
         })
         return decision
+
+    @classmethod
+    def batch_decide(cls, batch: AgentBatch, market_state: Dict, history: List,
+                     round_number: int) -> Dict[str, dict]:
+        """make_decision for a batch of momentum traders, as plain decision records"""
+        current_price = market_state['price']
+        params = batch.params
+
+        short_ma = moving_averages(history, params['short_window'])
+        long_ma = moving_averages(history, params['long_window'])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            trend = (short_ma - long_ma) / long_ma
+        size = np.minimum(np.abs(trend), params['max_position'])
+        buy_quantity = np.trunc(np.trunc(batch.available_cash() / current_price) * size)
+        sell_quantity = np.trunc(batch.available_shares() * size)
+        insufficient = len(history) < params['long_window']
+        weak = np.abs(trend) < params['min_trend']
+
+        holds = {
+            'history': hold_record(current_price, "Insufficient history for momentum analysis",
+                                   "No trend data available"),
+            'weak': hold_record(current_price, "Insufficient trend strength", "Trend below threshold"),
+            'cash': hold_record(current_price, "Insufficient cash for momentum trade",
+                                "Cannot participate in trend"),
+            'shares': hold_record(current_price, "Insufficient shares for momentum trade",
+                                  "Cannot participate in trend"),
+        }
+        price = float(current_price)
+        buy_limit, sell_limit = current_price * 1.01, current_price * 0.99
+        decisions = {}
+        messages = []
+        for agent, no_history, is_weak, t, s_ma, l_ma, buy, sell in zip(
+                batch.agents, insufficient.tolist(), weak.tolist(), trend.tolist(), short_ma.tolist(),
+                long_ma.tolist(), buy_quantity.tolist(), sell_quantity.tolist()):
+            if no_history or is_weak:
+                decision = {**holds['history' if no_history else 'weak'], 'orders': []}
+            elif t > 0:
+                if int(buy) == 0:
+                    decision = {**holds['cash'], 'orders': []}
+                else:
+                    decision = trade_record(
+                        price,
+                        f"upward trend: short ma ${s_ma:.2f} above long ma ${l_ma:.2f} by {t:.1%}",
+                        "expect price to rise with trend",
+                        "Buy", int(buy), buy_limit, current_price * (1 + min(t, 0.05)))
+            elif int(sell) == 0:
+                decision = {**holds['shares'], 'orders': []}
+            else:
+                decision = trade_record(
+                    price,
+                    f"downward trend: short ma ${s_ma:.2f} below long ma ${l_ma:.2f} by {abs(t):.1%}",
+                    "expect price to fall with trend",
+                    "Sell", int(sell), sell_limit, current_price * (1 - min(abs(t), 0.05)))
+            decisions[agent.agent_id] = decision
+            messages.append((agent.agent_id, {
+                'valuation': decision['valuation'],
+                'price_prediction_t1': decision['price_prediction_t1'],
+                'reasoning': decision['reasoning'],
+            }))
+        MessagingService.add_messages(round_number, messages)
+        return decisions
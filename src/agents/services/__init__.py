@@ -5,5 +5,6 @@ Extracted from BaseAgent as part of issue #57 refactoring.
 """
 
 from agents.services.margin_service import MarginService
+from agents.services.trade_ledger import TradeLedger
 
-__all__ = ['MarginService']
+__all__ = ['MarginService', 'TradeLedger']
@@ -0,0 +1,120 @@
+"""Running trade ledger for agents.
+
+Keeps an agent's cumulative buy/sell counts, volumes and values, and a
+bounded deque of its most recent trades, updated as each trade is recorded.
+Prompt formatting, trade summaries and position checks read these instead
+of walking the full trade history.
+
+Pattern: Follows the MarginService pattern (holds the agent reference)
+"""
+
+from collections import deque
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional, TYPE_CHECKING
+
+from market.trade import Trade
+
+if TYPE_CHECKING:
+    from agents.base_agent import BaseAgent
+
+# Trades kept in the recent deque. Prompts show the last 5; the rest is
+# headroom for trades recorded in the round being decided
+DEFAULT_RECENT_TRADES = 50
+
+
+class TradeLedger:
+    """Cumulative trade totals and recent trades of one agent."""
+
+    def __init__(self, agent: 'BaseAgent', recent_size: int = DEFAULT_RECENT_TRADES):
+        """Initialize ledger with agent reference.
+
+        Args:
+            agent: The BaseAgent whose trades are recorded
+            recent_size: Number of most recent trades to keep
+        """
+        self.agent = agent
+        self.count = 0
+        self.buys = 0
+        self.sells = 0
+        self.buy_volume = 0
+        self.sell_volume = 0
+        self.buy_value = 0.0
+        self.sell_value = 0.0
+        self.recent: Deque[Trade] = deque(maxlen=recent_size)
+
+    def record(self, trade: Trade) -> None:
+        """Add a trade to the totals and the recent deque"""
+        self.count += 1
+        self.recent.append(trade)
+        if trade.buyer_id == self.agent.agent_id:
+            self.buys += 1
+            self.buy_volume += trade.quantity
+            self.buy_value += trade.value
+        else:  # seller
+            self.sells += 1
+            self.sell_volume += trade.quantity
+            self.sell_value += trade.value
+
+    @property
+    def avg_buy_price(self) -> float:
+        return self.buy_value / self.buy_volume if self.buy_volume > 0 else 0.0
+
+    @property
+    def avg_sell_price(self) -> float:
+        return self.sell_value / self.sell_volume if self.sell_volume > 0 else 0.0
+
+    @property
+    def net_volume(self) -> float:
+        """Shares bought minus shares sold"""
+        return self.buy_volume - self.sell_volume
+
+    @property
+    def realized_pnl(self) -> float:
+        """Sales value less the average buy cost of the shares sold"""
+        if self.buy_volume <= 0:
+            return 0.0
+        return self.sell_value - self.sell_volume * self.avg_buy_price
+
+    def stats(self) -> Dict[str, Any]:
+        """Totals in the shape of BaseAgent.trade_stats"""
+        return {
+            'buys': self.buys,
+            'sells': self.sells,
+            'buy_volume': self.buy_volume,
+            'sell_volume': self.sell_volume,
+            'buy_value': self.buy_value,
+            'sell_value': self.sell_value,
+            'avg_buy_price': self.avg_buy_price,
+            'avg_sell_price': self.avg_sell_price,
+        }
+
+    def last(self, n: int) -> List[Trade]:
+        """The n most recent trades, oldest first"""
+        if n <= 0:
+            return []
+        return list(islice(reversed(self.recent), n))[::-1]
+
+    def recent_trades(self, before_round: int, lookback: int) -> Optional[List[Trade]]:
+        """Up to `lookback` trades from rounds before `before_round`, newest
+        round first and in recorded order within a round.
+
+        Walks the deque from the newest trade, so this is O(lookback) plus
+        any trades of later rounds. Returns None when the deque may have
+        dropped trades the answer needs; the caller then scans the history.
+        """
+        if lookback <= 0:
+            return []
+        collected = []
+        for trade in reversed(self.recent):
+            if trade.round >= before_round:
+                continue
+            # Finish the round of the last trade taken: the earliest
+            # trades of a round come first
+            if len(collected) >= lookback and trade.round != collected[-1].round:
+                break
+            collected.append(trade)
+        else:
+            if len(self.recent) < self.count:
+                return None  # Older trades were dropped; any could belong in the answer
+        collected.reverse()
+        return sorted(collected, key=lambda t: t.round, reverse=True)[:lookback]
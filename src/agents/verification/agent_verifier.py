@@ -161,14 +161,8 @@ class AgentVerifier:
         Returns:
             bool: True if position matches trade history, False otherwise
         """
-        net_trade_position = 0
-
-        # Calculate net position from trades
-        for trade in self.agent.trade_history:
-            if trade.buyer_id == self.agent.agent_id:
-                net_trade_position += trade.quantity
-            elif trade.seller_id == self.agent.agent_id:
-                net_trade_position -= trade.quantity
+        # Net position from trades, kept by the agent's trade ledger
+        net_trade_position = self.agent.trade_ledger.net_volume
 
         expected_position = self.agent.initial_shares + net_trade_position
 
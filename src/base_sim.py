@@ -1,6 +1,7 @@
 from datetime import datetime
 import traceback
-from market.orders.order_book import OrderBook
+from pathlib import Path
+from market.orders.order_book import create_order_book
 from market.orders.order import OrderState
 from agents.agent_types import *
 from agents.agents_api import *
@@ -8,7 +9,11 @@ from market.engine.match_engine import MatchingEngine
 from market.state.market_state_manager import MarketStateManager
 from agents.agent_manager.base_agent_manager import AgentManager
 from market.data_recorder import DataRecorder
+from market.columnar_store import ColumnarTable
 from agents.LLMs.llm_agent import LLMAgent
+from agents.LLMs.services.llm_retry import LLMCallControl, RetryPolicy
+from agents.LLMs.services.llm_cache import LLMResponseCache
+from agents.LLMs.services.prompt_fragments import PromptFragments
 from agents.deterministic.deterministic_registry import DETERMINISTIC_AGENTS
 from market.state.sim_context import SimulationContext
 from market.orders.order_repository import OrderRepository
@@ -22,16 +27,27 @@ from agents.agent_manager.services.agent_decision_service import AgentDecisionSe
 from market.orders.order_service_factory import OrderServiceFactory
 from services.shared_service_factory import SharedServiceFactory
 from market.information.base_information_services import InformationService
+from market.information.signal_history import DEFAULT_SIGNAL_RETENTION, SignalArchive
 from market.state.provider_registry import ProviderRegistry
 from services.logging_service import LoggingService
+from services.simulation_runtime import SimulationRuntime
+from services.settlement_buffer import SettlementBuffer
 from agents.agent_manager.services.borrowing_repository import BorrowingRepository
 from agents.agent_manager.services.cash_lending_repository import CashLendingRepository
 from verification.simulation_verifier import SimulationVerifier
 from scenarios.base import FundamentalInfoMode
+import contextvars
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import warnings
 from wordcloud import WordCloud
 
+# Run ids handed out in this process, so simulations started in the same
+# second get separate run directories
+_claimed_run_ids = set()
+_run_id_lock = threading.Lock()
+
 class BaseSimulation:
     """
     The core class for running a trading simulation.
@@ -71,16 +87,49 @@ class BaseSimulation:
                  sim_type: str = "default",
                  stock_configs: dict = None,
                  enable_intra_round_margin_checking: bool = False,
-                 news_enabled: bool = False):
+                 news_enabled: bool = False,
+                 order_book_backend: str = "heap",
+                 deferred_order_book_view: bool = False,
+                 async_llm_decisions: bool = False,
+                 batched_deterministic_decisions: bool = False,
+                 shared_prompt_fragments: bool = False,
+                 prompt_layout: str = "standard",
+                 llm_endpoint_profile=None,
+                 llm_round_deadline: Optional[float] = None,
+                 llm_retry_policy: Optional[dict] = None,
+                 llm_cache=None,
+                 data_recorder_storage: Optional[dict] = None,
+                 order_retention_rounds: Optional[int] = None,
+                 signal_retention_rounds: Optional[int] = DEFAULT_SIGNAL_RETENTION,
+                 queued_logging: bool = False,
+                 diagnostic_logging: str = "full",
+                 verification_level: str = "full",
+                 verification_sample=None,
+                 verification_full_audit_every: Optional[int] = None,
+                 check_order_commitments: bool = False,
+                 matching_mode: str = "continuous",
+                 auction_allocation: str = "time",
+                 matching_workers: Optional[int] = None,
+                 random_seed: Optional[int] = None,
+                 runtime: Optional[SimulationRuntime] = None,
+                 run_id: Optional[str] = None):
+        if matching_workers is not None and matching_workers < 1:
+            raise ValueError(f"matching_workers must be at least 1, got {matching_workers}")
+
+        # Loggers, message bus, news cache, shared services and random
+        # generators of this simulation; current in __init__, run() and execute_round()
+        self.runtime = runtime or SimulationRuntime(seed=random_seed)
+        self.runtime.make_current()
         SharedServiceFactory.reset()
 
         self.infinite_rounds = infinite_rounds
         # Setup logging with sim_type directory structure
-        self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.run_id = self._claim_run_id(sim_type, run_id)
         self.sim_type = sim_type
         
         # Let LoggingService handle directory creation
-        LoggingService.initialize(f"{sim_type}/{self.run_id}")
+        LoggingService.initialize(f"{sim_type}/{self.run_id}", queued=queued_logging,
+                                  diagnostics=diagnostic_logging)
         self.logger = LoggingService.get_logger('simulation')
         
         # Get directories from LoggingService
@@ -92,7 +141,27 @@ class BaseSimulation:
         self.initial_price = initial_price
         self.lendable_shares = lendable_shares
         self.enable_intra_round_margin_checking = enable_intra_round_margin_checking
-        self.order_repository = OrderRepository()
+        self.order_book_backend = order_book_backend  # "heap" or "price_level"
+        self.deferred_order_book_view = deferred_order_book_view  # Publish book snapshots per phase
+        self.data_recorder_storage = data_recorder_storage  # DataRecorder backend, see data_recorder.DEFAULT_STORAGE
+        # Terminal orders older than order_retention_rounds move to data/order_archive
+        self.order_archive = None
+        if order_retention_rounds is not None:
+            storage = data_recorder_storage or {}
+            self.order_archive = ColumnarTable(
+                'order_archive',
+                Path(self.data_dir) / 'order_archive',
+                fmt=storage.get('format', 'csv') if storage.get('backend') == 'columnar' else 'csv'
+            )
+        self.order_repository = OrderRepository(
+            retention_rounds=order_retention_rounds,
+            archive=self.order_archive
+        )
+        # Signals older than signal_retention_rounds move to data/signal_history.sqlite
+        self.signal_retention_rounds = signal_retention_rounds
+        self.signal_archive = None
+        if signal_retention_rounds is not None:
+            self.signal_archive = SignalArchive(Path(self.data_dir) / 'signal_history.sqlite')
 
         # MULTI-STOCK SUPPORT: Detect if this is a multi-stock scenario
         self.is_multi_stock = stock_configs is not None
@@ -133,6 +202,18 @@ class BaseSimulation:
         self.fundamental_volatility = fundamental_volatility
         self.news_enabled = news_enabled
         self.model_open_ai = model_open_ai
+        self.async_llm_decisions = async_llm_decisions  # asyncio fan-out of agent decisions
+        self.batched_deterministic_decisions = batched_deterministic_decisions  # One NumPy pass per rule-based agent type
+        self.llm_endpoint_profile = llm_endpoint_profile  # Profile name or dict, see llm_endpoints.py
+        self.prompt_layout = prompt_layout  # "standard" or "prefix_stable" (provider prompt caching)
+        self.llm_round_deadline = llm_round_deadline  # Seconds per round before agents fall back to hold
+        # This simulation's retry policy and fresh counters (shared by all its LLM agents)
+        LLMCallControl.reset()
+        LLMCallControl.configure(RetryPolicy(**llm_retry_policy) if llm_retry_policy else None)
+        # Response cache must be open before LLM agents (and their clients) are created
+        LLMResponseCache.configure(llm_cache)
+        # Market sections of LLM prompts rendered once per round, not per agent
+        PromptFragments.configure(shared_prompt_fragments)
 
         # Fundamental info mode: controls what agents see
         # Handle backwards compatibility with hide_fundamental_price
@@ -175,7 +256,9 @@ class BaseSimulation:
                 agents,
                 logger=LoggingService.get_logger('agent_repository'),
                 context=self.context,
-                borrowing_repositories=self.borrowing_repositories
+                borrowing_repositories=self.borrowing_repositories,
+                rng=self.runtime.rng,
+                check_order_commitments=check_order_commitments
             )
         else:
             # Single stock: Original behavior (backwards compatible)
@@ -189,26 +272,32 @@ class BaseSimulation:
                 agents,
                 logger=LoggingService.get_logger('agent_repository'),
                 context=self.context,
-                borrowing_repository=self.borrowing_repository
+                borrowing_repository=self.borrowing_repository,
+                rng=self.runtime.rng,
+                check_order_commitments=check_order_commitments
             )
         # Initialize components in correct order
         if self.is_multi_stock:
             # Multi-stock: Create order books for each stock (FOR LOOP!)
             self.order_books = {}
             for stock_id in self.contexts.keys():
-                self.order_books[stock_id] = OrderBook(
+                self.order_books[stock_id] = create_order_book(
                     context=self.contexts[stock_id],
                     logger=LoggingService.get_logger(f'order_book_{stock_id}'),
-                    order_repository=self.order_repository
+                    order_repository=self.order_repository,
+                    backend=self.order_book_backend,
+                    defer_public_view=self.deferred_order_book_view
                 )
             # For backwards compatibility, expose first stock's order book
             self.order_book = list(self.order_books.values())[0]
         else:
             # Single stock: Original behavior
-            self.order_book = OrderBook(
+            self.order_book = create_order_book(
                 context=self.context,
                 logger=LoggingService.get_logger('order_book'),
-                order_repository=self.order_repository
+                order_repository=self.order_repository,
+                backend=self.order_book_backend,
+                defer_public_view=self.deferred_order_book_view
             )
         
         # Initialize shared services
@@ -239,7 +328,8 @@ class BaseSimulation:
                         logger=LoggingService.get_logger(f'dividend_{stock_id}'),
                         dividend_params=stock_dividend_params,
                         redemption_value=self.contexts[stock_id].redemption_value,
-                        stock_id=stock_id  # Pass stock_id so it pays dividends for correct stock
+                        stock_id=stock_id,  # Pass stock_id so it pays dividends for correct stock
+                        rng=self.runtime.rng
                     )
             # For backwards compatibility
             self.dividend_service = list(self.dividend_services.values())[0] if self.dividend_services else None
@@ -249,7 +339,8 @@ class BaseSimulation:
                 agent_repository=self.agent_repository,
                 logger=LoggingService.get_logger('market_state'),
                 dividend_params=self.dividend_params,
-                redemption_value=self.context.redemption_value
+                redemption_value=self.context.redemption_value,
+                rng=self.runtime.rng
             ) if dividend_params else None
 
         # Initialize dividend shock structure (for systematic vs idiosyncratic shocks)
@@ -335,7 +426,10 @@ class BaseSimulation:
             # Create information service with all managers
             information_service = InformationService(
                 agent_repository=self.agent_repository,
-                market_state_managers=self.market_state_managers
+                market_state_managers=self.market_state_managers,
+                np_rng=self.runtime.np_rng,
+                retention_rounds=signal_retention_rounds,
+                archive=self.signal_archive
             )
 
             # Set information service on all managers
@@ -343,7 +437,10 @@ class BaseSimulation:
                 manager.information_service = information_service
         else:
             # Single stock: Original behavior
-            information_service = InformationService(agent_repository=self.agent_repository)
+            information_service = InformationService(agent_repository=self.agent_repository,
+                                                     np_rng=self.runtime.np_rng,
+                                                     retention_rounds=signal_retention_rounds,
+                                                     archive=self.signal_archive)
             self.market_state_manager = MarketStateManager(
                 context=self.context,
                 order_book=self.order_book,
@@ -357,13 +454,19 @@ class BaseSimulation:
                 news_enabled=self.news_enabled
             )
 
+        self.information_service = information_service
+        # Agents keep the same number of rounds of their own signals
+        for agent_id in self.agent_repository.get_all_agent_ids():
+            self.agent_repository.get_agent(agent_id).signal_history.retention_rounds = signal_retention_rounds
+
         # Create data recorder with repository
         self.data_recorder = DataRecorder(
             context=self.context,
             agent_repository=self.agent_repository,
             loggers=LoggingService.get_logger('decisions'),
             data_dir=self.data_dir,
-            market_state_manager=self.market_state_manager
+            market_state_manager=self.market_state_manager,
+            storage=self.data_recorder_storage
         )
 
         # Create agent manager
@@ -395,7 +498,10 @@ class BaseSimulation:
                     context=self.contexts[stock_id],
                     is_multi_stock=True,  # Flag multi-stock mode
                     enable_intra_round_margin_checking=self.enable_intra_round_margin_checking,
-                    stock_id=stock_id  # Pass stock identifier for margin checking
+                    stock_id=stock_id,  # Pass stock identifier for margin checking
+                    rng=self.runtime.rng,
+                    matching_mode=matching_mode,
+                    auction_allocation=auction_allocation
                 )
             # For backwards compatibility
             self.matching_engine = list(self.matching_engines.values())[0]
@@ -411,9 +517,18 @@ class BaseSimulation:
                 order_state_manager=self.order_state_manager,
                 agent_repository=self.agent_repository,
                 context=self.context,
-                enable_intra_round_margin_checking=self.enable_intra_round_margin_checking
+                enable_intra_round_margin_checking=self.enable_intra_round_margin_checking,
+                rng=self.runtime.rng,
+                matching_mode=matching_mode,
+                auction_allocation=auction_allocation
             )
 
+        # Multi-stock rounds match the stocks side by side on these threads; settlement stays serial
+        self.matching_pool = None
+        if self.is_multi_stock and matching_workers and matching_workers > 1:
+            self.matching_pool = ThreadPoolExecutor(max_workers=matching_workers,
+                                                    thread_name_prefix='matching')
+
         # Initialize agent-dependent structures
         self.data_recorder.initialize_agent_structures()
         # Record initial state
@@ -425,7 +540,10 @@ class BaseSimulation:
             order_state_manager=self.order_state_manager,
             agents_logger=LoggingService.get_logger('agents'),
             decisions_logger=LoggingService.get_logger('decisions'),
-            context=self.context
+            context=self.context,
+            async_decisions=self.async_llm_decisions,
+            round_deadline=self.llm_round_deadline,
+            batch_deterministic=self.batched_deterministic_decisions
         )
 
         # Initialize verification service
@@ -447,11 +565,16 @@ class BaseSimulation:
             cash_lending_repo=self.cash_lending_repo if self.leverage_enabled else None,
             interest_service=self.interest_service,
             borrow_service=self.borrow_service,
-            leverage_interest_service=self.leverage_interest_service if self.leverage_enabled else None
+            leverage_interest_service=self.leverage_interest_service if self.leverage_enabled else None,
+            full_audit_every=verification_full_audit_every,
+            level=verification_level,
+            sample=verification_sample,
+            sample_seed=random_seed
         )
 
     def execute_round(self, round_number):
         """Execute a single round of trading"""
+        self.runtime.make_current()
         # Log initial states
         self._log_round_start(round_number)
 
@@ -492,6 +615,9 @@ class BaseSimulation:
             last_paid_dividend=last_paid_dividend
         )
 
+        # Persist this round's buffered CSV log rows
+        LoggingService.flush_csv_logs()
+
     def create_agent(self, agent_id: int, agent_type: str, agent_params: dict):
         """Factory method to create appropriate agent type with explicit parameters"""
         # Get type-specific parameters if they exist, otherwise use defaults
@@ -544,7 +670,9 @@ class BaseSimulation:
             agent_type=agent_type,
             model_open_ai=model,
             enabled_features=enabled_features,
-            fundamental_info_mode=self.fundamental_info_mode
+            fundamental_info_mode=self.fundamental_info_mode,
+            endpoint_profile=self.llm_endpoint_profile,
+            prompt_layout=self.prompt_layout
         )
 
     def initialize_agents(self, agent_params: dict):
@@ -583,11 +711,12 @@ class BaseSimulation:
     
     def run(self):
         """Base simulation run logic"""
+        self.runtime.make_current()
         try:
             # Clear any cached news from previous simulations (if running multiple in same process)
             if self.news_enabled:
                 from market.information.information_providers import NewsProvider
-                NewsProvider._multi_stock_cache.clear()
+                NewsProvider._multi_stock_cache().clear()
 
             for round_number in range(self.context._num_rounds):
                 self.execute_round(round_number)
@@ -600,10 +729,55 @@ class BaseSimulation:
         finally:
             try:
                 self.data_recorder.save_simulation_data()
+                self._save_llm_call_stats()
+                if self.order_archive is not None:
+                    self.order_archive.flush()
+                if self.signal_archive is not None:
+                    self.information_service.signal_history.flush()
+                    self.signal_archive.close()
+                LoggingService.verify_csv_logs()
             except Exception as e:
                 LoggingService.log_simulation(f"Failed to save final data: {str(e)}")
+            LoggingService.finalize()
        # Clean up expired orders at end of round
 
+    def close(self):
+        """Close this simulation's log files (its runtime's loggers), LLM response cache and matching threads"""
+        if self.matching_pool is not None:
+            self.matching_pool.shutdown()
+            self.matching_pool = None
+        with self.runtime.activate():
+            LoggingService.close()
+            LLMResponseCache.close_active()
+
+    @staticmethod
+    def _claim_run_id(sim_type: str, run_id: Optional[str] = None) -> str:
+        """Timestamp run id, suffixed if another simulation in this process has it.
+
+        A run id passed in (a directory already claimed by run_base_sim's
+        create_run_directory) is only suffixed if this process has used it.
+        """
+        run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        with _run_id_lock:
+            candidate, n = run_id, 1
+            while (sim_type, candidate) in _claimed_run_ids:
+                n += 1
+                candidate = f"{run_id}_{n}"
+            _claimed_run_ids.add((sim_type, candidate))
+        return candidate
+
+    def _save_llm_call_stats(self):
+        """Save per-round LLM call counters (retries, timeouts, fallbacks, waits)"""
+        import pandas as pd
+        from pathlib import Path
+        stats = self.decision_service.llm_stats_history
+        if stats:
+            pd.DataFrame(stats).to_csv(Path(self.data_dir) / 'llm_call_stats.csv', index=False)
+        LoggingService.log_simulation(f"LLM call totals: {LLMCallControl.stats.as_dict()}")
+        cache = LLMResponseCache.get_active()
+        if cache is not None:
+            LoggingService.log_simulation(f"LLM response cache: {cache.stats()}")
+
     def _generate_dividend_shocks(self) -> dict:
         """Generate systematic and style-level dividend shocks for the current round.
 
@@ -619,14 +793,14 @@ class BaseSimulation:
 
         # Draw systematic shock (affects all stocks)
         systematic_volatility = self.shock_config.get('systematic_volatility', 0.0)
-        systematic_shock = random.gauss(0, systematic_volatility) if systematic_volatility > 0 else 0.0
+        systematic_shock = self.runtime.rng.gauss(0, systematic_volatility) if systematic_volatility > 0 else 0.0
 
         # Draw style-level shocks (affects stocks in same style)
         style_shocks = {}
         style_config = self.shock_config.get('styles', {})
         for style, config in style_config.items():
             vol = config.get('volatility', 0.0) if isinstance(config, dict) else config
-            style_shocks[style] = random.gauss(0, vol) if vol > 0 else 0.0
+            style_shocks[style] = self.runtime.rng.gauss(0, vol) if vol > 0 else 0.0
 
         shocks = {
             'systematic': systematic_shock,
@@ -722,24 +896,11 @@ class BaseSimulation:
 
         # Get last volume from data recorder
         if self.is_multi_stock:
-            # Multi-stock: Get per-stock volumes from market_data
-            last_stock_volumes = {}
-            if self.data_recorder.market_data:
-                # Get volumes from previous round for each stock
-                for stock_id in self.contexts.keys():
-                    # Filter market_data for this stock and previous round
-                    prev_round_data = [
-                        entry for entry in self.data_recorder.market_data
-                        if entry['stock_id'] == stock_id and entry['round'] == round_number
-                    ]
-                    last_stock_volumes[stock_id] = (
-                        prev_round_data[-1]['total_volume']
-                        if prev_round_data
-                        else 0
-                    )
-            else:
-                # First round - no previous volume
-                last_stock_volumes = {stock_id: 0 for stock_id in self.contexts.keys()}
+            # Multi-stock: Previous round's per-stock volume from the recorder's index
+            last_stock_volumes = {
+                stock_id: self.data_recorder.get_round_volume(stock_id, round_number)
+                for stock_id in self.contexts.keys()
+            }
         else:
             # Single-stock: Get total volume from history
             last_volume = (
@@ -860,22 +1021,29 @@ class BaseSimulation:
             # Multi-stock: Match orders FOR EACH STOCK separately
             stock_market_results = {}
 
-            for stock_id in self.contexts.keys():
-                # Filter orders for THIS stock only
-                stock_orders = [o for o in new_orders if o.stock_id == stock_id]
-
-                self.logger.info(f"=== Matching {len(stock_orders)} orders for {stock_id} ===")
+            # Split orders by stock in one pass (orders for unknown stocks are dropped)
+            orders_by_stock = {stock_id: [] for stock_id in self.contexts}
+            for order in new_orders:
+                stock_orders = orders_by_stock.get(order.stock_id)
+                if stock_orders is not None:
+                    stock_orders.append(order)
 
-                # Match orders for this stock
-                stock_market_results[stock_id] = self.matching_engines[stock_id].match_orders(
-                    stock_orders,
-                    self.contexts[stock_id].current_price,
-                    round_number + 1
-                )
+            if self.matching_pool is not None:
+                stock_market_results = self._match_stocks_in_parallel(orders_by_stock, round_number)
+            else:
+                for stock_id, stock_orders in orders_by_stock.items():
+                    self.logger.info(f"=== Matching {len(stock_orders)} orders for {stock_id} ===")
+
+                    # Match orders for this stock
+                    stock_market_results[stock_id] = self.matching_engines[stock_id].match_orders(
+                        stock_orders,
+                        self.contexts[stock_id].current_price,
+                        round_number + 1
+                    )
 
-                # Update price for THIS stock
-                self.contexts[stock_id].current_price = stock_market_results[stock_id].price
-                self.contexts[stock_id].round_number = round_number + 1
+                    # Update price for THIS stock
+                    self.contexts[stock_id].current_price = stock_market_results[stock_id].price
+                    self.contexts[stock_id].round_number = round_number + 1
 
             # Aggregate all trades and volumes from all stocks
             all_trades = []
@@ -915,6 +1083,59 @@ class BaseSimulation:
 
             return market_result, None
 
+    def _match_stocks_in_parallel(self, orders_by_stock: Dict[str, list], round_number: int) -> dict:
+        """Match every stock on matching_pool's threads, then settle the stocks in stock order
+
+        Each stock matches with a SettlementBuffer recording, so it sees the
+        agent balances as they stood before matching and queues its writes
+        to agents and the order repository. The buffers are then applied, and
+        each stock's round finished (trade log, new price, margin calls), in
+        the contexts' order, which makes the same writes in the same order as
+        matching the stocks one after another.
+        """
+        # The shuffles draw from the shared generator, so they stay in stock order
+        batches = {
+            stock_id: self.matching_engines[stock_id].prepare_orders(stock_orders)
+            for stock_id, stock_orders in orders_by_stock.items()
+        }
+
+        def match(stock_id: str):
+            buffer = SettlementBuffer()
+            with buffer.recording():
+                trades = self.matching_engines[stock_id].match_prepared_orders(
+                    batches[stock_id], self.contexts[stock_id].current_price, round_number + 1)
+            return trades, buffer
+
+        for stock_id, stock_orders in orders_by_stock.items():
+            self.logger.info(f"=== Matching {len(stock_orders)} orders for {stock_id} ===")
+        futures = {
+            stock_id: self.matching_pool.submit(contextvars.copy_context().run, match, stock_id)
+            for stock_id in batches
+        }
+
+        # Until every buffer is applied, later stocks' orders are ahead of their agents' totals
+        check_commitments = self.agent_repository.check_order_commitments
+        self.agent_repository.check_order_commitments = False
+        stock_market_results = {}
+        try:
+            for stock_id, future in futures.items():
+                trades, buffer = future.result()
+                buffer.apply()
+                stock_market_results[stock_id] = self.matching_engines[stock_id].finish_round(
+                    trades, self.contexts[stock_id].current_price, round_number + 1)
+                self.contexts[stock_id].current_price = stock_market_results[stock_id].price
+                self.contexts[stock_id].round_number = round_number + 1
+        finally:
+            self.agent_repository.check_order_commitments = check_commitments
+
+        if check_commitments:
+            for agent_id in self.agent_repository.get_all_agent_ids():
+                self.agent_repository.check_agent_commitments(
+                    self.agent_repository.get_agent(agent_id),
+                    self.order_repository.get_active_orders_from_agent(agent_id)
+                )
+        return stock_market_results
+
     def _phase_end_of_round(self, round_number: int, market_result,
                            stock_market_results: dict, pre_round_states: dict,
                            last_paid_dividend: float):
@@ -1013,6 +1234,11 @@ class BaseSimulation:
         # Verify final states
         self.verifier.verify_round_end_states(pre_round_states)
 
+        # Move long-finished orders out of the repository and agents' histories
+        archived_orders = self.order_repository.compact(round_number)
+        if archived_orders:
+            self.agent_repository.forget_agent_orders(archived_orders)
+
     def _phase_record_data(self, round_number: int, market_state: dict, market_result,
                           new_orders: list, stock_market_results: dict = None):
         """Phase 4: Record round data including dividends and trades
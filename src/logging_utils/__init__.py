@@ -1,11 +1,15 @@
 """Logging utilities package with factory, CSV management, and service."""
 from logging_utils.logger_factory import LoggerFactory
 from logging_utils.csv_header_manager import CSVHeaders, CSVHeaderManager
-from logging_utils.csv_logger import CSVLogger
+from logging_utils.csv_logger import BufferedCSVFileHandler, CSVLogger
+from logging_utils.queued_logging import QueuedLogWriter, mirror_file
 
 __all__ = [
     'LoggerFactory',
     'CSVHeaders',
     'CSVHeaderManager',
     'CSVLogger',
+    'BufferedCSVFileHandler',
+    'QueuedLogWriter',
+    'mirror_file',
 ]
@@ -6,9 +6,51 @@ from pathlib import Path
 from typing import Optional
 
 
+class BufferedCSVFileHandler(logging.FileHandler):
+    """FileHandler for CSV logs that leaves flushing to sync().
+
+    logging.FileHandler flushes after every record; CSV logs can see
+    thousands of rows per round, so rows stay in the file buffer until
+    sync() (once per round) and are counted as they are written. The count
+    is what verify() checks the file against.
+    """
+
+    def __init__(self, filename, mode: str = 'a', encoding: Optional[str] = None):
+        super().__init__(filename, mode=mode, encoding=encoding)
+        self.start_offset = self.stream.tell()  # File size when this handler opened it
+        self.rows_written = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            self.rows_written += 1
+        except Exception:
+            self.handleError(record)
+
+    def sync(self) -> None:
+        """Flush buffered rows and fsync them to disk"""
+        self.acquire()
+        try:
+            if self.stream and not self.stream.closed:
+                self.stream.flush()
+                os.fsync(self.stream.fileno())
+        finally:
+            self.release()
+
+    def lines_written(self) -> int:
+        """Lines in the file since this handler opened it (reads only that part)"""
+        with open(self.baseFilename, 'rb') as f:
+            f.seek(self.start_offset)
+            return sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1 << 20), b''))
+
+
 class CSVLogger:
     """Handles CSV logging with optional verification."""
 
+    # Debug flag: verify every validation error write (O(file size) per call).
+    # Otherwise verify() runs once at shutdown.
+    verify_writes: bool = False
+
     @staticmethod
     def log_validation_error(
         logger: logging.Logger,
@@ -22,7 +64,7 @@ class CSVLogger:
         debug: bool = False
     ) -> None:
         """
-        Log validation error with verification.
+        Log validation error (verified immediately only if verify_writes is set).
 
         Args:
             logger: Logger instance to use
@@ -36,43 +78,18 @@ class CSVLogger:
             debug: If True, also log human-readable format to console
 
         Raises:
-            RuntimeError: If CSV file not found or write verification fails
+            RuntimeError: If verify_writes is set and the row is missing from the CSV file
         """
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
 
         # Create CSV formatted string
         csv_message = f"{timestamp},{round_number},{agent_id},{agent_type},{error_type},{details},{attempted_action}"
 
-        # Get number of lines before writing
-        with open(csv_file_path, 'r') as f:
-            pre_lines = sum(1 for _ in f)
-
         # Log CSV format to file
         logger.info(csv_message)
 
-        # Force flush the handlers
-        for handler in logger.handlers:
-            handler.flush()
-
-        # Get number of lines after writing
-        with open(csv_file_path, 'r') as f:
-            post_lines = sum(1 for _ in f)
-
-        # Verify the file exists and has more lines
-        if not os.path.exists(csv_file_path):
-            raise RuntimeError(
-                f"Validation errors CSV file not found at {csv_file_path}. "
-                "Logger initialization may have failed."
-            )
-
-        if post_lines <= pre_lines:  # Must have strictly more lines
-            raise RuntimeError(
-                f"CRITICAL: Validation error not written to CSV file. "
-                f"Lines before: {pre_lines}, after: {post_lines}. "
-                f"Message was: {csv_message}\n"
-                f"Handlers: {logger.handlers}\n"
-                f"File path: {csv_file_path}"
-            )
+        if CSVLogger.verify_writes:
+            CSVLogger.verify(logger, csv_file_path, last_message=csv_message)
 
         if debug:
             # Log human readable format to console
@@ -113,3 +130,47 @@ class CSVLogger:
             f"{max_borrowable},{action},{excess_shares},{price}"
         )
         logger.info(csv_message)
+
+    @staticmethod
+    def sync(logger: logging.Logger) -> None:
+        """Flush and fsync a CSV logger's buffered file handlers"""
+        for handler in logger.handlers:
+            if isinstance(handler, BufferedCSVFileHandler):
+                handler.sync()
+
+    @staticmethod
+    def verify(
+        logger: logging.Logger,
+        csv_file_path: Optional[Path] = None,
+        last_message: Optional[str] = None
+    ) -> None:
+        """
+        Check every row a CSV logger counted actually reached its files.
+
+        Args:
+            logger: CSV logger to verify
+            csv_file_path: Expected primary file (must exist if given)
+            last_message: Most recent row, included in the error for context
+
+        Raises:
+            RuntimeError: If a file is missing or holds fewer lines than rows written
+        """
+        if csv_file_path is not None and not os.path.exists(csv_file_path):
+            raise RuntimeError(
+                f"CSV file not found at {csv_file_path}. "
+                "Logger initialization may have failed."
+            )
+
+        CSVLogger.sync(logger)
+        for handler in logger.handlers:
+            if not isinstance(handler, BufferedCSVFileHandler):
+                continue
+            lines = handler.lines_written()
+            if lines < handler.rows_written:  # Rows may span lines, never the reverse
+                raise RuntimeError(
+                    f"CRITICAL: Rows missing from CSV file. "
+                    f"Rows written: {handler.rows_written}, lines found: {lines}. "
+                    f"Last message: {last_message}\n"
+                    f"Handlers: {logger.handlers}\n"
+                    f"File path: {handler.baseFilename}"
+                )
@@ -3,6 +3,8 @@ import logging
 from pathlib import Path
 from typing import Optional
 
+from logging_utils.csv_logger import BufferedCSVFileHandler
+
 
 class LoggerFactory:
     """Factory for creating loggers with standardized configurations."""
@@ -15,7 +17,8 @@ class LoggerFactory:
         filename: str,
         console_handler: logging.Handler,
         formatter: Optional[logging.Formatter] = None,
-        use_dual_output: bool = True
+        use_dual_output: bool = True,
+        handler_class: type = logging.FileHandler
     ) -> logging.Logger:
         """
         Create a logger with file and console handlers.
@@ -28,6 +31,7 @@ class LoggerFactory:
             console_handler: Console handler for warnings/errors
             formatter: Custom formatter (default: timestamped)
             use_dual_output: If True, write to both run_dir and latest_dir
+            handler_class: File handler type (BufferedCSVFileHandler for CSV logs)
 
         Returns:
             Configured logger
@@ -39,14 +43,14 @@ class LoggerFactory:
             formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
 
         # Create file handler for run directory
-        run_handler = logging.FileHandler(run_dir / filename)
+        run_handler = handler_class(run_dir / filename)
         run_handler.setLevel(logging.INFO)
         run_handler.setFormatter(formatter)
         logger.addHandler(run_handler)
 
         # Create file handler for latest directory if dual output enabled
         if use_dual_output and latest_dir:
-            latest_handler = logging.FileHandler(latest_dir / filename)
+            latest_handler = handler_class(latest_dir / filename)
             latest_handler.setLevel(logging.INFO)
             latest_handler.setFormatter(formatter)
             logger.addHandler(latest_handler)
@@ -68,6 +72,9 @@ class LoggerFactory:
         """
         Create a CSV logger with plain formatting (no timestamps).
 
+        Rows are buffered and counted by BufferedCSVFileHandler; call
+        CSVLogger.sync() to flush them (LoggingService does so every round).
+
         Args:
             name: Logger name
             run_dir: Run-specific directory for logs
@@ -89,7 +96,8 @@ class LoggerFactory:
             filename=filename,
             console_handler=console_handler,
             formatter=csv_formatter,
-            use_dual_output=use_dual_output
+            use_dual_output=use_dual_output,
+            handler_class=BufferedCSVFileHandler
         )
 
     @staticmethod
@@ -0,0 +1,141 @@
+"""Background file writing for loggers, plus end-of-run mirroring of log files.
+
+With queued logging each logger keeps only a QueueHandler (and its console
+handler); its file handlers move behind one QueueListener thread, so the
+simulation thread only enqueues records. Files are written once, to the run
+directory, and copied into latest_sim by mirror_file() when the run ends
+instead of being written twice as they are produced.
+"""
+import logging
+import os
+import queue
+import shutil
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Dict, List
+
+
+class _RecordQueueHandler(QueueHandler):
+    """QueueHandler that enqueues the record itself.
+
+    The stock prepare() formats and copies every record so it can cross a
+    process boundary; here the listener is a thread in the same process, so
+    only %-style arguments are resolved up front (they may be mutable).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class _LoggerRouter(logging.Handler):
+    """Hands each dequeued record to the file handlers of the logger that emitted it.
+
+    File handlers are written without a per-record flush; everything written
+    is flushed whenever the queue runs empty.
+    """
+
+    def __init__(self, routes: Dict[str, List[logging.Handler]], source: queue.SimpleQueue):
+        super().__init__()
+        self.routes = routes
+        self.source = source
+        self._unflushed = set()
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        for handler in self.routes.get(record.name, ()):
+            if record.levelno < handler.level:
+                continue
+            if isinstance(handler, logging.FileHandler) and handler.stream is not None:
+                try:
+                    handler.stream.write(handler.format(record) + handler.terminator)
+                    self._unflushed.add(handler)
+                except Exception:
+                    handler.handleError(record)
+            else:
+                handler.handle(record)
+        if self._unflushed and self.source.empty():
+            self.flush()
+        return True
+
+    def flush(self) -> None:
+        for handler in self._unflushed:
+            handler.flush()
+        self._unflushed.clear()
+
+
+class QueuedLogWriter:
+    """Moves the file handlers of attached loggers onto one background thread"""
+
+    def __init__(self):
+        self.queue = queue.SimpleQueue()
+        self._routes: Dict[str, List[logging.Handler]] = {}
+        self._queue_handlers: Dict[str, QueueHandler] = {}
+        self._router = _LoggerRouter(self._routes, self.queue)
+        self._listener = QueueListener(self.queue, self._router)
+        self._running = False
+
+    def attach(self, logger: logging.Logger) -> None:
+        """Replace the logger's file handlers with a QueueHandler"""
+        if logger.name in self._queue_handlers:
+            return
+        file_handlers = [h for h in logger.handlers if isinstance(h, logging.FileHandler)]
+        if not file_handlers:
+            return
+        for handler in file_handlers:
+            logger.removeHandler(handler)
+        self._routes[logger.name] = file_handlers
+        queue_handler = _RecordQueueHandler(self.queue)
+        self._queue_handlers[logger.name] = queue_handler
+        logger.addHandler(queue_handler)
+
+    def start(self) -> None:
+        if not self._running:
+            self._listener.start()
+            self._running = True
+
+    def stop(self) -> None:
+        """Write out queued records, then put the file handlers back on their loggers.
+
+        Anything logged after stop() is written synchronously, so late messages
+        (final summaries, shutdown errors) are not lost.
+        """
+        if self._running:
+            self._listener.stop()
+            self._running = False
+        self._router.flush()
+        for name, queue_handler in self._queue_handlers.items():
+            logger = logging.getLogger(name)
+            logger.removeHandler(queue_handler)
+            for handler in self._routes.pop(name, ()):
+                handler.flush()
+                logger.addHandler(handler)
+        self._queue_handlers.clear()
+
+
+def mirror_file(source: Path, target: Path) -> str:
+    """Make `target` show the contents of `source`.
+
+    Tries a hardlink, then a symlink, then a copy. Returns the method used.
+    """
+    if target.is_symlink() or target.exists():
+        target.unlink()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(source, target)
+        return 'hardlink'
+    except OSError:
+        pass
+    try:
+        target.symlink_to(Path(source).resolve())
+        return 'symlink'
+    except OSError:
+        shutil.copy2(source, target)
+        return 'copy'
+
+
+def unlink_mirror(target: Path) -> None:
+    """Remove `target` if mirror_file() linked it, so appends cannot reach the source"""
+    if target.is_symlink() or (target.exists() and target.stat().st_nlink > 1):
+        target.unlink()
@@ -0,0 +1,240 @@
+"""Columnar, chunked storage for per-round simulation records.
+
+A ColumnarTable accepts the same row dicts DataRecorder builds, but keeps
+them in typed, preallocated column buffers (one numpy array per column)
+instead of a list of dicts. When a buffer fills, or when DataRecorder
+flushes every N rounds, the chunk is written to disk as one part file:
+
+    data/market_data/part-00000.csv
+    data/market_data/part-00001.csv
+    ...
+
+so memory stays bounded by the chunk size however long the run is, and a
+crash loses at most one chunk. 'csv' chunks (the default) work with pandas
+alone; Parquet and Arrow IPC (feather) chunks need pyarrow. A chunk
+directory can be read back with ColumnarTable.read(), or a Parquet one
+with pd.read_parquet(dir) / pyarrow.dataset.
+"""
+import math
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+CHUNK_FORMATS = ('parquet', 'arrow', 'csv')
+_EXTENSIONS = {'parquet': '.parquet', 'arrow': '.arrow', 'csv': '.csv'}
+
+
+def require_chunk_format(fmt: str) -> None:
+    """Validate a chunk format, checking the optional pyarrow dependency"""
+    if fmt not in CHUNK_FORMATS:
+        raise ValueError(f"Unknown chunk format '{fmt}'. Valid formats: {CHUNK_FORMATS}")
+    if fmt in ('parquet', 'arrow'):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                f"Chunk format '{fmt}' requires pyarrow (pip install pyarrow); "
+                f"use format 'csv' to run without it"
+            ) from e
+
+
+class ColumnBuffer:
+    """Preallocated storage for one column of a chunk.
+
+    The dtype comes from the first value seen (bool, int64, float64 or
+    object) and is promoted the way pandas would when a later value does
+    not fit: ints become floats, missing numbers become NaN, anything else
+    falls back to object.
+    """
+
+    def __init__(self, capacity: int, sample: Any):
+        self.data = np.empty(capacity, dtype=self._dtype_for(sample))
+        if self.data.dtype == object:
+            self.data[:] = None
+
+    @staticmethod
+    def _dtype_for(value: Any):
+        if isinstance(value, (bool, np.bool_)):
+            return np.bool_
+        if isinstance(value, (int, np.integer)):
+            return np.int64
+        if isinstance(value, (float, np.floating)):
+            return np.float64
+        return object
+
+    def _promote(self, dtype) -> None:
+        self.data = self.data.astype(dtype)
+
+    def set(self, index: int, value: Any) -> None:
+        kind = self.data.dtype.kind
+        if value is None:
+            if kind == 'i':
+                self._promote(np.float64)
+                kind = 'f'
+            elif kind == 'b':
+                self._promote(object)
+                kind = 'O'
+            self.data[index] = math.nan if kind == 'f' else None
+            return
+        if kind == 'O':
+            # Nested structures are stored the way to_csv would render them
+            self.data[index] = str(value) if isinstance(value, (dict, list, tuple)) else value
+            return
+        value_kind = np.dtype(self._dtype_for(value)).kind
+        if value_kind == kind:
+            self.data[index] = value
+        elif kind == 'f' and value_kind in 'ib':
+            self.data[index] = float(value)
+        elif kind == 'i' and value_kind == 'f':
+            self._promote(np.float64)
+            self.data[index] = value
+        else:
+            self._promote(object)
+            self.set(index, value)
+
+    def values(self, length: int) -> np.ndarray:
+        return self.data[:length]
+
+
+class ColumnarTable:
+    """Append-only table flushed to numbered part files in `directory`"""
+
+    def __init__(self, name: str, directory: Union[str, Path], chunk_rows: int = 10_000,
+                 fmt: str = 'csv'):
+        if chunk_rows < 1:
+            raise ValueError(f"chunk_rows must be at least 1, got {chunk_rows}")
+        require_chunk_format(fmt)
+        self.name = name
+        self.directory = Path(directory)
+        self.chunk_rows = chunk_rows
+        self.format = fmt
+        self.columns: List[str] = []  # Union of columns across chunks, in first-seen order
+        self.flushed_rows = 0
+        self._buffers: Dict[str, ColumnBuffer] = {}
+        self._buffered = 0
+        self._parts: List[Path] = []
+        self._exported_rows: Optional[int] = None
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for stale in self.directory.glob(f"part-*{_EXTENSIONS[fmt]}"):
+            stale.unlink()
+
+    def __len__(self) -> int:
+        return self.flushed_rows + self._buffered
+
+    def append(self, row: Dict[str, Any]) -> None:
+        index = self._buffered
+        present = set()
+        for key, value in row.items():
+            column = str(key)
+            present.add(column)
+            buffer = self._buffers.get(column)
+            if buffer is None:
+                buffer = ColumnBuffer(self.chunk_rows, value)
+                for earlier in range(index):
+                    buffer.set(earlier, None)
+                self._buffers[column] = buffer
+                if column not in self.columns:
+                    self.columns.append(column)
+            buffer.set(index, value)
+        if len(present) < len(self._buffers):
+            for column, buffer in self._buffers.items():
+                if column not in present:
+                    buffer.set(index, None)
+        self._buffered += 1
+        if self._buffered >= self.chunk_rows:
+            self.flush()
+
+    def _buffer_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({column: buffer.values(self._buffered)
+                             for column, buffer in self._buffers.items()})
+
+    @staticmethod
+    def _arrow_safe(frame: pd.DataFrame) -> pd.DataFrame:
+        """Render mixed-type object columns as text so Arrow can type them"""
+        for column in frame.columns:
+            series = frame[column]
+            if series.dtype == object:
+                types = {type(value) for value in series if value is not None}
+                if len(types) > 1:
+                    frame[column] = series.map(lambda value: value if value is None else str(value))
+        return frame
+
+    def flush(self) -> None:
+        """Write buffered rows as the next part file and release the buffers"""
+        if self._buffered == 0:
+            return
+        frame = self._buffer_frame()
+        path = self.directory / f"part-{len(self._parts):05d}{_EXTENSIONS[self.format]}"
+        if self.format == 'parquet':
+            self._arrow_safe(frame).to_parquet(path, index=False)
+        elif self.format == 'arrow':
+            self._arrow_safe(frame).to_feather(path)
+        else:
+            frame.to_csv(path, index=False)
+        self._parts.append(path)
+        self.flushed_rows += self._buffered
+        self._buffers = {}
+        self._buffered = 0
+
+    def _read_part(self, path: Path) -> pd.DataFrame:
+        if self.format == 'parquet':
+            return pd.read_parquet(path)
+        if self.format == 'arrow':
+            return pd.read_feather(path)
+        return pd.read_csv(path)
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """Flushed chunks followed by the rows still buffered"""
+        for path in self._parts:
+            yield self._read_part(path)
+        if self._buffered:
+            yield self._buffer_frame()
+
+    def read(self) -> pd.DataFrame:
+        """Whole table as one DataFrame (loads every chunk; for analysis and tests)"""
+        chunks = list(self.iter_chunks())
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True).reindex(columns=self.columns)
+
+    def export_csv(self, path: Union[str, Path]) -> None:
+        """Stream all chunks into one CSV with the union of columns.
+
+        Memory use is one chunk; a repeat export with no new rows is skipped.
+        """
+        self.flush()
+        path = Path(path)
+        if self._exported_rows == len(self) and path.exists():
+            return
+        if not self._parts:
+            pd.DataFrame().to_csv(path, index=False)
+        for i, chunk in enumerate(self.iter_chunks()):
+            chunk.reindex(columns=self.columns).to_csv(
+                path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+        self._exported_rows = len(self)
+
+
+class RunningStats:
+    """Count, total, mean and population std of a stream (Welford's method)"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def average(self) -> float:
+        return self.mean if self.count else math.nan
+
+    def std(self) -> float:
+        return math.sqrt(self._m2 / self.count) if self.count else math.nan
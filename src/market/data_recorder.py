@@ -1,11 +1,13 @@
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import pandas as pd
 import numpy as np
 import json
 from pathlib import Path
 from dataclasses import dataclass
 
+from market.columnar_store import ColumnarTable, RunningStats, require_chunk_format
+from market.indicators import DEFAULT_CAPACITY, IndicatorStore, MarketHistory
 from services.short_interest_calculator import calculate_short_interest
 from services.dividend_calculator import (
     calculate_agent_dividends_received,
@@ -25,13 +27,28 @@ class AgentRecordData:
     total_value: float
     dividends_received: float
 
+# Tables the columnar backend streams to disk instead of keeping in memory
+COLUMNAR_TABLES = ('market_data', 'trade_data', 'agent_data', 'order_data',
+                   'wealth_history', 'stock_positions')
+
+# Defaults for the DATA_RECORDER scenario setting
+DEFAULT_STORAGE = {
+    'backend': 'memory',   # 'memory' (lists of dicts) or 'columnar' (chunked part files)
+    'format': 'csv',       # Columnar chunk format: 'csv', 'parquet' or 'arrow' (both need pyarrow)
+    'flush_every': 50,     # Write buffered rows to disk every N rounds
+    'chunk_rows': 50_000,  # ...or sooner, when a table's buffer holds this many rows
+    'export_csv': True,    # Also write the usual <table>.csv files on save (plots read these)
+    'indicator_capacity': DEFAULT_CAPACITY,  # Rounds per stock kept for rolling indicators
+}
+
 class DataRecorder:
     def __init__(self,
                  context,
                  agent_repository,
                  market_state_manager,
                  loggers,
-                 data_dir: Path):
+                 data_dir: Path,
+                 storage: Optional[Dict[str, Any]] = None):
         # Core dependencies
         self.context = context
         self.agent_repository = agent_repository
@@ -39,8 +56,12 @@ class DataRecorder:
         self.loggers = loggers
         self.data_dir = data_dir
         
+        self.storage = {**DEFAULT_STORAGE, **(storage or {})}
+
         # Data structures
-        self.history: List[Dict[str, Any]] = []
+        # Rolling prices and volumes per stock; agents reach it through history
+        self.indicators = IndicatorStore(self.storage['indicator_capacity'])
+        self.history: List[Dict[str, Any]] = MarketHistory(self.indicators)
         self.market_data: List[Dict[str, Any]] = []
         self.trade_data: List[Dict[str, Any]] = []
         self.agent_data: List[Dict[str, Any]] = []
@@ -49,9 +70,35 @@ class DataRecorder:
         self.dividend_data: List[Dict[str, Any]] = []
         self.social_messages: List[Dict[str, Any]] = []
         self.stock_positions: List[Dict[str, Any]] = []  # NEW: Per-stock position tracking
+        # Latest market_data row per stock, kept in step with market_data so
+        # per-round lookups don't rescan the whole history
+        self.last_round_summary: Dict[str, Dict[str, Any]] = {}
+
+        # Optional columnar backend: the large per-round tables become
+        # ColumnarTables with the same append()/len() interface
+        if self.storage['backend'] not in ('memory', 'columnar'):
+            raise ValueError(f"Unknown data recorder backend '{self.storage['backend']}'. "
+                             f"Valid backends: ('memory', 'columnar')")
+        self.columnar = self.storage['backend'] == 'columnar'
+        self._market_stats: Dict[str, RunningStats] = {}
+        if self.columnar:
+            require_chunk_format(self.storage['format'])
+            for name in COLUMNAR_TABLES:
+                setattr(self, name, ColumnarTable(
+                    name,
+                    Path(data_dir) / name,
+                    chunk_rows=self.storage['chunk_rows'],
+                    fmt=self.storage['format'],
+                ))
+            self._market_stats = {
+                column: RunningStats()
+                for column in ('price', 'total_volume', 'num_trades', 'price_fundamental_ratio')
+            }
 
     def initialize_agent_structures(self):
         """Initialize data structures that depend on agents"""
+        if self.columnar:
+            return  # wealth_history is a table with one column per agent
         self.wealth_history = {
             agent_id: [] for agent_id in self.agent_repository.get_all_agent_ids()
         }
@@ -101,6 +148,14 @@ class DataRecorder:
         # Add dividend data recording
         self._record_dividend_data(round_number, market_state, timestamp)
 
+        if self.columnar and (round_number + 1) % self.storage['flush_every'] == 0:
+            self.flush()
+
+    def flush(self):
+        """Write buffered rows of every columnar table to disk"""
+        for name in COLUMNAR_TABLES:
+            getattr(self, name).flush()
+
     def _record_market_history(self, round_number, market_state, orders, trades, total_volume):
         """Record market history data"""
         order_dicts = [{
@@ -140,6 +195,24 @@ class DataRecorder:
             'short_interest': self.context.public_info.get('short_interest', 0)
         })
 
+    def get_last_round_summary(self, stock_id: str) -> Optional[Dict[str, Any]]:
+        """Most recent market_data row for a stock, or None before the first round"""
+        return self.last_round_summary.get(stock_id)
+
+    def get_round_volume(self, stock_id: str, round_number: int) -> float:
+        """Volume recorded for a stock in the given (1-based) round, 0 if none"""
+        summary = self.last_round_summary.get(stock_id)
+        if summary is None or summary['round'] != round_number:
+            return 0
+        return summary['total_volume']
+
+    def _append_market_row(self, row: Dict[str, Any]):
+        self.market_data.append(row)
+        self.last_round_summary[row['stock_id']] = row
+        self.indicators.record(row['stock_id'], row['price'], row['total_volume'])
+        for column, stats in self._market_stats.items():
+            stats.add(row[column])
+
     def _record_market_data(self, round_number, market_state, trades, total_volume, timestamp):
         """Record market data - one row per stock in multi-stock mode"""
         if market_state.get('is_multi_stock'):
@@ -149,7 +222,7 @@ class DataRecorder:
                 stock_trades = [t for t in trades if t.stock_id == stock_id]
                 stock_volume = sum(t.quantity for t in stock_trades)
 
-                self.market_data.append({
+                self._append_market_row({
                     'round': round_number + 1,
                     'stock_id': stock_id,
                     'price': stock_state['price'],
@@ -168,7 +241,7 @@ class DataRecorder:
                 })
         else:
             # Single-stock: Original behavior
-            self.market_data.append({
+            self._append_market_row({
                 'round': round_number + 1,
                 'stock_id': 'DEFAULT_STOCK',
                 'price': self.context.current_price,
@@ -208,6 +281,7 @@ class DataRecorder:
             dividends: Aggregate dividend (single-stock) or sum (multi-stock)
             dividends_by_stock: Per-stock dividends for multi-stock scenarios
         """
+        wealth_row = {}
         for agent_id in self.agent_repository.get_all_agent_ids():
             # Get agent state through repository
             state = self.agent_repository.get_agent_state_snapshot(
@@ -233,7 +307,7 @@ class DataRecorder:
             )
             
             # Update wealth history
-            self.wealth_history[agent_id].append(current_wealth)
+            wealth_row[agent_id] = current_wealth
             
             # Record agent data
             self.agent_data.append({
@@ -258,6 +332,16 @@ class DataRecorder:
                 'total_cash': round(state.cash + state.committed_cash + state.dividend_cash, 2)  # Full total including committed
             })
 
+        self._record_wealth(wealth_row)
+
+    def _record_wealth(self, wealth_row: Dict[Any, float]):
+        """Append one round of agent wealth (a row in columnar mode, per-agent lists otherwise)"""
+        if self.columnar:
+            self.wealth_history.append(wealth_row)
+            return
+        for agent_id, wealth in wealth_row.items():
+            self.wealth_history[agent_id].append(wealth)
+
     def _record_stock_positions(self, round_number: int, market_state: dict, timestamp: str):
         """Record per-stock positions for each agent in multi-stock mode"""
         if not market_state.get('is_multi_stock'):
@@ -452,30 +536,33 @@ class DataRecorder:
                 msg['timestamp'] = datetime.datetime.now().isoformat()
             self.social_messages.extend(all_messages)
 
-        # Save market data
-        market_df = pd.DataFrame(self.market_data)
-        market_df.to_csv(data_path / 'market_data.csv', index=False)
+        if self.columnar:
+            self._save_columnar_tables(data_path)
+        else:
+            # Save market data
+            market_df = pd.DataFrame(self.market_data)
+            market_df.to_csv(data_path / 'market_data.csv', index=False)
 
-        # Save trade data
-        trade_df = pd.DataFrame(self.trade_data)
-        trade_df.to_csv(data_path / 'trade_data.csv', index=False)
+            # Save trade data
+            trade_df = pd.DataFrame(self.trade_data)
+            trade_df.to_csv(data_path / 'trade_data.csv', index=False)
 
-        # Save agent data
-        agent_df = pd.DataFrame(self.agent_data)
-        agent_df.to_csv(data_path / 'agent_data.csv', index=False)
+            # Save agent data
+            agent_df = pd.DataFrame(self.agent_data)
+            agent_df.to_csv(data_path / 'agent_data.csv', index=False)
 
-        # Save order data
-        order_df = pd.DataFrame(self.order_data)
-        order_df.to_csv(data_path / 'order_data.csv', index=False)
+            # Save order data
+            order_df = pd.DataFrame(self.order_data)
+            order_df.to_csv(data_path / 'order_data.csv', index=False)
 
-        # Save wealth history
-        wealth_df = pd.DataFrame(self.wealth_history)
-        wealth_df.to_csv(data_path / 'wealth_history.csv', index=False)
+            # Save wealth history
+            wealth_df = pd.DataFrame(self.wealth_history)
+            wealth_df.to_csv(data_path / 'wealth_history.csv', index=False)
 
-        # Save stock positions (multi-stock)
-        if self.stock_positions:
-            stock_positions_df = pd.DataFrame(self.stock_positions)
-            stock_positions_df.to_csv(data_path / 'stock_positions.csv', index=False)
+            # Save stock positions (multi-stock)
+            if self.stock_positions:
+                stock_positions_df = pd.DataFrame(self.stock_positions)
+                stock_positions_df.to_csv(data_path / 'stock_positions.csv', index=False)
 
         # Save dividend data
         dividend_df = pd.DataFrame(self.dividend_data)
@@ -504,11 +591,7 @@ class DataRecorder:
         ]
 
         summary_data = {
-            'avg_price': np.mean([d['price'] for d in self.market_data]),
-            'price_volatility': np.std([d['price'] for d in self.market_data]),
-            'avg_volume': np.mean([d['total_volume'] for d in self.market_data]),
-            'total_trades': sum(d['num_trades'] for d in self.market_data),
-            'avg_price_fundamental_ratio': np.mean([d['price_fundamental_ratio'] for d in self.market_data]),
+            **self._market_summary(),
             'avg_dividend': np.mean(dividend_values) if dividend_values else 0.0,
             'total_dividends_paid': sum(
                 d['total_dividend_payment'] for d in self.dividend_data
@@ -522,6 +605,36 @@ class DataRecorder:
         with open(data_path / 'summary_statistics.json', 'w') as f:
             json.dump(summary_data, f, indent=4)
 
+    def _save_columnar_tables(self, data_path: Path):
+        """Flush remaining chunks and stream each table into its usual CSV"""
+        self.flush()
+        if not self.storage['export_csv']:
+            return
+        for name in COLUMNAR_TABLES:
+            table = getattr(self, name)
+            if name == 'stock_positions' and not len(table):
+                continue  # Multi-stock only, as in memory mode
+            table.export_csv(data_path / f'{name}.csv')
+
+    def _market_summary(self) -> Dict[str, Any]:
+        """Price/volume summary statistics over market_data"""
+        if self.columnar:
+            stats = self._market_stats
+            return {
+                'avg_price': stats['price'].average(),
+                'price_volatility': stats['price'].std(),
+                'avg_volume': stats['total_volume'].average(),
+                'total_trades': int(stats['num_trades'].total),
+                'avg_price_fundamental_ratio': stats['price_fundamental_ratio'].average(),
+            }
+        return {
+            'avg_price': np.mean([d['price'] for d in self.market_data]),
+            'price_volatility': np.std([d['price'] for d in self.market_data]),
+            'avg_volume': np.mean([d['total_volume'] for d in self.market_data]),
+            'total_trades': sum(d['num_trades'] for d in self.market_data),
+            'avg_price_fundamental_ratio': np.mean([d['price_fundamental_ratio'] for d in self.market_data]),
+        }
+
     def _save_agent_memory_timeline(self, data_path: Path):
         """Export all agent memory notes to a separate CSV file for timeline analysis
 
@@ -2,14 +2,20 @@ import random
 from market.orders.handlers.market_handler import MarketOrderHandler
 from market.orders.handlers.limit_handler import LimitOrderHandler
 from market.orders.order import Order
-from typing import List
+from typing import List, Tuple
+from market.trade import Trade
 from market.engine.market_result import MarketResult
 from market.engine.services.order_processing_service import OrderProcessingService
 from market.engine.services.trade_processing_service import TradeProcessingService
+from market.engine.services.call_auction_service import CallAuctionService
 from services.logging_service import LoggingService
 
+MATCHING_MODES = ('continuous', 'call_auction')
+
 class MatchingEngine:
-    def __init__(self, order_book, agent_manager, agent_repository, order_repository, context, order_state_manager = None, logger=None, trades_logger=None, trade_execution_service=None, is_multi_stock=False, enable_intra_round_margin_checking=False, stock_id="DEFAULT_STOCK"):
+    def __init__(self, order_book, agent_manager, agent_repository, order_repository, context, order_state_manager = None, logger=None, trades_logger=None, trade_execution_service=None, is_multi_stock=False, enable_intra_round_margin_checking=False, stock_id="DEFAULT_STOCK", rng=None, matching_mode="continuous", auction_allocation="time"):
+        if matching_mode not in MATCHING_MODES:
+            raise ValueError(f"Unknown matching mode: {matching_mode}. Must be one of {list(MATCHING_MODES)}")
         self.order_book = order_book
         self.agent_manager = agent_manager
         self.order_repository = order_repository
@@ -20,9 +26,10 @@ class MatchingEngine:
         self.is_multi_stock = is_multi_stock  # Flag to indicate multi-stock mode
         self.enable_intra_round_margin_checking = enable_intra_round_margin_checking  # Flag to enable margin checking during matching
         self.stock_id = stock_id  # Stock identifier for this engine (used in multi-stock margin checking)
+        self.matching_mode = matching_mode  # "continuous" or "call_auction"
         
         # Initialize services
-        self.order_processing_service = OrderProcessingService(order_book)
+        self.order_processing_service = OrderProcessingService(order_book, rng=rng)
         self.trade_processing_service = TradeProcessingService(
             agent_manager,
             order_state_manager,
@@ -54,15 +61,47 @@ class MatchingEngine:
             context=self.context
         )
 
+        # Uniform-price batch clearing of each round's orders (matching_mode="call_auction")
+        self.call_auction_service = None
+        if matching_mode == 'call_auction':
+            self.call_auction_service = CallAuctionService(
+                order_book=order_book,
+                order_state_manager=order_state_manager,
+                trade_execution_service=trade_execution_service,
+                market_order_handler=self.market_order_handler,
+                context=self.context,
+                allocation=auction_allocation
+            )
+
     def match_orders(self, new_orders: List[Order], current_price: float, round_number: int) -> MarketResult:
         """Match orders for a trading round with prioritized processing"""
-        # Log pre-match state
-        LoggingService.log_market_state(self.order_book, round_number, "Pre-Match State")
+        batches = self.prepare_orders(new_orders)
+        trades = self.match_prepared_orders(batches, current_price, round_number)
+        return self.finish_round(trades, current_price, round_number)
 
+    def prepare_orders(self, new_orders: List[Order]) -> Tuple[List[Order], List[Order], List[Order]]:
+        """Split a round's orders into (liquidation, market, limit); draws the processing order from rng"""
         # Separate liquidation orders initiated by broker
         liquidation_orders = [o for o in new_orders if getattr(o, 'liquidation', False)]
         regular_orders = [o for o in new_orders if not getattr(o, 'liquidation', False)]
 
+        # Split remaining orders by type
+        market_orders, limit_orders = self.order_processing_service.split_orders_by_type(regular_orders)
+        return liquidation_orders, market_orders, limit_orders
+
+    def match_prepared_orders(self, batches: Tuple[List[Order], List[Order], List[Order]],
+                              current_price: float, round_number: int) -> List[Trade]:
+        """Match prepared orders against this stock's book and execute the trades.
+
+        Reads only this stock's book and orders, plus agent balances when
+        validating market orders, so several stocks can match at once while
+        their settlement buffers record (see BaseSimulation._match_stocks_in_parallel).
+        """
+        liquidation_orders, market_orders, limit_orders = batches
+
+        # Log pre-match state
+        self._end_phase(round_number, "Pre-Match State")
+
         trades = []
 
         # Process liquidation orders with highest priority
@@ -75,32 +114,18 @@ class MatchingEngine:
                     liq_trades, [], []
                 )
             )
-            LoggingService.log_market_state(
-                self.order_book, round_number, "Post-Liquidation Order State"
-            )
+            self._end_phase(round_number, "Post-Liquidation Order State")
 
-        # Split remaining orders by type
-        market_orders, limit_orders = self.order_processing_service.split_orders_by_type(regular_orders)
-        
-        # Handle limit orders
-        crossing_orders = self.limit_order_handler.add_non_crossing_orders(limit_orders)
-        LoggingService.log_market_state(self.order_book, round_number, "Post-Limit Order State")
-        
-        # Process market orders
-        if market_orders:
-            market_trades, new_aggressive_limits = self.market_order_handler.process_orders(
-                market_orders, current_price, round_number
-            )
-            trades.extend(self.trade_processing_service.process_market_order_results(
-                market_trades, new_aggressive_limits, limit_orders
-            ))
-            LoggingService.log_market_state(self.order_book, round_number, "Post-Market Order State")
-        
-        # Process crossing limit orders
-        if crossing_orders:
-            limit_trades = self.limit_order_handler.process_orders(crossing_orders)
-            trades.extend(self.trade_processing_service.process_limit_order_results(limit_trades))
-        
+        if self.call_auction_service:
+            # All of the round's orders and the resting book clear at one price
+            trades.extend(self.call_auction_service.run(market_orders, limit_orders, current_price))
+            self._end_phase(round_number, "Post-Auction State")
+        else:
+            trades.extend(self._match_continuous(market_orders, limit_orders, current_price, round_number))
+        return trades
+
+    def finish_round(self, trades: List[Trade], current_price: float, round_number: int) -> MarketResult:
+        """Log the round's trades, set the new price and run margin calls at it"""
         # Log trades and calculate new price
         LoggingService.log_trades(trades, round_number)
         new_price = self.trade_processing_service.calculate_new_price(trades, current_price)
@@ -215,7 +240,7 @@ class MatchingEngine:
         # In multi-stock mode, wealth is updated centrally with all stock prices
         if not self.is_multi_stock:
             self.agent_repository.update_all_wealth(new_price)
-        LoggingService.log_market_state(self.order_book, round_number, "End of Round State")
+        self._end_phase(round_number, "End of Round State")
         
         return MarketResult(
             trades=trades,
@@ -223,6 +248,36 @@ class MatchingEngine:
             volume=sum(t.quantity for t in trades)
         )
 
+    def _match_continuous(self, market_orders: List[Order], limit_orders: List[Order],
+                          current_price: float, round_number: int) -> list:
+        """Non-crossing limits to the book, then market orders, then crossing limits, one order at a time"""
+        trades = []
+
+        # Handle limit orders
+        crossing_orders = self.limit_order_handler.add_non_crossing_orders(limit_orders)
+        self._end_phase(round_number, "Post-Limit Order State")
+        
+        # Process market orders
+        if market_orders:
+            market_trades, new_aggressive_limits = self.market_order_handler.process_orders(
+                market_orders, current_price, round_number
+            )
+            trades.extend(self.trade_processing_service.process_market_order_results(
+                market_trades, new_aggressive_limits, limit_orders
+            ))
+            self._end_phase(round_number, "Post-Market Order State")
+        
+        # Process crossing limit orders
+        if crossing_orders:
+            limit_trades = self.limit_order_handler.process_orders(crossing_orders)
+            trades.extend(self.trade_processing_service.process_limit_order_results(limit_trades))
+        return trades
+
+    def _end_phase(self, round_number: int, state_name: str) -> None:
+        """Publish the (possibly deferred) order book snapshot and log the book state"""
+        self.order_book.refresh_public_view()
+        LoggingService.log_market_state(self.order_book, round_number, state_name)
+
     def _check_and_create_margin_call_orders(self, current_price: float, round_number: int) -> List[Order]:
         """Check all agents for margin violations and create forced orders.
 
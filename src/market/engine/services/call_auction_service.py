@@ -0,0 +1,217 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+import numpy as np
+from market.orders.order import Order
+from market.trade import Trade
+from services.logging_service import LoggingService
+
+AUCTION_ALLOCATIONS = ('time', 'pro_rata')
+
+
+@dataclass
+class AuctionClearing:
+    """Uniform clearing price and per-order fills, aligned with the input arrays"""
+    price: Optional[float]
+    volume: int
+    buy_fills: np.ndarray
+    sell_fills: np.ndarray
+
+
+def clear_call_auction(buy_prices: Sequence[float], buy_quantities: Sequence[int],
+                       sell_prices: Sequence[float], sell_quantities: Sequence[int],
+                       reference_price: float, allocation: str = 'time',
+                       buy_budgets: Optional[Sequence[float]] = None) -> AuctionClearing:
+    """Clear one batch of orders at a single price.
+
+    Orders on each side are given in time priority. Market buys have price
+    inf and market sells price 0. A buy with a finite budget (a market buy's
+    committed cash) demands at most floor(budget / price) shares.
+
+    Aggregate demand and supply are cumulative sums over the distinct limit
+    prices. The clearing price maximises executed volume, then minimises the
+    order imbalance. Among prices still tied it is the reference price if
+    that lies between them, else the tied price nearest to it. Fills follow
+    price priority; the marginal price level is filled in time priority or
+    pro rata to remaining quantity.
+    """
+    if allocation not in AUCTION_ALLOCATIONS:
+        raise ValueError(f"Unknown auction allocation: {allocation}. Must be one of {list(AUCTION_ALLOCATIONS)}")
+    buy_prices = np.asarray(buy_prices, dtype=float)
+    sell_prices = np.asarray(sell_prices, dtype=float)
+    buy_quantities = np.asarray(buy_quantities, dtype=np.int64)
+    sell_quantities = np.asarray(sell_quantities, dtype=np.int64)
+    budgets = np.full(len(buy_prices), np.inf) if buy_budgets is None else np.asarray(buy_budgets, dtype=float)
+    no_trade = AuctionClearing(None, 0, np.zeros(len(buy_prices), dtype=np.int64),
+                               np.zeros(len(sell_prices), dtype=np.int64))
+    if not len(buy_prices) or not len(sell_prices):
+        return no_trade
+
+    limits = np.concatenate([buy_prices, sell_prices])
+    levels = np.unique(limits[np.isfinite(limits) & (limits > 0)])
+    if not len(levels):
+        levels = np.array([reference_price])  # Market orders only
+
+    demand = _demand(levels, buy_prices, buy_quantities, budgets)
+    supply = np.cumsum(np.bincount(np.searchsorted(levels, sell_prices, side='left'),
+                                   weights=sell_quantities, minlength=len(levels) + 1)[:len(levels)])
+    volume = np.minimum(demand, supply)
+    if volume.max() <= 0:
+        return no_trade
+
+    imbalance = np.abs(demand - supply)
+    tied = volume == volume.max()
+    tied &= imbalance == imbalance[tied].min()
+    candidates = levels[tied]
+    if candidates[0] <= reference_price <= candidates[-1]:
+        price = float(reference_price)
+    else:
+        price = float(candidates[np.argmin(np.abs(candidates - reference_price))])
+
+    buy_eligible = np.where(buy_prices >= price,
+                            np.minimum(buy_quantities, np.floor(budgets / price)), 0).astype(np.int64)
+    sell_eligible = np.where(sell_prices <= price, sell_quantities, 0)
+    executed = int(min(buy_eligible.sum(), sell_eligible.sum()))
+    return AuctionClearing(
+        price=price,
+        volume=executed,
+        buy_fills=_allocate(-buy_prices, buy_eligible, executed, allocation),
+        sell_fills=_allocate(sell_prices, sell_eligible, executed, allocation)
+    )
+
+
+def _demand(levels: np.ndarray, prices: np.ndarray, quantities: np.ndarray,
+            budgets: np.ndarray) -> np.ndarray:
+    """Shares bid at or above each level"""
+    budgeted = np.isfinite(budgets)
+    unbudgeted = ~budgeted
+    index = np.searchsorted(levels, prices[unbudgeted], side='right')
+    # index = number of levels at or below each bid, so a bid counts at levels < index
+    by_index = np.bincount(index, weights=quantities[unbudgeted], minlength=len(levels) + 1)
+    demand = by_index[::-1].cumsum()[::-1][1:]
+    if budgeted.any():
+        # Budget-capped (market) buys: affordable shares fall as the price rises
+        affordable = np.floor(budgets[budgeted, None] / levels[None, :])
+        affordable = np.minimum(quantities[budgeted, None], affordable)
+        demand = demand + np.where(prices[budgeted, None] >= levels[None, :], affordable, 0).sum(axis=0)
+    return demand
+
+
+def _allocate(priority: np.ndarray, eligible: np.ndarray, volume: int, allocation: str) -> np.ndarray:
+    """Split volume over orders, best (lowest) priority key first, ties by input order"""
+    fills = np.zeros(len(eligible), dtype=np.int64)
+    if volume <= 0:
+        return fills
+    order = np.argsort(priority, kind='stable')
+    wanted = eligible[order]
+    before = np.cumsum(wanted) - wanted
+    if allocation == 'time':
+        fills[order] = np.clip(volume - before, 0, wanted)
+        return fills
+
+    # Pro rata within the marginal price level, price priority across levels
+    keys = priority[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    level_of = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(keys)]))
+    level_wanted = np.add.reduceat(wanted, starts)
+    level_take = np.clip(volume - (np.cumsum(level_wanted) - level_wanted), 0, level_wanted)
+    share = np.divide(wanted * level_take[level_of], level_wanted[level_of],
+                      out=np.zeros(len(wanted)), where=level_wanted[level_of] > 0)
+    taken = np.floor(share).astype(np.int64)
+    for level in np.flatnonzero(level_take < level_wanted):
+        leftover = int(level_take[level] - taken[level_of == level].sum())
+        if leftover > 0:
+            # Largest remainders first, earlier orders on ties
+            members = np.flatnonzero(level_of == level)
+            remainders = share[members] - taken[members]
+            taken[members[np.argsort(-remainders, kind='stable')[:leftover]]] += 1
+    fills[order] = taken
+    return fills
+
+
+class CallAuctionService:
+    """Clears a round's orders, with the resting book, as one uniform-price call auction"""
+
+    def __init__(self, order_book, order_state_manager, trade_execution_service, market_order_handler,
+                 context, allocation: str = 'time'):
+        if allocation not in AUCTION_ALLOCATIONS:
+            raise ValueError(f"Unknown auction allocation: {allocation}. Must be one of {list(AUCTION_ALLOCATIONS)}")
+        self.order_book = order_book
+        self.order_state_manager = order_state_manager
+        self.trade_execution_service = trade_execution_service
+        self.market_order_handler = market_order_handler
+        self.context = context
+        self.allocation = allocation
+
+    def run(self, market_orders: List[Order], limit_orders: List[Order], current_price: float) -> List[Trade]:
+        """Execute the auction's trades, rest unfilled limits in the book and cancel unfilled market orders"""
+        market_orders = self.market_order_handler._validate_orders(market_orders)
+        for order in limit_orders:
+            self.order_state_manager.transition_to_matching(order, notes="Entering call auction")
+            self.order_state_manager.transition_to_limit_matching(order, notes="Entering call auction")
+
+        # Time priority: resting orders (price-time order), then this round's orders as shuffled
+        book_buys = [entry.order for entry in sorted(self.order_book.buy_orders)]
+        book_sells = [entry.order for entry in sorted(self.order_book.sell_orders)]
+        new_orders = market_orders + limit_orders
+        buys = book_buys + [o for o in new_orders if o.side == 'buy']
+        sells = book_sells + [o for o in new_orders if o.side == 'sell']
+
+        clearing = clear_call_auction(
+            buy_prices=[o.price if o.order_type == 'limit' else np.inf for o in buys],
+            buy_quantities=[o.remaining_quantity for o in buys],
+            sell_prices=[o.price if o.order_type == 'limit' else 0.0 for o in sells],
+            sell_quantities=[o.remaining_quantity for o in sells],
+            reference_price=current_price,
+            allocation=self.allocation,
+            buy_budgets=[o.current_cash_commitment if o.order_type == 'market' else np.inf for o in buys]
+        )
+        trades = self._execute(buys, clearing.buy_fills, sells, clearing.sell_fills, clearing.price)
+        if clearing.price is not None:
+            LoggingService.get_logger('market').info(
+                f"Call auction cleared {clearing.volume} shares @ ${clearing.price:.2f} "
+                f"({len(buys)} bids, {len(sells)} asks, {len(trades)} trades)"
+            )
+
+        self._settle_book(book_buys + book_sells)
+        for order in new_orders:
+            if order.remaining_quantity <= 0:
+                continue
+            if order.order_type == 'market':
+                self.order_state_manager.handle_single_order_cancellation(order, "Unfilled in call auction")
+            else:
+                self.order_state_manager.transition_to_pending(order, notes="Resting after call auction")
+                self.order_book.add_limit_order(order)
+                self.order_state_manager.transition_to_active(order)
+                self.order_state_manager.sync_agent_orders(order.agent_id)
+        return trades
+
+    def _execute(self, buys: List[Order], buy_fills: np.ndarray, sells: List[Order],
+                 sell_fills: np.ndarray, price: Optional[float]) -> List[Trade]:
+        """Pair filled buys and sells in priority order into trades at the clearing price"""
+        trades = []
+        buy_queue = [[buys[i], int(buy_fills[i])] for i in np.flatnonzero(buy_fills)]
+        sell_queue = [[sells[i], int(sell_fills[i])] for i in np.flatnonzero(sell_fills)]
+        b = s = 0
+        while b < len(buy_queue) and s < len(sell_queue):
+            buy, sell = buy_queue[b], sell_queue[s]
+            quantity = min(buy[1], sell[1])
+            trade = Trade.from_orders(buy_order=buy[0], sell_order=sell[0], quantity=quantity,
+                                      price=price, round=self.context.round_number)
+            self.trade_execution_service.handle_trade_execution(trade)
+            LoggingService.log_trade(trade, prefix="Auction ")
+            trades.append(trade)
+            buy[1] -= quantity
+            sell[1] -= quantity
+            b += buy[1] == 0
+            s += sell[1] == 0
+        return trades
+
+    def _settle_book(self, book_orders: List[Order]) -> None:
+        """Drop resting orders the auction filled; filled orders lead their side of the book"""
+        while (best := self.order_book.peek_best_buy()) is not None and best.remaining_quantity <= 0:
+            self.order_book.pop_best_buy()
+        while (best := self.order_book.peek_best_sell()) is not None and best.remaining_quantity <= 0:
+            self.order_book.pop_best_sell()
+        for order in book_orders:
+            if order.remaining_quantity <= 0 and self.order_book.contains_order(order):
+                self.order_book.remove_order(order)  # Pro rata can fill one inside the marginal level
@@ -0,0 +1,202 @@
+"""Rolling price and volume indicators, updated once per round.
+
+DataRecorder feeds every market_data row into an IndicatorStore: one
+RollingSeries per stock, each a fixed-size ring buffer of the most recent
+prices and volumes with running sums alongside. Moving averages, rolling
+volatility, returns and last-N views are then O(1) (or O(N) for an N-row
+view) however long the run is, instead of a rescan of `history` per agent
+per round.
+
+The agent-facing `history` is a MarketHistory: the usual list of per-round
+dicts, carrying the store. Agents look their series up with price_series()
+and fall back to scanning the list when it is a plain list (tests, analysis
+scripts) or the window is longer than the buffer.
+"""
+import math
+from typing import Dict, List, Optional
+
+import numpy as np
+
+DEFAULT_CAPACITY = 1024
+
+
+class RollingSeries:
+    """The last `capacity` prices and volumes of one stock.
+
+    Values are written twice into buffers of twice the capacity, so the
+    last N rounds are always a contiguous slice and views need no copy.
+    Cumulative sums of prices, returns and squared returns make window
+    means and variances two lookups.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 2:
+            raise ValueError(f"Indicator capacity must be at least 2, got {capacity}")
+        self.capacity = capacity
+        self.count = 0
+        # One slot more than the capacity: a window of `capacity` rounds
+        # needs the cumulative sum just before it
+        self._size = capacity + 1
+        self._prices = np.zeros(2 * self._size)
+        self._volumes = np.zeros(2 * self._size)
+        self._returns = np.zeros(2 * self._size)
+        self._price_sums = np.zeros(2 * self._size)
+        self._return_sums = np.zeros(2 * self._size)
+        self._square_sums = np.zeros(2 * self._size)
+        self._end = 0  # One past the latest value in the upper copy
+        self._ema: Dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, price: float, volume: float = 0.0) -> None:
+        """Append one round"""
+        if self.count:
+            last = self._end - 1
+            previous = self._prices[last]
+            ret = price / previous - 1 if previous else 0.0
+            price_sum = self._price_sums[last] + price
+            return_sum = self._return_sums[last] + ret
+            square_sum = self._square_sums[last] + ret * ret
+        else:
+            ret = 0.0
+            price_sum, return_sum, square_sum = price, 0.0, 0.0
+
+        slot = self.count % self._size
+        for i in (slot, slot + self._size):
+            self._prices[i] = price
+            self._volumes[i] = volume
+            self._returns[i] = ret
+            self._price_sums[i] = price_sum
+            self._return_sums[i] = return_sum
+            self._square_sums[i] = square_sum
+        self._end = slot + self._size + 1
+        self.count += 1
+
+        for span, value in self._ema.items():
+            alpha = 2 / (span + 1)
+            self._ema[span] = alpha * price + (1 - alpha) * value
+
+    @property
+    def available(self) -> int:
+        """Rounds still in the buffer"""
+        return min(self.count, self.capacity)
+
+    def covers(self, window: int) -> bool:
+        """Whether the last `window` rounds are all still buffered"""
+        return 0 < window <= self.available
+
+    def _check_window(self, window: int, available: int) -> None:
+        if not 0 < window <= available:
+            raise ValueError(f"Window {window} outside the {available} buffered values")
+
+    def last_price(self) -> float:
+        self._check_window(1, self.available)
+        return float(self._prices[self._end - 1])
+
+    def prices(self, n: Optional[int] = None) -> np.ndarray:
+        """Read-only view of the last n prices (all buffered by default), oldest first"""
+        return self._view(self._prices, self.available if n is None else n, self.available)
+
+    def volumes(self, n: Optional[int] = None) -> np.ndarray:
+        """Read-only view of the last n volumes, oldest first"""
+        return self._view(self._volumes, self.available if n is None else n, self.available)
+
+    def returns(self, n: Optional[int] = None) -> np.ndarray:
+        """Read-only view of the last n simple returns, oldest first"""
+        available = min(self.count - 1, self.capacity)
+        return self._view(self._returns, available if n is None else n, available)
+
+    def _view(self, values: np.ndarray, n: int, available: int) -> np.ndarray:
+        if n == 0:
+            return values[:0]
+        self._check_window(n, available)
+        view = values[self._end - n:self._end]
+        view.flags.writeable = False
+        return view
+
+    def _window_sum(self, sums: np.ndarray, window: int) -> float:
+        last = self._end - 1
+        if window == self.count:
+            return float(sums[last])
+        return float(sums[last] - sums[last - window])
+
+    def sma(self, window: int) -> float:
+        """Mean of the last `window` prices"""
+        self._check_window(window, self.available)
+        return self._window_sum(self._price_sums, window) / window
+
+    def volatility(self, window: int) -> float:
+        """Population standard deviation of the last `window` returns"""
+        self._check_window(window, min(self.count - 1, self.capacity))
+        if window == 1:
+            return 0.0
+        mean = self._window_sum(self._return_sums, window) / window
+        variance = self._window_sum(self._square_sums, window) / window - mean * mean
+        return math.sqrt(max(variance, 0.0))
+
+    def ema(self, span: int) -> float:
+        """Exponential moving average with alpha = 2 / (span + 1).
+
+        The first call for a span seeds it with the oldest buffered price and
+        runs over the buffer once; later rounds update it as they are added.
+        """
+        if span not in self._ema:
+            prices = self.prices()
+            if not len(prices):
+                raise ValueError("No prices recorded yet")
+            alpha = 2 / (span + 1)
+            value = float(prices[0])
+            for price in prices[1:].tolist():
+                value = alpha * price + (1 - alpha) * value
+            self._ema[span] = value
+        return self._ema[span]
+
+
+class IndicatorStore:
+    """A RollingSeries per stock, fed from DataRecorder's market_data rows"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._series: Dict[str, RollingSeries] = {}
+
+    def record(self, stock_id: str, price: float, volume: float = 0.0) -> None:
+        series = self._series.get(stock_id)
+        if series is None:
+            series = self._series[stock_id] = RollingSeries(self.capacity)
+        series.add(price, volume)
+
+    def series(self, stock_id: str = "DEFAULT_STOCK") -> Optional[RollingSeries]:
+        return self._series.get(stock_id)
+
+    def stock_ids(self) -> List[str]:
+        return list(self._series)
+
+
+class MarketHistory(list):
+    """DataRecorder.history: the per-round market records, with the indicator store.
+
+    `history[-1]['price']` is the DEFAULT_STOCK price of the same round, so
+    the DEFAULT_STOCK series is in step with the list once each round is
+    recorded.
+    """
+
+    def __init__(self, indicators: IndicatorStore, stock_id: str = "DEFAULT_STOCK"):
+        super().__init__()
+        self.indicators = indicators
+        self.stock_id = stock_id
+
+
+def price_series(history) -> Optional[RollingSeries]:
+    """The rolling series matching `history`, or None for a plain list.
+
+    Also None when the series is not in step with the list, e.g. while a
+    round is half recorded.
+    """
+    indicators = getattr(history, 'indicators', None)
+    if indicators is None:
+        return None
+    series = indicators.series(history.stock_id)
+    if series is None or series.count != len(history):
+        return None
+    return series
@@ -1,21 +1,28 @@
-from typing import Dict
+from typing import Dict, Optional
 import numpy as np
 from .information_types import InformationType, InformationSignal, InfoCapability, InformationProvider, SignalCategory, SIGNAL_CATEGORIES
+from .signal_history import DEFAULT_SIGNAL_RETENTION, SignalArchive, SignalHistory
 
 
 class InformationService:
     """Central service managing all information distribution"""
 
-    def __init__(self, agent_repository, market_state_managers=None):
+    def __init__(self, agent_repository, market_state_managers=None, np_rng=None,
+                 retention_rounds: Optional[int] = DEFAULT_SIGNAL_RETENTION,
+                 archive: Optional[SignalArchive] = None):
         self.agent_repository = agent_repository
+        self.np_rng = np_rng if np_rng is not None else np.random  # Signal noise
         self.market_state_managers = market_state_managers or {}
         # Multi-stock if market_state_managers dict was explicitly provided (even with 1 stock)
         # This must match base_sim.py's is_multi_stock = stock_configs is not None
         self.is_multi_stock = market_state_managers is not None and len(self.market_state_managers) > 0
         self.providers: Dict[InformationType, InformationProvider] = {}
-        # Separate current signals from history
+        # Separate current signals from history. Rounds older than
+        # retention_rounds move to the archive (or are dropped without one)
         self.current_signals: Dict[str, Dict[InformationType, InformationSignal]] = {}
-        self.signal_history: Dict[int, Dict[str, Dict[InformationType, InformationSignal]]] = {}
+        self.signal_history: Dict[int, Dict[str, Dict[InformationType, InformationSignal]]] = SignalHistory(
+            retention_rounds, archive
+        )
         
     def register_provider(self, type: InformationType, provider: InformationProvider):
         """Register an information provider"""
@@ -33,8 +40,7 @@ class InformationService:
                 }
                 all_stock_signals[stock_id] = stock_signals
 
-            # Store in history
-            self.signal_history[round_number] = {
+            round_signals = {
                 'base': all_stock_signals,  # Store all stocks
                 'agent': {}
             }
@@ -51,7 +57,10 @@ class InformationService:
                     'is_multi_stock': True
                 }
                 self.current_signals[agent_id] = agent_signals
-                self.signal_history[round_number]['agent'][agent_id] = agent_signals
+                round_signals['agent'][agent_id] = agent_signals
+
+            # Store in history once complete: storing may evict old rounds to the archive
+            self.signal_history[round_number] = round_signals
 
             # Distribute to agents
             self.agent_repository.distribute_information(self.current_signals)
@@ -63,8 +72,7 @@ class InformationService:
                 for info_type, provider in self.providers.items()
             }
 
-            # Store in history
-            self.signal_history[round_number] = {
+            round_signals = {
                 'base': base_signals,
                 'agent': {}
             }
@@ -79,7 +87,10 @@ class InformationService:
                     agent, base_signals, round_number
                 )
                 self.current_signals[agent_id] = agent_signals
-                self.signal_history[round_number]['agent'][agent_id] = agent_signals
+                round_signals['agent'][agent_id] = agent_signals
+
+            # Store in history once complete: storing may evict old rounds to the archive
+            self.signal_history[round_number] = round_signals
 
             # Distribute to agents
             self.agent_repository.distribute_information(self.current_signals)
@@ -123,7 +134,7 @@ class InformationService:
         elif category == SignalCategory.FUNDAMENTAL:
             # Apply noise to fundamental signals
             if isinstance(value, (int, float)) and capability.noise_level > 0:
-                noise = np.random.normal(0, capability.noise_level * abs(value))
+                noise = self.np_rng.normal(0, capability.noise_level * abs(value))
                 value += noise
                 metadata['noisy'] = True
             
@@ -167,13 +178,18 @@ class InformationService:
         return agent_signals
 
     def get_signal_history(self, round_number: int = None, agent_id: str = None):
-        """Get historical signals"""
+        """Get historical signals
+
+        Without a round, returns the rounds still in memory. A given round is
+        looked up in memory first, then in the archive.
+        """
         if round_number is None:
             return self.signal_history
-            
-        if round_number not in self.signal_history:
+
+        round_signals = self.signal_history.lookup(round_number)
+        if round_signals is None:
             raise ValueError(f"No signals for round: {round_number}")
-            
+
         if agent_id:
-            return self.signal_history[round_number]['agent'].get(agent_id)
-        return self.signal_history[round_number]['base']
+            return round_signals['agent'].get(agent_id)
+        return round_signals['base']
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from typing import Dict, Any
 from .information_types import InformationType, InformationSignal, SignalCategory, DEFAULT_CAPABILITIES
+from services.simulation_runtime import SimulationRuntime
 
 @dataclass
 class ProviderConfig:
@@ -323,8 +324,10 @@ class NewsProvider(BaseProvider):
     - Multi-stock news (affected_stocks=["STOCK_A", "STOCK_B"])
     """
 
-    # Class-level cache for multi-stock scenarios (shared across instances)
-    _multi_stock_cache: Dict[int, list] = {}
+    @staticmethod
+    def _multi_stock_cache() -> Dict[int, list]:
+        """Multi-stock news by round, shared by this simulation's providers"""
+        return SimulationRuntime.current().news_cache
 
     def __init__(self, market_state_manager, config: ProviderConfig = ProviderConfig(),
                  news_service=None, total_rounds: int = 20):
@@ -392,9 +395,10 @@ class NewsProvider(BaseProvider):
             managers: Dict of {stock_id: market_state_manager}
 
         Returns:
-            List of NewsItem objects (cached at class level)
+            List of NewsItem objects (cached per simulation)
         """
-        if round_number not in NewsProvider._multi_stock_cache:
+        cache = NewsProvider._multi_stock_cache()
+        if round_number not in cache:
             # Collect market state from all managers
             stocks_data = {}
             for stock_id, manager in managers.items():
@@ -406,9 +410,9 @@ class NewsProvider(BaseProvider):
                 total_rounds=self.total_rounds,
                 stocks_data=stocks_data
             )
-            NewsProvider._multi_stock_cache[round_number] = news_items
+            cache[round_number] = news_items
 
-        return NewsProvider._multi_stock_cache[round_number]
+        return cache[round_number]
 
     def generate_signal_for_manager(self, manager, round_number: int) -> InformationSignal:
         """
@@ -420,8 +424,9 @@ class NewsProvider(BaseProvider):
         stock_id = getattr(manager, 'stock_id', None)
 
         # Check if we have multi-stock cached news for this round
-        if round_number in NewsProvider._multi_stock_cache:
-            news_items = NewsProvider._multi_stock_cache[round_number]
+        cache = NewsProvider._multi_stock_cache()
+        if round_number in cache:
+            news_items = cache[round_number]
         else:
             # Fallback: generate for single stock (shouldn't happen in proper multi-stock flow)
             state = manager.get_observable_state()
@@ -449,4 +454,4 @@ class NewsProvider(BaseProvider):
         """Clear news cache (call between simulations if reusing provider)"""
         self._news_cache.clear()
         self._price_history.clear()
-        NewsProvider._multi_stock_cache.clear()
\ No newline at end of file
+        NewsProvider._multi_stock_cache().clear()
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""Round-keyed signal history with bounded retention.
+
+InformationService records every agent's signals every round, and each
+agent archives a copy of its own. Kept whole, that grows with rounds x
+agents x signal types. A SignalHistory keeps the last `retention_rounds`
+rounds in memory (the prompt formatters show 5) and hands older rounds to
+a SignalArchive: one pickled row per round in a SQLite file, so any round
+of a finished or running simulation can still be looked up.
+
+Rounds must be added in increasing order, as the simulation does; the
+oldest round is the first key.
+"""
+import pickle
+import sqlite3
+from pathlib import Path
+from typing import Any, List, Optional
+
+# Rounds of signals kept in memory by default: the price history lookback
+# of MarketStateFormatter
+DEFAULT_SIGNAL_RETENTION = 5
+
+
+class SignalArchive:
+    """Rounds of signals pickled into a SQLite table keyed by round"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        # Losing the tail of the archive on a crash is acceptable; a sync per
+        # round is not
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS signals (round INTEGER PRIMARY KEY, payload BLOB NOT NULL)"
+        )
+
+    def put(self, round_number: int, signals: Any) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO signals (round, payload) VALUES (?, ?)",
+            (round_number, pickle.dumps(signals, protocol=pickle.HIGHEST_PROTOCOL)),
+        )
+        self._conn.commit()
+
+    def get(self, round_number: int) -> Optional[Any]:
+        row = self._conn.execute(
+            "SELECT payload FROM signals WHERE round = ?", (round_number,)
+        ).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def rounds(self) -> List[int]:
+        return [row[0] for row in self._conn.execute("SELECT round FROM signals ORDER BY round")]
+
+    def __contains__(self, round_number: int) -> bool:
+        return self._conn.execute(
+            "SELECT 1 FROM signals WHERE round = ?", (round_number,)
+        ).fetchone() is not None
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class SignalHistory(dict):
+    """round -> signals, holding at most retention_rounds rounds in memory.
+
+    Setting a new round evicts the oldest ones beyond the retention to the
+    archive, or drops them when there is none. retention_rounds None keeps
+    every round.
+    """
+
+    def __init__(self, retention_rounds: Optional[int] = DEFAULT_SIGNAL_RETENTION,
+                 archive: Optional[SignalArchive] = None):
+        super().__init__()
+        if retention_rounds is not None and retention_rounds < 0:
+            raise ValueError(f"retention_rounds must be non-negative, got {retention_rounds}")
+        self.retention_rounds = retention_rounds
+        self.archive = archive
+
+    def __setitem__(self, round_number: int, signals: Any) -> None:
+        super().__setitem__(round_number, signals)
+        if self.retention_rounds is not None:
+            while len(self) > self.retention_rounds:
+                oldest = next(iter(self))
+                evicted = self.pop(oldest)
+                if self.archive is not None:
+                    self.archive.put(oldest, evicted)
+
+    def lookup(self, round_number: int) -> Optional[Any]:
+        """Signals of a round from memory or the archive, None if neither has it"""
+        signals = self.get(round_number)
+        if signals is None and self.archive is not None:
+            signals = self.archive.get(round_number)
+        return signals
+
+    def flush(self) -> None:
+        """Write the rounds still in memory to the archive, keeping them, so
+        the archive holds the whole run"""
+        if self.archive is not None:
+            for round_number, signals in self.items():
+                self.archive.put(round_number, signals)
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from typing import List, Optional, Dict
 from market.orders.order import Order, OrderState
+from services.settlement_buffer import SettlementBuffer
 
 @dataclass
 class OrderSyncState:
@@ -26,6 +27,13 @@ class AgentSyncService:
         
     def sync_agent_orders_from_order_repository(self, agent_id: str) -> SyncResult:
         """Synchronize agent's orders with the repository"""
+        if SettlementBuffer.defer(self.sync_agent_orders_from_order_repository, agent_id):
+            return SyncResult(
+                success=True,
+                message="Sync queued for settlement",
+                agent_id=agent_id
+            )
+
         try:
             # Verify agent exists
             if agent_id not in self._agent_repository:
@@ -36,7 +44,7 @@ class AgentSyncService:
                 )
                 
             # Get active orders from order repository
-            agent_orders = self._order_repository.get_agent_orders(agent_id)
+            agent_orders = self._order_repository.get_active_orders_from_agent(agent_id)
             
             # Validate orders before syncing
             if not self._validate_orders(agent_id, agent_orders):
@@ -22,8 +22,10 @@ class OrderState(Enum):
     FILLED = "filled"       # Fully executed
     CANCELLED = "cancelled" # Removed from book
 
-@dataclass
+@dataclass(slots=True)
 class OrderHistoryEntry:
+    """One state transition. Commitment figures are stored as numbers and
+    only formatted when the history is printed."""
     timestamp: float
     round_placed: int
     side: str
@@ -31,9 +33,41 @@ class OrderHistoryEntry:
     to_state: OrderState
     filled_quantity: float = 0
     price: Optional[float] = None
-    notes: Optional[str] = None
+    note: Optional[str] = None  # Caller's note, without commitment details
+    current_commitment: float = 0  # Cash for buys, shares for sells
+    original_commitment: float = 0
+    released: float = 0
+
+    @property
+    def commitment_info(self) -> str:
+        if self.side == 'buy':
+            details = (
+                f"cash_commit={self.current_commitment:.2f}",
+                f"orig_cash_commit={self.original_commitment:.2f}",
+                f"released_cash={self.released:.2f}"
+            )
+        else:
+            details = (
+                f"share_commit={self.current_commitment}",
+                f"orig_share_commit={self.original_commitment}",
+                f"released_shares={self.released}"
+            )
+        return f"[{', '.join(details)}]"
+
+    @property
+    def notes(self) -> str:
+        """Caller's note followed by the commitment snapshot"""
+        return f"{self.note + ' ' if self.note else ''}{self.commitment_info}"
 
 class Order:
+    __slots__ = (
+        'agent_id', 'stock_id', 'order_type', 'side', 'quantity', 'price', 'round_placed',
+        'timestamp', 'remaining_quantity', 'order_id', 'state', 'filled_quantity',
+        'original_cash_commitment', 'original_share_commitment',
+        'current_cash_commitment', 'current_share_commitment',
+        'released_cash', 'released_shares', 'replace_decision', 'is_margin_call', 'history',
+    )
+
     def __init__(self, agent_id, order_type, side, quantity, round_placed, stock_id=None, price=None, timestamp=None, order_id=None, replace_decision=None, is_margin_call=False):
         if side not in ['buy', 'sell']:
             raise ValueError(f"Invalid side: {side}. Must be 'buy' or 'sell'")
@@ -112,26 +146,12 @@ class Order:
                          filled_qty: float = 0, price: Optional[float] = None, 
                          notes: Optional[str] = None) -> None:
         """Add a new entry to the order history"""
-        # Build commitment details
-        commitment_details = []
         if self.side == 'buy':
-            commitment_details.extend([
-                f"cash_commit={self.current_cash_commitment:.2f}",
-                f"orig_cash_commit={self.original_cash_commitment:.2f}",
-                f"released_cash={self.released_cash:.2f}"
-            ])
-        else:  # sell
-            commitment_details.extend([
-                f"share_commit={self.current_share_commitment}",
-                f"orig_share_commit={self.original_share_commitment}",
-                f"released_shares={self.released_shares}"
-            ])
-
-        # Add commitment info to notes
-        commitment_info = f"[{', '.join(commitment_details)}]"
-        full_notes = f"{notes + ' ' if notes else ''}{commitment_info}"
+            commitment = (self.current_cash_commitment, self.original_cash_commitment, self.released_cash)
+        else:
+            commitment = (self.current_share_commitment, self.original_share_commitment, self.released_shares)
 
-        entry = OrderHistoryEntry(
+        self.history.append(OrderHistoryEntry(
             timestamp=time.time(),
             round_placed=self.round_placed,
             side=self.side,
@@ -139,9 +159,11 @@ class Order:
             to_state=to_state,
             filled_quantity=filled_qty,
             price=price,
-            notes=full_notes
-        )
-        self.history.append(entry)
+            note=notes,
+            current_commitment=commitment[0],
+            original_commitment=commitment[1],
+            released=commitment[2]
+        ))
 
     def __str__(self) -> str:
         price_str = f"${self.price:.2f}" if self.price is not None else "None"
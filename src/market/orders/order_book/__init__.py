@@ -2,9 +2,30 @@ from .base_order_book import OrderBook
 from .order_book_queries import OrderBookQueries
 from .order_book_modifiers import OrderBookModifiers
 from .order_book_logging import OrderBookLogging
+from .price_level_order_book import PriceLevelOrderBook
 
 class CompleteOrderBook(OrderBook, OrderBookQueries, OrderBookModifiers, OrderBookLogging):
     pass
+
+class CompletePriceLevelOrderBook(PriceLevelOrderBook, OrderBookQueries, OrderBookModifiers, OrderBookLogging):
+    pass
+
+ORDER_BOOK_BACKENDS = {
+    'heap': CompleteOrderBook,
+    'price_level': CompletePriceLevelOrderBook,
+}
+
+def create_order_book(context, order_repository, logger=None, backend: str = 'heap',
+                      defer_public_view: bool = False):
+    """Create an order book with the requested storage backend and snapshot mode"""
+    if backend not in ORDER_BOOK_BACKENDS:
+        raise ValueError(f"Unknown order book backend: {backend}. Must be one of {list(ORDER_BOOK_BACKENDS)}")
+    return ORDER_BOOK_BACKENDS[backend](
+        context=context,
+        order_repository=order_repository,
+        logger=logger,
+        defer_public_view=defer_public_view
+    )
         
 # Make this the default export
-OrderBook = CompleteOrderBook
\ No newline at end of file
+OrderBook = CompleteOrderBook
@@ -4,13 +4,20 @@ from market.state.sim_context import SimulationContext
 from datetime import datetime
 
 class OrderBook:
-    def __init__(self, context: SimulationContext, order_repository, logger=None):
+    def __init__(self, context: SimulationContext, order_repository, logger=None,
+                 defer_public_view: bool = False):
         self.context = context
         self.logger = logger
         self.order_repository = order_repository
         # Own our state
         self._buy_orders = []
         self._sell_orders = []
+        # Deferred mode: mutations only mark the view dirty; the snapshot is
+        # published at phase boundaries or when the context is read
+        self.defer_public_view = defer_public_view
+        self._view_dirty = False
+        if defer_public_view:
+            context.register_public_view_refresher(self.refresh_public_view)
         
     @property
     def buy_orders(self):
@@ -35,7 +42,20 @@ class OrderBook:
         self._update_public_view()
 
     def _update_public_view(self):
-        """Update the public view in context"""
+        """Update the public view in context, or mark it dirty in deferred mode"""
+        if self.defer_public_view:
+            self._view_dirty = True
+            return
+        self._publish_public_view()
+
+    def refresh_public_view(self):
+        """Publish the deferred snapshot if the book changed since the last one"""
+        if self._view_dirty:
+            self._publish_public_view()
+
+    def _publish_public_view(self):
+        """Rebuild order_book_state and record one quote in market history"""
+        self._view_dirty = False
         best_bid = self.get_best_bid()
         best_ask = self.get_best_ask()
         aggregated_levels = self.get_aggregated_levels()
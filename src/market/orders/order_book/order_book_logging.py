@@ -8,6 +8,8 @@ class OrderBookLogging:
 
     def _log_removals(self, buy_entries, sell_entries):
         """Log details of orders being removed from the book"""
+        if LoggingService.diagnostic_level() == 'off':
+            return
         LoggingService.log_order_state("\n=== Removing Orders ===")
         
         if buy_entries:
@@ -27,9 +29,15 @@ class OrderBookLogging:
                 )
 
     def log_order_book_state(self, message="Current Order Book State"):
-        """Log the current state of the order book"""
+        """Log the current state of the order book (see LoggingService.diagnostic_level)"""
+        level = LoggingService.diagnostic_level()
+        if level == 'off':
+            return
         LoggingService.log_order_state(f"\n{message}")
-        
+        if level == 'summary':
+            self._log_summary_view()
+            return
+
         # Detailed View
         LoggingService.log_order_state(
             f"=== Detailed Order Book Round {self.context.public_info['round_number'] + 1} ==="
@@ -42,6 +50,17 @@ class OrderBookLogging:
         )
         self._log_aggregated_view()
 
+    def _log_summary_view(self):
+        """Log top of book and order counts (no sorting)"""
+        best_bid, best_ask = self.get_best_bid(), self.get_best_ask()
+        bid = f"${best_bid:.2f}" if best_bid is not None else "none"
+        ask = f"${best_ask:.2f}" if best_ask is not None else "none"
+        LoggingService.log_order_state(
+            f"=== Order Book Summary Round {self.context.public_info['round_number'] + 1} === "
+            f"bid: {bid}, ask: {ask}, "
+            f"buy orders: {len(self.buy_orders)}, sell orders: {len(self.sell_orders)}"
+        )
+
     def _log_detailed_view(self):
         """Log detailed view of order book"""
         if self.buy_orders:
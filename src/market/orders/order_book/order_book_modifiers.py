@@ -69,9 +69,13 @@ class OrderBookModifiers:
         if existing_buys or existing_sells:
             self._log_removals(existing_buys, existing_sells)
         
-        # Remove orders and update states
-        self.buy_orders = [entry for entry in self.buy_orders if entry.agent_id != agent_id]
-        self.sell_orders = [entry for entry in self.sell_orders if entry.agent_id != agent_id]
+        # Remove orders and update states (filtering breaks the heap invariant, so re-heapify)
+        remaining_buys = [entry for entry in self.buy_orders if entry.agent_id != agent_id]
+        remaining_sells = [entry for entry in self.sell_orders if entry.agent_id != agent_id]
+        heapq.heapify(remaining_buys)
+        heapq.heapify(remaining_sells)
+        self.buy_orders = remaining_buys
+        self.sell_orders = remaining_sells
         
         # Update states for removed orders
         for entry in existing_buys + existing_sells:
@@ -105,13 +109,17 @@ class OrderBookModifiers:
         if order.state in [OrderState.ACTIVE, OrderState.PARTIALLY_FILLED]:
             self.order_repository.transition_state(order.order_id, OrderState.CANCELLED)
 
-        # Remove from appropriate side
+        # Remove from appropriate side (filtering breaks the heap invariant, so re-heapify)
         if order.side == 'buy':
-            self.buy_orders = [entry for entry in self.buy_orders
-                              if entry.order.order_id != order.order_id]
+            remaining = [entry for entry in self.buy_orders
+                         if entry.order.order_id != order.order_id]
+            heapq.heapify(remaining)
+            self.buy_orders = remaining
         else:
-            self.sell_orders = [entry for entry in self.sell_orders
-                              if entry.order.order_id != order.order_id]
+            remaining = [entry for entry in self.sell_orders
+                         if entry.order.order_id != order.order_id]
+            heapq.heapify(remaining)
+            self.sell_orders = remaining
 
         self._update_public_view()
 
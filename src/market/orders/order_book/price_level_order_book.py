@@ -0,0 +1,316 @@
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
+from market.orders.order import Order, OrderState
+from market.orders.order_entry import OrderEntry
+from market.orders.order_book.base_order_book import OrderBook
+from market.state.sim_context import SimulationContext
+from services.logging_service import LoggingService
+
+
+class PriceLevelSide:
+    """One side of a price-level book.
+
+    Level keys are the heap keys of OrderEntry (negative for bids), so ascending
+    key order is always best-first. Each level is a FIFO queue keyed by order_id,
+    kept in timestamp order to match the heap's (price, timestamp) priority.
+    """
+
+    def __init__(self):
+        self._prices: List[float] = []
+        self._levels: Dict[float, OrderedDict] = {}
+        self._level_quantity: Dict[float, float] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __iter__(self) -> Iterator[OrderEntry]:
+        """Iterate entries in price-time priority"""
+        for price in self._prices:
+            yield from self._levels[price].values()
+
+    def __getitem__(self, index: int) -> OrderEntry:
+        if index == 0 and self._size:
+            return self.peek()
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("order book side index out of range")
+        for position, entry in enumerate(self):
+            if position == index:
+                return entry
+
+    def push(self, entry: OrderEntry) -> None:
+        """Insert an entry at its price level, preserving timestamp priority"""
+        level = self._levels.get(entry.price)
+        if level is None:
+            level = OrderedDict()
+            self._levels[entry.price] = level
+            self._level_quantity[entry.price] = 0
+            self._prices.insert(bisect_left(self._prices, entry.price), entry.price)
+
+        order_id = entry.order.order_id
+        if not level:
+            level[order_id] = entry
+        else:
+            first = next(iter(level.values()))
+            last = next(reversed(level.values()))
+            if entry.timestamp >= last.timestamp:
+                level[order_id] = entry
+            elif entry.timestamp < first.timestamp:
+                # Entry popped for a partial fill and pushed back: regains the front
+                level[order_id] = entry
+                level.move_to_end(order_id, last=False)
+            else:
+                # Out-of-order arrival inside the level, rare enough to re-sort
+                level[order_id] = entry
+                ordered = sorted(level.values(), key=lambda e: e.timestamp)
+                level.clear()
+                for queued in ordered:
+                    level[queued.order.order_id] = queued
+
+        self._level_quantity[entry.price] += entry.quantity
+        self._size += 1
+
+    def peek(self) -> Optional[OrderEntry]:
+        """Best entry without removing it"""
+        if not self._size:
+            return None
+        return next(iter(self._levels[self._prices[0]].values()))
+
+    def pop(self) -> Optional[OrderEntry]:
+        """Remove and return the best entry"""
+        if not self._size:
+            return None
+        price = self._prices[0]
+        _, entry = self._levels[price].popitem(last=False)
+        self._after_removal(price, entry)
+        return entry
+
+    def remove(self, entry: OrderEntry) -> None:
+        """Remove a specific resting entry"""
+        self._levels[entry.price].pop(entry.order.order_id)
+        self._after_removal(entry.price, entry)
+
+    def iter_levels(self) -> Iterator[Tuple[float, float]]:
+        """Yield (display_price, aggregated quantity) best-first"""
+        for price in self._prices:
+            yield abs(price), self._level_quantity[price]
+
+    def clear(self) -> None:
+        self._prices.clear()
+        self._levels.clear()
+        self._level_quantity.clear()
+        self._size = 0
+
+    def _after_removal(self, price: float, entry: OrderEntry) -> None:
+        self._size -= 1
+        self._level_quantity[price] -= entry.quantity
+        if not self._levels[price]:
+            del self._levels[price]
+            del self._level_quantity[price]
+            del self._prices[bisect_left(self._prices, price)]
+
+
+class PriceLevelOrderBook(OrderBook):
+    """Order book backed by sorted price levels with FIFO queues.
+
+    Drop-in replacement for the heap book: same public API, but inserts and
+    cancels touch a single level, and lookups by order or agent use indexes
+    instead of scanning both sides. `buy_orders`/`sell_orders` expose the
+    PriceLevelSide objects, which iterate in priority order and support
+    `[0]`, `len()` and truthiness like the heap lists did.
+    """
+
+    def __init__(self, context: SimulationContext, order_repository, logger=None,
+                 defer_public_view: bool = False):
+        super().__init__(context, order_repository, logger, defer_public_view)
+        self._buy_orders = PriceLevelSide()
+        self._sell_orders = PriceLevelSide()
+        self._entries: Dict[str, OrderEntry] = {}  # order_id -> resting entry
+        self._agent_index: Dict[str, Dict[str, None]] = {}  # agent_id -> ordered set of order_ids
+
+    @property
+    def buy_orders(self) -> PriceLevelSide:
+        """Access buy orders"""
+        return self._buy_orders
+
+    @property
+    def sell_orders(self) -> PriceLevelSide:
+        """Access sell orders"""
+        return self._sell_orders
+
+    def _side(self, side: str) -> PriceLevelSide:
+        return self._buy_orders if side == 'buy' else self._sell_orders
+
+    # Index maintenance
+    def _index_entry(self, entry: OrderEntry) -> None:
+        order = entry.order
+        self._entries[order.order_id] = entry
+        self._agent_index.setdefault(order.agent_id, {})[order.order_id] = None
+
+    def _unindex_entry(self, entry: OrderEntry) -> None:
+        order = entry.order
+        self._entries.pop(order.order_id, None)
+        agent_orders = self._agent_index.get(order.agent_id)
+        if agent_orders is not None:
+            agent_orders.pop(order.order_id, None)
+            if not agent_orders:
+                del self._agent_index[order.agent_id]
+
+    # State queries
+    def is_empty(self):
+        return not self._buy_orders and not self._sell_orders
+
+    def is_empty_for_side(self, side: str) -> bool:
+        if side == 'buy':
+            return not self._sell_orders
+        elif side == 'sell':
+            return not self._buy_orders
+        raise ValueError("Side must be 'buy' or 'sell'")
+
+    def contains_order(self, order: Order) -> bool:
+        entry = self._entries.get(order.order_id)
+        return entry is not None and entry.order.side == order.side
+
+    def get_order_by_id(self, order_id: str) -> Optional[Order]:
+        entry = self._entries.get(order_id)
+        return entry.order if entry else None
+
+    def get_agent_orders(self, agent_id: str) -> dict[str, List[Order]]:
+        agent_orders = {'buy': [], 'sell': []}
+        for order_id in self._agent_index.get(agent_id, {}):
+            order = self._entries[order_id].order
+            agent_orders[order.side].append(order)
+        return agent_orders
+
+    def get_best_bid(self) -> Optional[float]:
+        """Get the best (highest) bid price"""
+        entry = self._buy_orders.peek()
+        return entry.display_price if entry else None
+
+    def get_best_ask(self) -> Optional[float]:
+        """Get the best (lowest) ask price"""
+        entry = self._sell_orders.peek()
+        return entry.display_price if entry else None
+
+    def peek_best_buy(self) -> Optional[Order]:
+        """Get the best buy order without removing it"""
+        entry = self._buy_orders.peek()
+        return entry.order if entry else None
+
+    def peek_best_sell(self) -> Optional[Order]:
+        """Get the best sell order without removing it"""
+        entry = self._sell_orders.peek()
+        return entry.order if entry else None
+
+    def get_aggregated_levels(self) -> Dict[str, List[Dict[str, float]]]:
+        """Get aggregated buy and sell levels from the per-level running totals"""
+        return {
+            'buy_levels': [{'price': p, 'quantity': q} for p, q in self._buy_orders.iter_levels()],
+            'sell_levels': [{'price': p, 'quantity': q} for p, q in self._sell_orders.iter_levels()]
+        }
+
+    # Modifiers
+    def _push_order(self, entry: OrderEntry, side: str):
+        """Insert an entry into its price level"""
+        valid_states = [OrderState.PENDING, OrderState.PARTIALLY_FILLED]
+        if entry.order.state not in valid_states:
+            raise ValueError(
+                f"Cannot push order in state: {entry.order.state}. "
+                f"Valid states are: {', '.join(str(s) for s in valid_states)}"
+            )
+        if entry.order.order_id in self._entries:
+            raise ValueError(f"Order {entry.order.order_id} is already in the book")
+
+        self._side(side).push(entry)
+        self._index_entry(entry)
+        self._update_public_view()
+
+    def clear(self):
+        """Clear all orders from the book"""
+        self._buy_orders.clear()
+        self._sell_orders.clear()
+        self._entries.clear()
+        self._agent_index.clear()
+        self._update_public_view()
+
+    def add_limit_order(self, order: Order) -> None:
+        """Add a limit order to the book"""
+        LoggingService.log_order_state(f"Adding limit order: {order.side.upper()} {order.quantity} @ ${order.price:.2f}")
+
+        self._validate_limit_order(order)
+        entry = OrderEntry.create_buy(order) if order.side == 'buy' else OrderEntry.create_sell(order)
+
+        self._push_order(entry, order.side)
+
+    def pop_best_buy(self) -> Optional[OrderEntry]:
+        """Remove and return the best buy order entry"""
+        entry = self._buy_orders.pop()
+        if entry is None:
+            return None
+        self._unindex_entry(entry)
+        self._update_public_view()
+        return entry
+
+    def pop_best_sell(self) -> Optional[OrderEntry]:
+        """Remove and return the best sell order entry"""
+        entry = self._sell_orders.pop()
+        if entry is None:
+            return None
+        self._unindex_entry(entry)
+        self._update_public_view()
+        return entry
+
+    def push_buy(self, entry: OrderEntry) -> None:
+        """Push a buy order entry to the book"""
+        self._push_order(entry, 'buy')
+
+    def push_sell(self, entry: OrderEntry) -> None:
+        """Push a sell order entry to the book"""
+        self._push_order(entry, 'sell')
+
+    def remove_agent_orders(self, agent_id: str) -> tuple[List[OrderEntry], List[OrderEntry]]:
+        """Remove all orders for a specific agent with state updates"""
+        if self.logger:
+            self.logger.info(f"Removing orders for Agent {agent_id}")
+
+        entries = [self._entries[order_id] for order_id in self._agent_index.get(agent_id, {})]
+        existing_buys = [entry for entry in entries if entry.order.side == 'buy']
+        existing_sells = [entry for entry in entries if entry.order.side == 'sell']
+
+        if existing_buys or existing_sells:
+            self._log_removals(existing_buys, existing_sells)
+
+        for entry in entries:
+            self._side(entry.order.side).remove(entry)
+            self._unindex_entry(entry)
+            if entry.order.state in [OrderState.ACTIVE, OrderState.PARTIALLY_FILLED]:
+                self.order_repository.transition_state(entry.order.order_id, OrderState.CANCELLED)
+
+        self._update_public_view()
+        return existing_buys, existing_sells
+
+    def remove_order(self, order: Order) -> None:
+        """Public API: Remove an order from the book and update its state.
+
+        Args:
+            order: The order to remove from the book
+        """
+        self._remove_order_from_book(order)
+
+    def _remove_order_from_book(self, order: Order) -> None:
+        """Internal implementation: Remove an order from the book and update its state"""
+        if order.state in [OrderState.ACTIVE, OrderState.PARTIALLY_FILLED]:
+            self.order_repository.transition_state(order.order_id, OrderState.CANCELLED)
+
+        entry = self._entries.get(order.order_id)
+        if entry is not None and entry.order.side == order.side:
+            self._side(order.side).remove(entry)
+            self._unindex_entry(entry)
+
+        self._update_public_view()
@@ -2,7 +2,7 @@
 from dataclasses import dataclass, field
 from market.orders.order import Order
 
-@dataclass(order=True)
+@dataclass(order=True, slots=True)
 class OrderEntry:
     """Represents an entry in the order book with price-time priority"""
     price: float
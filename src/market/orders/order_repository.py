@@ -1,25 +1,67 @@
-from typing import Dict, List, Optional
+from collections import deque
+from itertools import chain
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
 from market.orders.order import Order, OrderState
 import logging
-from agents.agent_manager.services.order_services import get_active_orders, get_book_orders
+from agents.agent_manager.services.order_services import ACTIVE_STATES, BOOK_STATES
+from services.settlement_buffer import SettlementBuffer
+
+TERMINAL_STATES = (OrderState.FILLED, OrderState.CANCELLED)
+
+# Allowed state transitions, checked on every transition_state call
+VALID_TRANSITIONS = {
+    OrderState.INPUT: {OrderState.VALIDATED, OrderState.CANCELLED},
+    OrderState.VALIDATED: {OrderState.COMMITTED, OrderState.CANCELLED},
+    OrderState.COMMITTED: {OrderState.MATCHING, OrderState.LIMIT_MATCHING, OrderState.PENDING, OrderState.CANCELLED},
+    OrderState.MATCHING: {OrderState.PENDING, OrderState.PARTIALLY_FILLED, OrderState.FILLED, OrderState.CANCELLED, OrderState.LIMIT_MATCHING, OrderState.COMMITTED},
+    OrderState.LIMIT_MATCHING: {OrderState.PENDING, OrderState.PARTIALLY_FILLED, OrderState.FILLED, OrderState.CANCELLED},
+    OrderState.PENDING: {OrderState.ACTIVE, OrderState.CANCELLED},
+    OrderState.ACTIVE: {OrderState.PARTIALLY_FILLED, OrderState.FILLED, OrderState.CANCELLED},
+    OrderState.PARTIALLY_FILLED: {OrderState.PENDING, OrderState.FILLED, OrderState.COMMITTED, OrderState.CANCELLED},
+    OrderState.FILLED: set(),  # Terminal state
+    OrderState.CANCELLED: set()  # Terminal state
+}
 
 class OrderRepository:
-    """Centralized repository for all orders in the system"""
-    def __init__(self, logger=None):
+    """Centralized repository for all orders in the system
+
+    Indexes are insertion-ordered dicts used as sets (order_id -> None), so
+    state moves are O(1) and iteration keeps arrival order. Each agent's
+    commitment-holding orders (ACTIVE_STATES) are indexed separately, so
+    syncing an agent after a fill costs O(its live orders), not O(every
+    order it ever placed).
+
+    With retention_rounds set, compact() moves orders that have been FILLED
+    or CANCELLED for that many rounds out of the repository, appending a
+    one-row summary to `archive` (anything with append(), e.g. a
+    ColumnarTable), so memory tracks live orders instead of the whole run.
+    """
+    def __init__(self, logger=None, retention_rounds: Optional[int] = None, archive=None):
         self.orders: Dict[str, Order] = {}  # order_id -> Order
-        self.state_index: Dict[OrderState, Dict[str, List[str]]] = {
-            state: {'buy': [], 'sell': []} for state in OrderState
+        self.state_index: Dict[OrderState, Dict[str, Dict[str, None]]] = {
+            state: {'buy': {}, 'sell': {}} for state in OrderState
         }
-        self.agent_index: Dict[str, List[str]] = {}  # agent_id -> [order_ids]
+        self.agent_index: Dict[str, Dict[str, None]] = {}  # agent_id -> {order_id: None}
+        self.agent_active_index: Dict[str, Dict[str, None]] = {}  # agent_id -> live order ids
         self.logger = logger or logging.getLogger('orders')
 
+        # Compaction of terminal orders (None = keep everything)
+        if retention_rounds is not None and retention_rounds < 0:
+            raise ValueError(f"retention_rounds must be non-negative, got {retention_rounds}")
+        self.retention_rounds = retention_rounds
+        self.archive = archive
+        self.archived_count = 0
+        self._newly_terminal: List[str] = []
+        self._terminal_by_round: Deque[Tuple[int, List[str]]] = deque()
+
     def create_order(self, order: Order) -> str:
         """Register a new order in the repository"""
         self.orders[order.order_id] = order
         self._index_order(order)
         
-        # Use order's string representation
-        self.logger.info(f"Order created: {order}")
+        # Use order's string representation (only built if INFO is enabled)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f"Order created: {order}")
         return order.order_id
 
     def transition_state(self, order_id: str, new_state: OrderState, 
@@ -33,9 +75,8 @@ class OrderRepository:
         if not self._is_valid_transition(old_state, new_state):
             raise ValueError(f"Invalid transition: {old_state} -> {new_state}")
         
-        # Update indexes
-        self.state_index[old_state][order.side].remove(order_id)
-        self.state_index[new_state][order.side].append(order_id)
+        # Update indexes (queued while a settlement buffer is recording)
+        SettlementBuffer.settle(self._move_order, order, old_state, new_state)
         
         # Update order state
         order.state = new_state
@@ -43,55 +84,121 @@ class OrderRepository:
         # Record history with current commitment values
         order.add_history_entry(old_state, new_state, filled_qty, price, notes)
         
-        # Enhanced logging with trade details
-        log_msg = f"State change {old_state} → {new_state} | {order}"
-        if filled_qty > 0:
-            log_msg += (
-                f" | Filled: {filled_qty} @ ${price:.2f}"
-                f" | Total filled: {order.filled_quantity}/{order.quantity}"
-                f" | Committed cash: ${order.current_cash_commitment:.2f}"
-                f" | Released cash: ${order.released_cash:.2f}"
-                f" | Committed shares: {order.current_share_commitment}"
-                f" | Released shares: {order.released_shares}"
-            )
-        if notes:
-            log_msg += f" | Notes: {notes}"
-        
-        self.logger.info(log_msg)
+        # Enhanced logging with trade details (skip formatting when INFO is disabled)
+        if self.logger.isEnabledFor(logging.INFO):
+            log_msg = f"State change {old_state} → {new_state} | {order}"
+            if filled_qty > 0:
+                log_msg += (
+                    f" | Filled: {filled_qty} @ ${price:.2f}"
+                    f" | Total filled: {order.filled_quantity}/{order.quantity}"
+                    f" | Committed cash: ${order.current_cash_commitment:.2f}"
+                    f" | Released cash: ${order.released_cash:.2f}"
+                    f" | Committed shares: {order.current_share_commitment}"
+                    f" | Released shares: {order.released_shares}"
+                )
+            if notes:
+                log_msg += f" | Notes: {notes}"
+            self.logger.info(log_msg)
+
+    def _move_order(self, order: Order, old_state: OrderState, new_state: OrderState) -> None:
+        """Move an order between the state indexes after a transition"""
+        order_id = order.order_id
+        del self.state_index[old_state][order.side][order_id]
+        self.state_index[new_state][order.side][order_id] = None
+        was_live, is_live = old_state in ACTIVE_STATES, new_state in ACTIVE_STATES
+        if is_live and not was_live:
+            self.agent_active_index.setdefault(order.agent_id, {})[order_id] = None
+        elif was_live and not is_live:
+            self.agent_active_index[order.agent_id].pop(order_id, None)
+        if new_state in TERMINAL_STATES and self.retention_rounds is not None:
+            self._newly_terminal.append(order_id)
+
+    def iter_orders_by_state(self, state: OrderState, side: Optional[str] = None) -> Iterator[Order]:
+        """Iterate orders in a given state without building a list"""
+        index = self.state_index[state]
+        order_ids = index[side] if side else chain(index['buy'], index['sell'])
+        return (self.orders[oid] for oid in order_ids)
 
     def get_orders_by_state(self, state: OrderState, side: Optional[str] = None) -> List[Order]:
         """Get all orders in a given state"""
-        if side:
-            return [self.get_order(oid) for oid in self.state_index[state][side]]
-        return [self.get_order(oid) for oid in self.state_index[state]['buy'] + self.state_index[state]['sell']]
+        return list(self.iter_orders_by_state(state, side))
+
+    def count_orders_by_state(self, state: OrderState, side: Optional[str] = None) -> int:
+        index = self.state_index[state]
+        return len(index[side]) if side else len(index['buy']) + len(index['sell'])
 
     def get_agent_orders(self, agent_id: str) -> List[Order]:
         """Get all orders for a specific agent"""
-        return [self.get_order(oid) for oid in self.agent_index.get(agent_id, [])]
+        return [self.orders[oid] for oid in self.agent_index.get(agent_id, ())]
     
     def _index_order(self, order: Order) -> None:
         """Update internal indexes for the order"""
-        self.state_index[order.state][order.side].append(order.order_id)
+        self.state_index[order.state][order.side][order.order_id] = None
         if order.agent_id not in self.agent_index:
-            self.agent_index[order.agent_id] = []
-        self.agent_index[order.agent_id].append(order.order_id)
+            self.agent_index[order.agent_id] = {}
+        self.agent_index[order.agent_id][order.order_id] = None
+        if order.state in ACTIVE_STATES:
+            self.agent_active_index.setdefault(order.agent_id, {})[order.order_id] = None
+
+    def compact(self, round_number: int) -> List[Order]:
+        """Archive orders that reached a terminal state retention_rounds ago.
+
+        Call once at the end of each round. Returns the archived orders so
+        other holders (agents' order_history) can drop them too.
+        """
+        if self.retention_rounds is None:
+            return []
+        if self._newly_terminal:
+            self._terminal_by_round.append((round_number, self._newly_terminal))
+            self._newly_terminal = []
+
+        archived = []
+        cutoff = round_number - self.retention_rounds
+        while self._terminal_by_round and self._terminal_by_round[0][0] <= cutoff:
+            _, order_ids = self._terminal_by_round.popleft()
+            for order_id in order_ids:
+                archived.append(self._archive_order(order_id, round_number))
+        if archived:
+            self.archived_count += len(archived)
+            self.logger.info(f"Archived {len(archived)} terminal orders at round {round_number} "
+                             f"({len(self.orders)} orders remain)")
+        return archived
+
+    def _archive_order(self, order_id: str, round_number: int) -> Order:
+        """Remove a terminal order from every index, keeping a summary row"""
+        order = self.orders.pop(order_id)
+        for state in TERMINAL_STATES:
+            self.state_index[state][order.side].pop(order_id, None)
+        agent_orders = self.agent_index[order.agent_id]
+        del agent_orders[order_id]
+        if not agent_orders:
+            del self.agent_index[order.agent_id]
+        if self.archive is not None:
+            self.archive.append(self._archive_row(order, round_number))
+        return order
+
+    @staticmethod
+    def _archive_row(order: Order, round_number: int) -> Dict[str, Any]:
+        return {
+            'order_id': order.order_id,
+            'agent_id': order.agent_id,
+            'stock_id': order.stock_id,
+            'side': order.side,
+            'order_type': order.order_type,
+            'quantity': order.quantity,
+            'price': order.price,
+            'filled_quantity': order.filled_quantity,
+            'round_placed': order.round_placed,
+            'final_state': order.state.value,
+            'is_margin_call': order.is_margin_call,
+            'transitions': '>'.join(entry.to_state.value for entry in order.history),
+            'archived_round': round_number,
+        }
 
     @staticmethod
     def _is_valid_transition(from_state: OrderState, to_state: OrderState) -> bool:
         """Validate state transitions"""
-        valid_transitions = {
-            OrderState.INPUT: {OrderState.VALIDATED, OrderState.CANCELLED},
-            OrderState.VALIDATED: {OrderState.COMMITTED, OrderState.CANCELLED},
-            OrderState.COMMITTED: {OrderState.MATCHING, OrderState.LIMIT_MATCHING, OrderState.PENDING, OrderState.CANCELLED},
-            OrderState.MATCHING: {OrderState.PENDING, OrderState.PARTIALLY_FILLED, OrderState.FILLED, OrderState.CANCELLED, OrderState.LIMIT_MATCHING, OrderState.COMMITTED},
-            OrderState.LIMIT_MATCHING: {OrderState.PENDING, OrderState.PARTIALLY_FILLED, OrderState.FILLED, OrderState.CANCELLED},
-            OrderState.PENDING: {OrderState.ACTIVE, OrderState.CANCELLED},
-            OrderState.ACTIVE: {OrderState.PARTIALLY_FILLED, OrderState.FILLED, OrderState.CANCELLED},
-            OrderState.PARTIALLY_FILLED: {OrderState.PENDING, OrderState.FILLED, OrderState.COMMITTED, OrderState.CANCELLED},
-            OrderState.FILLED: set(),  # Terminal state
-            OrderState.CANCELLED: set()  # Terminal state
-        }
-        return to_state in valid_transitions[from_state]
+        return to_state in VALID_TRANSITIONS[from_state]
 
     def get_order(self, order_id: str) -> Order:
         """Get a specific order by ID"""
@@ -142,12 +249,10 @@ class OrderRepository:
         return result
     
     def get_active_orders_from_agent(self, agent_id: str) -> List[Order]:
-        """Get only active/pending/partially filled orders"""
-        orders = self.get_agent_orders(agent_id)
-        return get_active_orders(orders)
+        """Get the agent's orders that hold a commitment (committed through partially filled)"""
+        return [self.orders[oid] for oid in self.agent_active_index.get(agent_id, ())]
     
     def get_book_orders_from_agent(self, agent_id: str) -> List[Order]:
-        """Get only active/pending/partially filled orders"""
-        orders = self.get_agent_orders(agent_id)
-        return get_book_orders(orders)
+        """Get the agent's orders resting in the book (active or partially filled)"""
+        return [order for order in self.get_active_orders_from_agent(agent_id) if order.state in BOOK_STATES]
 
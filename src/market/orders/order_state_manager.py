@@ -5,6 +5,7 @@ import logging
 from dataclasses import dataclass, field
 from agents.agent_manager.services.commitment_services import CommitmentCalculator, release_for_cancellation
 from services.shared_service_factory import SharedServiceFactory
+from services.settlement_buffer import SettlementBuffer
 
 @dataclass
 class StateTransitionResult:
@@ -248,7 +249,10 @@ class OrderStateManager:
             )
 
     def sync_agent_orders(self, agent_id: str):
-        """Sync agent's orders using repository"""
+        """Sync agent's orders using repository (queued while a settlement buffer is recording)"""
+        SettlementBuffer.settle(self._sync_agent_orders, agent_id)
+
+    def _sync_agent_orders(self, agent_id: str):
         active_orders = self.order_repository.get_active_orders_from_agent(agent_id)
         self.agent_repository.sync_agent_orders(agent_id, active_orders)
 
@@ -3,6 +3,7 @@ from typing import Optional
 import logging
 from market.trade import Trade
 from market.orders.order import OrderState
+from services.settlement_buffer import SettlementBuffer
 from agents.agent_manager.services.commitment_services import release_for_trade
 from agents.agent_manager.services.position_services import PositionCalculator, update_position_after_trade, log_position_update
 
@@ -88,8 +89,9 @@ class TradeExecutionService:
                              commitment_calculator=self.commitment_calculator, 
                              logger=self.logger)
             
-            # Update positions (this should handle BOTH cash and share transfers)
-            self._update_positions_after_trade(trade)
+            # Update positions (this should handle BOTH cash and share transfers),
+            # queued while a settlement buffer is recording
+            SettlementBuffer.settle(self._update_positions_after_trade, trade)
             
             # Sync orders
             self.order_state_manager.sync_agent_orders(trade.buyer_id)
@@ -38,10 +38,11 @@ class DividendRealization:
     style_contribution: float = 0.0  # gamma * style_shock
 class DividendCalculator:
     """Pure calculation logic - no state"""
-    def __init__(self, dividend_params: dict):
+    def __init__(self, dividend_params: dict, rng=None):
         if not dividend_params:
             raise ValueError("dividend_params is required")
         self.model = dividend_params
+        self.rng = rng or random
 
     def calculate_dividend(self, systematic_shock: float = 0.0, style_shock: float = 0.0) -> DividendRealization:
         """Calculate actual dividend payment with optional factor shocks.
@@ -65,7 +66,7 @@ class DividendCalculator:
         gamma = self.model.get('style_gamma', 1.0)
 
         # Idiosyncratic component (existing stochastic logic)
-        if random.random() < prob:
+        if self.rng.random() < prob:
             idio = variation
         else:
             idio = -variation
@@ -252,8 +253,9 @@ class DividendPaymentProcessor:
 
 class DividendService:
     """Coordinates dividend operations"""
-    def __init__(self, agent_repository, logger, dividend_params, redemption_value=None, stock_id="DEFAULT_STOCK"):
-        self.calculator = DividendCalculator(dividend_params)
+    def __init__(self, agent_repository, logger, dividend_params, redemption_value=None, stock_id="DEFAULT_STOCK",
+                 rng=None):
+        self.calculator = DividendCalculator(dividend_params, rng=rng)
         self.payment_processor = DividendPaymentProcessor(agent_repository, logger, stock_id)
         self.stock_id = stock_id
         self.dividend_history = []  # List of DividendRealization objects
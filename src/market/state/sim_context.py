@@ -24,6 +24,17 @@ class MarketHistory:
     leverage_cash_repaid: List[float]  # Track cash repaid on leverage debt
     margin_call_costs: List[float]  # Track cash spent on forced buy-to-cover margin calls
 
+# MarketHistory payment lists that SimulationContext also keeps running totals for
+PAYMENT_FIELDS = (
+    'dividends_paid',
+    'interest_paid',
+    'borrow_fees_paid',
+    'leverage_cash_borrowed',
+    'leverage_interest_charged',
+    'leverage_cash_repaid',
+    'margin_call_costs',
+)
+
 class SimulationContext:
     """
     Manages the global state of the market simulation.
@@ -66,6 +77,10 @@ class SimulationContext:
             leverage_cash_repaid=[],
             margin_call_costs=[]
         )
+        # Running payment totals, updated by every record_* call so verification
+        # does not rescan the history lists: field -> total, field -> {round: total}
+        self.payment_totals: Dict[str, float] = {field: 0.0 for field in PAYMENT_FIELDS}
+        self.round_payment_totals: Dict[str, Dict[int, float]] = {field: {} for field in PAYMENT_FIELDS}
         
         # Public market information (observable by all)
         self.public_info = {
@@ -88,6 +103,9 @@ class SimulationContext:
             'short_interest': 0
         }
         
+        # Callbacks that publish deferred order book snapshots before public reads
+        self._public_view_refreshers = []
+
         # Simulation parameters
         self.infinite_rounds = infinite_rounds
         self._num_rounds = num_rounds
@@ -98,65 +116,60 @@ class SimulationContext:
         self.public_info['short_interest'] = short_interest
         self.market_history.short_interest.append(short_interest)
     
-    def record_dividend_payment(self, amount: float, round_number: int):
-        """Record dividend payment"""
-        self.market_history.dividends_paid.append({
+    def _record_payment(self, field: str, amount: float, round_number: int):
+        """Append a payment to its history list and add it to the running totals"""
+        getattr(self.market_history, field).append({
             'round': round_number,
             'amount': amount,
             'timestamp': datetime.now().isoformat()
         })
+        self.payment_totals[field] += amount
+        by_round = self.round_payment_totals[field]
+        by_round[round_number] = by_round.get(round_number, 0.0) + amount
+
+    def payment_total(self, field: str, round_number: Optional[int] = None) -> float:
+        """Total recorded for a payment field over the whole run, or for one round"""
+        if round_number is None:
+            return self.payment_totals[field]
+        return self.round_payment_totals[field].get(round_number, 0.0)
+
+    def record_dividend_payment(self, amount: float, round_number: int):
+        """Record dividend payment"""
+        self._record_payment('dividends_paid', amount, round_number)
     
     def record_interest_payment(self, amount: float, round_number: int):
         """Record interest payment"""
-        self.market_history.interest_paid.append({
-            'round': round_number,
-            'amount': amount,
-            'timestamp': datetime.now().isoformat()
-        })
+        self._record_payment('interest_paid', amount, round_number)
 
     def record_borrow_fee_payment(self, amount: float, round_number: int):
         """Record borrow fee payment"""
-        self.market_history.borrow_fees_paid.append({
-            'round': round_number,
-            'amount': amount,
-            'timestamp': datetime.now().isoformat()
-        })
+        self._record_payment('borrow_fees_paid', amount, round_number)
 
     def record_leverage_cash_borrowed(self, amount: float, round_number: int):
         """Record cash borrowed for leverage"""
-        self.market_history.leverage_cash_borrowed.append({
-            'round': round_number,
-            'amount': amount,
-            'timestamp': datetime.now().isoformat()
-        })
+        self._record_payment('leverage_cash_borrowed', amount, round_number)
 
     def record_leverage_interest_charged(self, amount: float, round_number: int):
         """Record interest charged on borrowed cash"""
-        self.market_history.leverage_interest_charged.append({
-            'round': round_number,
-            'amount': amount,
-            'timestamp': datetime.now().isoformat()
-        })
+        self._record_payment('leverage_interest_charged', amount, round_number)
 
     def record_leverage_cash_repaid(self, amount: float, round_number: int):
         """Record cash repaid on leverage debt"""
-        self.market_history.leverage_cash_repaid.append({
-            'round': round_number,
-            'amount': amount,
-            'timestamp': datetime.now().isoformat()
-        })
+        self._record_payment('leverage_cash_repaid', amount, round_number)
 
     def record_margin_call_cost(self, amount: float, round_number: int):
         """Record cash spent on forced buy-to-cover margin calls"""
-        self.market_history.margin_call_costs.append({
-            'round': round_number,
-            'amount': amount,
-            'timestamp': datetime.now().isoformat()
-        })
+        self._record_payment('margin_call_costs', amount, round_number)
 
     # Information access
+    def register_public_view_refresher(self, refresher):
+        """Register a callback run before public info is read (deferred order book views)"""
+        self._public_view_refreshers.append(refresher)
+
     def get_public_info(self):
         """Return only public market information"""
+        for refresher in self._public_view_refreshers:
+            refresher()
         return self.public_info.copy()
 
     @property
@@ -1,9 +1,9 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 from market.orders.order import OrderId
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """
     Represents a completed trade between two agents
@@ -17,6 +17,7 @@ class Trade:
     round: int
     buyer_order_id: OrderId
     seller_order_id: OrderId
+    value: float = field(init=False)  # quantity * price
     
     def __post_init__(self):
         """Validate trade data and compute additional fields"""
@@ -4,12 +4,12 @@ import os
 import json
 import hashlib
 import numpy as np
-import random
 from base_sim import BaseSimulation
 import warnings
 from pathlib import Path
 from datetime import datetime
 from services.logging_service import LoggingService
+from market.information.signal_history import DEFAULT_SIGNAL_RETENTION
 from scenarios import get_scenario, list_scenarios
 import shutil
 from visualization.plot_generator import PlotGenerator
@@ -27,21 +27,28 @@ def create_run_directory(sim_type: str, description: str = "", parameters: dict
     date_str = datetime.now().strftime('%Y%m%d_%H%M%S')
     
     # Create nested structure: logs/sim_type/YYYY-MM-DD_HH-MM-SS/
-    run_dir = base_dir / sim_type / date_str
+    # mkdir is atomic, so runs of one scenario started in the same second by
+    # different processes (see run_sweep.py) get _2, _3... instead of sharing
+    (base_dir / sim_type).mkdir(parents=True, exist_ok=True)
+    run_dir, n = base_dir / sim_type / date_str, 1
+    while True:
+        try:
+            run_dir.mkdir()
+            break
+        except FileExistsError:
+            n += 1
+            run_dir = base_dir / sim_type / f"{date_str}_{n}"
     
     # Add description to metadata rather than folder name to keep paths clean
     metadata = {
         'sim_type': sim_type,
         'description': description,
         'timestamp': date_str,
-        'run_id': f"{sim_type}_{date_str}",
+        'run_id': f"{sim_type}_{run_dir.name}",
         'config_hash': compute_config_hash(parameters) if parameters else None,
         'parameters': parameters
     }
     
-    # Create directories
-    run_dir.mkdir(parents=True, exist_ok=True)
-    
     # Save metadata
     with open(run_dir / 'metadata.json', 'w') as f:
         json.dump(metadata, f, indent=4)
@@ -138,8 +145,9 @@ def run_scenario(
     allow_short_selling: bool = None,
     margin_requirement: float = None,
     borrow_rate: float = None,
-):
-    """Run a single scenario by name"""
+    random_seed: int = None,
+) -> Path:
+    """Run a single scenario by name and return its run directory"""
     # Load scenario
     scenario = get_scenario(scenario_name)
     params = scenario.parameters
@@ -155,10 +163,8 @@ def run_scenario(
         borrow_model['rate'] = borrow_rate
         borrow_model.setdefault('payment_frequency', 1)
         agent_params['borrow_model'] = borrow_model
-
-    # Set random seeds for reproducibility
-    np.random.seed(params["RANDOM_SEED"])
-    random.seed(params["RANDOM_SEED"])
+    if random_seed is not None:
+        params["RANDOM_SEED"] = random_seed
 
     # Create run directory with scenario info
     run_dir = create_run_directory(
@@ -188,7 +194,31 @@ def run_scenario(
             infinite_rounds=params["INFINITE_ROUNDS"],
             sim_type=scenario.name,
             stock_configs=params["STOCKS"],  # NEW: Pass stock configurations
-            news_enabled=params.get("NEWS_ENABLED", False)
+            news_enabled=params.get("NEWS_ENABLED", False),
+            order_book_backend=params.get("ORDER_BOOK_BACKEND", "heap"),
+            deferred_order_book_view=params.get("DEFERRED_ORDER_BOOK_VIEW", False),
+            async_llm_decisions=params.get("ASYNC_LLM_DECISIONS", False),
+            batched_deterministic_decisions=params.get("BATCHED_DETERMINISTIC_DECISIONS", False),
+            shared_prompt_fragments=params.get("SHARED_PROMPT_FRAGMENTS", False),
+            prompt_layout=params.get("PROMPT_LAYOUT", "standard"),
+            llm_endpoint_profile=params.get("LLM_ENDPOINT_PROFILE"),
+            llm_round_deadline=params.get("LLM_ROUND_DEADLINE"),
+            llm_retry_policy=params.get("LLM_RETRY_POLICY"),
+            llm_cache=params.get("LLM_CACHE"),
+            data_recorder_storage=params.get("DATA_RECORDER"),
+            order_retention_rounds=params.get("ORDER_RETENTION_ROUNDS"),
+            signal_retention_rounds=params.get("SIGNAL_RETENTION_ROUNDS", DEFAULT_SIGNAL_RETENTION),
+            queued_logging=params.get("QUEUED_LOGGING", False),
+            diagnostic_logging=params.get("DIAGNOSTIC_LOGGING", "full"),
+            verification_level=params.get("VERIFICATION_LEVEL", "full"),
+            verification_sample=params.get("VERIFICATION_SAMPLE"),
+            verification_full_audit_every=params.get("VERIFICATION_FULL_AUDIT_EVERY"),
+            check_order_commitments=params.get("CHECK_ORDER_COMMITMENTS", False),
+            matching_mode=params.get("MATCHING_MODE", "continuous"),
+            auction_allocation=params.get("AUCTION_ALLOCATION", "time"),
+            matching_workers=params.get("MATCHING_WORKERS"),
+            random_seed=params["RANDOM_SEED"],
+            run_id=run_dir.name
         )
     else:
         # Single-stock scenario: original behavior (backwards compatible)
@@ -209,7 +239,31 @@ def run_scenario(
             infinite_rounds=params["INFINITE_ROUNDS"],
             sim_type=scenario.name,
             enable_intra_round_margin_checking=params.get("ENABLE_INTRA_ROUND_MARGIN_CHECKING", False),
-            news_enabled=params.get("NEWS_ENABLED", False)
+            news_enabled=params.get("NEWS_ENABLED", False),
+            order_book_backend=params.get("ORDER_BOOK_BACKEND", "heap"),
+            deferred_order_book_view=params.get("DEFERRED_ORDER_BOOK_VIEW", False),
+            async_llm_decisions=params.get("ASYNC_LLM_DECISIONS", False),
+            batched_deterministic_decisions=params.get("BATCHED_DETERMINISTIC_DECISIONS", False),
+            shared_prompt_fragments=params.get("SHARED_PROMPT_FRAGMENTS", False),
+            prompt_layout=params.get("PROMPT_LAYOUT", "standard"),
+            llm_endpoint_profile=params.get("LLM_ENDPOINT_PROFILE"),
+            llm_round_deadline=params.get("LLM_ROUND_DEADLINE"),
+            llm_retry_policy=params.get("LLM_RETRY_POLICY"),
+            llm_cache=params.get("LLM_CACHE"),
+            data_recorder_storage=params.get("DATA_RECORDER"),
+            order_retention_rounds=params.get("ORDER_RETENTION_ROUNDS"),
+            signal_retention_rounds=params.get("SIGNAL_RETENTION_ROUNDS", DEFAULT_SIGNAL_RETENTION),
+            queued_logging=params.get("QUEUED_LOGGING", False),
+            diagnostic_logging=params.get("DIAGNOSTIC_LOGGING", "full"),
+            verification_level=params.get("VERIFICATION_LEVEL", "full"),
+            verification_sample=params.get("VERIFICATION_SAMPLE"),
+            verification_full_audit_every=params.get("VERIFICATION_FULL_AUDIT_EVERY"),
+            check_order_commitments=params.get("CHECK_ORDER_COMMITMENTS", False),
+            matching_mode=params.get("MATCHING_MODE", "continuous"),
+            auction_allocation=params.get("AUCTION_ALLOCATION", "time"),
+            matching_workers=params.get("MATCHING_WORKERS"),
+            random_seed=params["RANDOM_SEED"],
+            run_id=run_dir.name
         )
 
     # Save parameters and run simulation
@@ -238,6 +292,9 @@ def run_scenario(
             f"Shares: {state.total_shares}, "
             f"Total Value: ${state.wealth:.2f}")
 
+    simulation.close()
+    return simulation.run_dir
+
 def main():
     """
     Main function to run simulations.
@@ -286,6 +343,12 @@ def main():
         default=None,
         help="Override borrow rate for short positions"
     )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Override the scenario's RANDOM_SEED"
+    )
 
     args = parser.parse_args()
 
@@ -325,6 +388,7 @@ def main():
             allow_short_selling=args.allow_short_selling,
             margin_requirement=args.margin_requirement,
             borrow_rate=args.borrow_rate,
+            random_seed=args.seed,
         )
         print(f"Successfully completed scenario: {scenario_name}")
     except Exception as e:
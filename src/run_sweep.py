@@ -0,0 +1,344 @@
+"""
+Run scenario sweeps in parallel: scenarios x seeds x parameter overrides.
+
+Each job is one run_scenario() call in a worker process of a bounded pool
+(a fresh process per job, so class-level state never leaks between runs).
+A shared LLM concurrency budget caps the requests in flight across all
+workers (SharedLLMBudget). Progress is recorded in manifest.json after every
+finished job; a crashed or interrupted sweep resumes with --resume, which
+reruns only the jobs that did not succeed.
+
+Usage:
+    python src/run_sweep.py social_with_memory social_without_memory --seeds 1 2 3
+    python src/run_sweep.py single_short --short-selling on off --margin-requirement 0.25 0.5
+    python src/run_sweep.py --ab-tests --workers 4 --llm-concurrency 16
+    python src/run_sweep.py --resume logs/sweep_20250101_120000
+
+Output:
+    logs/sweep_YYYYMMDD_HHMMSS/
+    ├── manifest.json
+    ├── <scenario>__seed1/     # data/, plots/, metadata.json, parameters.json, ...
+    │   └── run.log            # stdout/stderr of the run
+    └── ...
+"""
+import argparse
+import contextlib
+import itertools
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Copied from a run directory into the sweep output, as run_paper_scenarios always has
+OUTPUT_DIRS = ('data', 'plots')
+OUTPUT_FILES = ('metadata.json', 'parameters.json', 'structured_decisions.csv',
+                'margin_calls.csv', 'validation_errors.csv', 'decisions.log')
+
+
+@dataclass(frozen=True)
+class SweepJob:
+    """One run_scenario() call; None leaves the scenario's own setting"""
+    scenario: str
+    seed: Optional[int] = None
+    allow_short_selling: Optional[bool] = None
+    margin_requirement: Optional[float] = None
+    borrow_rate: Optional[float] = None
+
+    @property
+    def key(self) -> str:
+        """Manifest key and output directory name; the bare scenario name without overrides"""
+        parts = [self.scenario]
+        if self.seed is not None:
+            parts.append(f"seed{self.seed}")
+        if self.allow_short_selling is not None:
+            parts.append('short' if self.allow_short_selling else 'noshort')
+        if self.margin_requirement is not None:
+            parts.append(f"margin{self.margin_requirement:g}")
+        if self.borrow_rate is not None:
+            parts.append(f"borrow{self.borrow_rate:g}")
+        return '__'.join(parts)
+
+
+def expand_jobs(scenarios: Sequence[str], seeds: Sequence[Optional[int]] = (None,),
+                allow_short_selling: Sequence[Optional[bool]] = (None,),
+                margin_requirement: Sequence[Optional[float]] = (None,),
+                borrow_rate: Sequence[Optional[float]] = (None,)) -> List[SweepJob]:
+    """Cartesian product of scenarios and each override's values"""
+    return [SweepJob(*combo) for combo in itertools.product(
+        scenarios, seeds or (None,), allow_short_selling or (None,),
+        margin_requirement or (None,), borrow_rate or (None,))]
+
+
+def get_git_info():
+    """Get current git commit and status for provenance tracking."""
+    try:
+        commit = subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'],
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
+
+        branch = subprocess.check_output(
+            ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
+
+        # Check if working directory is clean
+        status = subprocess.check_output(
+            ['git', 'status', '--porcelain'],
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
+        is_clean = len(status) == 0
+
+        return {
+            'commit': commit,
+            'branch': branch,
+            'is_clean': is_clean,
+            'dirty_files': status.split('\n') if status else []
+        }
+    except (subprocess.CalledProcessError, OSError):
+        return {'commit': 'unknown', 'branch': 'unknown', 'is_clean': False}
+
+
+class SweepManifest:
+    """manifest.json of a sweep: provenance, the job list and per-job results.
+
+    Only the parent process writes it, after each finished job. Writes go to a
+    temporary file that replaces the manifest, so a crash never leaves it
+    half-written.
+    """
+
+    def __init__(self, path: Path, data: Dict[str, Any]):
+        self.path = Path(path)
+        self.data = data
+
+    @classmethod
+    def create(cls, output_dir: Path, jobs: Sequence[SweepJob], start_time: datetime,
+               **extra) -> 'SweepManifest':
+        """New manifest; `extra` keys (e.g. paper_version) go first"""
+        data = dict(extra)
+        data.update({
+            'created_at': start_time.isoformat(),
+            'git': get_git_info(),
+            'python_version': sys.version,
+            'scenarios': list(dict.fromkeys(job.scenario for job in jobs)),
+            'jobs': {job.key: asdict(job) for job in jobs},
+            'output_directory': str(output_dir),
+            'status': 'in_progress',
+            'results': {},
+        })
+        manifest = cls(Path(output_dir) / 'manifest.json', data)
+        manifest.save()
+        return manifest
+
+    @classmethod
+    def load(cls, output_dir: Path) -> 'SweepManifest':
+        path = Path(output_dir) / 'manifest.json'
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if 'jobs' not in data:  # Manifest written before sweeps: one job per scenario
+            data['jobs'] = {name: asdict(SweepJob(name)) for name in data['scenarios']}
+        return cls(path, data)
+
+    @property
+    def jobs(self) -> List[SweepJob]:
+        return [SweepJob(**job) for job in self.data['jobs'].values()]
+
+    def pending(self) -> List[SweepJob]:
+        """Jobs without a successful result"""
+        results = self.data['results']
+        return [job for job in self.jobs if results.get(job.key, {}).get('status') != 'success']
+
+    def record(self, key: str, status: str, duration: Optional[float] = None, **details) -> None:
+        result = {
+            'status': status,
+            'completed_at': datetime.now().isoformat(),
+            'duration_seconds': duration,
+        }
+        result.update(details)
+        self.data['results'][key] = result
+
+        results = self.data['results']
+        if all(key in results for key in self.data['jobs']):
+            all_success = all(results[key]['status'] == 'success' for key in self.data['jobs'])
+            self.data['status'] = 'completed' if all_success else 'completed_with_errors'
+            self.data['completed_at'] = datetime.now().isoformat()
+        else:
+            self.data['status'] = 'in_progress'
+        self.save()
+
+    def save(self) -> None:
+        tmp_path = self.path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def _init_worker(repo_root: str, llm_budget) -> None:
+    """Pool initializer: run from the repo root (logs/ is relative) under the shared LLM budget"""
+    os.chdir(repo_root)
+    from agents.LLMs.services.llm_endpoints import SharedLLMBudget
+    SharedLLMBudget.install(llm_budget)
+
+
+def _run_job(job: SweepJob, output_dir: str) -> Dict[str, Any]:
+    """Worker: run one job and copy its outputs to output_dir/<job key>"""
+    import shutil
+
+    job_dir = Path(output_dir) / job.key
+    job_dir.mkdir(parents=True, exist_ok=True)
+    start_time = time.time()
+    with open(job_dir / 'run.log', 'w') as log, \
+            contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        try:
+            from run_base_sim import run_scenario
+            run_dir = run_scenario(
+                job.scenario,
+                allow_short_selling=job.allow_short_selling,
+                margin_requirement=job.margin_requirement,
+                borrow_rate=job.borrow_rate,
+                random_seed=job.seed,
+            )
+            for item in OUTPUT_DIRS:
+                if (run_dir / item).exists():
+                    shutil.copytree(run_dir / item, job_dir / item, dirs_exist_ok=True)
+            for fname in OUTPUT_FILES:
+                if (run_dir / fname).exists():
+                    shutil.copy2(run_dir / fname, job_dir / fname)
+            return {'status': 'success', 'duration': time.time() - start_time,
+                    'run_dir': str(run_dir)}
+        except Exception as e:
+            traceback.print_exc()
+            return {'status': 'failed', 'duration': time.time() - start_time,
+                    'error': f"{type(e).__name__}: {e}"}
+
+
+def run_sweep(manifest: SweepManifest, workers: Optional[int] = None,
+              llm_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Run the manifest's pending jobs on a process pool, recording each result.
+
+    Args:
+        manifest: Sweep manifest; its directory receives the job outputs
+        workers: Processes running at once (default: one per pending job, at most os.cpu_count())
+        llm_concurrency: LLM requests in flight across all workers (None = only
+            the per-process endpoint profile limits)
+
+    Returns:
+        One dict per job run (key, status, duration, ...), in completion order
+    """
+    jobs = manifest.pending()
+    if not jobs:
+        return []
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    output_dir = str(manifest.path.parent.resolve())
+
+    # spawn: workers start clean (no copied locks or loggers) on every platform
+    context = multiprocessing.get_context('spawn')
+    llm_budget = context.BoundedSemaphore(llm_concurrency) if llm_concurrency else None
+
+    completed = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                             initargs=(str(REPO_ROOT), llm_budget), max_tasks_per_child=1) as pool:
+        futures = {pool.submit(_run_job, job, output_dir): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:  # Worker died (e.g. BrokenProcessPool)
+                result = {'status': 'failed', 'duration': None, 'error': f"{type(e).__name__}: {e}"}
+            manifest.record(job.key, **result)
+            completed.append({'key': job.key, **result})
+            mark = '✓' if result['status'] == 'success' else '✗'
+            duration = f"{result['duration']:.1f}s" if result['duration'] is not None else '-'
+            print(f"[{len(completed)}/{len(jobs)}] {mark} {job.key} ({duration})"
+                  + (f": {result['error']}" if 'error' in result else ''))
+    return completed
+
+
+def print_summary(results: Iterable[Dict[str, Any]], wall_time: float) -> None:
+    results = list(results)
+    success = sum(1 for r in results if r['status'] == 'success')
+    job_time = sum(r['duration'] or 0.0 for r in results)
+    print(f"✓ Success: {success}/{len(results)}")
+    if success < len(results):
+        print(f"✗ Failed: {len(results) - success}/{len(results)}")
+    print(f"⏱ Wall time: {wall_time/60:.1f} minutes (sum of job times: {job_time/60:.1f} minutes)")
+
+
+def _parse_switch(value: str) -> bool:
+    if value in ('on', 'true', '1', 'yes'):
+        return True
+    if value in ('off', 'false', '0', 'no'):
+        return False
+    raise argparse.ArgumentTypeError(f"expected on/off, got '{value}'")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run scenarios x seeds x overrides on a process pool',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('scenarios', nargs='*', help='Scenarios to run')
+    parser.add_argument('--ab-tests', action='store_true',
+                        help='Add every scenario from scenarios/feature_ab_tests.py')
+    parser.add_argument('--seeds', type=int, nargs='+', default=None,
+                        help="RANDOM_SEED values (default: each scenario's own)")
+    parser.add_argument('--short-selling', type=_parse_switch, nargs='+', default=None,
+                        metavar='on|off', help='allow_short_selling values')
+    parser.add_argument('--margin-requirement', type=float, nargs='+', default=None,
+                        help='margin_requirement values')
+    parser.add_argument('--borrow-rate', type=float, nargs='+', default=None,
+                        help='borrow_rate values')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Processes running at once (default: one per job, at most the CPU count)')
+    parser.add_argument('--llm-concurrency', type=int, default=None,
+                        help='LLM requests in flight across all workers (default: no shared cap)')
+    parser.add_argument('--resume', type=Path, default=None, metavar='DIR',
+                        help='Rerun the unfinished jobs of an earlier sweep')
+    parser.add_argument('--dry-run', action='store_true', help='List the jobs without running them')
+    args = parser.parse_args()
+
+    if args.resume:
+        manifest = SweepManifest.load(args.resume)
+        print(f"Resuming {args.resume}: {len(manifest.pending())}/{len(manifest.jobs)} jobs left")
+    else:
+        from scenarios import list_scenarios
+        scenarios = list(args.scenarios)
+        if args.ab_tests:
+            from scenarios.feature_ab_tests import SCENARIOS as AB_SCENARIOS
+            scenarios.extend(AB_SCENARIOS)
+        available = list_scenarios()
+        unknown = [name for name in scenarios if name not in available]
+        if unknown or not scenarios:
+            parser.error(f"unknown scenarios: {unknown}" if unknown else "no scenarios given")
+        jobs = expand_jobs(scenarios, args.seeds, args.short_selling,
+                           args.margin_requirement, args.borrow_rate)
+        if args.dry_run:
+            print(f"Dry run - would run {len(jobs)} jobs:")
+            for job in jobs:
+                print(f"  • {job.key}")
+            return
+        start_time = datetime.now()
+        output_dir = REPO_ROOT / 'logs' / f"sweep_{start_time.strftime('%Y%m%d_%H%M%S')}"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        manifest = SweepManifest.create(output_dir, jobs, start_time)
+        print(f"📁 Output directory: {output_dir}")
+
+    start = time.time()
+    results = run_sweep(manifest, workers=args.workers, llm_concurrency=args.llm_concurrency)
+    print_summary(results, time.time() - start)
+    print(f"📋 Manifest: {manifest.path} ({manifest.data['status']})")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,55 +1,100 @@
 """Refactored LoggingService using modular logging components."""
 import logging
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, Any, Optional, List, TYPE_CHECKING
 
 from logging_utils.logger_factory import LoggerFactory
 from logging_utils.csv_header_manager import CSVHeaders, CSVHeaderManager
 from logging_utils.csv_logger import CSVLogger
+from logging_utils.queued_logging import QueuedLogWriter, mirror_file, unlink_mirror
 from services.logging_models import LogFormatter, LogMessage, AgentStateLogEntry
+from services.simulation_runtime import SimulationRuntime
+from services.settlement_buffer import SettlementBuffer
 
 if TYPE_CHECKING:
     from agents.agent_manager.agent_repository import AgentRepository
 from market.trade import Trade
 
+# Verbosity of the per-phase order book and agent state dumps
+DIAGNOSTIC_LEVELS = ('off', 'summary', 'full')
+
+
+@dataclass
+class _LoggingState:
+    """LoggingService state for one SimulationRuntime"""
+    loggers: Dict[str, logging.Logger] = field(default_factory=dict)
+    run_dir: Optional[Path] = None
+    latest_dir: Optional[Path] = None
+    data_dir: Optional[Path] = None
+    latest_data_dir: Optional[Path] = None
+    queued_writer: Optional[QueuedLogWriter] = None
+    diagnostics: str = 'full'
+
 
 class LoggingService:
-    """Centralized logging service with singleton pattern."""
+    """Centralized logging service with singleton pattern.
+
+    Loggers and directories belong to the current SimulationRuntime, so
+    concurrent simulations each log to their own run directory.
+    """
 
     _instance = None
-    _loggers: Dict[str, logging.Logger] = {}
-    _run_dir: Optional[Path] = None
-    _latest_dir: Optional[Path] = None
-    _data_dir: Optional[Path] = None
-    _latest_data_dir: Optional[Path] = None
+    _csv_loggers = ('validation_errors', 'margin_calls', 'structured_decisions')
+    # Files that also appear in latest_sim
+    _mirrored_files = ('validation_errors.csv', 'margin_calls.csv', 'structured_decisions.csv',
+                       'market.log', 'borrow.log', 'borrowing.log')
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
+    @staticmethod
+    def _state() -> _LoggingState:
+        return SimulationRuntime.current().service_state('logging', _LoggingState)
+
     @classmethod
-    def initialize(cls, run_id: str):
-        """Initialize all loggers and directories."""
+    def initialize(cls, run_id: str, queued: bool = False, diagnostics: str = 'full'):
+        """Initialize all loggers and directories.
+
+        Args:
+            run_id: Run directory under logs/ (format: scenario_name/timestamp)
+            queued: Write log files on a background thread, once each, and
+                mirror them into latest_sim at finalize() instead of writing
+                every line to both directories
+            diagnostics: Order book and agent state dumps, one of
+                DIAGNOSTIC_LEVELS ('summary' logs top of book and totals only)
+        """
+        if diagnostics not in DIAGNOSTIC_LEVELS:
+            raise ValueError(f"Unknown diagnostics level '{diagnostics}'. Valid levels: {DIAGNOSTIC_LEVELS}")
+        cls.close()  # Drain and detach a previous run's loggers
+        state = cls._state()
+        state.diagnostics = diagnostics
+
         # Create base directory structure
         base_log_dir = Path('logs')
-        cls._run_dir = base_log_dir / run_id
-        cls._latest_dir = base_log_dir / 'latest_sim'
-        cls._data_dir = cls._run_dir / 'data'
+        state.run_dir = base_log_dir / run_id
+        state.latest_dir = base_log_dir / 'latest_sim'
+        state.data_dir = state.run_dir / 'data'
 
         # Extract scenario name from run_id (format: scenario_name/timestamp)
         scenario_name = run_id.split('/')[0] if '/' in run_id else run_id
 
         # Create scenario-specific directory in latest_sim
-        scenario_dir = cls._latest_dir / scenario_name
-        cls._latest_data_dir = scenario_dir / 'data'
+        scenario_dir = state.latest_dir / scenario_name
+        state.latest_data_dir = scenario_dir / 'data'
 
         # Create all necessary directories
-        cls._run_dir.mkdir(parents=True, exist_ok=True)
-        cls._latest_dir.mkdir(parents=True, exist_ok=True)
+        state.run_dir.mkdir(parents=True, exist_ok=True)
+        state.latest_dir.mkdir(parents=True, exist_ok=True)
         scenario_dir.mkdir(parents=True, exist_ok=True)
-        cls._data_dir.mkdir(exist_ok=True)
-        cls._latest_data_dir.mkdir(parents=True, exist_ok=True)
+        state.data_dir.mkdir(exist_ok=True)
+        state.latest_data_dir.mkdir(parents=True, exist_ok=True)
+
+        # Files mirrored by a queued run are links into that run's directory
+        for filename in cls._mirrored_files:
+            unlink_mirror(state.latest_dir / filename)
 
         # Setup console handler for warnings and errors
         console_handler = logging.StreamHandler()
@@ -58,109 +103,135 @@ class LoggingService:
         console_handler.setFormatter(console_formatter)
 
         # Initialize all CSV files with headers
-        cls._initialize_csv_headers()
+        cls._initialize_csv_headers(dual_output=not queued)
 
         # Setup all loggers
-        cls._setup_all_loggers(console_handler)
+        cls._setup_all_loggers(console_handler, dual_output=not queued)
 
         # Prevent duplicate messages
-        for logger in cls._loggers.values():
+        for logger in state.loggers.values():
             logger.propagate = False
 
+        if queued:
+            # CSV loggers stay synchronous: they are synced per round and verified
+            state.queued_writer = QueuedLogWriter()
+            for name, logger in state.loggers.items():
+                if name not in cls._csv_loggers:
+                    state.queued_writer.attach(logger)
+            state.queued_writer.start()
+
     @classmethod
-    def _initialize_csv_headers(cls):
+    def close(cls):
+        """Finalize and detach this runtime's handlers, closing its log files."""
+        cls.finalize()
+        state = cls._state()
+        for logger in state.loggers.values():
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+                handler.close()
+        state.loggers = {}
+
+    @classmethod
+    def _initialize_csv_headers(cls, dual_output: bool = True):
         """Initialize all CSV files with headers."""
+        state = cls._state()
+        dirs = [state.run_dir, state.latest_dir] if dual_output else [state.run_dir]
+
         # Validation errors CSV
         CSVHeaderManager.initialize_csv_files(
-            [cls._run_dir / 'validation_errors.csv', cls._latest_dir / 'validation_errors.csv'],
+            [d / 'validation_errors.csv' for d in dirs],
             CSVHeaders.VALIDATION_ERRORS
         )
 
         # Margin calls CSV
         CSVHeaderManager.initialize_csv_files(
-            [cls._run_dir / 'margin_calls.csv', cls._latest_dir / 'margin_calls.csv'],
+            [d / 'margin_calls.csv' for d in dirs],
             CSVHeaders.MARGIN_CALLS
         )
 
         # Structured decisions CSV
         CSVHeaderManager.initialize_csv_files(
-            [cls._run_dir / 'structured_decisions.csv', cls._latest_dir / 'structured_decisions.csv'],
+            [d / 'structured_decisions.csv' for d in dirs],
             CSVHeaders.STRUCTURED_DECISIONS
         )
 
     @classmethod
-    def _setup_all_loggers(cls, console_handler: logging.Handler):
+    def _setup_all_loggers(cls, console_handler: logging.Handler, dual_output: bool = True):
         """Setup all loggers using the factory."""
+        state = cls._state()
+        run_dir, latest_dir = state.run_dir, state.latest_dir
+        name = SimulationRuntime.current().logger_name  # Namespaced per runtime
+
         # CSV loggers with dual output (run_dir + latest_dir)
-        cls._loggers['validation_errors'] = LoggerFactory.create_csv_logger(
-            'validation_errors', cls._run_dir, cls._latest_dir,
-            'validation_errors.csv', console_handler
+        state.loggers['validation_errors'] = LoggerFactory.create_csv_logger(
+            name('validation_errors'), run_dir, latest_dir,
+            'validation_errors.csv', console_handler, use_dual_output=dual_output
         )
 
-        cls._loggers['margin_calls'] = LoggerFactory.create_csv_logger(
-            'margin_calls', cls._run_dir, cls._latest_dir,
-            'margin_calls.csv', console_handler
+        state.loggers['margin_calls'] = LoggerFactory.create_csv_logger(
+            name('margin_calls'), run_dir, latest_dir,
+            'margin_calls.csv', console_handler, use_dual_output=dual_output
         )
 
-        cls._loggers['structured_decisions'] = LoggerFactory.create_csv_logger(
-            'structured_decisions', cls._run_dir, cls._latest_dir,
-            'structured_decisions.csv', console_handler
+        state.loggers['structured_decisions'] = LoggerFactory.create_csv_logger(
+            name('structured_decisions'), run_dir, latest_dir,
+            'structured_decisions.csv', console_handler, use_dual_output=dual_output
         )
 
         # Regular loggers with dual output
-        cls._loggers['market'] = LoggerFactory.create_logger(
-            'market', cls._run_dir, cls._latest_dir,
-            'market.log', console_handler
+        state.loggers['market'] = LoggerFactory.create_logger(
+            name('market'), run_dir, latest_dir,
+            'market.log', console_handler, use_dual_output=dual_output
         )
 
-        cls._loggers['borrow'] = LoggerFactory.create_logger(
-            'borrow', cls._run_dir, cls._latest_dir,
-            'borrow.log', console_handler
+        state.loggers['borrow'] = LoggerFactory.create_logger(
+            name('borrow'), run_dir, latest_dir,
+            'borrow.log', console_handler, use_dual_output=dual_output
         )
 
-        cls._loggers['borrowing'] = LoggerFactory.create_logger(
-            'borrowing', cls._run_dir, cls._latest_dir,
-            'borrowing.log', console_handler
+        state.loggers['borrowing'] = LoggerFactory.create_logger(
+            name('borrowing'), run_dir, latest_dir,
+            'borrowing.log', console_handler, use_dual_output=dual_output
         )
 
         # Simple loggers (run_dir only, mode='w')
-        cls._loggers['decisions'] = LoggerFactory.create_simple_logger(
-            'decisions', cls._run_dir, 'decisions.log', console_handler
+        state.loggers['decisions'] = LoggerFactory.create_simple_logger(
+            name('decisions'), run_dir, 'decisions.log', console_handler
         )
 
-        cls._loggers['simulation'] = LoggerFactory.create_simple_logger(
-            'simulation', cls._run_dir, 'simulation.log', console_handler
+        state.loggers['simulation'] = LoggerFactory.create_simple_logger(
+            name('simulation'), run_dir, 'simulation.log', console_handler
         )
 
-        cls._loggers['agents'] = LoggerFactory.create_simple_logger(
-            'agents', cls._run_dir, 'agents.log', console_handler
+        state.loggers['agents'] = LoggerFactory.create_simple_logger(
+            name('agents'), run_dir, 'agents.log', console_handler
         )
 
-        cls._loggers['order_state'] = LoggerFactory.create_simple_logger(
-            'order_state', cls._run_dir, 'order_state.log', console_handler
+        state.loggers['order_state'] = LoggerFactory.create_simple_logger(
+            name('order_state'), run_dir, 'order_state.log', console_handler
         )
 
-        cls._loggers['info_signals'] = LoggerFactory.create_simple_logger(
-            'info_signals', cls._run_dir, 'info_signals.log', console_handler
+        state.loggers['info_signals'] = LoggerFactory.create_simple_logger(
+            name('info_signals'), run_dir, 'info_signals.log', console_handler
         )
 
-        cls._loggers['order_book'] = LoggerFactory.create_logger(
-            'order_book', cls._run_dir, None,
+        state.loggers['order_book'] = LoggerFactory.create_logger(
+            name('order_book'), run_dir, None,
             'order_book.log', console_handler, use_dual_output=False
         )
 
-        cls._loggers['interest'] = LoggerFactory.create_logger(
-            'interest', cls._run_dir, None,
+        state.loggers['interest'] = LoggerFactory.create_logger(
+            name('interest'), run_dir, None,
             'interest.log', console_handler, use_dual_output=False
         )
 
-        cls._loggers['dividend'] = LoggerFactory.create_logger(
-            'dividend', cls._run_dir, None,
+        state.loggers['dividend'] = LoggerFactory.create_logger(
+            name('dividend'), run_dir, None,
             'dividend.log', console_handler, use_dual_output=False
         )
 
-        cls._loggers['verification'] = LoggerFactory.create_logger(
-            'verification', cls._run_dir, None,
+        state.loggers['verification'] = LoggerFactory.create_logger(
+            name('verification'), run_dir, None,
             'verification.log', console_handler, use_dual_output=False
         )
 
@@ -175,10 +246,18 @@ class LoggingService:
         attempted_action: str,
         debug: bool = False
     ):
-        """Log validation error with verification."""
-        csv_file_path = cls._run_dir / 'validation_errors.csv'
+        """Log validation error (buffered; see CSVLogger.verify_writes).
+
+        Queued while a settlement buffer is recording, so stocks matched side
+        by side write their rows in stock order.
+        """
+        if SettlementBuffer.defer(cls.log_validation_error, round_number, agent_id, agent_type,
+                                  error_type, details, attempted_action, debug):
+            return
+        state = cls._state()
+        csv_file_path = state.run_dir / 'validation_errors.csv'
         CSVLogger.log_validation_error(
-            logger=cls._loggers['validation_errors'],
+            logger=state.loggers['validation_errors'],
             csv_file_path=csv_file_path,
             round_number=round_number,
             agent_id=agent_id,
@@ -203,7 +282,7 @@ class LoggingService:
     ):
         """Log margin call event."""
         CSVLogger.log_margin_call(
-            logger=cls._loggers['margin_calls'],
+            logger=cls._state().loggers['margin_calls'],
             round_number=round_number,
             agent_id=agent_id,
             agent_type=agent_type,
@@ -214,35 +293,77 @@ class LoggingService:
             price=price
         )
 
+    @classmethod
+    def flush_csv_logs(cls):
+        """Flush and fsync buffered CSV rows (called once per round)."""
+        loggers = cls._state().loggers
+        for name in cls._csv_loggers:
+            if name in loggers:
+                CSVLogger.sync(loggers[name])
+
+    @classmethod
+    def verify_csv_logs(cls):
+        """Check every counted CSV row reached disk (called at shutdown)."""
+        state = cls._state()
+        for name in cls._csv_loggers:
+            if name in state.loggers:
+                CSVLogger.verify(state.loggers[name], state.run_dir / f'{name}.csv')
+
+    @classmethod
+    def finalize(cls):
+        """Drain queued log writes and mirror the run's files into latest_sim.
+
+        No-op unless initialize() was called with queued=True. Loggers write
+        synchronously afterwards.
+        """
+        state = cls._state()
+        writer, state.queued_writer = state.queued_writer, None
+        if writer is None:
+            return
+        writer.stop()
+        cls.flush_csv_logs()
+        for filename in cls._mirrored_files:
+            source = state.run_dir / filename
+            if source.exists():
+                mirror_file(source, state.latest_dir / filename)
+
     @classmethod
     def log_structured_decision(cls, entry):
         """Log structured decision."""
-        cls._loggers['structured_decisions'].info(entry.to_csv())
+        cls._state().loggers['structured_decisions'].info(entry.to_csv())
 
     @classmethod
     def log_decision(cls, message: str):
         """Log decision."""
-        cls._loggers['decisions'].info(message)
+        cls._state().loggers['decisions'].info(message)
 
     @classmethod
     def log_simulation(cls, message: str):
         """Log simulation message."""
-        cls._loggers['simulation'].info(message)
+        cls._state().loggers['simulation'].info(message)
 
     @classmethod
     def log_agent(cls, message: str):
         """Log agent message."""
-        cls._loggers['agents'].info(message)
+        cls._state().loggers['agents'].info(message)
 
     @classmethod
     def log_order_state(cls, message: str):
         """Log order state message."""
-        cls._loggers['order_state'].info(message)
+        cls._state().loggers['order_state'].info(message)
 
     @classmethod
     def log_info_signal(cls, message: str):
         """Log information signal."""
-        cls._loggers['info_signals'].info(message)
+        cls._state().loggers['info_signals'].info(message)
+
+    @classmethod
+    def diagnostic_level(cls, logger_name: str = 'order_state') -> str:
+        """Effective dump level: 'off' whenever the target logger drops INFO."""
+        diagnostics = cls._state().diagnostics
+        if diagnostics == 'off' or not cls.get_logger(logger_name).isEnabledFor(logging.INFO):
+            return 'off'
+        return diagnostics
 
     @classmethod
     def log_all_agent_states(
@@ -252,12 +373,20 @@ class LoggingService:
         prefix: str = ""
     ):
         """Log states for all agents."""
-        logger = cls.get_logger('agents')
-        logger.info(f"\n=== {prefix}Round {round_number} Agent States ===")
-
         # Get current price from context
         current_price = agent_repository.context.current_price
 
+        level = cls.diagnostic_level('agents')
+        if level != 'full':
+            # Snapshots refresh wealth (and its margin checks); keep that without the dump
+            agent_repository.update_all_wealth(current_price)
+            if level == 'summary':
+                cls._log_agent_totals(agent_repository, round_number, prefix)
+            return
+
+        logger = cls.get_logger('agents')
+        logger.info(f"\n=== {prefix}Round {round_number} Agent States ===")
+
         for agent_id in agent_repository.get_all_agent_ids():
             agent = agent_repository.get_agent(agent_id)
             state = agent_repository.get_agent_state_snapshot(agent_id, current_price)
@@ -270,6 +399,28 @@ class LoggingService:
             for msg in messages:
                 logger.info(msg.message)
 
+    @classmethod
+    def _log_agent_totals(cls, agent_repository: 'AgentRepository', round_number: int, prefix: str):
+        """One line of population totals instead of a per-agent dump."""
+        agent_ids = agent_repository.get_all_agent_ids()
+        cash = committed_cash = borrowed_cash = wealth = 0.0
+        shares = committed_shares = borrowed_shares = 0
+        for agent_id in agent_ids:
+            agent = agent_repository.get_agent(agent_id)
+            cash += agent.cash
+            committed_cash += agent.committed_cash
+            borrowed_cash += agent.borrowed_cash
+            wealth += agent.wealth
+            shares += agent.shares
+            committed_shares += agent.committed_shares
+            borrowed_shares += agent.borrowed_shares
+        cls.get_logger('agents').info(
+            f"=== {prefix}Round {round_number} Agent Totals === agents: {len(agent_ids)}, "
+            f"cash: {cash:.2f} (committed {committed_cash:.2f}, borrowed {borrowed_cash:.2f}), "
+            f"shares: {shares} (committed {committed_shares}, borrowed {borrowed_shares}), "
+            f"wealth: {wealth:.2f}"
+        )
+
     @classmethod
     def log_trade(cls, trade: 'Trade', prefix: str = ""):
         """Log trade execution."""
@@ -290,38 +441,43 @@ class LoggingService:
     @classmethod
     def log_market_state(cls, order_book, round_number: int, state_name: str):
         """Log market state."""
+        if cls.diagnostic_level() == 'off':
+            return
         cls.log_order_state(f"\n=== {state_name} ===")
         order_book.log_order_book_state()
 
     @classmethod
     def get_run_dir(cls) -> Path:
         """Get the run directory path."""
-        if cls._run_dir is None:
+        run_dir = cls._state().run_dir
+        if run_dir is None:
             raise RuntimeError("LoggingService not initialized. Call initialize() first.")
-        return cls._run_dir
+        return run_dir
 
     @classmethod
     def get_data_dir(cls) -> Path:
         """Get the data directory path."""
-        if cls._data_dir is None:
+        data_dir = cls._state().data_dir
+        if data_dir is None:
             raise RuntimeError("LoggingService not initialized. Call initialize() first.")
-        return cls._data_dir
+        return data_dir
 
     @classmethod
     def get_logger(cls, name: str) -> logging.Logger:
         """Get logger by name. Creates a default logger if not found."""
-        if not cls._loggers:
+        state = cls._state()
+        if not state.loggers:
             raise RuntimeError("LoggingService not initialized. Call initialize() first.")
 
-        if name not in cls._loggers:
+        if name not in state.loggers:
             # Create a default logger for unregistered names
             # This prevents None returns and crashes
-            logger = logging.getLogger(name)
+            logger = logging.getLogger(SimulationRuntime.current().logger_name(name))
             logger.setLevel(logging.DEBUG)
 
             # Add file handler if run_dir is available
-            if cls._run_dir:
-                file_handler = logging.FileHandler(cls._run_dir / f'{name}.log', mode='w')
+            if state.run_dir:
+                file_handler = logging.FileHandler(state.run_dir / f'{name}.log', mode='w')
                 file_handler.setLevel(logging.DEBUG)
                 file_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
                 logger.addHandler(file_handler)
@@ -333,9 +489,11 @@ class LoggingService:
             logger.addHandler(console_handler)
 
             logger.propagate = False
-            cls._loggers[name] = logger
+            state.loggers[name] = logger
+            if state.queued_writer is not None:
+                state.queued_writer.attach(logger)
 
-        return cls._loggers[name]
+        return state.loggers[name]
 
     @classmethod
     def log_agent_state(
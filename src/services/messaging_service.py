@@ -1,30 +1,42 @@
 from typing import Any, Dict, List
 
+from services.simulation_runtime import SimulationRuntime
+
 
 class MessagingService:
     """Simple in-memory broadcast channel for agent messages.
 
-    Messages accumulate during simulation and are cleared on reset.
+    Messages belong to the current SimulationRuntime, accumulate during the
+    simulation and are cleared on reset.
     For very long simulations (100+ rounds), consider memory implications.
     """
 
-    _messages: Dict[int, List[dict]] = {}
+    @staticmethod
+    def _messages() -> Dict[int, List[dict]]:
+        return SimulationRuntime.current().messages
 
     @classmethod
     def get_messages(cls, round_number: int) -> List[dict]:
         """Return all messages for a given round."""
-        return cls._messages.get(round_number, [])
+        return cls._messages().get(round_number, [])
 
     @classmethod
     def add_message(cls, round_number: int, agent_id: str, message: Dict[str, Any]) -> None:
         """Store a structured message for the specified round."""
         if not message:
             return
-        cls._messages.setdefault(round_number, []).append({
+        cls._messages().setdefault(round_number, []).append({
             "agent_id": agent_id,
             "message": message,
         })
 
+    @classmethod
+    def add_messages(cls, round_number: int, messages: List[tuple]) -> None:
+        """Store (agent_id, message) pairs for the specified round, in order."""
+        cls._messages().setdefault(round_number, []).extend(
+            {"agent_id": agent_id, "message": message} for agent_id, message in messages if message
+        )
+
     @classmethod
     def get_message_history(cls, up_to_round: int) -> List[dict]:
         """Return all messages from round 1 through ``up_to_round`` inclusive."""
@@ -36,9 +48,10 @@ class MessagingService:
     @classmethod
     def get_all_messages(cls) -> List[dict]:
         """Get all messages from all rounds for export/logging."""
+        messages = cls._messages()
         all_messages = []
-        for round_num in sorted(cls._messages.keys()):
-            for msg_data in cls._messages[round_num]:
+        for round_num in sorted(messages.keys()):
+            for msg_data in messages[round_num]:
                 all_messages.append({
                     'round': round_num,
                     'agent_id': msg_data['agent_id'],
@@ -49,4 +62,4 @@ class MessagingService:
     @classmethod
     def reset(cls) -> None:
         """Clear all stored messages."""
-        cls._messages.clear()
+        cls._messages().clear()
@@ -26,6 +26,7 @@ import logging
 from dotenv import load_dotenv
 
 from scenarios.base import DEFAULT_LLM_BASE_URL
+from agents.LLMs.services.llm_endpoints import SharedLLMBudget
 
 logger = logging.getLogger(__name__)
 
@@ -259,15 +260,16 @@ class NewsService:
 
             logger.debug(f"[NEWS] Generating news for round {round_number}")
 
-            completion = self.client.beta.chat.completions.parse(
-                model=self.config.model,
-                messages=[
-                    {"role": "system", "content": NEWS_SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt}
-                ],
-                response_format=NewsGenerationOutput,
-                temperature=0.7,  # Some creativity for varied news
-            )
+            with SharedLLMBudget.slot():
+                completion = self.client.beta.chat.completions.parse(
+                    model=self.config.model,
+                    messages=[
+                        {"role": "system", "content": NEWS_SYSTEM_PROMPT},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    response_format=NewsGenerationOutput,
+                    temperature=0.7,  # Some creativity for varied news
+                )
 
             parsed = completion.choices[0].message.parsed
             news_items = parsed.news_items[:self.config.max_items_per_round]
@@ -330,15 +332,16 @@ class NewsService:
 
             logger.debug(f"[NEWS] Generating multi-stock news for round {round_number} ({len(stocks_data)} stocks)")
 
-            completion = self.client.beta.chat.completions.parse(
-                model=self.config.model,
-                messages=[
-                    {"role": "system", "content": NEWS_SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt}
-                ],
-                response_format=NewsGenerationOutput,
-                temperature=0.7,
-            )
+            with SharedLLMBudget.slot():
+                completion = self.client.beta.chat.completions.parse(
+                    model=self.config.model,
+                    messages=[
+                        {"role": "system", "content": NEWS_SYSTEM_PROMPT},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    response_format=NewsGenerationOutput,
+                    temperature=0.7,
+                )
 
             parsed = completion.choices[0].message.parsed
             news_items = parsed.news_items[:self.config.max_items_per_round]
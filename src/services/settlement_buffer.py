@@ -0,0 +1,67 @@
+"""Deferred settlement, so several stocks can match at the same time.
+
+Matching a stock reads only its own order book and its own orders. Settling
+its trades writes state every stock shares: agent cash, positions and
+commitments, the agents' order lists, the order repository's state indexes
+and the validation error log. While a SettlementBuffer is recording, those
+writes are queued instead of made. Each stock can then match on its own
+thread, against the agent balances as they stood when matching began:
+
+    buffer = SettlementBuffer()
+    with buffer.recording():
+        ...                 # settle() calls are queued
+    buffer.apply()          # ...and run here, in the order they were made
+
+Applying the stocks' buffers in stock order makes the same writes, in the
+same order, as matching the stocks one after another. Market order
+validation is the one read of agent balances during matching. It compares an
+order's cost with the agent's available cash plus what the order already
+holds, so it only decides differently for an agent whose available cash is
+negative.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from typing import Any, Callable, Iterator, List, Optional
+
+
+class SettlementBuffer:
+    """Shared-state writes queued by one stock's matching"""
+
+    _recording: ContextVar[Optional['SettlementBuffer']] = ContextVar('settlement_buffer', default=None)
+
+    def __init__(self):
+        self._writes: List[Callable[[], Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._writes)
+
+    @contextmanager
+    def recording(self) -> Iterator['SettlementBuffer']:
+        """Queue the calling thread/task's settle() calls on this buffer"""
+        token = self._recording.set(self)
+        try:
+            yield self
+        finally:
+            self._recording.reset(token)
+
+    @classmethod
+    def defer(cls, write: Callable[..., Any], *args, **kwargs) -> bool:
+        """Queue write(*args, **kwargs) if a buffer is recording; False means nothing was queued"""
+        buffer = cls._recording.get()
+        if buffer is None:
+            return False
+        buffer._writes.append(partial(write, *args, **kwargs))
+        return True
+
+    @classmethod
+    def settle(cls, write: Callable[..., Any], *args, **kwargs) -> None:
+        """Call write(*args, **kwargs) now, or queue it while a buffer is recording"""
+        if not cls.defer(write, *args, **kwargs):
+            write(*args, **kwargs)
+
+    def apply(self) -> None:
+        """Make the queued writes, in the order they were queued (call outside recording())"""
+        writes, self._writes = self._writes, []
+        for write in writes:
+            write()
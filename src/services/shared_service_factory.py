@@ -1,16 +1,27 @@
+from dataclasses import dataclass
 from typing import Optional, Dict, Union
 from agents.agent_manager.services.commitment_services import CommitmentCalculator
 from agents.agent_manager.services.position_services import PositionCalculator
 from services.messaging_service import MessagingService
+from services.simulation_runtime import SimulationRuntime
+
+
+@dataclass
+class _SharedServices:
+    """SharedServiceFactory state for one SimulationRuntime"""
+    commitment_calculator: Optional[CommitmentCalculator] = None
+    position_calculator: Optional[PositionCalculator] = None
+    order_book: object = None
+    order_books: Optional[Dict] = None  # For multi-stock support
+    is_multi_stock: bool = False
+
 
 class SharedServiceFactory:
-    """Factory for services shared across multiple components"""
+    """Factory for services shared across multiple components of one simulation"""
 
-    _commitment_calculator: Optional[CommitmentCalculator] = None
-    _position_calculator: Optional[PositionCalculator] = None
-    _order_book = None
-    _order_books: Optional[Dict] = None  # For multi-stock support
-    _is_multi_stock: bool = False
+    @staticmethod
+    def _state() -> _SharedServices:
+        return SimulationRuntime.current().service_state('shared_services', _SharedServices)
 
     @classmethod
     def initialize(cls, order_book=None, order_books: Optional[Dict] = None) -> None:
@@ -20,36 +31,39 @@ class SharedServiceFactory:
             order_book: Single order book for single-stock mode
             order_books: Dict of {stock_id: OrderBook} for multi-stock mode
         """
+        state = cls._state()
         if order_books is not None:
             # Multi-stock mode
-            cls._order_books = order_books
-            cls._order_book = list(order_books.values())[0]  # Backwards compatibility
-            cls._is_multi_stock = True
+            state.order_books = order_books
+            state.order_book = list(order_books.values())[0]  # Backwards compatibility
+            state.is_multi_stock = True
         else:
             # Single-stock mode
-            cls._order_book = order_book
-            cls._order_books = None
-            cls._is_multi_stock = False
+            state.order_book = order_book
+            state.order_books = None
+            state.is_multi_stock = False
 
     @classmethod
     def get_commitment_calculator(cls) -> CommitmentCalculator:
         """Get or create CommitmentCalculator singleton"""
-        if cls._commitment_calculator is None:
-            if cls._order_book is None:
+        state = cls._state()
+        if state.commitment_calculator is None:
+            if state.order_book is None:
                 raise RuntimeError("SharedServiceFactory not initialized with order_book")
             # Pass both single and multi-stock order books to calculator
-            cls._commitment_calculator = CommitmentCalculator(
-                order_book=cls._order_book,
-                order_books=cls._order_books
+            state.commitment_calculator = CommitmentCalculator(
+                order_book=state.order_book,
+                order_books=state.order_books
             )
-        return cls._commitment_calculator
+        return state.commitment_calculator
     
     @classmethod
     def get_position_calculator(cls) -> PositionCalculator:
         """Get or create PositionCalculator singleton"""
-        if cls._position_calculator is None:
-            cls._position_calculator = PositionCalculator()
-        return cls._position_calculator
+        state = cls._state()
+        if state.position_calculator is None:
+            state.position_calculator = PositionCalculator()
+        return state.position_calculator
     
     @classmethod
     def get_order_book_for_stock(cls, stock_id: str):
@@ -61,17 +75,19 @@ class SharedServiceFactory:
         Returns:
             The order book for the specified stock, or the single order book if not multi-stock
         """
-        if cls._order_books is not None and stock_id in cls._order_books:
-            return cls._order_books[stock_id]
+        state = cls._state()
+        if state.order_books is not None and stock_id in state.order_books:
+            return state.order_books[stock_id]
         # Fallback to single order book
-        return cls._order_book
+        return state.order_book
 
     @classmethod
     def reset(cls) -> None:
         """Reset all shared services"""
-        cls._commitment_calculator = None
-        cls._position_calculator = None
-        cls._order_book = None
-        cls._order_books = None
-        cls._is_multi_stock = False
+        state = cls._state()
+        state.commitment_calculator = None
+        state.position_calculator = None
+        state.order_book = None
+        state.order_books = None
+        state.is_multi_stock = False
         MessagingService.reset()
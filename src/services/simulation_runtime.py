@@ -0,0 +1,99 @@
+"""Per-simulation runtime: the state class-level services keep for one simulation.
+
+LoggingService, MessagingService, SharedServiceFactory and the news cache
+are used through classmethods all over the code base. Their state lives on
+the SimulationRuntime that is current in the calling thread or asyncio task,
+so several BaseSimulation instances can run concurrently in one process:
+
+    runtime = SimulationRuntime(seed=42)
+    with runtime.activate():
+        ...                      # services see this simulation's state
+
+BaseSimulation creates a runtime (or takes one) and makes it current in
+__init__, run() and execute_round(). Code that never creates a runtime uses
+a process-wide default, which behaves like the old class attributes.
+
+The runtime also owns the simulation's random generators. An unseeded
+runtime uses the module-level `random` and `numpy.random` state, as before.
+A seeded runtime gets its own random.Random and numpy RandomState, which
+produce the same streams as seeding the module-level generators did.
+
+LLM call control (retry policy, deadline, counters), the LLM response cache
+and the async client pools are per runtime too. Only SharedLLMBudget, the
+cap on requests in flight across sweep processes, is process-wide.
+"""
+import itertools
+import random
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+_counter = itertools.count(1)
+_default_lock = threading.Lock()
+
+
+class SimulationRuntime:
+    """State owned by one simulation, reached through SimulationRuntime.current()"""
+
+    _current: ContextVar[Optional['SimulationRuntime']] = ContextVar('simulation_runtime', default=None)
+    _default: Optional['SimulationRuntime'] = None
+
+    def __init__(self, seed: Optional[int] = None, namespace: Optional[str] = None):
+        """
+        Args:
+            seed: Seed for this runtime's generators (None = module-level generators)
+            namespace: Prefix for logger names. Defaults to '' for the first
+                runtime in the process and 'simN' for later ones, so the
+                loggers of concurrent simulations never share handlers.
+        """
+        if namespace is None:
+            number = next(_counter)
+            namespace = '' if number == 1 else f"sim{number}"
+        self.namespace = namespace
+        self.seed = seed
+        if seed is None:
+            self.rng = random
+            self.np_rng = np.random
+        else:
+            self.rng = random.Random(seed)
+            self.np_rng = np.random.RandomState(seed)
+        self.messages: Dict[int, List[dict]] = {}  # MessagingService
+        self.news_cache: Dict[int, list] = {}      # NewsProvider multi-stock news
+        self._services: Dict[str, Any] = {}
+
+    @classmethod
+    def current(cls) -> 'SimulationRuntime':
+        """Runtime of the calling thread/task, or the process-wide default"""
+        runtime = cls._current.get()
+        if runtime is not None:
+            return runtime
+        with _default_lock:
+            if cls._default is None:
+                cls._default = cls(namespace='')
+        return cls._default
+
+    def make_current(self) -> None:
+        """Make this runtime current for the rest of the calling thread/task"""
+        self._current.set(self)
+
+    @contextmanager
+    def activate(self) -> Iterator['SimulationRuntime']:
+        """Make this runtime current inside the block"""
+        token = self._current.set(self)
+        try:
+            yield self
+        finally:
+            self._current.reset(token)
+
+    def logger_name(self, name: str) -> str:
+        return f"{self.namespace}.{name}" if self.namespace else name
+
+    def service_state(self, key: str, factory: Callable[[], Any]) -> Any:
+        """State object of a class-level service, created on first use"""
+        state = self._services.get(key)
+        if state is None:
+            state = self._services[key] = factory()
+        return state
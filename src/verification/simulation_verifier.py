@@ -6,9 +6,18 @@ throughout execution, including cash conservation, share conservation, commitmen
 and various financial calculations.
 """
 
-from typing import Dict
+import random
+from itertools import chain
+from typing import Dict, Optional, Union
 from services.logging_service import LoggingService
 from market.orders.order import OrderState
+from agents.agent_manager.services.order_services import is_active
+from market.state.sim_context import PAYMENT_FIELDS
+
+# off: no checks; cheap: system cash and share totals only; sampled: full checks
+# on sampled rounds and cheap checks on the rest; full: every check, every round
+VERIFICATION_LEVELS = ('off', 'cheap', 'sampled', 'full')
+DEFAULT_VERIFICATION_SAMPLE = 0.1  # Fraction of rounds with full checks in sampled mode
 
 
 class SimulationVerifier:
@@ -16,6 +25,18 @@ class SimulationVerifier:
     Verifies simulation state invariants and detects accounting errors.
 
     Extracted from BaseSimulation to separate verification logic from simulation logic.
+
+    Per-round checks read payment aggregates from the contexts' running totals
+    and commitments from the order state index, so they cost O(agents + active
+    orders) however long the run is. A full audit additionally reconciles those
+    totals with the raw market history and scans every order in the repository;
+    it runs every `full_audit_every` rounds (if set) and on the final round.
+
+    The verification level (see VERIFICATION_LEVELS) trades these checks for
+    speed. At `cheap`, only system-wide cash and share totals are checked, with
+    no per-agent logging, and there is no full audit. At `sampled`, rounds
+    picked by `sample` and full audit rounds get the full checks, the rest
+    the cheap ones.
     """
 
     def __init__(self,
@@ -36,7 +57,11 @@ class SimulationVerifier:
                  cash_lending_repo=None,
                  interest_service=None,
                  borrow_service=None,
-                 leverage_interest_service=None):
+                 leverage_interest_service=None,
+                 full_audit_every: Optional[int] = None,
+                 level: str = 'full',
+                 sample: Union[float, int, list, None] = None,
+                 sample_seed: Optional[int] = None):
         """
         Initialize the verifier with references to simulation components.
 
@@ -59,7 +84,15 @@ class SimulationVerifier:
             interest_service: Interest service for interest rate verification
             borrow_service: Borrow service for borrow fee verification
             leverage_interest_service: Leverage interest service for leverage interest verification
+            full_audit_every: Run the full audit every N rounds (None = final round only)
+            level: Verification level, one of VERIFICATION_LEVELS
+            sample: Rounds with full checks at the sampled level: a fraction of
+                rounds drawn at random (float), every N rounds (int) or a list
+                of round numbers (default DEFAULT_VERIFICATION_SAMPLE)
+            sample_seed: Seed for drawing sampled rounds
         """
+        if full_audit_every is not None and full_audit_every < 1:
+            raise ValueError(f"full_audit_every must be at least 1, got {full_audit_every}")
         self.agent_repository = agent_repository
         self.context = context
         self.contexts = contexts
@@ -78,17 +111,61 @@ class SimulationVerifier:
         self.interest_service = interest_service
         self.borrow_service = borrow_service
         self.leverage_interest_service = leverage_interest_service
+        self.full_audit_every = full_audit_every
+        self.configure(level, sample, sample_seed)
 
         self.logger = LoggingService.get_logger('verification')
 
+    def configure(self, level: str, sample: Union[float, int, list, None] = None,
+                  sample_seed: Optional[int] = None):
+        """Set the verification level and, for `sampled`, which rounds get full checks"""
+        if level not in VERIFICATION_LEVELS:
+            raise ValueError(f"Unknown verification level: {level!r}. "
+                             f"Choose one of {', '.join(VERIFICATION_LEVELS)}")
+        if sample is None:
+            sample = DEFAULT_VERIFICATION_SAMPLE
+        if isinstance(sample, float):
+            if not 0 < sample <= 1:
+                raise ValueError(f"Verification sample rate must be in (0, 1], got {sample}")
+        elif isinstance(sample, int):
+            if sample < 1:
+                raise ValueError(f"Verification sample interval must be at least 1, got {sample}")
+        else:
+            sample = frozenset(sample)
+
+        self.level = level
+        self.sample = sample
+        # Own generator, so sampling never shifts the simulation's random draws
+        self._sample_rng = random.Random(sample_seed)
+
+    def checks_for_round(self, round_number: int) -> str:
+        """Which checks run at the end of a round: 'off', 'cheap' or 'full'
+
+        At the sampled level, call once per round: random sampling draws here.
+        """
+        if self.level != 'sampled':
+            return self.level
+        if self.is_full_audit_round(round_number):
+            return 'full'
+        if isinstance(self.sample, float):
+            sampled = self._sample_rng.random() < self.sample
+        elif isinstance(self.sample, int):
+            sampled = round_number % self.sample == 0
+        else:
+            sampled = round_number in self.sample
+        return 'full' if sampled else 'cheap'
+
     def store_pre_round_states(self) -> Dict[str, Dict]:
         """
         Store pre-round states for verification.
 
         Returns:
             Dict mapping agent_id to dict with 'total_cash' and 'total_shares'
+            (empty when verification is off)
         """
         pre_round_states = {}
+        if self.level == 'off':
+            return pre_round_states
 
         for agent_id in self.agent_repository.get_all_agent_ids():
             agent = self.agent_repository.get_agent(agent_id)
@@ -110,7 +187,16 @@ class SimulationVerifier:
         Args:
             pre_round_states: Pre-round state snapshot from store_pre_round_states()
         """
-        self.logger.info(f"\n=== Verifying state changes for round {self.context.round_number} ===")
+        checks = self.checks_for_round(self.context.round_number)
+        if checks == 'off':
+            return
+        if checks == 'cheap':
+            self.verify_conservation_totals(pre_round_states)
+            return
+
+        full_audit = self.is_full_audit_round(self.context.round_number)
+        self.logger.info(f"\n=== Verifying state changes for round {self.context.round_number}"
+                         f"{' (full audit)' if full_audit else ''} ===")
 
         # Log per-agent changes
         self._log_agent_changes(pre_round_states)
@@ -127,13 +213,159 @@ class SimulationVerifier:
         self.verify_leverage_cash_flows()
         self.verify_order_book_consistency()
         self.verify_wealth_conservation(pre_round_states)
-        self.verify_commitment_order_matching()
+        self.verify_commitment_order_matching(exhaustive=full_audit)
         self.verify_agent_equity_non_negative()  # CRITICAL: Check no agent has negative equity
 
+        # Periodic safety net: recheck the running totals and indexes against raw state
+        if full_audit:
+            self.verify_payment_ledger()
+            self.verify_order_state_index()
+
         # Multi-stock specific invariants
         if self.is_multi_stock:
             self.verify_multi_stock_invariants()
 
+    def is_full_audit_round(self, round_number: int) -> bool:
+        """Whether the end-of-round checks for this round include the full audit"""
+        if self.full_audit_every and round_number % self.full_audit_every == 0:
+            return True
+        return not self.infinite_rounds and round_number == self.context._num_rounds
+
+    def verify_conservation_totals(self, pre_round_states):
+        """Cheap check: system-wide cash and share totals, without per-agent logging
+
+        Same conservation invariants as _verify_cash_conservation and
+        _verify_share_conservation, in one pass over agents.
+        """
+        total_cash_pre = sum(state['total_cash'] for state in pre_round_states.values())
+        total_cash_post = initial_cash = margin_call_costs = 0
+        total_shares = initial_shares = 0
+        for agent in self.agent_repository.get_all_agents():
+            total_cash_post += agent.total_cash
+            initial_cash += agent.initial_cash
+            margin_call_costs += agent.margin_call_cost_this_round
+            total_shares += agent.total_shares
+            initial_shares += agent.initial_shares
+
+        # Margin call costs are subtracted because buy-to-cover creates shares without going through market
+        current_round = self.context.round_number
+        expected_change = self._net_cash_flow(current_round - 1) - margin_call_costs
+        cash_difference = total_cash_post - total_cash_pre
+        if abs(cash_difference - expected_change) > 0.01:
+            msg = (f"Round cash change doesn't match round payments:\n"
+                   f"Change in cash: ${cash_difference:.2f}\n"
+                   f"Round payments: ${expected_change:.2f}")
+            self.logger.error(msg)
+            raise ValueError(msg)
+
+        expected_total_cash = initial_cash + self._net_cash_flow()
+        if abs(total_cash_post - expected_total_cash) > 0.01:
+            msg = (f"Total system cash doesn't match historical payments:\n"
+                   f"Current total cash: ${total_cash_post:.2f}\n"
+                   f"Expected total: ${expected_total_cash:.2f}")
+            self.logger.error(msg)
+            raise ValueError(msg)
+
+        if self.is_multi_stock:
+            repos = self.borrowing_repositories.values()
+        else:
+            repos = (self.agent_repository.borrowing_repository,)
+        borrowed_total = sum(repo.total_lendable - repo.available_shares for repo in repos)
+        is_final_redemption = current_round == self.context._num_rounds and not self.infinite_rounds
+        expected_shares = 0 if is_final_redemption else initial_shares + borrowed_total
+        if total_shares != expected_shares:
+            msg = (f"Total shares in system don't match {'final redemption' if is_final_redemption else 'initial allocation'}:\n"
+                   f"Initial shares: {initial_shares}\n"
+                   f"Borrowed shares: {borrowed_total}\n"
+                   f"Current shares: {total_shares}\n"
+                   f"Expected shares: {expected_shares}")
+            self.logger.error(msg)
+            raise ValueError(msg)
+
+        self.logger.info(f"✓ Round {current_round}: cash and share totals conserved "
+                         f"(cash ${total_cash_post:.2f}, shares {total_shares})")
+
+    def _net_cash_flow(self, round_number: Optional[int] = None) -> float:
+        """Net cash paid into the system by payments, over the run or in one round"""
+        return (self._payment_total('dividends_paid', round_number)
+                + self._payment_total('interest_paid', round_number)
+                - self._payment_total('borrow_fees_paid', round_number)
+                + self._payment_total('leverage_cash_borrowed', round_number)
+                - self._payment_total('leverage_interest_charged', round_number)
+                - self._payment_total('leverage_cash_repaid', round_number))
+
+    def _payment_contexts(self):
+        """Contexts whose payments make up system cash flows"""
+        return self.contexts.values() if self.is_multi_stock else (self.context,)
+
+    def _payment_total(self, field: str, round_number: Optional[int] = None) -> float:
+        """Sum a payment field across stocks from the contexts' running totals"""
+        return sum(context.payment_total(field, round_number) for context in self._payment_contexts())
+
+    def verify_payment_ledger(self):
+        """Verify running payment totals match the market history they summarize"""
+        self.logger.info("\n=== Payment Ledger Verification ===")
+
+        errors = []
+        for context in self._payment_contexts():
+            for field in PAYMENT_FIELDS:
+                history_total = 0.0
+                history_by_round = {}
+                for payment in getattr(context.market_history, field):
+                    history_total += payment['amount']
+                    history_by_round[payment['round']] = \
+                        history_by_round.get(payment['round'], 0.0) + payment['amount']
+
+                if abs(context.payment_total(field) - history_total) > 0.01:
+                    errors.append(f"{field}: running total ${context.payment_total(field):.2f} "
+                                  f"!= history ${history_total:.2f}")
+                rounds = set(history_by_round) | set(context.round_payment_totals[field])
+                for round_number in sorted(rounds):
+                    ledger_amount = context.payment_total(field, round_number)
+                    history_amount = history_by_round.get(round_number, 0.0)
+                    if abs(ledger_amount - history_amount) > 0.01:
+                        errors.append(f"{field} round {round_number}: running total ${ledger_amount:.2f} "
+                                      f"!= history ${history_amount:.2f}")
+
+        if errors:
+            msg = "CRITICAL ERROR - Payment ledger out of sync with market history:\n" + "\n".join(errors)
+            self.logger.error(msg)
+            raise ValueError(msg)
+
+        self.logger.info("✓ Payment ledger matches market history")
+
+    def verify_order_state_index(self):
+        """Verify the order repository's state and per-agent active indexes hold exactly its orders"""
+        self.logger.info("\n=== Order State Index Verification ===")
+
+        state_index = self.order_repository.state_index
+        errors = []
+        for order_id, order in self.order_repository.orders.items():
+            if order_id not in state_index[order.state][order.side]:
+                errors.append(f"Order {order_id[:8]} ({order.side}, {order.state.value}) "
+                              f"missing from its state index")
+
+        indexed = sum(len(order_ids) for sides in state_index.values() for order_ids in sides.values())
+        if indexed != len(self.order_repository.orders):
+            errors.append(f"State index holds {indexed} orders, "
+                          f"repository holds {len(self.order_repository.orders)}")
+
+        # Each agent's live order index holds exactly its commitment-holding orders
+        active_index = self.order_repository.agent_active_index
+        for agent_id, order_ids in self.order_repository.agent_index.items():
+            live = [oid for oid in order_ids if is_active(self.order_repository.orders[oid])]
+            indexed_live = list(active_index.get(agent_id, ()))
+            if sorted(live) != sorted(indexed_live):
+                errors.append(f"Agent {agent_id} active order index holds {len(indexed_live)} orders, "
+                              f"{len(live)} orders hold commitments")
+
+        if errors:
+            msg = "CRITICAL ERROR - Order state index inconsistent:\n" + "\n".join(errors)
+            self.logger.error(msg)
+            raise ValueError(msg)
+
+        self.logger.info("✓ Order state index verified")
+
     def verify_borrowing_pool_consistency(self):
         """Verify borrowing pool accounting is consistent"""
         self.logger.info("\n=== Borrowing Pool Consistency Verification ===")
@@ -292,17 +524,7 @@ class SimulationVerifier:
         self.logger.info("\n=== Dividend Accumulation Verification ===")
 
         # Calculate total dividends paid across all stocks
-        if self.is_multi_stock:
-            total_dividends_paid = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.dividends_paid
-            )
-        else:
-            total_dividends_paid = sum(
-                payment['amount']
-                for payment in self.context.market_history.dividends_paid
-            )
+        total_dividends_paid = self._payment_total('dividends_paid')
 
         # Calculate total dividend cash held by agents
         total_dividend_cash = sum(
@@ -371,19 +593,7 @@ class SimulationVerifier:
         # Verify interest payments match calculations
         current_round = self.context.round_number
 
-        if self.is_multi_stock:
-            total_interest_paid = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.interest_paid
-                if payment['round'] == current_round - 1
-            )
-        else:
-            total_interest_paid = sum(
-                payment['amount']
-                for payment in self.context.market_history.interest_paid
-                if payment['round'] == current_round - 1
-            )
+        total_interest_paid = self._payment_total('interest_paid', current_round - 1)
 
         self.logger.info(f"Total interest paid this round: ${total_interest_paid:.2f}")
 
@@ -419,19 +629,7 @@ class SimulationVerifier:
         # Get borrow fee payments
         current_round = self.context.round_number
 
-        if self.is_multi_stock:
-            total_borrow_fees_paid = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.borrow_fees_paid
-                if payment['round'] == current_round - 1
-            )
-        else:
-            total_borrow_fees_paid = sum(
-                payment['amount']
-                for payment in self.context.market_history.borrow_fees_paid
-                if payment['round'] == current_round - 1
-            )
+        total_borrow_fees_paid = self._payment_total('borrow_fees_paid', current_round - 1)
 
         # Get total borrowed shares
         total_borrowed = sum(
@@ -483,30 +681,8 @@ class SimulationVerifier:
         current_round = self.context.round_number
 
         # Get leverage cash flows for this round
-        if self.is_multi_stock:
-            total_leverage_cash_borrowed = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.leverage_cash_borrowed
-                if payment['round'] == current_round - 1
-            )
-            total_leverage_interest_charged = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.leverage_interest_charged
-                if payment['round'] == current_round - 1
-            )
-        else:
-            total_leverage_cash_borrowed = sum(
-                payment['amount']
-                for payment in self.context.market_history.leverage_cash_borrowed
-                if payment['round'] == current_round - 1
-            )
-            total_leverage_interest_charged = sum(
-                payment['amount']
-                for payment in self.context.market_history.leverage_interest_charged
-                if payment['round'] == current_round - 1
-            )
+        total_leverage_cash_borrowed = self._payment_total('leverage_cash_borrowed', current_round - 1)
+        total_leverage_interest_charged = self._payment_total('leverage_interest_charged', current_round - 1)
 
         # Get total borrowed cash from agents
         total_agent_borrowed_cash = sum(
@@ -650,74 +826,12 @@ class SimulationVerifier:
         # Get payments from this round
         current_round = self.context.round_number
 
-        if self.is_multi_stock:
-            dividend_payment = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.dividends_paid
-                if payment['round'] == current_round - 1
-            )
-            interest_payment = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.interest_paid
-                if payment['round'] == current_round - 1
-            )
-            borrow_fee_payment = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.borrow_fees_paid
-                if payment['round'] == current_round - 1
-            )
-            leverage_cash_borrowed = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.leverage_cash_borrowed
-                if payment['round'] == current_round - 1
-            )
-            leverage_interest_charged = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.leverage_interest_charged
-                if payment['round'] == current_round - 1
-            )
-            leverage_cash_repaid = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.leverage_cash_repaid
-                if payment['round'] == current_round - 1
-            )
-        else:
-            dividend_payment = sum(
-                payment['amount']
-                for payment in self.context.market_history.dividends_paid
-                if payment['round'] == current_round - 1
-            )
-            interest_payment = sum(
-                payment['amount']
-                for payment in self.context.market_history.interest_paid
-                if payment['round'] == current_round - 1
-            )
-            borrow_fee_payment = sum(
-                payment['amount']
-                for payment in self.context.market_history.borrow_fees_paid
-                if payment['round'] == current_round - 1
-            )
-            leverage_cash_borrowed = sum(
-                payment['amount']
-                for payment in self.context.market_history.leverage_cash_borrowed
-                if payment['round'] == current_round - 1
-            )
-            leverage_interest_charged = sum(
-                payment['amount']
-                for payment in self.context.market_history.leverage_interest_charged
-                if payment['round'] == current_round - 1
-            )
-            leverage_cash_repaid = sum(
-                payment['amount']
-                for payment in self.context.market_history.leverage_cash_repaid
-                if payment['round'] == current_round - 1
-            )
+        dividend_payment = self._payment_total('dividends_paid', current_round - 1)
+        interest_payment = self._payment_total('interest_paid', current_round - 1)
+        borrow_fee_payment = self._payment_total('borrow_fees_paid', current_round - 1)
+        leverage_cash_borrowed = self._payment_total('leverage_cash_borrowed', current_round - 1)
+        leverage_interest_charged = self._payment_total('leverage_interest_charged', current_round - 1)
+        leverage_cash_repaid = self._payment_total('leverage_cash_repaid', current_round - 1)
 
         expected_wealth_change = dividend_payment + interest_payment - borrow_fee_payment + leverage_cash_borrowed - leverage_interest_charged - leverage_cash_repaid
         actual_wealth_change = post_wealth - pre_wealth
@@ -738,8 +852,12 @@ class SimulationVerifier:
 
         self.logger.info("✓ Wealth conservation verified (trades are zero-sum)")
 
-    def verify_commitment_order_matching(self):
-        """Verify that committed resources match outstanding orders"""
+    def verify_commitment_order_matching(self, exhaustive: bool = False):
+        """Verify that committed resources match outstanding orders
+
+        Active orders come from the repository's state index, or with
+        exhaustive=True from a scan of every order in the repository.
+        """
         self.logger.info("\n=== Commitment-Order Matching Verification ===")
 
         # Get all active orders
@@ -751,7 +869,13 @@ class SimulationVerifier:
         expected_committed_cash = 0
         expected_committed_shares_per_stock = {}
 
-        for order in self.order_repository.orders.values():
+        if exhaustive:
+            orders = self.order_repository.orders.values()
+        else:
+            orders = chain.from_iterable(
+                self.order_repository.iter_orders_by_state(state) for state in active_states)
+
+        for order in orders:
             if order.state in active_states:
                 if order.side == 'buy':
                     # Buy orders commit cash - use current_cash_commitment which tracks actual commitment
@@ -963,74 +1087,12 @@ class SimulationVerifier:
         # Get payments from this round
         current_round = self.context.round_number
 
-        if self.is_multi_stock:
-            dividend_payment = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.dividends_paid
-                if payment['round'] == current_round - 1
-            )
-            interest_payment = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.interest_paid
-                if payment['round'] == current_round - 1
-            )
-            borrow_fee_payment = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.borrow_fees_paid
-                if payment['round'] == current_round - 1
-            )
-            leverage_cash_borrowed = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.leverage_cash_borrowed
-                if payment['round'] == current_round - 1
-            )
-            leverage_interest_charged = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.leverage_interest_charged
-                if payment['round'] == current_round - 1
-            )
-            leverage_cash_repaid = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.leverage_cash_repaid
-                if payment['round'] == current_round - 1
-            )
-        else:
-            dividend_payment = sum(
-                payment['amount']
-                for payment in self.context.market_history.dividends_paid
-                if payment['round'] == current_round - 1
-            )
-            interest_payment = sum(
-                payment['amount']
-                for payment in self.context.market_history.interest_paid
-                if payment['round'] == current_round - 1
-            )
-            borrow_fee_payment = sum(
-                payment['amount']
-                for payment in self.context.market_history.borrow_fees_paid
-                if payment['round'] == current_round - 1
-            )
-            leverage_cash_borrowed = sum(
-                payment['amount']
-                for payment in self.context.market_history.leverage_cash_borrowed
-                if payment['round'] == current_round - 1
-            )
-            leverage_interest_charged = sum(
-                payment['amount']
-                for payment in self.context.market_history.leverage_interest_charged
-                if payment['round'] == current_round - 1
-            )
-            leverage_cash_repaid = sum(
-                payment['amount']
-                for payment in self.context.market_history.leverage_cash_repaid
-                if payment['round'] == current_round - 1
-            )
+        dividend_payment = self._payment_total('dividends_paid', current_round - 1)
+        interest_payment = self._payment_total('interest_paid', current_round - 1)
+        borrow_fee_payment = self._payment_total('borrow_fees_paid', current_round - 1)
+        leverage_cash_borrowed = self._payment_total('leverage_cash_borrowed', current_round - 1)
+        leverage_interest_charged = self._payment_total('leverage_interest_charged', current_round - 1)
+        leverage_cash_repaid = self._payment_total('leverage_cash_repaid', current_round - 1)
 
         # Get margin call costs from all agents (cash that "leaves" system for buy-to-cover)
         margin_call_costs = sum(
@@ -1077,44 +1139,12 @@ class SimulationVerifier:
             for agent_id in self.agent_repository.get_all_agent_ids()
         )
 
-        if self.is_multi_stock:
-            total_historical_dividends = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.dividends_paid
-            )
-            total_historical_interest = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.interest_paid
-            )
-            total_historical_borrow_fees = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.borrow_fees_paid
-            )
-            total_historical_leverage_cash_borrowed = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.leverage_cash_borrowed
-            )
-            total_historical_leverage_interest_charged = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.leverage_interest_charged
-            )
-            total_historical_leverage_cash_repaid = sum(
-                payment['amount']
-                for context in self.contexts.values()
-                for payment in context.market_history.leverage_cash_repaid
-            )
-        else:
-            total_historical_dividends = sum(payment['amount'] for payment in self.context.market_history.dividends_paid)
-            total_historical_interest = sum(payment['amount'] for payment in self.context.market_history.interest_paid)
-            total_historical_borrow_fees = sum(payment['amount'] for payment in self.context.market_history.borrow_fees_paid)
-            total_historical_leverage_cash_borrowed = sum(payment['amount'] for payment in self.context.market_history.leverage_cash_borrowed)
-            total_historical_leverage_interest_charged = sum(payment['amount'] for payment in self.context.market_history.leverage_interest_charged)
-            total_historical_leverage_cash_repaid = sum(payment['amount'] for payment in self.context.market_history.leverage_cash_repaid)
+        total_historical_dividends = self._payment_total('dividends_paid')
+        total_historical_interest = self._payment_total('interest_paid')
+        total_historical_borrow_fees = self._payment_total('borrow_fees_paid')
+        total_historical_leverage_cash_borrowed = self._payment_total('leverage_cash_borrowed')
+        total_historical_leverage_interest_charged = self._payment_total('leverage_interest_charged')
+        total_historical_leverage_cash_repaid = self._payment_total('leverage_cash_repaid')
 
         expected_total_cash = (
             initial_cash + total_historical_dividends + total_historical_interest - total_historical_borrow_fees
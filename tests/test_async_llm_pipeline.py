@@ -0,0 +1,303 @@
+import sys
+import time
+import types
+import asyncio
+import logging
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+
+class _TestLoggingService:
+    @staticmethod
+    def get_logger(name):
+        return logging.getLogger(name)
+
+    @staticmethod
+    def log_agent_state(*args, **kwargs):
+        pass
+
+    @staticmethod
+    def log_validation_error(*args, **kwargs):
+        pass
+
+
+sys.modules.setdefault("services.logging_service", types.ModuleType("services.logging_service"))
+sys.modules["services.logging_service"].LoggingService = _TestLoggingService
+
+from agents.LLMs.services.llm_endpoints import (
+    ENDPOINT_PROFILES,
+    EndpointProfile,
+    TokenBucket,
+    resolve_endpoint_profile,
+)
+from agents.LLMs.services.llm_retry import LLMCallControl, LLMDeadlineExceeded, RetryPolicy
+from agents.LLMs.services.llm_services import LLMService, LLMRequest
+from agents.LLMs.services.schema_features import FeatureRegistry
+from agents.agent_manager.services.agent_decision_service import AgentDecisionService
+from services.simulation_runtime import SimulationRuntime
+
+
+@pytest.fixture(autouse=True)
+def _reset_call_control():
+    LLMCallControl.reset()
+    yield
+    LLMCallControl.reset()
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_refills_at_per_minute_rate():
+    clock = _FakeClock()
+    bucket = TokenBucket(per_minute=60, clock=clock)  # 1 token per second
+
+    assert bucket.try_acquire(60) == 0.0
+    assert bucket.try_acquire(1) == pytest.approx(1.0)
+
+    clock.now = 0.5
+    assert bucket.try_acquire(1) == pytest.approx(0.5)
+    clock.now = 1.0
+    assert bucket.try_acquire(1) == 0.0
+
+    # Usage reconciliation can push the balance negative
+    bucket.adjust(10)
+    assert bucket.try_acquire(1) == pytest.approx(11.0)
+
+
+def test_resolve_endpoint_profile():
+    assert resolve_endpoint_profile() is ENDPOINT_PROFILES['default']
+    assert resolve_endpoint_profile('local') is ENDPOINT_PROFILES['local']
+
+    custom = resolve_endpoint_profile({'base': 'local', 'max_in_flight': 4, 'requests_per_minute': 30})
+    assert custom.base_url == ENDPOINT_PROFILES['local'].base_url
+    assert custom.max_in_flight == 4
+    assert custom.requests_per_minute == 30
+
+    with pytest.raises(ValueError):
+        resolve_endpoint_profile('no_such_endpoint')
+    with pytest.raises(ValueError):
+        EndpointProfile(name='bad', max_in_flight=0)
+
+
+class _SlowAgentRepository:
+    """Agents answer in reverse order of the shuffle; records processing order"""
+
+    def __init__(self, agent_ids):
+        self.agent_ids = agent_ids
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.processed = []
+
+    def get_shuffled_agent_ids(self):
+        return list(self.agent_ids)
+
+    async def get_agent_decision_async(self, agent_id, market_state, history, round_number):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001 * (len(self.agent_ids) - self.agent_ids.index(agent_id)))
+        self.in_flight -= 1
+        return {'replace_decision': 'Add', 'orders': [], 'agent_id': agent_id}
+
+    def record_agent_decision(self, agent_id, decision):
+        self.processed.append(agent_id)
+
+    def get_agent(self, agent_id):
+        return SimpleNamespace(get_fallback_decision=lambda: {
+            'replace_decision': 'Add', 'orders': [], 'reasoning': 'fallback'})
+
+
+class _NoOrders:
+    def get_active_orders_from_agent(self, agent_id):
+        return []
+
+
+def _decision_service(repository, **kwargs):
+    return AgentDecisionService(
+        agent_repository=repository,
+        order_repository=_NoOrders(),
+        order_state_manager=None,
+        agents_logger=logging.getLogger("agents"),
+        decisions_logger=logging.getLogger("decisions"),
+        context=None,
+        async_decisions=True,
+        **kwargs,
+    )
+
+
+def test_async_decisions_fan_out_and_keep_shuffled_order():
+    agent_ids = [f"agent_{i}" for i in range(20)]
+    repository = _SlowAgentRepository(agent_ids)
+    service = _decision_service(repository)
+
+    new_orders = service.collect_decisions({'price': 100}, [], round_number=1)
+
+    assert new_orders == []
+    assert repository.max_in_flight == len(agent_ids)
+    assert repository.processed == agent_ids
+
+
+class _RuntimeAgentRepository(_SlowAgentRepository):
+    """Records the simulation runtime each decision sees"""
+
+    def __init__(self, agent_ids):
+        super().__init__(agent_ids)
+        self.runtimes = []
+
+    async def get_agent_decision_async(self, agent_id, market_state, history, round_number):
+        self.runtimes.append(SimulationRuntime.current())
+        return await super().get_agent_decision_async(agent_id, market_state, history, round_number)
+
+
+def test_async_decisions_inside_a_running_event_loop():
+    agent_ids = [f"agent_{i}" for i in range(5)]
+    repository = _RuntimeAgentRepository(agent_ids)
+    service = _decision_service(repository)
+    runtime = SimulationRuntime(seed=3)
+
+    async def simulate():
+        with runtime.activate():
+            return service.collect_decisions({'price': 100}, [], round_number=1)
+
+    assert asyncio.run(simulate()) == []
+    assert repository.processed == agent_ids
+    assert repository.runtimes == [runtime] * len(agent_ids)
+
+
+class _StuckAgentRepository(_SlowAgentRepository):
+    async def get_agent_decision_async(self, agent_id, market_state, history, round_number):
+        if agent_id == "stuck":
+            await asyncio.sleep(10)
+        return {'replace_decision': 'Add', 'orders': [], 'reasoning': 'llm'}
+
+    def record_agent_decision(self, agent_id, decision):
+        self.processed.append((agent_id, decision['reasoning']))
+
+
+def test_round_deadline_falls_back_for_outstanding_agents():
+    repository = _StuckAgentRepository(["fast", "stuck"])
+    service = _decision_service(repository, round_deadline=0.05)
+
+    start = time.monotonic()
+    service.collect_decisions({'price': 100}, [], round_number=3)
+
+    assert time.monotonic() - start < 5
+    assert repository.processed == [("fast", "llm"), ("stuck", "fallback")]
+    assert service.llm_stats_history[-1]['deadline_fallbacks'] == 1
+    assert service.llm_stats_history[-1]['round'] == 3
+
+
+def _status_error(status):
+    response = httpx.Response(status, request=httpx.Request("POST", "http://llm.test/v1/chat/completions"))
+    return openai.APIStatusError("error", response=response, body=None)
+
+
+def test_retry_policy_classifies_errors():
+    timeout = openai.APITimeoutError(request=httpx.Request("POST", "http://llm.test"))
+    assert RetryPolicy.is_retryable(timeout) and RetryPolicy.is_timeout(timeout)
+    assert RetryPolicy.is_retryable(_status_error(429))
+    assert RetryPolicy.is_retryable(_status_error(503))
+    assert not RetryPolicy.is_retryable(_status_error(400))
+    assert not RetryPolicy.is_retryable(ValueError("schema mismatch"))
+
+
+def test_retry_policy_backoff_grows_and_caps():
+    policy = RetryPolicy(base_delay=1.0, multiplier=2.0, max_delay=5.0, jitter=0.0)
+    assert [policy.delay(n) for n in range(5)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+    jittered = RetryPolicy(base_delay=1.0, max_delay=5.0, jitter=1.0)
+    assert all(0.0 <= jittered.delay(3) <= 5.0 for _ in range(50))
+
+
+def _hold_completion():
+    schema = FeatureRegistry.get_schema_for_features(set())
+    parsed = schema(valuation_reasoning="v", valuation=100.0, price_prediction_reasoning="p",
+                    price_prediction_t=100.0, price_prediction_t1=100.0, price_prediction_t2=100.0,
+                    reasoning="hold", orders=[], replace_decision="Add")
+    message = SimpleNamespace(content=parsed.model_dump_json(), parsed=parsed)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def _service_with_responses(monkeypatch, responses):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    service = LLMService()
+    calls = []
+
+    def parse(**kwargs):
+        calls.append(kwargs)
+        result = responses[len(calls) - 1]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    service.client = SimpleNamespace(beta=SimpleNamespace(chat=SimpleNamespace(
+        completions=SimpleNamespace(parse=parse))))
+    return service, calls
+
+
+def _request(deadline=None):
+    return LLMRequest(system_prompt="s", user_prompt="u", model="m", agent_id="1",
+                      round_number=1, enabled_features=set(), deadline=deadline)
+
+
+def test_service_retries_transient_errors_only(monkeypatch):
+    LLMCallControl.configure(RetryPolicy(base_delay=0.0, jitter=0.0))
+
+    service, calls = _service_with_responses(monkeypatch, [_status_error(503), _hold_completion()])
+    response = service.get_decision(_request())
+    assert response.decision['reasoning'] == "hold"
+    assert len(calls) == 2
+    assert LLMCallControl.stats.retries == 1
+
+    service, calls = _service_with_responses(monkeypatch, [_status_error(400), _hold_completion()])
+    with pytest.raises(openai.APIStatusError):
+        service.get_decision(_request())
+    assert len(calls) == 1
+    assert LLMCallControl.stats.non_retryable_errors == 1
+
+
+def test_service_stops_at_request_deadline(monkeypatch):
+    LLMCallControl.configure(RetryPolicy(base_delay=1.0, jitter=0.0))
+    service, calls = _service_with_responses(monkeypatch, [_status_error(503), _hold_completion()])
+
+    # Backoff (1s) would cross the deadline, so give up instead of sleeping
+    with pytest.raises(LLMDeadlineExceeded):
+        service.get_decision(_request(deadline=time.monotonic() + 0.5))
+    assert len(calls) == 1
+
+    with pytest.raises(LLMDeadlineExceeded):
+        service.get_decision(_request(deadline=time.monotonic() - 1))
+    assert len(calls) == 1
+
+
+def test_service_records_cached_prompt_tokens(monkeypatch):
+    cached = _hold_completion()
+    cached.usage = SimpleNamespace(prompt_tokens=1500, total_tokens=1600,
+                                   prompt_tokens_details=SimpleNamespace(cached_tokens=1280))
+    no_details = _hold_completion()
+    no_details.usage = SimpleNamespace(prompt_tokens=700, total_tokens=800, prompt_tokens_details=None)
+    service, calls = _service_with_responses(monkeypatch, [cached, no_details, _hold_completion()])
+
+    for _ in range(3):
+        service.get_decision(_request())
+    assert (LLMCallControl.stats.prompt_tokens, LLMCallControl.stats.cached_prompt_tokens) == (2200, 1280)
+
+
+def test_multi_stock_instructions_follow_prompt_layout(monkeypatch):
+    service, calls = _service_with_responses(monkeypatch, [_hold_completion()] * 2)
+    for layout in ("standard", "prefix_stable"):
+        request = LLMRequest(system_prompt="s", user_prompt="u", model="m", agent_id="1", round_number=1,
+                             is_multi_stock=True, enabled_features=set(), prompt_layout=layout)
+        service.get_decision(request)
+    standard, prefix_stable = (call["messages"][1]["content"] for call in calls)
+    assert "MULTI-STOCK" in standard and prefix_stable == "u"  # Already in the prefix-stable prompt
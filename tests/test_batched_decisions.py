@@ -0,0 +1,115 @@
+import sys
+import random
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import types
+import logging
+
+import pytest
+
+
+class _TestLoggingService:
+    @staticmethod
+    def get_logger(name):
+        return logging.getLogger(name)
+
+    @staticmethod
+    def log_agent_state(*args, **kwargs):
+        pass
+
+    @staticmethod
+    def log_validation_error(*args, **kwargs):
+        pass
+
+    @staticmethod
+    def log_margin_call(*args, **kwargs):
+        pass
+
+
+sys.modules.setdefault("services.logging_service", types.ModuleType("services.logging_service"))
+sys.modules["services.logging_service"].LoggingService = _TestLoggingService
+
+from agents.deterministic.batched_decisions import AgentBatch
+from agents.deterministic.mean_reversion_trader import MeanReversionTrader
+from agents.deterministic.momentum_trader import MomentumTrader
+from market.indicators import IndicatorStore, MarketHistory
+from services.messaging_service import MessagingService
+from services.simulation_runtime import SimulationRuntime
+
+
+def _make_agents(agent_class, n, rng):
+    agents = []
+    for i in range(n):
+        if agent_class is MomentumTrader:
+            params = dict(short_window=rng.choice([3, 5]), long_window=rng.choice([10, 20]),
+                          min_trend=rng.choice([0.0, 0.01, 0.02]), max_position=rng.choice([0.2, 0.5]))
+        else:
+            params = dict(window_size=rng.choice([5, 10, 30]), threshold=rng.choice([0.0, 0.02]),
+                          max_position=rng.choice([0.2, 0.5]))
+        agents.append(agent_class(agent_id=f"{agent_class.__name__}-{i}",
+                                  initial_cash=rng.choice([0.0, 50.0, 10000.0]),
+                                  initial_shares=rng.choice([0, 3, 100]), **params)
+                      )
+    return agents
+
+
+@pytest.mark.parametrize("with_indicators", [False, True])
+@pytest.mark.parametrize("agent_class", [MomentumTrader, MeanReversionTrader])
+def test_batch_decide_matches_make_decision(agent_class, with_indicators):
+    rng = random.Random(7)
+    agents = _make_agents(agent_class, 40, rng)
+    price = 100.0
+    indicators = IndicatorStore(capacity=16)  # Shorter than the longest windows
+    history = MarketHistory(indicators) if with_indicators else []
+    for round_number in range(1, 40):
+        price *= 1 + rng.uniform(-0.04, 0.04)
+        market_state = {'price': price, 'is_multi_stock': False}
+
+        with SimulationRuntime().activate():
+            expected = {agent.agent_id: agent.make_decision(market_state, history, round_number).model_dump()
+                        for agent in agents}
+            expected_messages = MessagingService.get_messages(round_number)
+        with SimulationRuntime().activate():
+            batched = AgentBatch(agents).decide(market_state, history, round_number)
+            messages = MessagingService.get_messages(round_number)
+
+        assert batched == expected
+        assert messages == expected_messages
+        history.append({'price': price, 'round': round_number})
+        indicators.record("DEFAULT_STOCK", price)
+
+
+class _Repository:
+    def __init__(self, agents):
+        self.agents = {agent.agent_id: agent for agent in agents}
+
+    def get_all_agent_ids(self):
+        return list(self.agents)
+
+    def get_agent(self, agent_id):
+        return self.agents[agent_id]
+
+
+def test_decision_service_batches_supported_agents_only():
+    from agents.agent_manager.services.agent_decision_service import AgentDecisionService
+    from agents.deterministic.hold_agent import HoldTrader
+
+    rng = random.Random(3)
+    agents = _make_agents(MomentumTrader, 3, rng) + [HoldTrader(agent_id="hold")] + \
+        _make_agents(MeanReversionTrader, 2, rng)
+    service = AgentDecisionService(_Repository(agents), None, None, None, None, None,
+                                   batch_deterministic=True)
+    agent_ids = [agent.agent_id for agent in agents][::-1]
+    history = [{'price': 100.0 + i} for i in range(30)]
+
+    with SimulationRuntime().activate():
+        decisions, pending = service._batch_decisions(agent_ids, {'price': 120.0}, history, 31)
+        batches = service._batches
+        service._batch_decisions(agent_ids, {'price': 121.0}, history, 32)
+
+    assert pending == ["hold"]
+    assert set(decisions) == set(agent_ids) - {"hold"}
+    assert [len(batch) for batch in batches] == [3, 2]
+    assert service._batches is batches  # Same population: batches are reused
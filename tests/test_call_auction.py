@@ -0,0 +1,323 @@
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from market.engine.services.call_auction_service import clear_call_auction
+
+INF = np.inf
+
+
+def _brute_force_volume(buy_prices, buy_quantities, sell_prices, sell_quantities, price):
+    demand = sum(q for p, q in zip(buy_prices, buy_quantities) if p >= price)
+    supply = sum(q for p, q in zip(sell_prices, sell_quantities) if p <= price)
+    return min(demand, supply)
+
+
+def test_clearing_price_maximises_volume():
+    rng = np.random.default_rng(5)
+    for _ in range(50):
+        buy_prices = rng.integers(90, 111, 30).astype(float)
+        sell_prices = rng.integers(90, 111, 30).astype(float)
+        buy_quantities, sell_quantities = rng.integers(1, 50, 30), rng.integers(1, 50, 30)
+        clearing = clear_call_auction(buy_prices, buy_quantities, sell_prices, sell_quantities,
+                                      reference_price=100.0)
+
+        best = max(_brute_force_volume(buy_prices, buy_quantities, sell_prices, sell_quantities, p)
+                   for p in range(90, 111))
+        assert clearing.volume == best
+        assert clearing.buy_fills.sum() == clearing.sell_fills.sum() == best
+        assert (clearing.buy_fills <= buy_quantities).all() and (clearing.sell_fills <= sell_quantities).all()
+        # Nobody trades through their limit
+        assert (buy_prices[clearing.buy_fills > 0] >= clearing.price).all()
+        assert (sell_prices[clearing.sell_fills > 0] <= clearing.price).all()
+
+
+def test_reference_price_breaks_ties():
+    clearing = clear_call_auction([101.0], [10], [99.0], [10], reference_price=100.0)
+    assert clearing.price == 100.0 and clearing.volume == 10
+
+    clearing = clear_call_auction([101.0], [10], [99.0], [10], reference_price=120.0)
+    assert clearing.price == 101.0
+
+
+def test_no_cross_no_trade():
+    clearing = clear_call_auction([99.0], [10], [101.0], [10], reference_price=100.0)
+    assert clearing.price is None and clearing.volume == 0
+    assert clearing.buy_fills.tolist() == [0] and clearing.sell_fills.tolist() == [0]
+
+
+def test_time_priority_at_marginal_level():
+    # Better-priced bid first, then earlier bids at the marginal price
+    clearing = clear_call_auction([100.0, 100.0, 102.0], [10, 10, 5], [100.0], [12],
+                                  reference_price=100.0, allocation='time')
+    assert clearing.buy_fills.tolist() == [7, 0, 5]
+
+
+def test_pro_rata_at_marginal_level():
+    clearing = clear_call_auction([100.0, 100.0, 100.0, 102.0], [30, 10, 20, 5], [100.0], [35],
+                                  reference_price=100.0, allocation='pro_rata')
+    # 5 to the better bid, 30 shared 30:10:20 -> 15, 5, 10
+    assert clearing.buy_fills.tolist() == [15, 5, 10, 5]
+
+    clearing = clear_call_auction([100.0, 100.0, 100.0], [1, 1, 1], [100.0], [2],
+                                  reference_price=100.0, allocation='pro_rata')
+    assert clearing.buy_fills.tolist() == [1, 1, 0]  # Leftover units go to earlier orders on ties
+
+
+def test_market_orders_and_buy_budgets():
+    # Market buy committed 1000 at a reference of 100: affords 9 shares at 110
+    clearing = clear_call_auction([INF], [20], [0.0, 110.0], [5, 20], reference_price=100.0,
+                                  buy_budgets=[1000.0])
+    assert clearing.price == 110.0
+    assert clearing.buy_fills.tolist() == [9]
+    assert clearing.sell_fills.tolist() == [5, 4]
+
+    # Market orders only clear at the reference price
+    clearing = clear_call_auction([INF], [10], [0.0], [4], reference_price=50.0)
+    assert clearing.price == 50.0 and clearing.volume == 4
+
+
+def test_unknown_allocation():
+    with pytest.raises(ValueError):
+        clear_call_auction([100.0], [1], [100.0], [1], reference_price=100.0, allocation='random')
+
+
+MULTI_STOCKS = {
+    f"S{i}": {'INITIAL_PRICE': 100.0 + 5 * i, 'FUNDAMENTAL_PRICE': 100.0 + 5 * i,
+              'REDEMPTION_VALUE': 100.0 + 5 * i, 'TRANSACTION_COST': 0.0,
+              'DIVIDEND_PARAMS': {'type': 'stochastic', 'base_dividend': 5.0, 'dividend_frequency': 1,
+                                  'dividend_growth': 0.0, 'dividend_probability': 0.5,
+                                  'dividend_variation': 0.0, 'destination': 'dividend'}}
+    for i in range(3)
+}
+MULTI_STOCK_AGENTS = {
+    'allow_short_selling': False,
+    'position_limit': 1000000,
+    'initial_cash': 3000000,
+    'initial_positions': {stock_id: 1000 for stock_id in MULTI_STOCKS},
+    'max_order_size': 1000,
+    'agent_composition': {'multi_stock_market_maker': 2, 'multi_stock_buy': 2, 'multi_stock_sell': 2,
+                          'multi_stock_value': 2},
+}
+INTEREST_MODEL = {'rate': 0.05, 'compound_frequency': 'per_round', 'destination': 'dividend'}
+
+
+def _multi_stock_run(matching_mode, rounds=4):
+    """Run a small multi-stock simulation and print its trades and matched order batches as JSON"""
+    from base_sim import BaseSimulation
+
+    sim = BaseSimulation(
+        num_rounds=rounds, initial_price=0, fundamental_price=0, redemption_value=None,
+        agent_params=MULTI_STOCK_AGENTS, dividend_params=None, interest_params=INTEREST_MODEL,
+        sim_type="test_call_auction", stock_configs=MULTI_STOCKS, async_llm_decisions=True,
+        matching_mode=matching_mode, random_seed=11,
+        verification_full_audit_every=1, check_order_commitments=True,
+    )
+    # Each round, the orders every stock's engine receives and what filtering new_orders per stock gives
+    received, per_stock_loop = [], []
+
+    def record_batches(phase_match_orders):
+        def wrapper(new_orders, round_number):
+            received.append({})
+            per_stock_loop.append({stock_id: [o.order_id for o in new_orders if o.stock_id == stock_id]
+                                   for stock_id in sim.contexts})
+            return phase_match_orders(new_orders, round_number)
+        return wrapper
+
+    def record_orders(stock_id, match_orders):
+        def wrapper(orders, *args, **kwargs):
+            received[-1][stock_id] = [o.order_id for o in orders]
+            return match_orders(orders, *args, **kwargs)
+        return wrapper
+
+    sim._phase_match_orders = record_batches(sim._phase_match_orders)
+    for stock_id, engine in sim.matching_engines.items():
+        engine.match_orders = record_orders(stock_id, engine.match_orders)
+    try:
+        for round_number in range(rounds):
+            sim.execute_round(round_number)
+        orders = sim.order_repository.orders
+        trades = {stock_id: [(t['stock_id'], orders[t['buyer_order_id']].stock_id,
+                              orders[t['seller_order_id']].stock_id)
+                             for t in context.public_info['trade_history']]
+                  for stock_id, context in sim.contexts.items()}
+        print(json.dumps([trades, received, per_stock_loop]))
+    finally:
+        sim.close()
+
+
+def _parallel_matching_run(matching_mode, matching_workers, rounds=5):
+    """Run the multi-stock simulation with matching_workers and print its trades, balances and orders as JSON"""
+    from base_sim import BaseSimulation
+    from services.settlement_buffer import SettlementBuffer
+
+    applied = []  # Writes each stock's settlement buffer queued
+    apply = SettlementBuffer.apply
+
+    def record_apply(buffer):
+        applied.append(len(buffer))
+        apply(buffer)
+
+    SettlementBuffer.apply = record_apply
+    sim = BaseSimulation(
+        num_rounds=rounds, initial_price=0, fundamental_price=0, redemption_value=None,
+        agent_params=MULTI_STOCK_AGENTS, dividend_params=None, interest_params=INTEREST_MODEL,
+        sim_type="test_call_auction", stock_configs=MULTI_STOCKS, async_llm_decisions=True,
+        matching_mode=matching_mode, matching_workers=matching_workers, random_seed=11,
+        verification_full_audit_every=1, check_order_commitments=True,
+    )
+    try:
+        for round_number in range(rounds):
+            sim.execute_round(round_number)
+        orders = sim.order_repository.orders
+        trades = {stock_id: [(t['buyer_id'], t['seller_id'], t['quantity'], t['price'], t['round'],
+                              orders[t['buyer_order_id']].round_placed)
+                             for t in context.public_info['trade_history']]
+                  for stock_id, context in sim.contexts.items()}
+        agents = {agent_id: [agent.cash, agent.committed_cash, agent.dividend_cash, agent.borrowed_cash,
+                             agent.positions, agent.committed_positions, agent.borrowed_positions,
+                             {state: {side: len(batch) for side, batch in sides.items()}
+                              for state, sides in agent.orders.items()}]
+                  for agent_id in sorted(sim.agent_repository.get_all_agent_ids())
+                  for agent in [sim.agent_repository.get_agent(agent_id)]}
+        order_states = sorted((o.agent_id, o.stock_id, o.side, o.round_placed, o.quantity, o.remaining_quantity,
+                               o.state.value, [entry.to_state.value for entry in o.history])
+                              for o in orders.values())
+        print(json.dumps([trades, agents, order_states, applied]))
+    finally:
+        sim.close()
+
+
+def _run_in_subprocess(tmp_path, runner, *args):
+    # A fresh interpreter: other test modules swap in a stub LoggingService at import
+    code = f"import sys; sys.path.insert(0, {str(Path(__file__).parent)!r}); " \
+           f"from test_call_auction import {runner}; {runner}(*{args!r})"
+    result = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr[-2000:]
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("matching_mode", ['continuous', 'call_auction'])
+def test_multi_stock_orders_match_in_their_own_book(tmp_path, matching_mode):
+    trades, received, per_stock_loop = _run_in_subprocess(tmp_path, '_multi_stock_run', matching_mode)
+    assert received == per_stock_loop  # Same batches, in the same order, as a filter per stock
+    assert any(any(batch) for batch in received)
+    for stock_id, stock_trades in trades.items():
+        assert stock_trades  # Every stock traded
+        assert all(ids == [stock_id] * 3 for ids in stock_trades)
+
+
+@pytest.mark.parametrize("matching_mode", ['continuous', 'call_auction'])
+def test_parallel_matching_settles_like_serial_matching(tmp_path, matching_mode):
+    *serial, serial_applied = _run_in_subprocess(tmp_path, '_parallel_matching_run', matching_mode, None)
+    *parallel, parallel_applied = _run_in_subprocess(tmp_path, '_parallel_matching_run', matching_mode, 3)
+    assert serial_applied == []
+    assert len(parallel_applied) == 5 * len(MULTI_STOCKS) and all(parallel_applied)  # Every stock's settlement was queued
+    trades, agents, order_states = parallel
+    assert all(trades.values())
+    assert parallel == serial  # Same trades, balances and order histories
+
+
+# Hold traders placing these orders, by agent index: round -> agent -> (side, quantity, limit or None)
+SCRIPTED_ORDERS = {
+    # Limit buys at 30 clear at 28; the market sell is 5 short of buyers; the limit sells rest
+    0: {0: ('Buy', 10, 30.0), 1: ('Buy', 10, 30.0), 2: ('Sell', 12, 27.0), 3: ('Sell', 25, None),
+        4: ('Sell', 3, 33.0)},
+    1: {5: ('Buy', 15, 27.0)},  # Fills the resting sell at 27, then rests with 3 left
+    2: {6: ('Buy', 1, 27.0), 7: ('Sell', 3, 27.0)},  # Pro rata fills the later bid at 27 first
+}
+
+
+def _scripted_auction_run(allocation, backend):
+    """Run SCRIPTED_ORDERS through a single-stock call auction and print the book and orders as JSON"""
+    from base_sim import BaseSimulation
+    from agents.agents_api import OrderDetails, OrderType, TradeDecision
+
+    def scripted(index):
+        def make_decision(market_state, history, round_number):
+            orders = []
+            if (scripted_order := SCRIPTED_ORDERS.get(round_number, {}).get(index)):
+                side, quantity, limit = scripted_order
+                orders.append(OrderDetails(decision=side, quantity=quantity, price_limit=limit,
+                                           order_type=OrderType.MARKET if limit is None else OrderType.LIMIT))
+            return TradeDecision(orders=orders, replace_decision="Add", reasoning="Scripted", valuation=28.0,
+                                 valuation_reasoning="", price_prediction_reasoning="", price_prediction_t=28.0,
+                                 price_prediction_t1=28.0, price_prediction_t2=28.0)
+        return make_decision
+
+    sim = BaseSimulation(
+        num_rounds=4, initial_price=28.0, fundamental_price=28.0, redemption_value=28.0,
+        agent_params={'allow_short_selling': False, 'position_limit': 1000000, 'initial_cash': 1000000.0,
+                      'initial_shares': 10000, 'max_order_size': 1000, 'agent_composition': {'hold_trader': 8}},
+        dividend_params=MULTI_STOCKS['S0']['DIVIDEND_PARAMS'], interest_params=INTEREST_MODEL,
+        sim_type="test_call_auction", async_llm_decisions=True,  # No serial pacing between agents
+        matching_mode='call_auction', auction_allocation=allocation, order_book_backend=backend,
+        verification_full_audit_every=1, check_order_commitments=True, random_seed=1,
+    )
+    try:
+        agent_ids = sorted(sim.agent_repository.get_all_agent_ids())
+        for index, agent_id in enumerate(agent_ids):
+            sim.agent_repository.get_agent(agent_id).make_decision = scripted(index)
+
+        def summary(order):
+            return {'agent': agent_ids.index(order.agent_id), 'side': order.side, 'price': order.price,
+                    'remaining': order.remaining_quantity, 'state': order.state.value,
+                    'cash': order.current_cash_commitment, 'shares': order.current_share_commitment,
+                    'states': [entry.to_state.value for entry in order.history],
+                    'notes': [entry.note for entry in order.history]}
+
+        books = []
+        for round_number in range(3):  # Not the last round, which cancels the book for redemption
+            sim.execute_round(round_number)
+            books.append([summary(entry.order) for entry in sorted(sim.order_book.buy_orders)]
+                         + [summary(entry.order) for entry in sorted(sim.order_book.sell_orders)])
+        orders = {agent_ids.index(o.agent_id): summary(o) for o in sim.order_repository.orders.values()}
+        trades = [(t['round'], t['quantity'], t['price']) for t in sim.context.public_info['trade_history']]
+        print(json.dumps([books, orders, trades]))
+    finally:
+        sim.close()
+
+
+@pytest.mark.parametrize("allocation", ['time', 'pro_rata'])
+def test_call_auction_settles_through_matching_engine(tmp_path, allocation):
+    books, orders, trades = _run_in_subprocess(tmp_path, '_scripted_auction_run', allocation, 'heap')
+    assert _run_in_subprocess(tmp_path, '_scripted_auction_run', allocation, 'price_level') == \
+        [books, orders, trades]
+
+    # Round 0: limit buys at 30 cross the market sell at 28, the reference price
+    assert [trade[1:] for trade in trades if trade[0] == 0] == [[10, 28.0], [10, 28.0]]
+    for buyer in (orders['0'], orders['1']):
+        assert buyer['state'] == 'filled' and buyer['cash'] == 0  # Commitment above 28 released too
+    market_sell = orders['3']
+    assert market_sell['state'] == 'cancelled' and market_sell['remaining'] == 5
+    assert market_sell['notes'][-1] == "Cancelled: Unfilled in call auction"
+    assert [(o['agent'], o['state']) for o in books[0]] == [(2, 'active'), (4, 'active')]
+
+    # Round 1: the new bid fills the resting ask, then rests with the rest
+    assert orders['2']['state'] == 'filled'
+    assert 'partially_filled,pending,active' in ','.join(orders['5']['states'])
+    assert [(o['agent'], o['remaining']) for o in books[1]] == [(5, 3), (4, 3)]
+
+    # Round 2: 3 of the 4 shares bid at 27 sell
+    if allocation == 'time':
+        assert orders['5']['state'] == 'filled'
+        assert [(o['agent'], o['remaining']) for o in books[2]] == [(6, 1), (4, 3)]
+    else:
+        # 2.25 and 0.75 shares: the largest remainder fills the later bid, which leaves the book
+        assert orders['6']['state'] == 'filled'
+        assert [(o['agent'], o['remaining']) for o in books[2]] == [(5, 1), (4, 3)]
+
+    for book in books:
+        for order in book:
+            assert order['remaining'] > 0 and order['state'] in ('active', 'partially_filled')
+            if order['side'] == 'buy':
+                assert order['cash'] >= order['remaining'] * order['price']
+            else:
+                assert order['shares'] == order['remaining']
+    assert all(o['cash'] == 0 and o['shares'] == 0 for o in orders.values() if o['state'] == 'filled')
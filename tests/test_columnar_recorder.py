@@ -0,0 +1,118 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from market.columnar_store import ColumnarTable, RunningStats
+from market.data_recorder import DataRecorder
+
+
+def _rows(n):
+    for i in range(n):
+        row = {
+            'round': i + 1,
+            'agent_id': i % 3,
+            'price': 100.0 + i,
+            'best_bid': None if i % 4 == 0 else 99.0 + i,
+            'depth': {'bids': [i]},
+            'timestamp': f"t{i}",
+        }
+        if i % 5 == 0:
+            row['note'] = 'late column'
+        yield row
+
+
+def _table_matches_list_export(tmp_path, fmt):
+    rows = list(_rows(23))
+    table = ColumnarTable('rows', tmp_path / 'rows', chunk_rows=5, fmt=fmt)
+    for row in rows:
+        table.append(row)
+        assert table._buffered < table.chunk_rows  # full buffers go straight to disk
+
+    assert len(table) == 23
+    assert len(list((tmp_path / 'rows').iterdir())) == 4
+
+    table.export_csv(tmp_path / 'columnar.csv')
+    pd.DataFrame(rows).to_csv(tmp_path / 'memory.csv', index=False)
+    columnar = pd.read_csv(tmp_path / 'columnar.csv')
+    memory = pd.read_csv(tmp_path / 'memory.csv')
+    pd.testing.assert_frame_equal(columnar, memory[columnar.columns])
+    assert set(columnar.columns) == set(memory.columns)
+
+
+def test_csv_chunks_export_same_csv_as_memory(tmp_path):
+    _table_matches_list_export(tmp_path, 'csv')
+
+
+def test_parquet_chunks_export_same_csv_as_memory(tmp_path):
+    pytest.importorskip("pyarrow")
+    _table_matches_list_export(tmp_path, 'parquet')
+
+
+def test_column_buffers_are_typed_and_promote(tmp_path):
+    table = ColumnarTable('t', tmp_path / 't', chunk_rows=8, fmt='csv')
+    table.append({'qty': 1, 'price': 1.5, 'flag': True})
+    assert table._buffers['qty'].data.dtype == np.int64
+    assert table._buffers['price'].data.dtype == np.float64
+    assert table._buffers['flag'].data.dtype == np.bool_
+
+    table.append({'qty': 2.5, 'price': None})
+    assert table._buffers['qty'].data.dtype == np.float64
+    assert np.isnan(table._buffers['price'].values(2)[1])
+    assert table._buffers['flag'].data.dtype == object  # missing value in a bool column
+
+
+def test_running_stats_match_numpy():
+    values = [101.0, 99.5, 100.25, 98.0, 103.5]
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    assert stats.average() == pytest.approx(np.mean(values))
+    assert stats.std() == pytest.approx(np.std(values))
+    assert stats.total == pytest.approx(sum(values))
+
+
+def test_columnar_recorder_flushes_and_keeps_index(tmp_path):
+    context = SimpleNamespace(current_price=100.0, fundamental_price=100.0,
+                              public_info={'short_interest': 0})
+    recorder = DataRecorder(context=context, agent_repository=None, market_state_manager=None,
+                            loggers={}, data_dir=tmp_path,
+                            storage={'backend': 'columnar', 'format': 'csv', 'chunk_rows': 4})
+    state = {'is_multi_stock': True,
+             'stocks': {'A': {'price': 10.0, 'fundamental_price': 10.0},
+                        'B': {'price': 20.0, 'fundamental_price': 10.0}}}
+    for round_number in range(5):
+        trades = [SimpleNamespace(stock_id='A', quantity=round_number)]
+        recorder._record_market_data(round_number, state, trades, round_number, 't')
+
+    assert len(recorder.market_data) == 10
+    assert recorder.market_data._buffered == 2
+    assert recorder.get_round_volume('A', 5) == 4
+    summary = recorder._market_summary()
+    assert summary['avg_price'] == pytest.approx(15.0)
+    assert summary['total_trades'] == 5
+
+    recorder.flush()
+    df = recorder.market_data.read()
+    assert list(df['stock_id']) == ['A', 'B'] * 5
+    assert df['total_volume'].sum() == sum(range(5))
+
+
+def test_unknown_backend_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        DataRecorder(context=None, agent_repository=None, market_state_manager=None,
+                     loggers={}, data_dir=tmp_path, storage={'backend': 'mmap'})
+
+
+def test_columnar_defaults_need_no_pyarrow(tmp_path):
+    recorder = DataRecorder(context=None, agent_repository=None, market_state_manager=None,
+                            loggers={}, data_dir=tmp_path, storage={'backend': 'columnar'})
+    assert recorder.storage['format'] == 'csv'
+    recorder.market_data.append({'round': 0, 'price': 100.0})
+    recorder.flush()
+    assert [p.suffix for p in (tmp_path / 'market_data').iterdir()] == ['.csv']
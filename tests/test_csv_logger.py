@@ -0,0 +1,69 @@
+import sys
+import logging
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from logging_utils.csv_header_manager import CSVHeaderManager, CSVHeaders
+from logging_utils.csv_logger import BufferedCSVFileHandler, CSVLogger
+from logging_utils.logger_factory import LoggerFactory
+
+
+@pytest.fixture
+def margin_logger(tmp_path, request):
+    run_dir, latest_dir = tmp_path / "run", tmp_path / "latest"
+    run_dir.mkdir()
+    latest_dir.mkdir()
+    CSVHeaderManager.initialize_csv_files(
+        [run_dir / "margin_calls.csv", latest_dir / "margin_calls.csv"], CSVHeaders.MARGIN_CALLS)
+    logger = LoggerFactory.create_csv_logger(
+        f"margin_calls_{request.node.name}", run_dir, latest_dir, "margin_calls.csv", logging.NullHandler())
+    yield logger, run_dir / "margin_calls.csv"
+    for handler in list(logger.handlers):
+        handler.close()
+        logger.removeHandler(handler)
+    CSVLogger.verify_writes = False
+
+
+def _log_calls(logger, n):
+    for i in range(n):
+        CSVLogger.log_margin_call(logger, round_number=1, agent_id=str(i), agent_type="leveraged",
+                                  borrowed_shares=10, max_borrowable=5, action="buy_to_cover",
+                                  excess_shares=5, price=100.0)
+
+
+def test_rows_are_counted_and_synced(margin_logger):
+    logger, path = margin_logger
+    _log_calls(logger, 25)
+
+    handlers = [h for h in logger.handlers if isinstance(h, BufferedCSVFileHandler)]
+    assert len(handlers) == 2
+    assert all(h.rows_written == 25 for h in handlers)
+
+    CSVLogger.sync(logger)
+    lines = path.read_text().splitlines()
+    assert lines[0] == CSVHeaders.MARGIN_CALLS
+    assert len(lines) == 26
+    CSVLogger.verify(logger, path)
+
+
+def test_verify_detects_missing_rows(margin_logger):
+    logger, path = margin_logger
+    _log_calls(logger, 3)
+    CSVLogger.sync(logger)
+    path.write_text(CSVHeaders.MARGIN_CALLS + "\n")  # Rows lost behind the logger's back
+
+    with pytest.raises(RuntimeError, match="Rows missing"):
+        CSVLogger.verify(logger, path)
+
+
+def test_verify_writes_flag_checks_each_validation_error(margin_logger, tmp_path):
+    logger, path = margin_logger
+    CSVLogger.verify_writes = True
+    CSVLogger.log_validation_error(logger, path, round_number=1, agent_id="1", agent_type="t",
+                                   error_type="e", details="d", attempted_action="a")
+    with pytest.raises(RuntimeError, match="not found"):
+        CSVLogger.log_validation_error(logger, tmp_path / "missing.csv", round_number=1, agent_id="1",
+                                       agent_type="t", error_type="e", details="d", attempted_action="a")
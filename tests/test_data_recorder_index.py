@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from market.data_recorder import DataRecorder
+
+
+def _recorder():
+    context = SimpleNamespace(current_price=100.0, fundamental_price=100.0,
+                              public_info={'short_interest': 0})
+    return DataRecorder(context=context, agent_repository=None, market_state_manager=None,
+                        loggers={}, data_dir=Path('.'))
+
+
+def _multi_stock_state(stock_ids):
+    return {
+        'is_multi_stock': True,
+        'stocks': {stock_id: {'price': 10.0, 'fundamental_price': 10.0} for stock_id in stock_ids},
+    }
+
+
+def test_last_round_summary_tracks_appended_rows():
+    recorder = _recorder()
+    state = _multi_stock_state(['A', 'B'])
+
+    trades = [SimpleNamespace(stock_id='A', quantity=3), SimpleNamespace(stock_id='A', quantity=2)]
+    recorder._record_market_data(0, state, trades, 5, 't0')
+    assert recorder.get_round_volume('A', 1) == 5
+    assert recorder.get_round_volume('B', 1) == 0
+    assert recorder.get_last_round_summary('A') is recorder.market_data[0]
+
+    recorder._record_market_data(1, state, [SimpleNamespace(stock_id='B', quantity=7)], 7, 't1')
+    assert recorder.get_round_volume('A', 2) == 0
+    assert recorder.get_round_volume('B', 2) == 7
+    # Only the latest round is indexed; older rounds stay in market_data
+    assert recorder.get_round_volume('A', 1) == 0
+    assert recorder.get_last_round_summary('C') is None
+
+
+def test_round_volume_matches_full_scan():
+    recorder = _recorder()
+    stock_ids = ['A', 'B', 'C']
+    state = _multi_stock_state(stock_ids)
+    for round_number in range(20):
+        trades = [SimpleNamespace(stock_id=stock_ids[(round_number + i) % 3], quantity=i + 1)
+                  for i in range(round_number % 4)]
+        recorder._record_market_data(round_number, state, trades, 0, 't')
+        for stock_id in stock_ids:
+            scanned = [row for row in recorder.market_data
+                       if row['stock_id'] == stock_id and row['round'] == round_number + 1]
+            assert recorder.get_round_volume(stock_id, round_number + 1) == scanned[-1]['total_volume']
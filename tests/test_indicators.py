@@ -0,0 +1,75 @@
+import sys
+import random
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import numpy as np
+import pytest
+
+from market.data_recorder import DataRecorder
+from market.indicators import RollingSeries, price_series
+
+
+def _random_walk(n, seed=5):
+    rng = random.Random(seed)
+    price, prices, volumes = 100.0, [], []
+    for _ in range(n):
+        price *= 1 + rng.gauss(0, 0.02)
+        prices.append(price)
+        volumes.append(float(rng.randint(0, 50)))
+    return prices, volumes
+
+
+def test_rolling_series_matches_full_recompute_across_wraps():
+    prices, volumes = _random_walk(40)
+    series = RollingSeries(capacity=8)
+    series.add(prices[0], volumes[0])
+    ema = series.ema(3)
+    alpha = 0.5
+
+    for i in range(1, len(prices)):
+        series.add(prices[i], volumes[i])
+        ema = alpha * prices[i] + (1 - alpha) * ema
+        seen = np.array(prices[:i + 1])
+        returns = seen[1:] / seen[:-1] - 1
+
+        assert len(series) == i + 1
+        assert series.last_price() == prices[i]
+        assert series.ema(3) == pytest.approx(ema)
+        for n in range(1, min(i + 1, 8) + 1):
+            np.testing.assert_array_equal(series.prices(n), seen[-n:])
+            np.testing.assert_array_equal(series.volumes(n), volumes[i + 1 - n:i + 1])
+            assert series.sma(n) == pytest.approx(seen[-n:].mean(), rel=1e-12)
+        for n in range(1, min(i, 8) + 1):
+            np.testing.assert_allclose(series.returns(n), returns[-n:], rtol=1e-12)
+            assert series.volatility(n) == pytest.approx(returns[-n:].std(), rel=1e-6, abs=1e-8)
+
+    assert not series.covers(9)
+    with pytest.raises(ValueError):
+        series.sma(9)
+    with pytest.raises(ValueError):
+        series.prices(2)[0] = 0.0  # Views are read-only
+
+
+def test_recorder_history_carries_indicators_in_step():
+    context = SimpleNamespace(current_price=100.0, fundamental_price=100.0, public_info={
+        'short_interest': 0, 'last_trade': {'price': None},
+        'order_book_state': {'best_bid': None, 'best_ask': None, 'midpoint': None},
+    })
+    recorder = DataRecorder(context=context, agent_repository=None, market_state_manager=None,
+                            loggers={}, data_dir=Path('.'), storage={'indicator_capacity': 16})
+    prices, volumes = _random_walk(30)
+    for round_number, (price, volume) in enumerate(zip(prices, volumes)):
+        context.current_price = price
+        recorder._record_market_history(round_number, {}, [], [], volume)
+        assert price_series(recorder.history) is None  # Half-recorded round
+        recorder._record_market_data(round_number, {}, [], volume, 't')
+
+        series = price_series(recorder.history)
+        assert series is recorder.indicators.series('DEFAULT_STOCK')
+        assert series.last_price() == recorder.history[-1]['price']
+        np.testing.assert_array_equal(series.volumes(), volumes[max(0, round_number - 15):round_number + 1])
+
+    assert price_series(list(recorder.history)) is None
@@ -0,0 +1,132 @@
+import sys
+import types
+import logging
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+
+class _TestLoggingService:
+    @staticmethod
+    def get_logger(name):
+        return logging.getLogger(name)
+
+    @staticmethod
+    def log_agent_state(*args, **kwargs):
+        pass
+
+    @staticmethod
+    def log_validation_error(*args, **kwargs):
+        pass
+
+
+sys.modules.setdefault("services.logging_service", types.ModuleType("services.logging_service"))
+sys.modules["services.logging_service"].LoggingService = _TestLoggingService
+
+from agents.LLMs.services.llm_cache import LLMCacheMiss, LLMResponseCache, cache_key
+from agents.LLMs.services.llm_retry import LLMCallControl
+from agents.LLMs.services.llm_services import LLMService, LLMRequest
+from agents.LLMs.services.schema_features import FeatureRegistry
+
+
+@pytest.fixture(autouse=True)
+def _clean_state(monkeypatch):
+    monkeypatch.delenv("LLM_CACHE_MODE", raising=False)
+    monkeypatch.delenv("LLM_CACHE_PATH", raising=False)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    LLMCallControl.reset()
+    yield
+    LLMResponseCache.close_active()
+    LLMCallControl.reset()
+
+
+def _completion(reasoning):
+    schema = FeatureRegistry.get_schema_for_features(set())
+    parsed = schema(valuation_reasoning="v", valuation=100.0, price_prediction_reasoning="p",
+                    price_prediction_t=100.0, price_prediction_t1=100.0, price_prediction_t2=100.0,
+                    reasoning=reasoning, orders=[], replace_decision="Add")
+    message = SimpleNamespace(content=parsed.model_dump_json(), parsed=parsed)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def _service(calls):
+    service = LLMService()
+
+    def parse(**kwargs):
+        calls.append(kwargs)
+        return _completion(f"live call {len(calls)}")
+
+    service.client = SimpleNamespace(beta=SimpleNamespace(chat=SimpleNamespace(
+        completions=SimpleNamespace(parse=parse))))
+    return service
+
+
+def _request(user_prompt="market data", agent_id="1"):
+    return LLMRequest(system_prompt="You are a trader.", user_prompt=user_prompt, model="m",
+                      agent_id=agent_id, round_number=1, enabled_features=set())
+
+
+def test_cache_key_covers_request_contents():
+    base = dict(model="m", system_prompt="s", user_prompt="u", schema={"a": 1}, seed=42, temperature=0.0)
+    assert cache_key(**base) == cache_key(**base)
+    for field, value in [("model", "m2"), ("user_prompt", "u2"), ("schema", {"a": 2}), ("seed", 7)]:
+        assert cache_key(**{**base, field: value}) != cache_key(**base)
+
+
+def test_read_through_serves_repeat_requests_from_disk(tmp_path):
+    LLMResponseCache.configure({'mode': 'read_through', 'path': tmp_path / 'cache.sqlite'})
+    calls = []
+    service = _service(calls)
+
+    first = service.get_decision(_request())
+    second = service.get_decision(_request(agent_id="2"))
+
+    assert len(calls) == 1
+    assert first.decision['reasoning'] == second.decision['reasoning'] == "live call 1"
+    assert second.decision['agent_id'] == "2"
+    assert LLMCallControl.stats.cache_hits == 1
+    assert LLMCallControl.stats.cache_misses == 1
+
+
+def test_record_then_replay_without_api(tmp_path):
+    path = tmp_path / 'cache.sqlite'
+    LLMResponseCache.configure({'mode': 'record', 'path': path})
+    calls = []
+    service = _service(calls)
+    service.get_decision(_request())
+    service.get_decision(_request())
+    assert len(calls) == 2  # record mode always calls the API
+
+    LLMResponseCache.configure({'mode': 'replay', 'path': path})
+    replay_calls = []
+    replay_service = _service(replay_calls)
+    assert replay_service.get_decision(_request()).decision['reasoning'] == "live call 2"
+    with pytest.raises(LLMCacheMiss):
+        replay_service.get_decision(_request(user_prompt="unseen prompt"))
+    assert replay_calls == []
+
+
+def test_environment_overrides_scenario_setting(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_MODE", "replay")
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / 'ci.sqlite'))
+    cache = LLMResponseCache.configure(None)
+    assert cache.mode == 'replay'
+    assert cache.path == tmp_path / 'ci.sqlite'
+
+
+def test_eviction_keeps_cache_under_size_bound(tmp_path):
+    cache = LLMResponseCache(tmp_path / 'cache.sqlite', max_bytes=250)
+    for i in range(5):
+        cache.put(f"k{i}", "m", "x" * 100)
+    cache.get("k3")  # refresh k3 so k4 is the oldest of the survivors
+    cache.put("k5", "m", "x" * 100)
+
+    stats = cache.stats()
+    assert stats['bytes'] <= 250
+    assert cache.get("k3") is not None
+    assert cache.get("k5") is not None
+    assert cache.get("k0") is None
+    cache.close()
@@ -0,0 +1,220 @@
+import sys
+import types
+import logging
+import random
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+
+class _TestLoggingService:
+    @staticmethod
+    def get_logger(name):
+        return logging.getLogger(name)
+
+    @staticmethod
+    def log_agent_state(*args, **kwargs):
+        pass
+
+    @staticmethod
+    def log_validation_error(*args, **kwargs):
+        pass
+
+    @staticmethod
+    def log_order_state(*args, **kwargs):
+        pass
+
+    @staticmethod
+    def diagnostic_level(logger_name='order_state'):
+        return 'full'
+
+
+sys.modules.setdefault("services.logging_service", types.ModuleType("services.logging_service"))
+sys.modules["services.logging_service"].LoggingService = _TestLoggingService
+
+from market.orders.order import Order, OrderState
+from market.orders.order_book import create_order_book
+from market.orders.order_repository import OrderRepository
+from market.state.sim_context import SimulationContext
+import market.orders.order_book.order_book_modifiers as order_book_modifiers
+import market.orders.order_book.order_book_logging as order_book_logging
+import market.orders.order_book.price_level_order_book as price_level_order_book
+
+
+@pytest.fixture(autouse=True)
+def _quiet_book_logging(monkeypatch):
+    for module in (order_book_modifiers, order_book_logging, price_level_order_book):
+        monkeypatch.setattr(module, "LoggingService", _TestLoggingService)
+
+
+def _make_book(backend, defer_public_view=False):
+    context = SimulationContext(
+        num_rounds=1,
+        initial_price=100,
+        fundamental_price=100,
+        redemption_value=100,
+        transaction_cost=0.0,
+    )
+    repository = OrderRepository(logger=logging.getLogger("test_orders"))
+    return create_order_book(context=context, order_repository=repository,
+                             logger=logging.getLogger("test_book"), backend=backend,
+                             defer_public_view=defer_public_view), repository
+
+
+def _make_order(agent_id, side, price, timestamp):
+    order = Order(agent_id=agent_id, order_type='limit', side=side, quantity=10,
+                  round_placed=0, price=price, timestamp=timestamp)
+    order.state = OrderState.PENDING
+    return order
+
+
+def _snapshot(book):
+    return (
+        book.get_best_bid(),
+        book.get_best_ask(),
+        book.get_aggregated_levels(),
+        len(book.buy_orders),
+        len(book.sell_orders),
+    )
+
+
+def test_backends_agree_on_random_operation_stream():
+    rng = random.Random(7)
+    heap_book, heap_repo = _make_book('heap')
+    level_book, level_repo = _make_book('price_level')
+    resting = []
+
+    for step in range(2000):
+        action = rng.random()
+        if action < 0.6 or not resting:
+            side = rng.choice(['buy', 'sell'])
+            price = round(rng.uniform(90, 110) * 2) / 2
+            agent_id = rng.randrange(20)
+            timestamp = float(step)
+            for book, repo in ((heap_book, heap_repo), (level_book, level_repo)):
+                order = _make_order(agent_id, side, price, timestamp)
+                order.order_id = f"o{step}"
+                repo.create_order(order)
+                book.add_limit_order(order)
+            resting.append(f"o{step}")
+        elif action < 0.8:
+            order_id = resting.pop(rng.randrange(len(resting)))
+            for book, repo in ((heap_book, heap_repo), (level_book, level_repo)):
+                book.remove_order(repo.get_order(order_id))
+        else:
+            side = rng.choice(['buy', 'sell'])
+            popped = []
+            for book in (heap_book, level_book):
+                entry = book.pop_best_buy() if side == 'buy' else book.pop_best_sell()
+                popped.append(entry.order.order_id if entry else None)
+            assert popped[0] == popped[1]
+            if popped[0] is not None:
+                resting.remove(popped[0])
+
+        assert _snapshot(heap_book) == _snapshot(level_book)
+
+    assert ([e.order.order_id for e in sorted(heap_book.buy_orders)]
+            == [e.order.order_id for e in level_book.buy_orders])
+
+
+def test_repushed_partial_fill_keeps_time_priority():
+    book, repo = _make_book('price_level')
+    first = _make_order(1, 'sell', 100.0, 1.0)
+    second = _make_order(2, 'sell', 100.0, 2.0)
+    for order in (first, second):
+        repo.create_order(order)
+        book.add_limit_order(order)
+
+    entry = book.pop_best_sell()
+    assert entry.order is first
+    first.state = OrderState.PARTIALLY_FILLED
+    book.push_sell(entry)
+
+    assert book.peek_best_sell() is first
+
+
+def test_agent_index_tracks_removals():
+    book, repo = _make_book('price_level')
+    orders = [_make_order(1, 'buy', 99.0, 1.0), _make_order(1, 'sell', 101.0, 2.0),
+              _make_order(2, 'buy', 98.0, 3.0)]
+    for order in orders:
+        repo.create_order(order)
+        book.add_limit_order(order)
+
+    agent_orders = book.get_agent_orders(1)
+    assert [o.order_id for o in agent_orders['buy']] == [orders[0].order_id]
+    assert [o.order_id for o in agent_orders['sell']] == [orders[1].order_id]
+
+    removed_buys, removed_sells = book.remove_agent_orders(1)
+    assert len(removed_buys) == 1 and len(removed_sells) == 1
+    assert book.get_agent_orders(1) == {'buy': [], 'sell': []}
+    assert book.get_best_bid() == 98.0
+    assert book.get_best_ask() is None
+    assert book.get_order_by_id(orders[0].order_id) is None
+
+
+@pytest.mark.parametrize("backend", ["heap", "price_level"])
+def test_deferred_view_publishes_once_per_refresh(backend):
+    book, repo = _make_book(backend, defer_public_view=True)
+    quotes = book.context.market_history.quote_history
+
+    for i, price in enumerate([99.0, 98.5, 101.0]):
+        order = _make_order(i, 'buy' if price < 100 else 'sell', price, float(i))
+        repo.create_order(order)
+        book.add_limit_order(order)
+    book.pop_best_buy()
+
+    # Mutations only mark the book dirty
+    assert quotes == []
+    assert book.context.public_info['order_book_state']['best_bid'] is None
+
+    book.refresh_public_view()
+    book.refresh_public_view()
+    assert len(quotes) == 1
+    assert book.context.public_info['order_book_state']['best_bid'] == 98.5
+    assert book.context.public_info['order_book_state']['best_ask'] == 101.0
+
+    # Reads through the context publish pending changes
+    book.pop_best_sell()
+    assert book.context.get_public_info()['order_book_state']['best_ask'] is None
+    assert len(quotes) == 2
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        _make_book('skiplist')
+
+
+@pytest.mark.parametrize("backend", ['heap', 'price_level'])
+@pytest.mark.parametrize("level", ['off', 'summary', 'full'])
+def test_book_dump_follows_diagnostic_level(backend, level, monkeypatch):
+    lines = []
+
+    class _RecordingLoggingService(_TestLoggingService):
+        @staticmethod
+        def log_order_state(message):
+            lines.append(message)
+
+        @staticmethod
+        def diagnostic_level(logger_name='order_state'):
+            return level
+
+    monkeypatch.setattr(order_book_logging, "LoggingService", _RecordingLoggingService)
+    book, repository = _make_book(backend)
+    for i, (side, price) in enumerate([('buy', 99.0), ('buy', 98.5), ('sell', 101.0)]):
+        order = _make_order(i, side, price, float(i))
+        repository.create_order(order)
+        book.add_limit_order(order)
+    lines.clear()
+
+    book.log_order_book_state("After New Orders")
+
+    if level == 'off':
+        assert lines == []
+    elif level == 'summary':
+        assert len(lines) == 2
+        assert "bid: $99.00, ask: $101.00, buy orders: 2, sell orders: 1" in lines[1]
+    else:
+        assert "  Agent 0: 10 @ $99.00" in lines
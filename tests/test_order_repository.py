@@ -0,0 +1,132 @@
+import sys
+import logging
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from market.orders.order import Order, OrderState
+from market.orders.order_repository import OrderRepository
+
+
+def _order(agent_id, side='buy', price=100.0):
+    return Order(agent_id=agent_id, order_type='limit', side=side, quantity=10,
+                 round_placed=0, price=price)
+
+
+def _to_pending(repository, order):
+    for state in (OrderState.VALIDATED, OrderState.COMMITTED, OrderState.PENDING):
+        repository.transition_state(order.order_id, state)
+
+
+def _repository(**kwargs):
+    return OrderRepository(logger=logging.getLogger("test_orders"), **kwargs)
+
+
+def test_state_index_moves_keep_arrival_order():
+    repository = _repository()
+    orders = [_order(agent_id=i % 2, side='buy' if i % 3 else 'sell') for i in range(6)]
+    for order in orders:
+        repository.create_order(order)
+        _to_pending(repository, order)
+
+    repository.transition_state(orders[1].order_id, OrderState.CANCELLED)
+
+    pending = [o for o in orders if o is not orders[1]]
+    assert repository.get_orders_by_state(OrderState.PENDING, 'buy') == [o for o in pending if o.side == 'buy']
+    assert repository.get_orders_by_state(OrderState.PENDING) == (
+        [o for o in pending if o.side == 'buy'] + [o for o in pending if o.side == 'sell'])
+    assert repository.count_orders_by_state(OrderState.PENDING) == 5
+    assert repository.get_orders_by_state(OrderState.CANCELLED) == [orders[1]]
+    assert repository.get_agent_orders(1) == [orders[1], orders[3], orders[5]]
+
+
+def test_compaction_disabled_by_default():
+    repository = _repository()
+    order = _order(agent_id=0)
+    repository.create_order(order)
+    repository.transition_state(order.order_id, OrderState.CANCELLED)
+    assert repository.compact(round_number=100) == []
+    assert repository.get_order(order.order_id) is order
+
+
+def test_terminal_orders_archived_after_retention():
+    archive = []
+    repository = _repository(retention_rounds=2, archive=archive)
+    live, done = _order(agent_id=0), _order(agent_id=1, side='sell')
+    for order in (live, done):
+        repository.create_order(order)
+        _to_pending(repository, order)
+    repository.transition_state(done.order_id, OrderState.CANCELLED)
+
+    assert repository.compact(round_number=5) == []  # Became terminal this round
+    assert repository.compact(round_number=6) == []
+    assert repository.compact(round_number=7) == [done]
+
+    with pytest.raises(ValueError):
+        repository.get_order(done.order_id)
+    assert repository.get_orders_by_state(OrderState.CANCELLED) == []
+    assert 1 not in repository.agent_index
+    assert repository.get_orders_by_state(OrderState.PENDING) == [live]
+    assert repository.archived_count == 1
+
+    row, = archive
+    assert row['order_id'] == done.order_id
+    assert row['final_state'] == 'cancelled'
+    assert row['transitions'] == 'input>validated>committed>pending>cancelled'
+    assert row['archived_round'] == 7
+
+
+def test_history_formats_commitments_lazily():
+    repository = _repository()
+    order = _order(agent_id=0)
+    order.original_cash_commitment = order.current_cash_commitment = 1000.0
+    repository.create_order(order)
+    repository.transition_state(order.order_id, OrderState.VALIDATED, notes="checked")
+
+    entry = order.history[-1]
+    assert entry.current_commitment == 1000.0
+    assert entry.notes == "checked [cash_commit=1000.00, orig_cash_commit=1000.00, released_cash=0.00]"
+    assert "notes: checked [cash_commit=1000.00" in order.print_history()
+    assert not hasattr(order, '__dict__')
+
+
+def test_log_messages_not_built_when_info_disabled(monkeypatch):
+    logger = logging.getLogger("test_orders_quiet")
+    logger.setLevel(logging.WARNING)
+    repository = OrderRepository(logger=logger)
+
+    def fail(self):
+        raise AssertionError("order formatted although INFO is disabled")
+
+    monkeypatch.setattr(Order, '__str__', fail)
+    order = _order(agent_id=0)
+    repository.create_order(order)
+    _to_pending(repository, order)
+    assert order.state == OrderState.PENDING
+
+
+def test_agent_active_index_follows_transitions():
+    repository = _repository(retention_rounds=0, archive=[])
+    orders = [_order(agent_id=0, side='buy' if i % 2 else 'sell') for i in range(5)]
+    for order in orders:
+        repository.create_order(order)
+    assert repository.get_active_orders_from_agent(0) == []  # INPUT holds no commitment
+
+    for order in orders:
+        _to_pending(repository, order)
+    repository.transition_state(orders[1].order_id, OrderState.ACTIVE)
+    repository.transition_state(orders[2].order_id, OrderState.ACTIVE)
+    repository.transition_state(orders[2].order_id, OrderState.PARTIALLY_FILLED)
+    repository.transition_state(orders[3].order_id, OrderState.ACTIVE)
+    repository.transition_state(orders[3].order_id, OrderState.FILLED)
+    repository.transition_state(orders[4].order_id, OrderState.CANCELLED)
+
+    assert repository.get_active_orders_from_agent(0) == orders[:3]
+    assert repository.get_book_orders_from_agent(0) == orders[1:3]
+    assert repository.get_active_orders_from_agent(1) == []
+
+    repository.compact(round_number=0)
+    assert repository.get_active_orders_from_agent(0) == orders[:3]
+    assert repository.get_agent_orders(0) == orders[:3]
@@ -0,0 +1,120 @@
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import pytest
+
+from agents.LLMs.services.formatting_services import AgentContext, MarketStateFormatter
+from agents.LLMs.services.prompt_builder import PromptBuilder
+from agents.LLMs.services.prompt_fragments import PromptFragmentCache, PromptFragments
+from agents.LLMs.services.schema_features import Feature
+from market.information.information_types import InformationSignal, InformationType
+from scenarios.base import FundamentalInfoMode
+from services.simulation_runtime import SimulationRuntime
+
+
+def _signals(round_number):
+    def signal(info_type, value, **metadata):
+        return InformationSignal(type=info_type, value=value, reliability=1.0,
+                                 metadata={'round': round_number, **metadata})
+
+    return {
+        InformationType.PRICE: signal(InformationType.PRICE, 28.0 + round_number),
+        InformationType.VOLUME: signal(InformationType.VOLUME, 120.0 + round_number),
+        InformationType.ORDER_BOOK: signal(
+            InformationType.ORDER_BOOK,
+            {'buy_levels': [{'price': 27.5, 'quantity': 10}, {'price': 27.0, 'quantity': 5}],
+             'sell_levels': [{'price': 29.0, 'quantity': 8}, {'price': 29.5, 'quantity': 3}]},
+            best_bid=27.5, best_ask=29.0),
+        InformationType.FUNDAMENTAL: signal(InformationType.FUNDAMENTAL, 28.0,
+                                            periods_remaining=20 - round_number, redemption_value=28.0),
+        InformationType.DIVIDEND: signal(
+            InformationType.DIVIDEND, 1.4,
+            yields={'expected': 5.0, 'max': 8.6, 'min': 1.4, 'last': 5.0},
+            max_dividend=2.4, min_dividend=0.4, last_paid_dividend=1.4, next_payment_round=round_number + 1,
+            should_pay=True, variation=1.0, probability=50.0, dividend_history=[0.4, 2.4, 1.4]),
+        InformationType.INTEREST: signal(InformationType.INTEREST, 0.05, compound_frequency='per_round',
+                                         interest_destination='dividend'),
+    }
+
+
+def _context(agent_id, cash, shares):
+    return AgentContext(agent_id=agent_id, cash=cash, shares=shares, available_cash=cash,
+                        available_shares=shares,
+                        outstanding_orders={'buy': [{'quantity': 2, 'price': 27.5, 'order_type': 'limit'}],
+                                            'sell': []})
+
+
+def _prompts(contexts, signals, history, mode):
+    market_state = {'price': 31.0}  # One market state per round, as execute_round passes
+    return [MarketStateFormatter.format_prompt_sections(agent_signals, context, signal_history=history,
+                                                        market_state=market_state,
+                                                        fundamental_info_mode=mode)
+            for context, agent_signals in zip(contexts, signals)]
+
+
+@pytest.mark.parametrize("mode", list(FundamentalInfoMode))
+def test_shared_fragments_give_identical_sections(mode):
+    history = {r: _signals(r) for r in range(1, 4)}
+    base = _signals(3)
+    # The third agent sees a truncated order book, as an information capability would make
+    book = base[InformationType.ORDER_BOOK]
+    truncated = replace(book, value={side: levels[:1] for side, levels in book.value.items()})
+    signals = [dict(base), dict(base), {**base, InformationType.ORDER_BOOK: truncated}]
+    contexts = [_context("a", 1000.0, 10), _context("b", 250.0, 40), _context("c", 10.0, 0)]
+
+    with SimulationRuntime().activate():
+        PromptFragments.configure(False)
+        expected = _prompts(contexts, signals, history, mode)
+        PromptFragments.configure(True)
+        assert _prompts(contexts, signals, history, mode) == expected
+        cache = PromptFragments.get_active()
+
+    # Market sections rendered for the shared and the truncated book; price history once
+    assert (cache.misses, cache.hits) == (3, 3)
+    assert expected[0]['position_info'] != expected[1]['position_info']  # Private sections differ
+    assert "29.50" in expected[0]['base_market_state']
+    assert "29.50" not in expected[2]['base_market_state']
+
+
+def test_cache_is_per_round_and_per_runtime():
+    cache = PromptFragmentCache()
+    source = object()
+    renders = []
+    render = lambda: renders.append(1) or len(renders)
+
+    assert cache.get(1, 'x', (source,), render) == 1
+    assert cache.get(1, 'x', (source,), render) == 1
+    assert cache.get(1, 'y', (source,), render) == 2
+    assert cache.get(2, 'x', (source,), render) == 3  # New round renders again
+
+    with SimulationRuntime().activate():
+        PromptFragments.configure(True)
+        with SimulationRuntime().activate():
+            assert PromptFragments.get_active() is None  # Off unless configured
+        assert PromptFragments.get_active() is not None
+
+
+def test_prefix_stable_layout_puts_agent_sections_last():
+    base = _signals(3)
+    history = {r: _signals(r) for r in range(1, 4)}
+    contexts = [_context("a", 1000.0, 10), _context("b", 250.0, 40)]
+    sections = _prompts(contexts, [base, base], history, FundamentalInfoMode.FULL)
+    feature_instructions = PromptBuilder.build_instructions({Feature.MEMORY, Feature.SOCIAL})
+    prompts = [PromptBuilder.build_prefix_stable_prompt(agent_sections, feature_instructions, is_multi_stock=True,
+                                                        social_feed="\n\nSocial Feed: No messages yet.",
+                                                        memory=f"\n\nNotes of {context.agent_id}")
+               for agent_sections, context in zip(sections, contexts)]
+
+    account = prompts[0].index("=== YOUR ACCOUNT ===")
+    assert prompts[0][:account] == prompts[1][:account]  # Everything before the account is shared
+    assert prompts[0].index("MULTI-STOCK") < prompts[0].index("=== MARKET THIS ROUND ===") < account
+    assert prompts[0].index(sections[0]['position_info']) > account
+    assert prompts[0].index("Notes of a") > account
+    for name in ('trading_options', 'market_state', 'price_history', 'dividend_info', 'interest_info',
+                 'redemption_info', 'trade_history', 'orders_display', 'position_info'):
+        assert sections[0][name] in prompts[0]
+    # Feature instructions come in a fixed order, whatever the set order
+    assert feature_instructions.index("MEMORY SYSTEM") < feature_instructions.index("MESSAGING")
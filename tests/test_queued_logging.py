@@ -0,0 +1,46 @@
+import sys
+import logging
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from logging_utils.logger_factory import LoggerFactory
+from logging_utils.queued_logging import QueuedLogWriter, mirror_file, unlink_mirror
+
+
+def test_queued_writer_writes_once_and_restores_handlers(tmp_path, request):
+    logger = LoggerFactory.create_logger(
+        f"queued_{request.node.name}", tmp_path, None, "market.log", logging.NullHandler(),
+        formatter=logging.Formatter('%(message)s'), use_dual_output=False)
+    writer = QueuedLogWriter()
+    writer.attach(logger)
+    assert not any(isinstance(h, logging.FileHandler) for h in logger.handlers)
+
+    writer.start()
+    for i in range(100):
+        logger.info(f"line {i}")
+    writer.stop()
+    logger.info("after stop")
+
+    lines = (tmp_path / "market.log").read_text().splitlines()
+    assert lines == [f"line {i}" for i in range(100)] + ["after stop"]
+    assert any(isinstance(h, logging.FileHandler) for h in logger.handlers)
+    for handler in list(logger.handlers):
+        handler.close()
+        logger.removeHandler(handler)
+
+
+def test_mirror_replaces_target_and_unlink_protects_source(tmp_path):
+    source = tmp_path / "run" / "market.log"
+    source.parent.mkdir()
+    source.write_text("run output\n")
+    target = tmp_path / "latest" / "market.log"
+    target.parent.mkdir()
+    target.write_text("stale\n")
+
+    assert mirror_file(source, target) in ('hardlink', 'symlink', 'copy')
+    assert target.read_text() == "run output\n"
+
+    unlink_mirror(target)
+    target.write_text("next run\n")
+    assert source.read_text() == "run output\n"
@@ -0,0 +1,103 @@
+import sys
+import json
+import time
+import asyncio
+import multiprocessing
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from run_sweep import SweepJob, SweepManifest, expand_jobs
+from agents.LLMs.services.llm_endpoints import SharedLLMBudget
+from agents.LLMs.services.llm_retry import LLMDeadlineExceeded
+
+
+def test_expand_jobs_and_keys():
+    jobs = expand_jobs(["a", "b"], seeds=[1, 2], allow_short_selling=[True, False])
+
+    assert len(jobs) == 8
+    assert len({job.key for job in jobs}) == 8
+    assert jobs[0].key == "a__seed1__short"
+    assert SweepJob("a", margin_requirement=0.5, borrow_rate=0.01).key == "a__margin0.5__borrow0.01"
+    assert expand_jobs(["a"]) == [SweepJob("a")]  # No overrides: key is the scenario name
+    assert SweepJob("a").key == "a"
+
+
+def test_manifest_resumes_unfinished_jobs(tmp_path):
+    jobs = expand_jobs(["a"], seeds=[1, 2, 3])
+    manifest = SweepManifest.create(tmp_path, jobs, datetime.now(), paper_version="v1")
+    manifest.record(jobs[0].key, "success", 1.0, run_dir="logs/a/1")
+    manifest.record(jobs[1].key, "failed", 0.5, error="boom")
+    assert manifest.data["status"] == "in_progress"
+
+    # A new process picks up what is on disk
+    resumed = SweepManifest.load(tmp_path)
+    assert resumed.data["paper_version"] == "v1"
+    assert resumed.pending() == jobs[1:]
+
+    for job in resumed.pending():
+        resumed.record(job.key, "success", 1.0)
+    assert resumed.data["status"] == "completed"
+    assert SweepManifest.load(tmp_path).pending() == []
+    assert not (tmp_path / "manifest.json.tmp").exists()
+
+
+def test_manifest_loads_pre_sweep_paper_manifests(tmp_path):
+    (tmp_path / "manifest.json").write_text(json.dumps({
+        "scenarios": ["paper_a", "paper_b"], "status": "in_progress",
+        "results": {"paper_a": {"status": "success"}},
+    }))
+
+    assert SweepManifest.load(tmp_path).pending() == [SweepJob("paper_b")]
+
+
+def test_shared_budget_caps_in_flight_requests():
+    in_flight = peak = 0
+
+    async def request():
+        nonlocal in_flight, peak
+        async with SharedLLMBudget.async_slot():
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    async def fan_out():
+        await asyncio.gather(*(request() for _ in range(6)))
+
+    SharedLLMBudget.install(multiprocessing.get_context("spawn").BoundedSemaphore(2))
+    try:
+        asyncio.run(fan_out())
+        with SharedLLMBudget.slot():
+            pass
+    finally:
+        SharedLLMBudget.install(None)
+    assert peak == 2
+
+
+def test_shared_budget_wait_stops_at_deadline():
+    semaphore = multiprocessing.get_context("spawn").BoundedSemaphore(1)
+    semaphore.acquire()  # A sibling worker holds the only slot
+
+    async def request(deadline):
+        async with SharedLLMBudget.async_slot(deadline):
+            pass
+
+    SharedLLMBudget.install(semaphore)
+    try:
+        start = time.monotonic()
+        with pytest.raises(LLMDeadlineExceeded):
+            with SharedLLMBudget.slot(deadline=time.monotonic() + 0.1):
+                pass
+        with pytest.raises(LLMDeadlineExceeded):
+            asyncio.run(request(time.monotonic() + 0.1))
+        assert time.monotonic() - start < 1.0
+
+        semaphore.release()
+        with SharedLLMBudget.slot(deadline=time.monotonic() + 0.1):
+            pass  # A free slot is taken at once
+    finally:
+        SharedLLMBudget.install(None)
@@ -27,6 +27,14 @@ from agents.agent_manager.services.borrowing_repository import BorrowingReposito
 from agents.agents_api import TradeDecision
 from market.state.sim_context import SimulationContext
 from market.state.services.dividend_service import DividendPaymentProcessor
+from agents.agent_manager.services.commitment_services import CommitmentCalculator
+from agents.agent_manager.services.position_services import PositionCalculator
+from market.orders.order import Order, OrderState
+from market.orders.order_repository import OrderRepository
+from market.orders.order_state_manager import OrderStateManager
+from market.orders.trade_execution_service import TradeExecutionService
+from market.trade import Trade
+from services.simulation_runtime import SimulationRuntime
 
 class DummyAgent(BaseAgent):
     def make_decision(self, market_state, history, round_number):
@@ -121,3 +129,57 @@ def test_redemption_updates_short_interest_history():
 
     assert context.public_info["short_interest"] == 0
     assert context.market_history.short_interest[-1] == 0
+
+
+class _Book:
+    def __init__(self):
+        self.removed = []
+
+    def remove_order(self, order):
+        self.removed.append(order)
+
+
+def _buckets(agent):
+    return {state: {side: [o.order_id for o in batch] for side, batch in sides.items() if batch}
+            for state, sides in agent.orders.items() if any(sides.values())}
+
+
+def test_agent_orders_hold_live_orders_after_fill_and_cancel():
+    context = SimulationContext(num_rounds=1, initial_price=100, fundamental_price=100,
+                                redemption_value=0, transaction_cost=0)
+    buyer = DummyAgent("buyer", initial_cash=10000, initial_shares=0)
+    seller = DummyAgent("seller", initial_cash=0, initial_shares=20)
+    agents = AgentRepository([buyer, seller], logger=None, context=context,
+                             borrowing_repository=BorrowingRepository(total_lendable=0, logger=None))
+    repository, book = OrderRepository(logger=logging.getLogger("test_orders")), _Book()
+    state_manager = OrderStateManager(repository, agents, book, logger=None,
+                                      commitment_calculator=CommitmentCalculator())
+    trades = TradeExecutionService(repository, agents, CommitmentCalculator(), state_manager,
+                                   logger=None, position_calculator=PositionCalculator())
+
+    with SimulationRuntime().activate():  # No order books registered: cancels use the manager's book
+        buy = Order(agent_id="buyer", order_type='limit', side='buy', quantity=10, round_placed=0, price=100.0)
+        sell = Order(agent_id="seller", order_type='limit', side='sell', quantity=4, round_placed=0, price=100.0)
+        for order in (buy, sell):
+            repository.create_order(order)
+            assert state_manager.handle_new_order(order, 100.0)[0]
+        assert _buckets(buyer) == {'committed': {'buy': [buy.order_id]}}
+
+        for order in (buy, sell):
+            for state in (OrderState.PENDING, OrderState.ACTIVE):
+                repository.transition_state(order.order_id, state)
+        trades.execute_trade(Trade.from_orders(buy, sell, quantity=4, price=100.0, round=1))
+
+        # The filled sell leaves every bucket; the partly filled buy stays live
+        assert sell.state == OrderState.FILLED and _buckets(seller) == {}
+        assert seller.outstanding_orders == {'buy': [], 'sell': []}
+        assert _buckets(buyer) == {'partially_filled': {'buy': [buy.order_id]}}
+        assert buyer.outstanding_orders == {'buy': [buy], 'sell': []}
+
+        state_manager.handle_single_order_cancellation(buy)
+        assert buy.state == OrderState.CANCELLED and book.removed == [buy]
+        assert _buckets(buyer) == {}
+        assert buyer.outstanding_orders == {'buy': [], 'sell': []}
+        assert set(buyer.orders) == {'committed', 'matching', 'limit_matching',
+                                     'pending', 'active', 'partially_filled'}
+        assert (buyer.committed_cash, buyer.cash, seller.cash, seller.committed_shares) == (0, 9600, 400, 0)
@@ -0,0 +1,93 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import pytest
+
+from market.information.base_information_services import InformationService
+from market.information.information_types import InformationSignal, InformationType
+from market.information.signal_history import SignalArchive, SignalHistory
+
+
+class _PriceProvider:
+    def generate_signal(self, round_number):
+        return InformationSignal(type=InformationType.PRICE, value=100.0 + round_number,
+                                 reliability=1.0, metadata={'round': round_number,
+                                                            'levels': [[99.0, 5], [98.0, 7]]})
+
+
+class _Agent:
+    def __init__(self, agent_id):
+        self.agent_id = agent_id
+        self.received = []
+
+    def receive_information(self, signals):
+        self.received.append(signals)
+
+
+class _Repository:
+    def __init__(self, agents):
+        self.agents = {agent.agent_id: agent for agent in agents}
+
+    def get_all_agent_ids(self):
+        return list(self.agents)
+
+    def get_agent(self, agent_id):
+        return self.agents[agent_id]
+
+    def distribute_information(self, signals):
+        for agent_id, agent_signals in signals.items():
+            self.agents[agent_id].receive_information(agent_signals)
+
+
+def test_signal_history_evicts_oldest_rounds_to_archive(tmp_path):
+    archive = SignalArchive(tmp_path / "signals.sqlite")
+    history = SignalHistory(retention_rounds=3, archive=archive)
+    for round_number in range(1, 8):
+        history[round_number] = {'round': round_number}
+
+    assert list(history) == [5, 6, 7]
+    assert archive.rounds() == [1, 2, 3, 4]
+    assert history.lookup(2) == {'round': 2}
+    assert history.lookup(6) == {'round': 6}
+    assert history.lookup(9) is None
+
+    history.flush()
+    assert archive.rounds() == list(range(1, 8))
+    assert list(history) == [5, 6, 7]  # Flushing keeps the retained rounds
+
+    dropped = SignalHistory(retention_rounds=1)
+    dropped[1], dropped[2] = 'a', 'b'
+    assert dict(dropped) == {2: 'b'} and dropped.lookup(1) is None
+    with pytest.raises(ValueError):
+        SignalHistory(retention_rounds=-1)
+    archive.close()
+
+
+def test_information_service_reads_archived_rounds(tmp_path):
+    agents = [_Agent("a"), _Agent("b")]
+    archive = SignalArchive(tmp_path / "signals.sqlite")
+    service = InformationService(_Repository(agents), retention_rounds=2, archive=archive)
+    service.register_provider(InformationType.PRICE, _PriceProvider())
+
+    for round_number in range(1, 6):
+        service.distribute_information(round_number)
+
+    assert list(service.get_signal_history()) == [4, 5]
+    assert archive.rounds() == [1, 2, 3]
+    for round_number in range(1, 6):
+        base = service.get_signal_history(round_number)
+        assert base[InformationType.PRICE].value == 100.0 + round_number
+        signal = service.get_signal_history(round_number, agent_id="b")[InformationType.PRICE]
+        assert signal == agents[1].received[round_number - 1][InformationType.PRICE]
+    with pytest.raises(ValueError):
+        service.get_signal_history(6)
+
+    # Without retention every round stays in memory, as before
+    unbounded = InformationService(_Repository([_Agent("a")]), retention_rounds=None)
+    unbounded.register_provider(InformationType.PRICE, _PriceProvider())
+    for round_number in range(1, 10):
+        unbounded.distribute_information(round_number)
+    assert list(unbounded.get_signal_history()) == list(range(1, 10))
+    archive.close()
@@ -0,0 +1,151 @@
+import os
+import sys
+import json
+import random
+import asyncio
+import threading
+import subprocess
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from services.messaging_service import MessagingService
+from services.shared_service_factory import SharedServiceFactory
+from services.simulation_runtime import SimulationRuntime
+
+
+def test_seeded_runtime_matches_module_level_seeding():
+    runtime = SimulationRuntime(seed=11)
+    random.seed(11)
+    np.random.seed(11)
+
+    assert [runtime.rng.random() for _ in range(5)] == [random.random() for _ in range(5)]
+    assert np.array_equal(runtime.np_rng.normal(0, 1, 5), np.random.normal(0, 1, 5))
+    assert SimulationRuntime().rng is random  # Unseeded runtimes keep the module-level state
+
+
+def test_concurrent_runtimes_keep_separate_state():
+    runtimes = [SimulationRuntime(seed=i) for i in range(4)]
+    barrier = threading.Barrier(len(runtimes))
+    seen = {}
+
+    def simulate(index, runtime):
+        runtime.make_current()
+        SharedServiceFactory.reset()
+        SharedServiceFactory.initialize(order_book=f"book-{index}")
+        barrier.wait()  # Every thread has initialized before any reads
+        for round_number in range(1, 4):
+            MessagingService.add_message(round_number, f"agent-{index}", {"text": f"sim {index}"})
+        seen[index] = (SharedServiceFactory.get_order_book_for_stock("DEFAULT_STOCK"),
+                       MessagingService.get_message_history(3))
+
+    threads = [threading.Thread(target=simulate, args=(i, r)) for i, r in enumerate(runtimes)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for index, (book, history) in seen.items():
+        assert book == f"book-{index}"
+        assert [m["agent_id"] for m in history] == [f"agent-{index}"] * 3
+    assert len({r.namespace for r in runtimes}) == len(runtimes)
+
+
+def test_activate_restores_previous_runtime():
+    outer, inner = SimulationRuntime(), SimulationRuntime()
+    with outer.activate():
+        MessagingService.add_message(1, "a", {"text": "outer"})
+        with inner.activate():
+            assert MessagingService.get_messages(1) == []
+        assert SimulationRuntime.current() is outer
+        assert len(MessagingService.get_messages(1)) == 1
+
+
+# Two simulations on threads: (round deadline, retry attempts, seconds each agent takes).
+# The "short" simulation's second agent misses every deadline; the "long" one's agents
+# are still deciding when the short one ends its round and closes its clients.
+CONCURRENT_LLM_SIMULATIONS = {'short': (0.3, 2, [0.05, 5.0]), 'long': (5.0, 7, [0.8, 0.8])}
+
+
+def _concurrent_llm_runs(rounds=2):
+    """Run CONCURRENT_LLM_SIMULATIONS side by side and print what their agents saw as JSON"""
+    from base_sim import BaseSimulation
+    from agents.LLMs.services.llm_endpoints import ENDPOINT_PROFILES, AsyncLLMPool
+    from agents.LLMs.services.llm_retry import LLMCallControl
+
+    def slow_decision(agent, seconds, seen):
+        async def make_decision_async(market_state, history, round_number):
+            LLMCallControl.stats.calls += 1
+            policy_attempts = LLMCallControl.policy.max_attempts
+            pool = AsyncLLMPool.for_profile(ENDPOINT_PROFILES['default'])
+            pool._bind_loop()
+            client = pool._client
+            await asyncio.sleep(seconds)
+            seen.append({'max_attempts': policy_attempts, 'same_client': pool._client is client is not None,
+                         'remaining': LLMCallControl.remaining(LLMCallControl.round_deadline())})
+            return agent.make_decision(market_state, history, round_number)
+        return make_decision_async
+
+    barrier = threading.Barrier(len(CONCURRENT_LLM_SIMULATIONS))
+    results = {}
+
+    def simulate(name, deadline, max_attempts, agent_seconds):
+        sim = BaseSimulation(
+            num_rounds=rounds + 1, initial_price=28.0, fundamental_price=28.0, redemption_value=28.0,
+            agent_params={'allow_short_selling': False, 'position_limit': 1000, 'initial_cash': 10000.0,
+                          'initial_shares': 100, 'max_order_size': 100,
+                          'agent_composition': {'hold_trader': len(agent_seconds)}},
+            dividend_params={'type': 'fixed', 'base_dividend': 1.0, 'dividend_frequency': 1,
+                             'dividend_growth': 0.0, 'dividend_probability': 1.0,
+                             'dividend_variation': 0.0, 'destination': 'dividend'},
+            interest_params={'rate': 0.05, 'compound_frequency': 'per_round', 'destination': 'dividend'},
+            sim_type=f"test_runtime_{name}", async_llm_decisions=True, random_seed=1,
+            llm_round_deadline=deadline, llm_retry_policy={'max_attempts': max_attempts, 'base_delay': 0.0},
+        )
+        seen = []
+        for agent_id, seconds in zip(sim.agent_repository.get_all_agent_ids(), agent_seconds):
+            agent = sim.agent_repository.get_agent(agent_id)
+            agent.make_decision_async = slow_decision(agent, seconds, seen)
+        barrier.wait()  # Both simulations are configured before either runs
+        try:
+            for round_number in range(rounds):
+                sim.execute_round(round_number)
+            results[name] = {'seen': seen, 'totals': LLMCallControl.stats.as_dict(),
+                             'rounds': sim.decision_service.llm_stats_history}
+        finally:
+            sim.close()
+
+    threads = [threading.Thread(target=simulate, args=(name, *settings))
+               for name, settings in CONCURRENT_LLM_SIMULATIONS.items()]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(json.dumps(results))
+
+
+def test_concurrent_simulations_keep_their_llm_call_control(tmp_path):
+    # A fresh interpreter: other test modules swap in a stub LoggingService at import
+    code = f"import sys; sys.path.insert(0, {str(Path(__file__).parent)!r}); " \
+           f"from test_simulation_runtime import _concurrent_llm_runs; _concurrent_llm_runs()"
+    env = dict(os.environ, OPENAI_API_KEY=os.environ.get('OPENAI_API_KEY', 'sk-test'))
+    result = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True, env=env)
+    assert result.returncode == 0, result.stderr[-2000:]
+    results = json.loads(result.stdout.strip().splitlines()[-1])
+
+    short, long = results['short'], results['long']
+    # Each simulation keeps its own retry policy
+    assert {seen['max_attempts'] for seen in short['seen']} == {2}
+    assert {seen['max_attempts'] for seen in long['seen']} == {7}
+    # The short simulation ending its rounds neither cut off the long one nor touched its clients
+    assert len(long['seen']) == 4
+    assert all(seen['same_client'] and seen['remaining'] > 0 for seen in long['seen'])
+    assert all(seen['remaining'] <= 0.3 for seen in short['seen'])  # Nor did the long one's deadline apply
+    assert [r['deadline_fallbacks'] for r in long['rounds']] == [0, 0]
+    # The slow agent misses the short deadline every round; counters stay per simulation
+    assert [r['deadline_fallbacks'] for r in short['rounds']] == [1, 1]
+    assert [r['calls'] for r in short['rounds']] == [2, 2] and [r['calls'] for r in long['rounds']] == [2, 2]
+    assert (short['totals']['calls'], long['totals']['calls']) == (4, 4)
+    assert (short['totals']['deadline_fallbacks'], long['totals']['deadline_fallbacks']) == (2, 0)
@@ -0,0 +1,207 @@
+import sys
+import random
+import logging
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from market.orders.order import Order, OrderState
+from market.orders.order_repository import OrderRepository
+from market.state.sim_context import PAYMENT_FIELDS, SimulationContext
+from verification import simulation_verifier
+from verification.simulation_verifier import SimulationVerifier
+
+
+@pytest.fixture(autouse=True)
+def _plain_loggers(monkeypatch):
+    monkeypatch.setattr(simulation_verifier.LoggingService, "get_logger",
+                        staticmethod(logging.getLogger))
+
+
+def _context(num_rounds=10):
+    return SimulationContext(num_rounds=num_rounds, initial_price=100.0, fundamental_price=100.0,
+                             redemption_value=100.0, transaction_cost=0.0)
+
+
+def _record_payments(context, n=200, seed=3):
+    recorders = {
+        'dividends_paid': context.record_dividend_payment,
+        'interest_paid': context.record_interest_payment,
+        'borrow_fees_paid': context.record_borrow_fee_payment,
+        'leverage_cash_borrowed': context.record_leverage_cash_borrowed,
+        'leverage_interest_charged': context.record_leverage_interest_charged,
+        'leverage_cash_repaid': context.record_leverage_cash_repaid,
+        'margin_call_costs': context.record_margin_call_cost,
+    }
+    rng = random.Random(seed)
+    for _ in range(n):
+        field = rng.choice(PAYMENT_FIELDS)
+        recorders[field](amount=rng.uniform(0, 50), round_number=rng.randint(0, 9))
+
+
+def _verifier(context, order_repository=None, full_audit_every=None, agents=(), **levels):
+    agent_repository = SimpleNamespace(
+        get_all_agent_ids=lambda: [agent.agent_id for agent in agents],
+        get_agent=lambda agent_id: next(a for a in agents if a.agent_id == agent_id),
+        get_all_agents=lambda: list(agents),
+        borrowing_repository=SimpleNamespace(total_lendable=100, available_shares=60),
+    )
+    return SimulationVerifier(
+        agent_repository=agent_repository, context=context, contexts=None,
+        order_repository=order_repository or OrderRepository(logger=logging.getLogger("test_orders")),
+        order_book=None, order_books=None, borrowing_repository=None, borrowing_repositories=None,
+        dividend_service=None, dividend_services=None, is_multi_stock=False, infinite_rounds=False,
+        agent_params={}, full_audit_every=full_audit_every, **levels)
+
+
+def _agent(agent_id, cash, shares):
+    return SimpleNamespace(agent_id=agent_id, total_cash=cash, initial_cash=cash, total_shares=shares,
+                           initial_shares=shares, margin_call_cost_this_round=0.0)
+
+
+def test_running_totals_match_history_sums():
+    context = _context()
+    _record_payments(context)
+
+    for field in PAYMENT_FIELDS:
+        history = getattr(context.market_history, field)
+        assert context.payment_total(field) == sum(p['amount'] for p in history)
+        for round_number in range(11):
+            assert context.payment_total(field, round_number) == sum(
+                p['amount'] for p in history if p['round'] == round_number)
+
+    _verifier(context).verify_payment_ledger()
+
+
+def test_payment_ledger_audit_detects_drift():
+    context = _context()
+    _record_payments(context, n=20)
+    context.market_history.interest_paid.append({'round': 4, 'amount': 5.0, 'timestamp': None})
+
+    with pytest.raises(ValueError, match="interest_paid"):
+        _verifier(context).verify_payment_ledger()
+
+
+@pytest.mark.parametrize("full_audit_every, expected", [
+    (None, [10]),
+    (4, [4, 8, 10]),
+])
+def test_full_audit_rounds(full_audit_every, expected):
+    verifier = _verifier(_context(num_rounds=10), full_audit_every=full_audit_every)
+    assert [r for r in range(1, 11) if verifier.is_full_audit_round(r)] == expected
+
+
+def test_full_audit_every_must_be_positive():
+    with pytest.raises(ValueError):
+        _verifier(_context(), full_audit_every=0)
+
+
+def test_commitment_check_agrees_with_exhaustive_scan():
+    repository = OrderRepository(logger=logging.getLogger("test_orders"))
+    agent = SimpleNamespace(agent_id="a", committed_cash=0.0, committed_positions={"DEFAULT_STOCK": 0})
+    for i in range(6):
+        order = Order(agent_id="a", order_type='limit', side='buy' if i % 2 else 'sell',
+                      quantity=10, round_placed=0, price=100.0)
+        repository.create_order(order)
+        for state in (OrderState.VALIDATED, OrderState.COMMITTED, OrderState.PENDING):
+            repository.transition_state(order.order_id, state)
+        if i == 0:
+            repository.transition_state(order.order_id, OrderState.CANCELLED)
+            continue
+        if order.side == 'buy':
+            order.current_cash_commitment = 1000.0
+            agent.committed_cash += 1000.0
+        else:
+            order.current_share_commitment = 10
+            agent.committed_positions["DEFAULT_STOCK"] += 10
+
+    verifier = _verifier(_context(), order_repository=repository, agents=[agent])
+    verifier.verify_commitment_order_matching()
+    verifier.verify_commitment_order_matching(exhaustive=True)
+    verifier.verify_order_state_index()
+
+    # An order whose state changed behind the repository's back is only seen by the full audit
+    stray = repository.get_orders_by_state(OrderState.PENDING, 'buy')[0]
+    stray.state = OrderState.ACTIVE
+    verifier.verify_commitment_order_matching()
+    with pytest.raises(ValueError, match="state index"):
+        verifier.verify_order_state_index()
+
+
+@pytest.mark.parametrize("sample, expected", [
+    (3, [3, 6, 9, 10]),
+    ([2, 5], [2, 5, 10]),
+    (1.0, list(range(1, 11))),
+])
+def test_sampled_level_picks_full_rounds(sample, expected):
+    verifier = _verifier(_context(num_rounds=10), level='sampled', sample=sample)
+    assert [r for r in range(1, 11) if verifier.checks_for_round(r) == 'full'] == expected
+    assert all(verifier.checks_for_round(r) == 'cheap' for r in range(1, 10) if r not in expected)
+
+
+def test_random_sample_is_seeded():
+    def full_rounds(seed):
+        verifier = _verifier(_context(num_rounds=1000), level='sampled', sample=0.2, sample_seed=seed)
+        return [r for r in range(1, 1000) if verifier.checks_for_round(r) == 'full']
+
+    assert full_rounds(7) == full_rounds(7) != full_rounds(8)
+    assert 150 < len(full_rounds(7)) < 250
+
+
+@pytest.mark.parametrize("level, sample", [('paranoid', None), ('sampled', 0.0), ('sampled', 1.5),
+                                           ('sampled', 0)])
+def test_invalid_level_or_sample(level, sample):
+    with pytest.raises(ValueError):
+        _verifier(_context(), level=level, sample=sample)
+
+
+def test_off_level_skips_everything():
+    agents = [_agent("a", 100.0, 10)]
+    verifier = _verifier(_context(), agents=agents, level='off')
+    assert verifier.store_pre_round_states() == {}
+    agents[0].total_cash = -1e9  # Would fail any check
+    verifier.verify_round_end_states({})
+
+
+def test_cheap_level_checks_conservation_totals():
+    context = _context()
+    agents = [_agent("a", 1000.0, 30), _agent("b", 500.0, 10)]
+    agents[0].total_shares += 40  # Borrowed from the pool (100 lendable, 60 available)
+    verifier = _verifier(context, agents=agents, level='cheap')
+    pre_round_states = verifier.store_pre_round_states()
+
+    context.round_number = 4
+    context.record_dividend_payment(amount=25.0, round_number=3)
+    agents[1].total_cash += 25.0
+    agents[0].total_cash -= 300.0  # A trade: cash moves between agents
+    agents[1].total_cash += 300.0
+    verifier.verify_round_end_states(pre_round_states)
+
+    agents[1].total_cash += 1.0  # Cash from nowhere
+    with pytest.raises(ValueError, match="cash"):
+        verifier.verify_round_end_states(pre_round_states)
+    agents[1].total_cash -= 1.0
+
+    agents[1].total_shares += 1  # Shares from nowhere
+    with pytest.raises(ValueError, match="shares"):
+        verifier.verify_round_end_states(pre_round_states)
+
+
+def test_state_index_audit_checks_agent_active_index():
+    repository = OrderRepository(logger=logging.getLogger("test_orders"))
+    order = Order(agent_id="a", order_type='limit', side='buy', quantity=10, round_placed=0, price=100.0)
+    repository.create_order(order)
+    for state in (OrderState.VALIDATED, OrderState.COMMITTED, OrderState.PENDING):
+        repository.transition_state(order.order_id, state)
+    verifier = _verifier(_context(), order_repository=repository)
+    verifier.verify_order_state_index()
+
+    # Cancelled without the repository: still indexed as live
+    repository.state_index[OrderState.PENDING]['buy'].pop(order.order_id)
+    repository.state_index[OrderState.CANCELLED]['buy'][order.order_id] = None
+    order.state = OrderState.CANCELLED
+    with pytest.raises(ValueError, match="active order index"):
+        verifier.verify_order_state_index()
@@ -0,0 +1,66 @@
+import sys
+import random
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import pytest
+
+from agents.LLMs.calculation.market_calculator import MarketCalculator
+from agents.services.trade_ledger import TradeLedger
+from market.trade import Trade
+
+
+def _trades(agent_id, n, seed=11):
+    rng = random.Random(seed)
+    trades, round_number = [], 1
+    for i in range(n):
+        round_number += rng.choice([0, 0, 1, 2])  # Several trades per round, gaps between rounds
+        buyer, seller = (agent_id, "other") if rng.random() < 0.5 else ("other", agent_id)
+        trades.append(Trade(buyer_id=buyer, seller_id=seller, stock_id="DEFAULT_STOCK",
+                            quantity=rng.randint(1, 20), price=round(rng.uniform(90, 110), 2),
+                            timestamp=datetime(2024, 1, 1), round=round_number,
+                            buyer_order_id=f"b{i}", seller_order_id=f"s{i}"))
+    return trades
+
+
+@pytest.mark.parametrize("recent_size", [3, 8, 50])
+def test_ledger_summary_matches_history_scan(recent_size):
+    agent = SimpleNamespace(agent_id="a")
+    ledger = TradeLedger(agent, recent_size=recent_size)
+    history = []
+    for trade in _trades("a", 60):
+        history.append(trade)
+        ledger.record(trade)
+        last_round = trade.round
+        for current_round in (last_round - 3, last_round, last_round + 1):
+            for lookback in (1, 3, 5):
+                expected = MarketCalculator.calculate_trade_pnl_summary(history, "a", current_round, lookback)
+                actual = MarketCalculator.calculate_trade_pnl_summary(history, "a", current_round, lookback,
+                                                                      ledger=ledger)
+                assert actual == expected
+
+    buys = [t for t in history if t.buyer_id == "a"]
+    sells = [t for t in history if t.seller_id == "a"]
+    buy_volume, sell_volume = sum(t.quantity for t in buys), sum(t.quantity for t in sells)
+    buy_value, sell_value = sum(t.value for t in buys), sum(t.value for t in sells)
+    assert ledger.count == len(history)
+    assert (ledger.buys, ledger.sells) == (len(buys), len(sells))
+    assert ledger.net_volume == buy_volume - sell_volume
+    assert ledger.avg_buy_price == pytest.approx(buy_value / buy_volume)
+    assert ledger.avg_sell_price == pytest.approx(sell_value / sell_volume)
+    assert ledger.realized_pnl == pytest.approx(sell_value - sell_volume * buy_value / buy_volume)
+    assert ledger.last(5) == history[-min(5, recent_size):]
+    assert len(ledger.recent) == min(recent_size, len(history))
+
+
+def test_recent_trades_falls_back_when_deque_is_too_short():
+    ledger = TradeLedger(SimpleNamespace(agent_id="a"), recent_size=4)
+    for trade in _trades("a", 10):
+        ledger.record(trade)
+    newest_round = ledger.recent[-1].round
+    # Every buffered trade is from the current round or later: the deque can't answer
+    assert ledger.recent_trades(ledger.recent[0].round, 2) is None
+    assert ledger.recent_trades(newest_round + 1, 0) == []